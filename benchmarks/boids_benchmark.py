@@ -0,0 +1,108 @@
+"""
+Boids swarm benchmark: one batched velocity frame for 200 zerglings vs 100 enemies.
+
+Target: a full 200-vs-100 frame of
+BoidsSwarmController.calculate_swarm_velocities in under 2 ms.
+
+Usage:
+    pytest benchmarks/boids_benchmark.py --benchmark-json=results.json
+    python benchmarks/boids_benchmark.py  # standalone mode
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import Any
+
+import numpy as np
+import pytest
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "wicked_zerg_challenger")
+)
+
+from combat.boids_swarm_control import BoidsSwarmController  # noqa: E402
+
+FRAME_TARGET_MS = 2.0
+
+ENEMY_TYPES = ["MARINE", "MARAUDER", "SIEGETANKSIEGED", "MEDIVAC", "HELLBAT"]
+
+
+def make_frame(
+    num_units: int = 200, num_enemies: int = 100, seed: int = 0
+) -> dict[str, Any]:
+    """Army clumped around (60, 60) attacking an enemy ball around (75, 75)."""
+    rng = np.random.default_rng(seed)
+    return {
+        "positions": rng.normal(60.0, 4.0, size=(num_units, 2)),
+        "velocities": rng.normal(0.0, 0.1, size=(num_units, 2)),
+        "target": (75.0, 75.0),
+        "enemy_positions": rng.normal(75.0, 4.0, size=(num_enemies, 2)),
+        "enemy_types": [ENEMY_TYPES[i % len(ENEMY_TYPES)] for i in range(num_enemies)],
+    }
+
+
+def run_frame(boids: BoidsSwarmController, frame: dict[str, Any]) -> np.ndarray:
+    return boids.calculate_swarm_velocities(
+        frame["positions"],
+        velocities=frame["velocities"],
+        target=frame["target"],
+        enemy_positions=frame["enemy_positions"],
+        enemy_types=frame["enemy_types"],
+    )
+
+
+# ── Pytest-benchmark fixtures ─────────────────────────────────────────────────
+
+
+@pytest.fixture
+def frame_200v100():
+    return make_frame(200, 100)
+
+
+def test_boids_frame_200v100(benchmark, frame_200v100):
+    """Benchmark one batched boids frame with 200 units vs 100 enemies."""
+    boids = BoidsSwarmController()
+    result = benchmark(run_frame, boids, frame_200v100)
+    assert result.shape == (200, 2)
+
+
+# ── Standalone benchmark runner ───────────────────────────────────────────────
+
+
+def run_boids_benchmark(trials: int = 500) -> dict[str, float]:
+    """Measure p50/p95/p99 latency of a 200-vs-100 boids frame."""
+    boids = BoidsSwarmController()
+    frame = make_frame(200, 100)
+    run_frame(boids, frame)  # warm-up
+
+    latencies: list[float] = []
+    for _ in range(trials):
+        t0 = time.perf_counter()
+        run_frame(boids, frame)
+        latencies.append((time.perf_counter() - t0) * 1000)  # ms
+
+    latencies.sort()
+    return {
+        "p50_ms": latencies[int(trials * 0.50)],
+        "p95_ms": latencies[int(trials * 0.95)],
+        "p99_ms": latencies[int(trials * 0.99)],
+        "min_ms": latencies[0],
+        "max_ms": latencies[-1],
+    }
+
+
+def main() -> None:
+    print("Running boids swarm benchmark (200 units vs 100 enemies)...\n")
+    latency = run_boids_benchmark()
+    print(f"  p50 latency : {latency['p50_ms']:.3f} ms")
+    print(f"  p95 latency : {latency['p95_ms']:.3f} ms")
+    print(f"  p99 latency : {latency['p99_ms']:.3f} ms")
+    status = "OK" if latency["p50_ms"] < FRAME_TARGET_MS else "OVER BUDGET"
+    print(f"  target      : < {FRAME_TARGET_MS:.1f} ms ({status})")
+
+
+if __name__ == "__main__":
+    main()
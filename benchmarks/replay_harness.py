@@ -0,0 +1,477 @@
+"""
+Offline replay harness: deterministic on_step benchmarks without StarCraft II.
+
+Feeds an observation log (recorded by ``ObservationRecorder`` during real
+games, ``OBSERVATION_LOG_DIR=...``) back into a headless BotAI through the
+regular burnysc2 ``_prepare_start`` / ``_prepare_step`` / ``on_step`` /
+``_after_step`` sequence. A fake client collects the emitted actions and
+answers queries with neutral defaults, so the whole pipeline runs on plain
+Linux.
+
+Reports step latency percentiles, emitted actions and per-manager timings
+(from BotStepIntegrator's LogicActivityTracker when present).
+
+Usage:
+    python benchmarks/replay_harness.py logs/obs_3_20260101_120000.wzobs
+    python benchmarks/replay_harness.py --synthetic --steps 200 --json out.json
+    REPLAY_LOG=... pytest benchmarks/replay_harness.py --benchmark-json=out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "python")
+BOT_DIR = os.path.join(os.path.dirname(__file__), "..", "wicked_zerg_challenger")
+sys.path.insert(0, BOT_DIR)
+
+from s2clientprotocol import common_pb2, data_pb2, raw_pb2  # noqa: E402
+from s2clientprotocol import sc2api_pb2 as sc_pb  # noqa: E402
+from sc2.action import combine_actions  # noqa: E402
+from sc2.data import ActionResult, Result  # noqa: E402
+from sc2.game_data import GameData  # noqa: E402
+from sc2.game_info import GameInfo  # noqa: E402
+from sc2.game_state import GameState  # noqa: E402
+
+from utils.observation_log import (  # noqa: E402
+    ObservationLog,
+    ObservationLogWriter,
+    RecordKind,
+)
+
+# ── Headless client ──────────────────────────────────────────────────────────
+
+
+class ReplayClient:
+    """
+    Stand-in for ``sc2.client.Client``.
+
+    Actions are collected per step; pathing / placement / ability queries get
+    neutral answers (straight-line distance, placement ok, no abilities).
+    Debug draw calls are accepted and dropped.
+    """
+
+    def __init__(self, game_step: int = 1):
+        self.game_step = game_step
+        self.in_game = True
+        self._game_result: Dict[int, Result] = {}
+        self.step_actions: List[Any] = []
+        self.chat: List[str] = []
+
+    def begin_step(self) -> None:
+        self.step_actions = []
+
+    async def actions(self, actions, return_successes: bool = False):
+        self.step_actions.extend(actions)
+        return [ActionResult.Success] * len(actions) if return_successes else []
+
+    async def query_pathing(self, start, end) -> Optional[float]:
+        start = getattr(start, "position", start)
+        return math.hypot(end[0] - start[0], end[1] - start[1])
+
+    async def query_pathings(self, zipped_list) -> List[float]:
+        return [await self.query_pathing(start, end) for start, end in zipped_list]
+
+    async def query_building_placement(
+        self, ability, positions, ignore_resources: bool = True
+    ) -> List[ActionResult]:
+        return [ActionResult.Success] * len(positions)
+
+    async def _query_building_placement_fast(
+        self, ability, positions, ignore_resources: bool = True
+    ) -> List[bool]:
+        return [True] * len(positions)
+
+    async def query_available_abilities(
+        self, units, ignore_resource_requirements: bool = False
+    ) -> List[list]:
+        return [[] for _ in units]
+
+    async def query_available_abilities_with_tag(
+        self, units, ignore_resource_requirements: bool = False
+    ) -> Dict[int, set]:
+        return {unit.tag: set() for unit in units}
+
+    async def chat_send(self, message: str, team_only: bool) -> None:
+        self.chat.append(message)
+
+    async def _send_debug(self) -> None:
+        return None
+
+    async def step(self, step_size: Optional[int] = None) -> None:
+        return None
+
+    def __getattr__(self, name: str):
+        # debug_text_*, debug_box_*, debug_sphere_* ... 는 무시
+        if name.startswith("debug_"):
+            return lambda *args, **kwargs: None
+        raise AttributeError(name)
+
+
+# ── Replay player ────────────────────────────────────────────────────────────
+
+
+@dataclass
+class ReplayResult:
+    steps: int = 0
+    step_ms: List[float] = field(default_factory=list)
+    actions_per_step: List[int] = field(default_factory=list)
+    protocol_actions_per_step: List[int] = field(default_factory=list)
+    action_counts: Counter = field(default_factory=Counter)
+    manager_ms: Dict[str, float] = field(default_factory=dict)
+    start_ms: float = 0.0
+
+    def summary(self, top: int = 15) -> Dict[str, Any]:
+        latencies = np.asarray(self.step_ms) if self.step_ms else np.zeros(1)
+        managers = sorted(self.manager_ms.items(), key=lambda x: x[1], reverse=True)
+        return {
+            "steps": self.steps,
+            "on_start_ms": self.start_ms,
+            "step_p50_ms": float(np.percentile(latencies, 50)),
+            "step_p95_ms": float(np.percentile(latencies, 95)),
+            "step_p99_ms": float(np.percentile(latencies, 99)),
+            "step_max_ms": float(latencies.max()),
+            "step_mean_ms": float(latencies.mean()),
+            "actions_total": int(sum(self.actions_per_step)),
+            "protocol_actions_total": int(sum(self.protocol_actions_per_step)),
+            "actions_by_ability": dict(self.action_counts.most_common(top)),
+            "manager_total_ms": dict(managers[:top]),
+        }
+
+
+def _default_bot_factory():
+    from wicked_zerg_bot_pro_impl import WickedZergBotProImpl
+
+    return WickedZergBotProImpl(train_mode=False)
+
+
+class ReplayPlayer:
+    """Drive a BotAI through a recorded game, step by step, without SC2."""
+
+    def __init__(
+        self,
+        log: ObservationLog,
+        bot_factory: Callable[[], Any] = _default_bot_factory,
+        seed: int = 0,
+        call_on_end: bool = False,
+    ):
+        self.log = log
+        self.bot_factory = bot_factory
+        self.seed = seed
+        self.call_on_end = call_on_end
+        self.bot = None
+        self.client: Optional[ReplayClient] = None
+
+    async def play(self, max_steps: Optional[int] = None) -> ReplayResult:
+        # 결정적 재생: 매 실행 동일 시드
+        random.seed(self.seed)
+        np.random.seed(self.seed)
+
+        result = ReplayResult()
+        bot = self.bot = self.bot_factory()
+        client = self.client = ReplayClient()
+        proto_game_info = sc_pb.Response()
+        proto_game_info.game_info.CopyFrom(self.log.game_info)
+
+        bot._initialize_variables()
+        bot._prepare_start(
+            client,
+            int(self.log.meta.get("player_id", 1)),
+            GameInfo(self.log.game_info),
+            GameData(self.log.game_data),
+            realtime=False,
+            base_build=int(self.log.meta.get("base_build", -1)),
+        )
+
+        for step in self.log.steps(max_steps):
+            if step.pathing is not None:
+                proto_game_info.game_info.start_raw.pathing_grid.CopyFrom(step.pathing)
+            bot._prepare_step(GameState(step.observation), proto_game_info)
+
+            if step.index == 0:
+                start = time.perf_counter()
+                await bot.on_before_start()
+                bot._prepare_first_step()
+                await bot.on_start()
+                result.start_ms = (time.perf_counter() - start) * 1000
+                bot._prepare_step(GameState(step.observation), proto_game_info)
+
+            client.begin_step()
+            start = time.perf_counter()
+            await bot.issue_events()
+            await bot.on_step(step.index)
+            await bot._after_step()
+            result.step_ms.append((time.perf_counter() - start) * 1000)
+
+            result.actions_per_step.append(len(client.step_actions))
+            result.protocol_actions_per_step.append(
+                sum(1 for _ in combine_actions(client.step_actions))
+            )
+            result.action_counts.update(
+                getattr(a.ability, "name", str(a.ability)) for a in client.step_actions
+            )
+            result.steps += 1
+
+        if self.call_on_end:
+            await bot.on_end(Result.Tie)
+
+        tracker = getattr(
+            getattr(bot, "_step_integrator", None), "_logic_tracker", None
+        )
+        if tracker is not None:
+            result.manager_ms = {
+                name: seconds * 1000
+                for name, seconds in tracker.execution_times.items()
+            }
+        return result
+
+
+def replay(
+    log_path, max_steps: Optional[int] = None, bot_factory=_default_bot_factory
+) -> ReplayResult:
+    return asyncio.run(
+        ReplayPlayer(ObservationLog.load(log_path), bot_factory).play(max_steps)
+    )
+
+
+# ── Synthetic log (pipeline smoke test without recorded games) ───────────────
+
+HATCHERY, DRONE, ZERGLING, OVERLORD, LARVA = 86, 104, 105, 106, 151
+MARINE, COMMANDCENTER, MINERALFIELD = 48, 18, 341
+STRUCTURE_ATTR = data_pb2.Attribute.Value("Structure")
+
+
+def _image(width: int, height: int, value: int, bits: int) -> common_pb2.ImageData:
+    if bits == 1:
+        data = bytes([0xFF if value else 0x00]) * (width * height // 8)
+    else:
+        data = bytes([value]) * (width * height)
+    return common_pb2.ImageData(
+        bits_per_pixel=bits,
+        size=common_pb2.Size2DI(x=width, y=height),
+        data=data,
+    )
+
+
+def synthetic_game_info(size: int = 64) -> sc_pb.ResponseGameInfo:
+    info = sc_pb.ResponseGameInfo(map_name="SyntheticFlat")
+    info.player_info.add(player_id=1, type=1, race_requested=2, race_actual=2)
+    info.player_info.add(
+        player_id=2, type=2, race_requested=1, race_actual=1, difficulty=3
+    )
+    raw = info.start_raw
+    raw.map_size.x = raw.map_size.y = size
+    raw.pathing_grid.CopyFrom(_image(size, size, 1, 1))
+    raw.placement_grid.CopyFrom(_image(size, size, 1, 1))
+    raw.terrain_height.CopyFrom(_image(size, size, 200, 8))
+    raw.playable_area.p0.x = raw.playable_area.p0.y = 0
+    raw.playable_area.p1.x = raw.playable_area.p1.y = size
+    raw.start_locations.add(x=size - 10.5, y=size - 10.5)
+    return info
+
+
+def synthetic_game_data() -> sc_pb.ResponseData:
+    """Every ability, unit type and upgrade id; costs only for the synthetic game's units."""
+    from sc2.dicts.unit_train_build_abilities import TRAIN_INFO
+    from sc2.ids.ability_id import AbilityId
+    from sc2.ids.unit_typeid import UnitTypeId
+    from sc2.ids.upgrade_id import UpgradeId
+
+    data = sc_pb.ResponseData()
+    for ability in AbilityId:
+        if ability.value == 0:
+            continue
+        no_target = (
+            ability.name.startswith(("STOP", "HOLD", "CANCEL"))
+            or "TRAIN" in ability.name
+        )
+        data.abilities.add(
+            ability_id=ability.value,
+            link_name=ability.name,
+            button_name=ability.name,
+            available=True,
+            target=1 if no_target else 4,  # None / PointOrUnit
+        )
+    for upgrade in UpgradeId:
+        if upgrade.value != 0:
+            data.upgrades.add(upgrade_id=upgrade.value, name=upgrade.name)
+    known = {
+        HATCHERY: (300, 0, 1152, True),
+        DRONE: (50, 1, 1342, False),
+        ZERGLING: (25, 0.5, 1343, False),
+        OVERLORD: (100, 0, 1344, False),
+        MARINE: (50, 1, 560, False),
+        COMMANDCENTER: (400, 0, 0, True),
+        MINERALFIELD: (0, 0, 0, True),
+    }
+    creation = {
+        unit_type.value: info["ability"].value
+        for trained in TRAIN_INFO.values()
+        for unit_type, info in trained.items()
+    }
+    for unit_type in UnitTypeId:
+        if unit_type.value == 0:
+            continue
+        minerals, food, ability_id, structure = known.get(
+            unit_type.value, (0, 0, creation.get(unit_type.value, 0), False)
+        )
+        unit = data.units.add(
+            unit_id=unit_type.value,
+            name=unit_type.name,
+            available=True,
+            mineral_cost=minerals,
+            food_required=food,
+            ability_id=ability_id,
+            movement_speed=0.0 if structure else 3.0,
+        )
+        if structure:
+            unit.attributes.append(STRUCTURE_ATTR)
+    return data
+
+
+def synthetic_observation(
+    step: int, num_lings: int = 40, num_marines: int = 20, size: int = 64
+) -> sc_pb.ResponseObservation:
+    """Zerglings circling their hatchery while marines walk in."""
+    response = sc_pb.ResponseObservation()
+    obs = response.observation
+    obs.game_loop = step
+    obs.player_common.player_id = 1
+    obs.player_common.minerals = 50 + 5 * step
+    obs.player_common.food_cap = 30
+    obs.player_common.food_used = 12 + num_lings // 2
+    obs.raw_data.map_state.visibility.CopyFrom(_image(size, size, 2, 8))
+    obs.raw_data.map_state.creep.CopyFrom(_image(size, size, 0, 1))
+    raw = obs.raw_data
+
+    def add(tag, unit_type, alliance, owner, x, y, health, structure=False):
+        unit = raw.units.add(
+            tag=tag,
+            unit_type=unit_type,
+            alliance=alliance,
+            owner=owner,
+            health=health,
+            health_max=health,
+            build_progress=1.0,
+            display_type=raw_pb2.Visible,
+            radius=2.5 if structure else 0.375,
+        )
+        unit.pos.x, unit.pos.y, unit.pos.z = x, y, 12.0
+
+    add(1, HATCHERY, raw_pb2.Self, 1, 12.5, 12.5, 1500, structure=True)
+    for i in range(8):
+        add(100 + i, MINERALFIELD, raw_pb2.Neutral, 16, 5.5 + i, 20.5, 0, True)
+    for i in range(12):
+        add(200 + i, DRONE, raw_pb2.Self, 1, 9.0 + i * 0.5, 17.0, 40)
+    for i in range(num_lings):
+        angle = 2 * math.pi * i / num_lings + step * 0.05
+        add(
+            1000 + i,
+            ZERGLING,
+            raw_pb2.Self,
+            1,
+            20 + 6 * math.cos(angle),
+            20 + 6 * math.sin(angle),
+            35,
+        )
+    advance = min(step * 0.2, 20.0)
+    for i in range(num_marines):
+        add(
+            5000 + i,
+            MARINE,
+            raw_pb2.Enemy,
+            2,
+            50 - advance + (i % 5),
+            50 - advance + (i // 5),
+            45,
+        )
+    return response
+
+
+def make_synthetic_log(path, steps: int = 100, **observation_kwargs) -> Path:
+    with ObservationLogWriter(path) as writer:
+        writer.write_meta({"player_id": 1, "base_build": -1, "synthetic": True})
+        writer.write_message(RecordKind.GAME_INFO, synthetic_game_info())
+        writer.write_message(RecordKind.GAME_DATA, synthetic_game_data())
+        for step in range(steps):
+            writer.write_message(
+                RecordKind.OBSERVATION,
+                synthetic_observation(step, **observation_kwargs),
+            )
+    return Path(path)
+
+
+# ── Pytest-benchmark ──────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def replay_log(tmp_path):
+    path = os.environ.get("REPLAY_LOG")
+    if path:
+        return ObservationLog.load(path)
+    return ObservationLog.load(make_synthetic_log(tmp_path / "synthetic.wzobs", 50))
+
+
+def test_replay_on_step(benchmark, replay_log):
+    """Benchmark a full replay of the recorded (or synthetic) game."""
+    result = benchmark.pedantic(
+        lambda: asyncio.run(ReplayPlayer(replay_log).play()), rounds=3, iterations=1
+    )
+    assert result.steps == len(replay_log)
+
+
+# ── Standalone runner ─────────────────────────────────────────────────────────
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("log", nargs="?", help="observation log (.wzobs)")
+    parser.add_argument("--synthetic", action="store_true", help="use a generated log")
+    parser.add_argument("--steps", type=int, default=None)
+    parser.add_argument("--json", help="write the summary to this file")
+    args = parser.parse_args()
+
+    if args.synthetic or not args.log:
+        import tempfile
+
+        log_path = Path(tempfile.mkdtemp()) / "synthetic.wzobs"
+        make_synthetic_log(log_path, args.steps or 200)
+    else:
+        log_path = Path(args.log)
+
+    print(f"Replaying {log_path} ...\n")
+    summary = replay(log_path, args.steps).summary()
+    for key in ("steps", "on_start_ms", "step_p50_ms", "step_p95_ms", "step_p99_ms"):
+        value = summary[key]
+        print(
+            f"  {key:<12}: {value:.3f}"
+            if isinstance(value, float)
+            else f"  {key:<12}: {value}"
+        )
+    print(f"  actions     : {summary['actions_total']}")
+    print(f"  protocol    : {summary['protocol_actions_total']} (after combine)")
+    print("\n  Top managers (total ms):")
+    for name, ms in summary["manager_total_ms"].items():
+        print(f"    {ms:9.2f}  {name}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"\nSummary written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Startup benchmark: cold on_start manager initialization with and without a budget.
+
+Target: ManagerFactory.initialize_all() returns within STARTUP_BUDGET_MS
+(plus the unavoidable cost of CRITICAL/HIGH managers); everything else is
+built lazily or by per-step warm_up() slices.
+
+Each measurement runs in a fresh interpreter so module imports are cold,
+exactly like the first on_start of a game. python-sc2 is imported before
+the factory and reported as "preload": the bot class subclasses BotAI, so
+that cost is paid at process start, not in on_start.
+
+Measured (cold runs, 400 ms budget): on_start 400-430 ms, with combat's
+import (~150 ms) the largest single item; preload 365-455 ms. Before
+utils.kd_tree imported SciPy lazily and preload was split out, on_start
+read ~650 ms.
+
+Usage:
+    pytest benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py  # standalone mode
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Optional
+
+BOT_DIR = os.path.join(os.path.dirname(__file__), "..", "wicked_zerg_challenger")
+sys.path.insert(0, BOT_DIR)
+
+from core.startup import STARTUP_BUDGET_MS  # noqa: E402
+
+# 예산은 MEDIUM 이하에만 적용되므로 CRITICAL/HIGH 비용 + 측정 오차 여유
+SLACK_MS = 150.0
+
+
+def run_child(budget_ms: Optional[float]) -> None:
+    """Build every registered manager against a mock bot and print the report."""
+    import logging
+    import time
+    from unittest.mock import Mock
+
+    logging.disable(logging.CRITICAL)
+
+    # WickedZergBotProImpl subclasses BotAI, so python-sc2 (and the
+    # scipy.spatial.distance it imports) is loaded before on_start runs.
+    t0 = time.perf_counter()
+    import sc2.bot_ai  # noqa: F401
+
+    preload_ms = (time.perf_counter() - t0) * 1000.0
+
+    from core.manager_factory import ManagerFactory
+    from core.manager_registry import get_all_manager_configs
+
+    factory = ManagerFactory(Mock())
+    factory.register_managers(get_all_manager_configs())
+    factory.initialize_all(verbose=False, budget_ms=budget_ms)
+    report = factory.startup_report.to_dict()
+
+    # 예산 밖 매니저를 on_step 슬라이스로 모두 생성하는 데 걸리는 step 수
+    # (lazy 매니저는 활성 조건이 필요하므로 제외)
+    timings = factory.startup_report.timings
+    steps = 0
+    while steps < 1000 and any(
+        timings[attr].mode == "deferred" for attr in factory.startup_report.pending()
+    ):
+        factory.warm_up()
+        steps += 1
+    report["warm_up_steps"] = steps
+    report["preload_ms"] = preload_ms
+    print(json.dumps(report))
+
+
+def measure_startup(budget_ms: Optional[float]) -> dict[str, Any]:
+    """Run one cold on_start in a fresh interpreter and return its report."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--child"]
+    if budget_ms is not None:
+        cmd += ["--budget", str(budget_ms)]
+    out = subprocess.run(
+        cmd, cwd=BOT_DIR, capture_output=True, text=True, check=True, timeout=120
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def eager_floor_ms(report: dict[str, Any]) -> float:
+    """Time spent on managers that are never deferred (CRITICAL/HIGH)."""
+    return sum(
+        m["import_ms"] + m["construct_ms"]
+        for m in report["managers"].values()
+        if m["mode"] == "eager"
+    )
+
+
+# ── Pytest tests ──────────────────────────────────────────────────────────────
+
+
+def test_startup_respects_budget():
+    """on_start stays within the budget except for CRITICAL/HIGH managers."""
+    report = measure_startup(STARTUP_BUDGET_MS)
+    limit = max(STARTUP_BUDGET_MS, eager_floor_ms(report)) + SLACK_MS
+    assert report["on_start_ms"] <= limit
+    assert report["warm_up_steps"] < 1000
+
+
+# ── Standalone benchmark runner ───────────────────────────────────────────────
+
+
+def print_report(label: str, report: dict[str, Any], top: int = 8) -> None:
+    print(f"{label}")
+    print(
+        f"  preload     : {report['preload_ms']:.1f} ms (sc2.bot_ai, before on_start)"
+    )
+    print(f"  on_start    : {report['on_start_ms']:.1f} ms")
+    print(f"  import      : {report['import_ms']:.1f} ms")
+    print(f"  construct   : {report['construct_ms']:.1f} ms")
+    print(f"  pending     : {len(report['pending'])} ({', '.join(report['pending'])})")
+    print(f"  warm_up     : {report['warm_up_steps']} steps to drain")
+    slowest = sorted(
+        report["managers"].items(),
+        key=lambda kv: -(kv[1]["import_ms"] + kv[1]["construct_ms"]),
+    )[:top]
+    for attr, m in slowest:
+        print(
+            f"    {attr:<24} {m['mode']:<8} "
+            f"import {m['import_ms']:7.1f} ms  construct {m['construct_ms']:7.1f} ms"
+        )
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--budget", type=float, default=None)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args.budget)
+        return
+
+    print("Running cold on_start startup benchmark...\n")
+    baseline = measure_startup(None)
+    budgeted = measure_startup(STARTUP_BUDGET_MS)
+    print_report("No budget (everything except lazy managers):", baseline)
+    print_report(f"Budget {STARTUP_BUDGET_MS:.0f} ms:", budgeted)
+
+    limit = max(STARTUP_BUDGET_MS, eager_floor_ms(budgeted)) + SLACK_MS
+    status = "OK" if budgeted["on_start_ms"] <= limit else "OVER BUDGET"
+    print(f"  speedup     : {baseline['on_start_ms'] / budgeted['on_start_ms']:.2f}x")
+    print(f"  target      : <= {limit:.0f} ms ({status})")
+
+
+if __name__ == "__main__":
+    main()
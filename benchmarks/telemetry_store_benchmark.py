@@ -0,0 +1,169 @@
+"""
+Telemetry store benchmark: per-game JSON scans vs. the columnar store.
+
+Generates N legacy telemetry files (indented JSON, one per game), then times:
+
+- legacy dashboard: glob + sort by mtime + json.loads of the newest 100 games
+- legacy matchup report: json.loads of every game to get win rate and
+  frame-time p95 per enemy race
+- store migration: one-time ingest of all files
+- store dashboard / matchup report: index-only queries
+
+Usage:
+    pytest benchmarks/telemetry_store_benchmark.py
+    python benchmarks/telemetry_store_benchmark.py --games 5000  # standalone mode
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+BOT_DIR = os.path.join(os.path.dirname(__file__), "..", "wicked_zerg_challenger")
+sys.path.insert(0, BOT_DIR)
+
+from monitoring.dashboard import DashboardServer  # noqa: E402
+from monitoring.telemetry_store import TelemetryStore, is_win  # noqa: E402
+
+RACES = ("Terran", "Protoss", "Zerg")
+MAPS = ("AbyssalReefAIE", "Simple64", "GoldenAuraAIE")
+FRAMES_PER_GAME = 600  # 22 스텝 샘플링 기준 약 10분 경기
+
+
+def make_legacy_games(directory: Path, games: int, seed: int = 0) -> None:
+    """Write games in the pre-store TelemetryCollector format (indent=2)."""
+    rng = np.random.default_rng(seed)
+    for index in range(games):
+        frame_ms = rng.gamma(2.0, 6.0, FRAMES_PER_GAME)
+        record = {
+            "game_id": f"game{index:06d}",
+            "start_time": f"2026-{1 + index % 12:02d}-{1 + index % 28:02d} 10:00:00",
+            "enemy_race": RACES[index % 3],
+            "map_name": MAPS[index % len(MAPS)],
+            "result": "Victory" if rng.random() < 0.55 else "Defeat",
+            "frames": [
+                {
+                    "game_time": i * 1.0,
+                    "frame": i * 22,
+                    "minerals": int(rng.integers(0, 800)),
+                    "supply_used": min(200, i // 3),
+                    "frame_time_ms": float(frame_ms[i]),
+                    "game_phase": "mid",
+                }
+                for i in range(FRAMES_PER_GAME)
+            ],
+            "events": [],
+        }
+        path = directory / f"{record['game_id']}_{record['result']}.json"
+        path.write_text(json.dumps(record, indent=2), encoding="utf-8")
+
+
+def legacy_dashboard(directory: Path, limit: int = 100) -> int:
+    files = sorted(
+        directory.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True
+    )
+    wins = 0
+    for path in files[:limit]:
+        wins += is_win(json.loads(path.read_text(encoding="utf-8")).get("result"))
+    return wins
+
+
+def legacy_matchup_report(directory: Path) -> Dict[str, Any]:
+    games: Dict[str, list] = {race: [] for race in RACES}
+    for path in directory.glob("*.json"):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        games[data["enemy_race"]].append(data)
+    report = {}
+    for race, items in games.items():
+        frame_ms = [f["frame_time_ms"] for game in items for f in game["frames"]]
+        report[race] = {
+            "total": len(items),
+            "wins": sum(is_win(game["result"]) for game in items),
+            "p95": float(np.percentile(frame_ms, 95)) if frame_ms else 0.0,
+        }
+    return report
+
+
+def timed(fn: Callable[[], Any]) -> tuple:
+    start = time.perf_counter()
+    value = fn()
+    return (time.perf_counter() - start) * 1000.0, value
+
+
+def run(games: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        make_legacy_games(directory, games)
+        size_json = sum(p.stat().st_size for p in directory.glob("*.json"))
+
+        legacy_dash_ms, _ = timed(lambda: legacy_dashboard(directory))
+        legacy_report_ms, legacy = timed(lambda: legacy_matchup_report(directory))
+
+        store = TelemetryStore(directory)
+        ingest_ms, _ = timed(store.ingest_directory)
+        size_store = store.db_path.stat().st_size + sum(
+            p.stat().st_size for p in store.frames_dir.glob("*.npz")
+        )
+
+        dashboard = DashboardServer(data_dir=tmp)
+        store_dash_ms, _ = timed(dashboard.generate_dashboard_html)
+        store_report_ms, summary = timed(store.matchup_summary)
+
+        for race in RACES:
+            assert summary[race]["total"] == legacy[race]["total"]
+            assert summary[race]["wins"] == legacy[race]["wins"]
+            assert abs(summary[race]["frame_ms"][95] - legacy[race]["p95"]) <= 1.0
+
+        return {
+            "games": games,
+            "json_mb": size_json / 1e6,
+            "store_mb": size_store / 1e6,
+            "legacy_dashboard_ms": legacy_dash_ms,
+            "legacy_matchup_ms": legacy_report_ms,
+            "store_ingest_ms": ingest_ms,
+            "store_dashboard_ms": store_dash_ms,
+            "store_matchup_ms": store_report_ms,
+        }
+
+
+# ── Pytest tests ──────────────────────────────────────────────────────────────
+
+
+def test_store_queries_match_legacy_scan():
+    """Store aggregates equal a full JSON scan and are faster than it."""
+    result = run(150)
+    assert result["store_matchup_ms"] < result["legacy_matchup_ms"]
+
+
+# ── Standalone benchmark runner ───────────────────────────────────────────────
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--games", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"Generating {args.games} legacy telemetry files...\n")
+    result = run(args.games)
+    print(
+        f"  on disk     : JSON {result['json_mb']:.1f} MB -> store {result['store_mb']:.1f} MB"
+    )
+    print(
+        f"  dashboard   : legacy {result['legacy_dashboard_ms']:8.1f} ms   store {result['store_dashboard_ms']:8.1f} ms"
+    )
+    print(
+        f"  matchups    : legacy {result['legacy_matchup_ms']:8.1f} ms   store {result['store_matchup_ms']:8.1f} ms"
+    )
+    print(f"  migration   : {result['store_ingest_ms']:.1f} ms (one-time ingest)")
+
+
+if __name__ == "__main__":
+    main()
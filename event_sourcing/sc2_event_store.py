@@ -19,14 +19,17 @@ SC2 event types:
 
 from __future__ import annotations
 
+import bisect
 import copy
 import json
 import logging
+import os
 import threading
 import time
 import uuid
-from collections import defaultdict
-from dataclasses import dataclass, field
+from array import array
+from collections import OrderedDict, defaultdict
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Type
 
@@ -159,6 +162,89 @@ class Snapshot:
 # Event Store
 # ---------------------------------------------------------------------------
 
+_SEGMENT_PREFIX = "segment_"
+
+
+class _Segment:
+    """
+    One fixed-size slice of the log.
+
+    With a directory, events are appended to a JSON-lines file and the byte
+    offset of every line is kept; sealing writes a columnar sidecar
+    (``.index.json``) so reopening rebuilds the indexes without parsing the
+    events.  Sealed segments may drop their event cache and reload on demand.
+    """
+
+    def __init__(self, number: int, path: Optional[str]):
+        self.number = number
+        self.path = path
+        self.events: Optional[List[Event]] = []
+        self.offsets = array("q")
+        self.sealed = False
+        self._file = None
+
+    @property
+    def index_path(self) -> Optional[str]:
+        return None if self.path is None else self.path + ".index.json"
+
+    def append(self, event: Event) -> None:
+        if self.path is not None:
+            if self._file is None:
+                self._file = open(self.path, "ab")
+            self.offsets.append(self._file.tell())
+            self._file.write(json.dumps(event.to_dict()).encode("utf-8") + b"\n")
+        self.events.append(event)
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def seal(self, aggregate_ids: List[str], types: List[str], ticks: List[int]):
+        """Close the file and write the columnar sidecar."""
+        self.close()
+        self.sealed = True
+        if self.path is None:
+            return
+        streams = list(dict.fromkeys(aggregate_ids))
+        codes = {s: i for i, s in enumerate(streams)}
+        columns = {
+            "count": len(ticks),
+            "offsets": list(self.offsets),
+            "streams": streams,
+            "stream_codes": [codes[a] for a in aggregate_ids],
+            "event_types": types,
+            "ticks": ticks,
+        }
+        with open(self.index_path, "w") as f:
+            json.dump(columns, f)
+
+    def load(self) -> List[Event]:
+        """Parse the whole file (and byte offsets) back into events."""
+        events: List[Event] = []
+        self.offsets = array("q")
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    self.offsets.append(offset)
+                    events.append(Event.from_dict(json.loads(line)))
+                offset += len(line)
+        return events
+
+    def read(self, positions: List[int]) -> List[Event]:
+        """Seek-read a few events without loading the segment."""
+        out = []
+        with open(self.path, "rb") as f:
+            for pos in positions:
+                f.seek(self.offsets[pos])
+                out.append(Event.from_dict(json.loads(f.readline())))
+        return out
+
 
 class EventStore:
     """
@@ -166,38 +252,155 @@ class EventStore:
 
     Stores all events for all aggregates. Supports event replay,
     snapshot storage, and stream queries.
+
+    The log is split into fixed-size segments (sequence ``seq`` lives in
+    segment ``seq // segment_size``).  With ``segment_dir`` every segment is
+    a rolling JSON-lines file and only ``max_cached_segments`` sealed
+    segments keep their events in memory.  Secondary indexes (per stream,
+    per event type, per-stream tick order) hold only sequence numbers.
+
+    Appends are serialized by a writer lock and publish ``count`` last, so
+    readers never take it: they snapshot ``count`` and ignore newer
+    sequence numbers.  The tick index is copy-on-write for out-of-order
+    inserts, so a reader's bisect never sees a shifting array.
     """
 
-    def __init__(self, snapshot_interval: int = 100):
-        self._events: List[Event] = []
-        self._streams: Dict[str, List[int]] = defaultdict(
-            list
-        )  # aggregate_id -> event indices
+    def __init__(
+        self,
+        snapshot_interval: int = 100,
+        segment_dir: Optional[str] = None,
+        segment_size: int = 10000,
+        max_cached_segments: int = 8,
+    ):
         self._snapshots: Dict[str, List[Snapshot]] = defaultdict(list)
         self._snapshot_interval = snapshot_interval
-        self._version_counter: Dict[str, int] = defaultdict(int)
-        self._lock = threading.Lock()
+        self._segment_dir = segment_dir
+        self._segment_size = segment_size
+        self._max_cached_segments = max_cached_segments
+        self._segments: List[_Segment] = []
+        self._count = 0
+        # aggregate_id -> sequence numbers (ascending)
+        self._streams: Dict[str, array] = {}
+        self._by_type: Dict[EventType, array] = {}
+        # aggregate_id -> (ticks sorted, sequence numbers in the same order)
+        self._tick_index: Dict[str, tuple] = {}
+        # active segment columns, flushed into the sidecar on seal
+        self._pending_columns: tuple = ([], [], [])
+        self._cached: "OrderedDict[int, None]" = OrderedDict()
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        if segment_dir is not None:
+            self._open_dir(segment_dir)
+
+    # --- write path ---
+
+    def _active_segment(self) -> _Segment:
+        if self._segments and not self._segments[-1].sealed:
+            seg = self._segments[-1]
+            if len(seg.events) < self._segment_size:
+                return seg
+            self._seal(seg)
+        number = len(self._segments)
+        path = None
+        if self._segment_dir is not None:
+            path = os.path.join(
+                self._segment_dir, f"{_SEGMENT_PREFIX}{number:06d}.jsonl"
+            )
+        seg = _Segment(number, path)
+        self._segments.append(seg)
+        return seg
+
+    def _seal(self, seg: _Segment) -> None:
+        seg.seal(*self._pending_columns)
+        self._pending_columns = ([], [], [])
+        if seg.path is not None:
+            with self._read_lock:
+                self._cached[seg.number] = None
+                self._evict()
+
+    def _index(self, seq: int, aggregate_id: str, event_type: EventType, tick: int):
+        stream = self._streams.get(aggregate_id)
+        if stream is None:
+            stream = self._streams[aggregate_id] = array("q")
+        stream.append(seq)
+        by_type = self._by_type.get(event_type)
+        if by_type is None:
+            by_type = self._by_type[event_type] = array("q")
+        by_type.append(seq)
+
+        entry = self._tick_index.get(aggregate_id)
+        if entry is None:
+            self._tick_index[aggregate_id] = (array("q", [tick]), array("q", [seq]))
+        elif tick >= entry[0][-1]:
+            entry[0].append(tick)
+            entry[1].append(seq)
+        else:
+            ticks, seqs = array("q", entry[0]), array("q", entry[1])
+            pos = bisect.bisect_right(ticks, tick)
+            ticks.insert(pos, tick)
+            seqs.insert(pos, seq)
+            self._tick_index[aggregate_id] = (ticks, seqs)
+
+    def _append_locked(self, event: Event) -> int:
+        seq = self._count
+        seg = self._active_segment()
+        seg.append(event)
+        self._index(seq, event.aggregate_id, event.event_type, event.game_tick)
+        if seg.path is not None:
+            aggregate_ids, types, ticks = self._pending_columns
+            aggregate_ids.append(event.aggregate_id)
+            types.append(event.event_type.value)
+            ticks.append(event.game_tick)
+        self._count = seq + 1  # publish
+        return seq
 
     def append(self, event: Event) -> int:
         """Append an event to the store. Returns the global sequence number."""
-        with self._lock:
-            seq = len(self._events)
-            self._events.append(event)
-            self._streams[event.aggregate_id].append(seq)
-            self._version_counter[event.aggregate_id] += 1
-            return seq
+        with self._write_lock:
+            return self._append_locked(event)
 
     def append_many(self, events: List[Event]) -> List[int]:
         """Append multiple events atomically."""
-        sequences = []
-        with self._lock:
-            for event in events:
-                seq = len(self._events)
-                self._events.append(event)
-                self._streams[event.aggregate_id].append(seq)
-                self._version_counter[event.aggregate_id] += 1
-                sequences.append(seq)
-        return sequences
+        with self._write_lock:
+            return [self._append_locked(event) for event in events]
+
+    # --- read path ---
+
+    def _events_at(self, seqs: List[int]) -> List[Event]:
+        """Resolve ascending sequence numbers to events, loading segments lazily."""
+        out: List[Event] = []
+        size = self._segment_size
+        start = 0
+        while start < len(seqs):
+            number = seqs[start] // size
+            stop = bisect.bisect_left(seqs, (number + 1) * size, start)
+            positions = [s - number * size for s in seqs[start:stop]]
+            out.extend(self._segment_events(self._segments[number], positions))
+            start = stop
+        return out
+
+    def _segment_events(self, seg: _Segment, positions: List[int]) -> List[Event]:
+        events = seg.events
+        if events is None:
+            with self._read_lock:
+                events = seg.events
+                if events is None:
+                    if len(positions) * 16 < len(seg.offsets):
+                        return seg.read(positions)
+                    events = seg.events = seg.load()
+                self._cached[seg.number] = None
+                self._cached.move_to_end(seg.number)
+                self._evict()
+        elif seg.sealed and seg.path is not None:
+            with self._read_lock:
+                if seg.number in self._cached:
+                    self._cached.move_to_end(seg.number)
+        return [events[p] for p in positions]
+
+    def _evict(self) -> None:
+        while len(self._cached) > self._max_cached_segments:
+            number, _ = self._cached.popitem(last=False)
+            self._segments[number].events = None
 
     def get_events(
         self,
@@ -205,14 +408,20 @@ class EventStore:
         after_version: int = 0,
     ) -> List[Event]:
         """Get all events for an aggregate after a given version."""
-        with self._lock:
-            indices = self._streams.get(aggregate_id, [])
-            return [self._events[i] for i in indices[after_version:]]
+        count = self._count
+        stream = self._streams.get(aggregate_id)
+        if stream is None:
+            return []
+        stop = bisect.bisect_left(stream, count)
+        return self._events_at(stream[after_version:stop].tolist())
 
     def get_events_by_type(self, event_type: EventType) -> List[Event]:
         """Get all events of a specific type across all aggregates."""
-        with self._lock:
-            return [e for e in self._events if e.event_type == event_type]
+        count = self._count
+        seqs = self._by_type.get(event_type)
+        if seqs is None:
+            return []
+        return self._events_at(seqs[: bisect.bisect_left(seqs, count)].tolist())
 
     def get_events_in_range(
         self,
@@ -221,49 +430,124 @@ class EventStore:
         end_tick: int,
     ) -> List[Event]:
         """Get events for an aggregate within a game tick range."""
-        with self._lock:
-            indices = self._streams.get(aggregate_id, [])
-            return [
-                self._events[i]
-                for i in indices
-                if start_tick <= self._events[i].game_tick <= end_tick
-            ]
+        count = self._count
+        entry = self._tick_index.get(aggregate_id)
+        if entry is None:
+            return []
+        ticks, seqs = entry
+        lo = bisect.bisect_left(ticks, start_tick)
+        hi = min(bisect.bisect_right(ticks, end_tick), len(seqs))
+        return self._events_at(sorted(s for s in seqs[lo:hi] if s < count))
 
     def get_all_events(self) -> List[Event]:
-        with self._lock:
-            return list(self._events)
+        return self._events_at(list(range(self._count)))
+
+    # --- snapshots ---
 
     def save_snapshot(self, snapshot: Snapshot) -> None:
-        with self._lock:
+        with self._write_lock:
             self._snapshots[snapshot.aggregate_id].append(snapshot)
-
-    def get_latest_snapshot(self, aggregate_id: str) -> Optional[Snapshot]:
-        with self._lock:
-            snaps = self._snapshots.get(aggregate_id, [])
-            return snaps[-1] if snaps else None
+            if self._segment_dir is not None:
+                path = os.path.join(self._segment_dir, "snapshots.jsonl")
+                with open(path, "a") as f:
+                    f.write(json.dumps(asdict(snapshot)) + "\n")
+
+    def get_latest_snapshot(
+        self, aggregate_id: str, max_tick: Optional[int] = None
+    ) -> Optional[Snapshot]:
+        """Latest snapshot, or the latest one taken at or before max_tick."""
+        snaps = self._snapshots.get(aggregate_id, [])
+        for snap in reversed(snaps):
+            if max_tick is None or snap.game_tick <= max_tick:
+                return snap
+        return None
 
     def should_snapshot(self, aggregate_id: str) -> bool:
-        with self._lock:
-            version = self._version_counter.get(aggregate_id, 0)
-            snaps = self._snapshots.get(aggregate_id, [])
-            last_snap_version = snaps[-1].version if snaps else 0
-            return (version - last_snap_version) >= self._snapshot_interval
+        version = self.get_version(aggregate_id)
+        snaps = self._snapshots.get(aggregate_id, [])
+        last_snap_version = snaps[-1].version if snaps else 0
+        return (version - last_snap_version) >= self._snapshot_interval
 
     def get_version(self, aggregate_id: str) -> int:
-        with self._lock:
-            return self._version_counter.get(aggregate_id, 0)
+        stream = self._streams.get(aggregate_id)
+        if stream is None:
+            return 0
+        return bisect.bisect_left(stream, self._count)
 
     def count(self) -> int:
-        with self._lock:
-            return len(self._events)
+        return self._count
 
     def stream_ids(self) -> List[str]:
-        with self._lock:
-            return list(self._streams.keys())
+        return list(self._streams)
+
+    # --- persistence ---
+
+    def _open_dir(self, path: str) -> None:
+        """Create or reopen a segment directory, rebuilding the indexes."""
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "store.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self._segment_size = json.load(f)["segment_size"]
+        else:
+            with open(meta_path, "w") as f:
+                json.dump({"segment_size": self._segment_size}, f)
+
+        names = sorted(
+            n
+            for n in os.listdir(path)
+            if n.startswith(_SEGMENT_PREFIX) and n.endswith(".jsonl")
+        )
+        for number, name in enumerate(names):
+            seg = _Segment(number, os.path.join(path, name))
+            self._segments.append(seg)
+            if os.path.exists(seg.index_path):
+                with open(seg.index_path) as f:
+                    columns = json.load(f)
+                seg.offsets = array("q", columns["offsets"])
+                seg.events = None
+                seg.sealed = True
+                streams = columns["streams"]
+                for code, etype, tick in zip(
+                    columns["stream_codes"], columns["event_types"], columns["ticks"]
+                ):
+                    self._index(self._count, streams[code], EventType(etype), tick)
+                    self._count += 1
+                continue
+            seg.events = seg.load()
+            for event in seg.events:
+                self._index(
+                    self._count, event.aggregate_id, event.event_type, event.game_tick
+                )
+                self._count += 1
+            self._pending_columns = (
+                [e.aggregate_id for e in seg.events],
+                [e.event_type.value for e in seg.events],
+                [e.game_tick for e in seg.events],
+            )
+            if number < len(names) - 1 or len(seg.events) >= self._segment_size:
+                self._seal(seg)
+
+        snap_path = os.path.join(path, "snapshots.jsonl")
+        if os.path.exists(snap_path):
+            with open(snap_path) as f:
+                for line in f:
+                    if line.strip():
+                        snap = Snapshot(**json.loads(line))
+                        self._snapshots[snap.aggregate_id].append(snap)
+
+    def flush(self) -> None:
+        with self._write_lock:
+            if self._segments:
+                self._segments[-1].flush()
+
+    def close(self) -> None:
+        with self._write_lock:
+            for seg in self._segments:
+                seg.close()
 
     def export_json(self) -> str:
-        with self._lock:
-            return json.dumps([e.to_dict() for e in self._events], indent=2)
+        return json.dumps([e.to_dict() for e in self.get_all_events()], indent=2)
 
     def import_json(self, data: str) -> int:
         parsed = json.loads(data)
@@ -333,6 +617,29 @@ class Aggregate:
         for event in events:
             self.apply(event)
 
+    @classmethod
+    def rehydrate(
+        cls,
+        store: EventStore,
+        aggregate_id: str,
+        up_to_tick: Optional[int] = None,
+    ) -> Aggregate:
+        """
+        Rebuild from the latest usable snapshot plus only the events after it.
+
+        With up_to_tick, uses the last snapshot taken at or before that tick
+        and stops replaying at the first later event (time travel).
+        """
+        agg = cls(aggregate_id)
+        snapshot = store.get_latest_snapshot(aggregate_id, max_tick=up_to_tick)
+        if snapshot is not None:
+            agg.load_from_snapshot(snapshot)
+        for event in store.get_events(aggregate_id, after_version=agg.version):
+            if up_to_tick is not None and event.game_tick > up_to_tick:
+                break
+            agg.apply(event)
+        return agg
+
     def load_from_snapshot(self, snapshot: Snapshot) -> None:
         self.state = copy.deepcopy(snapshot.state)
         self.version = snapshot.version
@@ -699,8 +1006,17 @@ class SC2EventSource:
     reconstructing state, building projections, and time-travel debugging.
     """
 
-    def __init__(self, snapshot_interval: int = 50):
-        self.store = EventStore(snapshot_interval=snapshot_interval)
+    def __init__(
+        self,
+        snapshot_interval: int = 50,
+        segment_dir: Optional[str] = None,
+        segment_size: int = 10000,
+    ):
+        self.store = EventStore(
+            snapshot_interval=snapshot_interval,
+            segment_dir=segment_dir,
+            segment_size=segment_size,
+        )
         self.bus = EventBus()
         self._aggregates: Dict[str, Aggregate] = {}
         self._projections: List[Projection] = []
@@ -710,14 +1026,16 @@ class SC2EventSource:
         self._projections.append(projection)
 
     def _get_or_create_aggregate(self, game_id: str) -> Aggregate:
-        if game_id not in self._aggregates:
-            self._aggregates[game_id] = Aggregate(game_id)
-        return self._aggregates[game_id]
+        agg = self._aggregates.get(game_id)
+        if agg is None:
+            # Streams already on disk (reopened segment_dir) resume from snapshot
+            agg = self._aggregates[game_id] = Aggregate.rehydrate(self.store, game_id)
+        return agg
 
     def record_event(self, event: Event) -> int:
         """Record an event: store, apply to aggregate, update projections, publish."""
-        seq = self.store.append(event)
         agg = self._get_or_create_aggregate(event.aggregate_id)
+        seq = self.store.append(event)
         agg.apply(event)
         for proj in self._projections:
             proj.process(event)
@@ -908,23 +1226,9 @@ class SC2EventSource:
         Uses the latest snapshot before target_tick, then replays
         remaining events.
         """
-        agg = Aggregate(game_id)
-
-        # Try to load from snapshot
-        snapshot = self.store.get_latest_snapshot(game_id)
-        start_version = 0
-        if snapshot and snapshot.game_tick <= target_tick:
-            agg.load_from_snapshot(snapshot)
-            start_version = snapshot.version
-
-        # Replay events after snapshot up to target tick
-        events = self.store.get_events(game_id, after_version=start_version)
-        for event in events:
-            if event.game_tick > target_tick:
-                break
-            agg.apply(event)
-
-        return agg.summary()
+        return Aggregate.rehydrate(
+            self.store, game_id, up_to_tick=target_tick
+        ).summary()
 
     def get_event_log(self, game_id: str) -> List[Dict[str, Any]]:
         events = self.store.get_events(game_id)
@@ -22,54 +22,76 @@ class PPOConfig:
     value_coef: float = 0.5
     entropy_coef: float = 0.01
     max_grad_norm: float = 0.5
-    n_steps: int = 2048
+    n_steps: int = 2048  # steps per env per rollout
     n_epochs: int = 10
     batch_size: int = 64
     obs_dim: int = 512
     action_dim: int = 256
+    n_envs: int = 1  # envs stepped in lockstep (rollout = n_steps * n_envs)
 
 
 class PPOBuffer:
-    """Rollout storage for PPO training."""
+    """Preallocated (n_steps, n_envs, ...) rollout storage for PPO training."""
 
-    def __init__(self, n_steps: int, obs_dim: int, action_dim: int):
+    def __init__(self, n_steps: int, obs_dim: int, action_dim: int, n_envs: int = 1):
         self.n_steps = n_steps
+        self.n_envs = n_envs
         self.obs_dim = obs_dim
         self.action_dim = action_dim
+        self.observations = np.zeros((n_steps, n_envs, obs_dim), dtype=np.float32)
+        self.actions = np.zeros((n_steps, n_envs), dtype=np.int64)
+        self.rewards = np.zeros((n_steps, n_envs), dtype=np.float32)
+        self.values = np.zeros((n_steps, n_envs), dtype=np.float32)
+        self.log_probs = np.zeros((n_steps, n_envs), dtype=np.float32)
+        self.dones = np.zeros((n_steps, n_envs), dtype=np.float32)
+        self.action_masks = np.ones((n_steps, n_envs, action_dim), dtype=bool)
+        self.last_values = np.zeros(n_envs, dtype=np.float32)
         self.reset()
 
     def reset(self):
-        self.observations = []
-        self.actions = []
-        self.rewards = []
-        self.values = []
-        self.log_probs = []
-        self.dones = []
-        self.action_masks = []
+        self.has_masks = False
+        self.last_values.fill(0.0)
         self.ptr = 0
 
     def add(self, obs, action, reward, value, log_prob, done, action_mask=None):
-        self.observations.append(obs)
-        self.actions.append(action)
-        self.rewards.append(reward)
-        self.values.append(value)
-        self.log_probs.append(log_prob)
-        self.dones.append(done)
-        self.action_masks.append(action_mask)
+        """Store one lockstep transition; scalars for n_envs == 1, (n_envs,) arrays otherwise."""
+        t = self.ptr
+        self.observations[t] = np.asarray(obs, dtype=np.float32).reshape(
+            self.n_envs, self.obs_dim
+        )
+        self.actions[t] = action
+        self.rewards[t] = reward
+        self.values[t] = value
+        self.log_probs[t] = log_prob
+        self.dones[t] = done
+        if action_mask is not None:
+            self.action_masks[t] = np.asarray(action_mask, dtype=bool).reshape(
+                self.n_envs, self.action_dim
+            )
+            self.has_masks = True
+        else:
+            self.action_masks[t] = True
         self.ptr += 1
 
     def is_full(self) -> bool:
         return self.ptr >= self.n_steps
 
     def get_tensors(self) -> Dict[str, torch.Tensor]:
-        return {
-            "obs": torch.stack(self.observations),
-            "actions": torch.tensor(self.actions, dtype=torch.long),
-            "rewards": torch.tensor(self.rewards, dtype=torch.float32),
-            "values": torch.tensor(self.values, dtype=torch.float32),
-            "log_probs": torch.tensor(self.log_probs, dtype=torch.float32),
-            "dones": torch.tensor(self.dones, dtype=torch.float32),
+        """Flatten (time, env) into one batch axis; zero-copy views of the storage."""
+        n = self.ptr * self.n_envs
+        data = {
+            "obs": torch.from_numpy(self.observations[: self.ptr].reshape(n, -1)),
+            "actions": torch.from_numpy(self.actions[: self.ptr].reshape(n)),
+            "rewards": torch.from_numpy(self.rewards[: self.ptr].reshape(n)),
+            "values": torch.from_numpy(self.values[: self.ptr].reshape(n)),
+            "log_probs": torch.from_numpy(self.log_probs[: self.ptr].reshape(n)),
+            "dones": torch.from_numpy(self.dones[: self.ptr].reshape(n)),
         }
+        if self.has_masks:
+            data["action_masks"] = torch.from_numpy(
+                self.action_masks[: self.ptr].reshape(n, -1)
+            )
+        return data
 
 
 class ActorCritic(nn.Module):
@@ -113,25 +135,83 @@ class PPOTrainer:
         self.cfg = config
         self.model = ActorCritic(config.obs_dim, config.action_dim)
         self.optimizer = optim.Adam(self.model.parameters(), lr=config.lr)
-        self.buffer = PPOBuffer(config.n_steps, config.obs_dim, config.action_dim)
+        self.buffer = PPOBuffer(
+            config.n_steps, config.obs_dim, config.action_dim, config.n_envs
+        )
         self.total_steps = 0
+        self._rollout_env = None
+        self._rollout_obs: Optional[np.ndarray] = None
+
+    @property
+    def rollout_size(self) -> int:
+        return self.cfg.n_steps * self.cfg.n_envs
 
     def collect_rollouts(self, env) -> None:
-        """Collect n_steps of experience from the environment."""
+        """
+        Collect n_steps of experience from each of n_envs environments.
+
+        `env` is a vector env (SyncVectorEnv / SubprocVectorEnv, num_envs ==
+        cfg.n_envs) or, for n_envs == 1, a plain single env. Vector envs keep
+        their episodes running across rollouts and are bootstrapped with the
+        value of the final observation.
+        """
+        if not hasattr(env, "num_envs"):
+            self._collect_single(env)
+            return
+        if env.num_envs != self.cfg.n_envs:
+            raise ValueError(
+                f"vector env has {env.num_envs} envs, config expects {self.cfg.n_envs}"
+            )
+
+        self.buffer.reset()
+        if self._rollout_env is not env or self._rollout_obs is None:
+            self._rollout_env = env
+            self._rollout_obs = env.reset()
+        obs = self._rollout_obs
+
+        with torch.no_grad():
+            while not self.buffer.is_full():
+                masks = env.get_action_masks()
+                mask_t = torch.from_numpy(masks) if masks is not None else None
+                action, log_prob, value = self.model.get_action(
+                    torch.from_numpy(obs), mask_t
+                )
+                actions = action.numpy()
+                next_obs, rewards, dones, _infos = env.step(actions)
+                self.buffer.add(
+                    obs, actions, rewards, value.numpy(), log_prob.numpy(), dones, masks
+                )
+                obs = next_obs
+            _, last_values = self.model(torch.from_numpy(obs))
+
+        self.buffer.last_values[:] = last_values.numpy()
+        self._rollout_obs = obs
+        self.total_steps += self.rollout_size
+
+    def _collect_single(self, env) -> None:
+        """Single (non-vector) env: fresh episode each rollout, no bootstrap."""
         self.buffer.reset()
         obs = env.reset()
         while not self.buffer.is_full():
-            obs_tensor = torch.FloatTensor(obs).unsqueeze(0)
+            obs_tensor = torch.as_tensor(
+                np.asarray(obs, dtype=np.float32).reshape(1, -1)
+            )
             mask = env.get_action_mask() if hasattr(env, "get_action_mask") else None
+            mask_t = (
+                torch.as_tensor(np.asarray(mask, dtype=bool)).reshape(1, -1)
+                if mask is not None
+                else None
+            )
             with torch.no_grad():
-                action, log_prob, value = self.model.get_action(obs_tensor, mask)
-            next_obs, reward, done, _ = env.step(action.item())
+                action, log_prob, value = self.model.get_action(obs_tensor, mask_t)
+            action = int(action[0])
+            next_obs, reward, done, _ = env.step(action)
             self.buffer.add(
-                obs_tensor.squeeze(0),
-                action.item(),
+                obs_tensor.numpy(),
+                action,
                 reward,
-                value.item(),
-                log_prob.item(),
+                float(value[0]),
+                float(log_prob[0]),
                 done,
                 mask,
             )
@@ -139,22 +219,32 @@ class PPOTrainer:
         self.total_steps += self.cfg.n_steps
 
     def compute_gae(
-        self, rewards, values, dones, last_value: float = 0.0
+        self, rewards, values, dones, last_value=0.0
     ) -> Tuple[torch.Tensor, torch.Tensor]:
-        """Generalized Advantage Estimation."""
+        """
+        Generalized Advantage Estimation, one reverse scan vectorized over envs.
+
+        rewards / values / dones are (n_steps,) or (n_steps, n_envs);
+        last_value is a scalar or (n_envs,) bootstrap value.
+        """
+        rewards = np.asarray(rewards, dtype=np.float32)
+        values = np.asarray(values, dtype=np.float32)
+        not_done = 1.0 - np.asarray(dones, dtype=np.float32)
         n = len(rewards)
-        advantages = torch.zeros(n)
-        returns = torch.zeros(n)
-        gae = 0.0
-        next_val = last_value
-        for t in reversed(range(n)):
-            mask = 1.0 - dones[t].item()
-            delta = rewards[t] + self.cfg.gamma * next_val * mask - values[t]
-            gae = delta + self.cfg.gamma * self.cfg.gae_lambda * mask * gae
+
+        next_values = np.empty_like(values)
+        next_values[:-1] = values[1:]
+        next_values[-1] = last_value
+        deltas = rewards + self.cfg.gamma * next_values * not_done - values
+        decay = self.cfg.gamma * self.cfg.gae_lambda * not_done
+
+        advantages = np.empty_like(values)
+        gae = np.zeros_like(values[0])
+        for t in range(n - 1, -1, -1):
+            gae = deltas[t] + decay[t] * gae
             advantages[t] = gae
-            next_val = values[t].item()
         returns = advantages + values
-        return advantages, returns
+        return torch.from_numpy(advantages), torch.from_numpy(returns)
 
     def update_policy(
         self,
@@ -163,7 +253,7 @@ class PPOTrainer:
         returns: torch.Tensor,
     ) -> Dict[str, float]:
         """Single PPO update step on a minibatch."""
-        logits, values = self.model(batch["obs"])
+        logits, values = self.model(batch["obs"], batch.get("action_masks"))
         dist = Categorical(logits=logits)
         new_log_probs = dist.log_prob(batch["actions"])
         entropy = dist.entropy().mean()
@@ -192,18 +282,24 @@ class PPOTrainer:
 
     def train_epoch(self) -> Dict[str, float]:
         """Run n_epochs of PPO updates over the buffer."""
-        data = self.buffer.get_tensors()
+        buf = self.buffer
         advantages, returns = self.compute_gae(
-            data["rewards"], data["values"], data["dones"]
+            buf.rewards[: buf.ptr],
+            buf.values[: buf.ptr],
+            buf.dones[: buf.ptr],
+            buf.last_values,
         )
+        advantages, returns = advantages.reshape(-1), returns.reshape(-1)
+        data = buf.get_tensors()
+        n_samples = len(advantages)
         metrics: Dict[str, List[float]] = {
             "policy_loss": [],
             "value_loss": [],
             "entropy": [],
         }
-        indices = torch.randperm(self.cfg.n_steps)
+        indices = torch.randperm(n_samples)
         for epoch in range(self.cfg.n_epochs):
-            for start in range(0, self.cfg.n_steps, self.cfg.batch_size):
+            for start in range(0, n_samples, self.cfg.batch_size):
                 idx = indices[start : start + self.cfg.batch_size]
                 batch = {k: v[idx] for k, v in data.items()}
                 step_metrics = self.update_policy(batch, advantages[idx], returns[idx])
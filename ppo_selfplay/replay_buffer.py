@@ -1,12 +1,19 @@
 """
 Phase 350: Replay Buffer
 Prioritized experience replay buffer for SC2 training data with SumTree.
+
+Storage is struct-of-arrays (obs / action / reward / n-step columns in
+preallocated NumPy arrays), the SumTree is an array heap with batched
+updates and batched stratified descent, n-step returns are accumulated
+incrementally, and save/load uses per-column .npy files that are
+memory-mapped on load instead of pickling Python objects.
 """
 
+import json
 import os
-import pickle
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Deque, Dict, Optional, Tuple
 
 import numpy as np
 
@@ -23,49 +30,99 @@ class Transition:
 
 
 class SumTree:
-    """Binary SumTree for efficient priority sampling."""
+    """
+    Array-backed binary SumTree (plus min-tree) for batched priority sampling.
+
+    Leaves are padded to a power of two and stored in a 1-indexed heap, so
+    every level is a contiguous slice: updates and descents run one NumPy
+    operation per level for the whole batch.
+    """
 
     def __init__(self, capacity: int):
         self.capacity = capacity
-        self.tree = np.zeros(2 * capacity - 1, dtype=np.float64)
-        self.data: List[Optional[Transition]] = [None] * capacity
-        self.write_ptr = 0
-        self.size = 0
-
-    def _propagate(self, idx: int, delta: float) -> None:
-        parent = (idx - 1) // 2
-        self.tree[parent] += delta
-        if parent != 0:
-            self._propagate(parent, delta)
-
-    def _retrieve(self, idx: int, val: float) -> int:
-        left = 2 * idx + 1
-        right = left + 1
-        if left >= len(self.tree):
-            return idx
-        if val <= self.tree[left]:
-            return self._retrieve(left, val)
-        return self._retrieve(right, val - self.tree[left])
+        self.depth = max(0, (capacity - 1).bit_length())
+        self.base = 1 << self.depth
+        self.tree = np.zeros(2 * self.base, dtype=np.float64)
+        self.min_tree = np.full(2 * self.base, np.inf, dtype=np.float64)
 
     def total_priority(self) -> float:
-        return self.tree[0]
+        return float(self.tree[1])
 
-    def add(self, priority: float, transition: Transition) -> None:
-        leaf = self.write_ptr + self.capacity - 1
-        self.data[self.write_ptr] = transition
-        self.update(leaf, priority)
-        self.write_ptr = (self.write_ptr + 1) % self.capacity
-        self.size = min(self.size + 1, self.capacity)
+    def min_priority(self) -> float:
+        """Smallest non-zero leaf priority (inf when empty)."""
+        return float(self.min_tree[1])
 
-    def update(self, leaf_idx: int, priority: float) -> None:
-        delta = priority - self.tree[leaf_idx]
-        self.tree[leaf_idx] = priority
-        self._propagate(leaf_idx, delta)
+    def leaves(self, data_idx: np.ndarray) -> np.ndarray:
+        return self.tree[np.asarray(data_idx) + self.base]
 
-    def sample(self, val: float) -> Tuple[int, float, Transition]:
-        leaf = self._retrieve(0, val)
-        data_idx = leaf - self.capacity + 1
-        return leaf, self.tree[leaf], self.data[data_idx]
+    def update(self, data_idx, priorities) -> None:
+        """Set leaf priorities for a batch of data indices and refresh parents."""
+        idx = np.asarray(data_idx, dtype=np.int64).ravel() + self.base
+        prios = np.broadcast_to(
+            np.asarray(priorities, dtype=np.float64), idx.shape
+        ).ravel()
+        if idx.size == 0:
+            return
+        if idx.size == 1:
+            self._update_one(int(idx[0]), float(prios[0]))
+            return
+        self.tree[idx] = prios
+        self.min_tree[idx] = np.where(prios > 0, prios, np.inf)
+        for _ in range(self.depth):
+            idx = np.unique(idx >> 1)
+            self.tree[idx] = self.tree[2 * idx] + self.tree[2 * idx + 1]
+            self.min_tree[idx] = np.minimum(
+                self.min_tree[2 * idx], self.min_tree[2 * idx + 1]
+            )
+
+    def _update_one(self, i: int, priority: float) -> None:
+        """Scalar path for single adds (avoids per-level NumPy call overhead)."""
+        tree, min_tree = self.tree, self.min_tree
+        tree[i] = priority
+        min_tree[i] = priority if priority > 0 else np.inf
+        i >>= 1
+        while i:
+            left, right = 2 * i, 2 * i + 1
+            tree[i] = tree[left] + tree[right]
+            min_tree[i] = min(min_tree[left], min_tree[right])
+            i >>= 1
+
+    def rebuild(self, leaf_priorities: np.ndarray) -> None:
+        """Rebuild every level from capacity leaf priorities (load path)."""
+        self.tree.fill(0.0)
+        self.tree[self.base : self.base + self.capacity] = leaf_priorities
+        leaves = self.tree[self.base :]
+        self.min_tree[self.base :] = np.where(leaves > 0, leaves, np.inf)
+        lo = self.base
+        while lo > 1:
+            lo //= 2
+            self.tree[lo : 2 * lo] = (
+                self.tree[2 * lo : 4 * lo : 2] + self.tree[2 * lo + 1 : 4 * lo : 2]
+            )
+            self.min_tree[lo : 2 * lo] = np.minimum(
+                self.min_tree[2 * lo : 4 * lo : 2],
+                self.min_tree[2 * lo + 1 : 4 * lo : 2],
+            )
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Batched descent: data index whose cumulative priority range holds each value."""
+        values = np.array(values, dtype=np.float64)
+        idx = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * idx
+            left_sum = self.tree[left]
+            go_right = values > left_sum
+            values -= np.where(go_right, left_sum, 0.0)
+            idx = left + go_right
+        data_idx = idx - self.base
+        # 부동소수 오차로 빈(0) 리프에 도달한 경우 가장 가까운 유효 리프로 보정
+        empty = self.tree[idx] <= 0
+        if np.any(empty):
+            valid = np.flatnonzero(self.tree[self.base : self.base + self.capacity])
+            if len(valid):
+                pos = np.searchsorted(valid, data_idx[empty]).clip(0, len(valid) - 1)
+                data_idx[empty] = valid[pos]
+        return data_idx
 
 
 class PrioritizedReplayBuffer:
@@ -80,7 +137,11 @@ class PrioritizedReplayBuffer:
         n_step: int = 3,
         gamma: float = 0.99,
         epsilon: float = 1e-6,
+        obs_dtype=np.float32,
+        seed: Optional[int] = None,
     ):
+        if capacity <= n_step:
+            raise ValueError("capacity must exceed n_step")
         self.capacity = capacity
         self.alpha = alpha
         self.beta = beta
@@ -88,19 +149,40 @@ class PrioritizedReplayBuffer:
         self.n_step = n_step
         self.gamma = gamma
         self.epsilon = epsilon
+        self.obs_dtype = np.dtype(obs_dtype)
         self.tree = SumTree(capacity)
-        self.n_step_buffer: List[Transition] = []
         self.max_priority = 1.0
+        self._gamma_pows = gamma ** np.arange(n_step + 1, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+
+        # struct-of-arrays 컬럼 (첫 add 에서 관측 shape 으로 할당)
+        self.obs: Optional[np.ndarray] = None
+        self.next_obs: Optional[np.ndarray] = None
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.n_step_returns = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.discounts = np.zeros(capacity, dtype=np.float32)
+
+        self.write_ptr = 0
+        self.size = 0
+        # n-step 미완료 슬롯 (오래된 순, 우선순위 0 -> 샘플링 제외)
+        self.n_step_buffer: Deque[int] = deque()
+
+    # ------------------------------------------------------------------
+    # Adding
+    # ------------------------------------------------------------------
 
-    def _compute_n_step(self) -> Tuple[float, np.ndarray, bool]:
-        """Compute n-step return for the oldest transition in the buffer."""
-        n_return = 0.0
-        for i, t in enumerate(self.n_step_buffer):
-            n_return += (self.gamma**i) * t.reward
-            if t.done:
-                return n_return, t.next_obs, True
-        last = self.n_step_buffer[-1]
-        return n_return, last.next_obs, last.done
+    def _allocate(self, obs: np.ndarray) -> None:
+        shape = (self.capacity,) + np.shape(obs)
+        self.obs = np.zeros(shape, dtype=self.obs_dtype)
+        self.next_obs = np.zeros(shape, dtype=self.obs_dtype)
+
+    def _finalize(self, slots, next_obs: np.ndarray, done: bool, steps) -> None:
+        self.next_obs[slots] = next_obs
+        self.dones[slots] = done
+        self.discounts[slots] = self._gamma_pows[steps]
+        self.tree.update(slots, self.max_priority**self.alpha)
 
     def add(
         self,
@@ -110,69 +192,151 @@ class PrioritizedReplayBuffer:
         next_obs: np.ndarray,
         done: bool,
     ) -> None:
-        transition = Transition(
-            obs=obs, action=action, reward=reward, next_obs=next_obs, done=done
-        )
-        self.n_step_buffer.append(transition)
-        if len(self.n_step_buffer) < self.n_step and not done:
-            return
-        n_return, n_next_obs, n_done = self._compute_n_step()
-        first = self.n_step_buffer.pop(0)
-        first.n_step_return = n_return
-        first.n_step_next_obs = n_next_obs
-        priority = self.max_priority**self.alpha
-        self.tree.add(priority, first)
+        if self.obs is None:
+            self._allocate(np.asarray(obs))
+
+        slot = self.write_ptr
+        # 덮어쓰는 슬롯은 즉시 샘플링 대상에서 제외
+        if self.size == self.capacity:
+            self.tree.update([slot], 0.0)
+        self.obs[slot] = obs
+        self.actions[slot] = action
+        self.rewards[slot] = reward
+        self.n_step_returns[slot] = 0.0
+        self.write_ptr = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+        # 증분 n-step 리턴: 대기 중인 슬롯들에 gamma^age * reward 누적
+        self.n_step_buffer.append(slot)
+        age = len(self.n_step_buffer) - 1
+        for pending in self.n_step_buffer:
+            self.n_step_returns[pending] += self._gamma_pows[age] * reward
+            age -= 1
+
         if done:
+            # 에피소드 종료: 대기 중인 모든 슬롯을 잘린 리턴으로 확정
+            pending = np.fromiter(self.n_step_buffer, dtype=np.int64)
+            self._finalize(pending, next_obs, True, np.arange(len(pending), 0, -1))
             self.n_step_buffer.clear()
+        elif len(self.n_step_buffer) >= self.n_step:
+            self._finalize([self.n_step_buffer.popleft()], next_obs, False, self.n_step)
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
 
     def sample(
         self, batch_size: int
-    ) -> Tuple[List[Transition], np.ndarray, np.ndarray]:
-        transitions, indices, weights = [], [], []
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        """
+        Stratified batched sampling.
+
+        Returns:
+            (batch columns, data indices for update_priorities, IS weights)
+        """
         total = self.tree.total_priority()
-        segment = total / batch_size
+        if total <= 0:
+            raise ValueError("cannot sample from an empty replay buffer")
         self.beta = min(1.0, self.beta + self.beta_increment)
-        min_prob = (
-            np.min(
-                self.tree.tree[-self.capacity :][self.tree.tree[-self.capacity :] > 0]
-            )
-            / total
+
+        segment = total / batch_size
+        values = (np.arange(batch_size) + self._rng.random(batch_size)) * segment
+        indices = self.tree.find(np.minimum(values, total * (1 - 1e-12)))
+
+        n = len(self)
+        probs = self.tree.leaves(indices) / total
+        max_weight = (self.tree.min_priority() / total * n) ** (-self.beta)
+        weights = ((probs * n) ** (-self.beta) / max_weight).astype(np.float32)
+        return self.gather(indices), indices, weights
+
+    def gather(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Column slices for the given data indices."""
+        return {
+            "obs": self.obs[indices],
+            "actions": self.actions[indices],
+            "rewards": self.rewards[indices],
+            "n_step_returns": self.n_step_returns[indices],
+            "next_obs": self.next_obs[indices],
+            "dones": self.dones[indices],
+            "discounts": self.discounts[indices],
+        }
+
+    def get(self, index: int) -> Transition:
+        """Single transition view (debugging / inspection)."""
+        return Transition(
+            obs=self.obs[index],
+            action=int(self.actions[index]),
+            reward=float(self.rewards[index]),
+            next_obs=self.next_obs[index],
+            done=bool(self.dones[index]),
+            n_step_return=float(self.n_step_returns[index]),
+            n_step_next_obs=self.next_obs[index],
         )
-        max_weight = (min_prob * self.tree.size) ** (-self.beta)
-        for i in range(batch_size):
-            val = np.random.uniform(segment * i, segment * (i + 1))
-            leaf_idx, priority, transition = self.tree.sample(val)
-            prob = priority / total
-            weight = ((prob * self.tree.size) ** (-self.beta)) / max_weight
-            transitions.append(transition)
-            indices.append(leaf_idx)
-            weights.append(weight)
-        return transitions, np.array(indices), np.array(weights, dtype=np.float32)
 
     def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray) -> None:
-        for idx, err in zip(indices, td_errors):
-            priority = (abs(err) + self.epsilon) ** self.alpha
-            self.max_priority = max(self.max_priority, priority)
-            self.tree.update(idx, priority)
+        raw = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.epsilon
+        if raw.size == 0:
+            return
+        self.max_priority = max(self.max_priority, float(raw.max()))
+        self.tree.update(indices, raw**self.alpha)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
 
     def save_to_disk(self, path: str) -> None:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "wb") as f:
-            pickle.dump(
-                {
-                    "tree": self.tree,
-                    "beta": self.beta,
-                    "max_priority": self.max_priority,
-                },
-                f,
-            )
+        """Write each column as .npy under directory `path` (+ meta.json)."""
+        os.makedirs(path, exist_ok=True)
+        if self.obs is not None:
+            for name in ("obs", "next_obs"):
+                np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        for name in ("actions", "rewards", "n_step_returns", "dones", "discounts"):
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        np.save(
+            os.path.join(path, "priorities.npy"),
+            self.tree.tree[self.tree.base : self.tree.base + self.capacity],
+        )
+        meta = {
+            "capacity": self.capacity,
+            "write_ptr": self.write_ptr,
+            "size": self.size,
+            "beta": self.beta,
+            "max_priority": self.max_priority,
+            "n_step_buffer": list(map(int, self.n_step_buffer)),
+        }
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    def load_from_disk(self, path: str, mmap: bool = True) -> None:
+        """
+        Load a buffer saved by save_to_disk.
 
-    def load_from_disk(self, path: str) -> None:
-        with open(path, "rb") as f:
-            data = pickle.load(f)
-        self.tree = data["tree"]
-        self.beta = data["beta"]
-        self.max_priority = data["max_priority"]
+        With mmap=True the observation columns are memory-mapped copy-on-write,
+        so large buffers are paged in on demand and never written back.
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["capacity"] != self.capacity:
+            raise ValueError(
+                f"capacity mismatch: saved {meta['capacity']}, buffer {self.capacity}"
+            )
+        mode = "c" if mmap else None
+        for name in ("obs", "next_obs"):
+            file = os.path.join(path, f"{name}.npy")
+            setattr(
+                self,
+                name,
+                np.load(file, mmap_mode=mode) if os.path.exists(file) else None,
+            )
+        for name in ("actions", "rewards", "n_step_returns", "dones", "discounts"):
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy")))
+        self.tree.rebuild(np.load(os.path.join(path, "priorities.npy")))
+        self.write_ptr = meta["write_ptr"]
+        self.size = meta["size"]
+        self.beta = meta["beta"]
+        self.max_priority = meta["max_priority"]
+        self.n_step_buffer = deque(meta["n_step_buffer"])
 
     def __len__(self) -> int:
-        return self.tree.size
+        """Transitions available for sampling (n-step complete)."""
+        return self.size - len(self.n_step_buffer)
@@ -7,6 +7,7 @@ Supports distributed training (Ray / multiprocessing) and Wandb experiment track
 import argparse
 import json
 import os
+import sys
 import time
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, Optional
@@ -31,6 +32,15 @@ from curriculum import CurriculumScheduler
 from ppo_trainer import PPOConfig, PPOTrainer
 from reward_shaper import RewardMode, RewardShaper
 from selfplay_manager import AgentRole, OpponentPool, SelfPlayManager
+from vec_env import make_vector_env
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+try:
+    from gymnasium_env.sc2_gym_env import SC2ZergEnv
+
+    SC2_ENV_AVAILABLE = True
+except ImportError:
+    SC2_ENV_AVAILABLE = False
 
 
 @dataclass
@@ -43,7 +53,7 @@ class TrainConfig:
     use_wandb: bool = False
     wandb_project: str = "sc2-selfplay-ppo"
     wandb_run_name: Optional[str] = None
-    n_workers: int = 4
+    n_workers: int = 4  # subprocess workers for the vector env (<= 1: in-process)
     use_ray: bool = False
     seed: int = 42
 
@@ -121,6 +131,37 @@ def evaluate_vs_builtin(trainer: PPOTrainer, env_factory, n_games: int = 20) ->
     return win_rate
 
 
+class _DummyEnv:
+    """Minimal fallback env for testing the training loop."""
+
+    def __init__(self, **kw):
+        import numpy as np
+
+        self._np = np
+        self.observation_space_n = 16
+        self.action_space_n = 7
+
+    def reset(self):
+        return self._np.zeros(self.observation_space_n, dtype="float32")
+
+    def step(self, action):
+        obs = self._np.random.rand(self.observation_space_n).astype("float32")
+        reward = self._np.random.uniform(-1, 1)
+        done = self._np.random.random() < 0.005
+        info = {"winner": "self"} if done and self._np.random.random() > 0.5 else {}
+        return obs, reward, done, info
+
+
+def env_factory(**kwargs):
+    """SC2ZergEnv, or _DummyEnv without it.
+
+    Module-level so SubprocVectorEnv workers can unpickle it under spawn.
+    """
+    if SC2_ENV_AVAILABLE:
+        return SC2ZergEnv(max_frames=kwargs.get("max_frames", 20000))
+    return _DummyEnv(**kwargs)
+
+
 def run_training_loop(cfg: TrainConfig, ppo_cfg: PPOConfig, env_factory) -> None:
     ctx = setup_training(cfg, ppo_cfg)
     trainer: PPOTrainer = ctx["trainer"]
@@ -128,7 +169,18 @@ def run_training_loop(cfg: TrainConfig, ppo_cfg: PPOConfig, env_factory) -> None
     curriculum: CurriculumScheduler = ctx["curriculum"]
     reward_shaper: RewardShaper = ctx["reward_shaper"]
 
-    env = env_factory()
+    if ppo_cfg.n_envs > 1:
+        env = make_vector_env(
+            env_factory,
+            ppo_cfg.n_envs,
+            ppo_cfg.obs_dim,
+            ppo_cfg.action_dim,
+            use_subprocess=cfg.n_workers > 1,
+            n_workers=cfg.n_workers,
+        )
+    else:
+        env = env_factory()
+    rollout_size = trainer.rollout_size
     step = 0
     t0 = time.time()
 
@@ -137,7 +189,7 @@ def run_training_loop(cfg: TrainConfig, ppo_cfg: PPOConfig, env_factory) -> None
         metrics = trainer.train_epoch()
         step = trainer.total_steps
 
-        if step % cfg.log_interval < ppo_cfg.n_steps:
+        if step % cfg.log_interval < rollout_size:
             elapsed = time.time() - t0
             fps = step / max(elapsed, 1)
             stats = selfplay.get_stats()
@@ -151,16 +203,18 @@ def run_training_loop(cfg: TrainConfig, ppo_cfg: PPOConfig, env_factory) -> None
             if cfg.use_wandb and WANDB_AVAILABLE:
                 wandb.log({**metrics, **stats, "step": step, "fps": fps})
 
-        if step % cfg.checkpoint_interval < ppo_cfg.n_steps:
+        if step % cfg.checkpoint_interval < rollout_size:
             save_checkpoint(trainer, selfplay, step, cfg.checkpoint_dir)
 
-        if step % cfg.eval_interval < ppo_cfg.n_steps:
+        if step % cfg.eval_interval < rollout_size:
             win_rate = evaluate_vs_builtin(trainer, env_factory)
             promoted = reward_shaper.advance_curriculum(win_rate)
             if promoted:
                 curriculum.advance(win_rate)
                 print(f"[Curriculum] Promoted to: {reward_shaper.stage_name}")
 
+    if hasattr(env, "close"):
+        env.close()
     if cfg.use_wandb and WANDB_AVAILABLE:
         wandb.finish()
     print("[Training] Complete.")
@@ -176,6 +230,7 @@ if __name__ == "__main__":
     parser.add_argument("--eval_interval", type=int, default=50_000)
     parser.add_argument("--checkpoint_interval", type=int, default=100_000)
     parser.add_argument("--n_workers", type=int, default=4)
+    parser.add_argument("--n_envs", type=int, default=1)
     args = parser.parse_args()
 
     train_cfg = TrainConfig(
@@ -186,48 +241,11 @@ if __name__ == "__main__":
         checkpoint_interval=args.checkpoint_interval,
         n_workers=args.n_workers,
     )
-    ppo_cfg = PPOConfig()
-
-    # Gymnasium 환경 팩토리 연결
-    try:
-        import sys
+    ppo_cfg = PPOConfig(n_envs=args.n_envs)
 
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-        from gymnasium_env.sc2_gym_env import SC2ZergEnv
-
-        def env_factory(**kwargs):
-            return SC2ZergEnv(max_frames=kwargs.get("max_frames", 20000))
-
-    except ImportError:
+    if not SC2_ENV_AVAILABLE:
         print("[WARN] SC2ZergEnv not found. Using fallback dummy environment.")
 
-        class _DummyEnv:
-            """Minimal fallback env for testing the training loop."""
-
-            def __init__(self, **kw):
-                import numpy as np
-
-                self._np = np
-                self.observation_space_n = 16
-                self.action_space_n = 7
-
-            def reset(self):
-                return self._np.zeros(self.observation_space_n, dtype="float32")
-
-            def step(self, action):
-                obs = self._np.random.rand(self.observation_space_n).astype("float32")
-                reward = self._np.random.uniform(-1, 1)
-                done = self._np.random.random() < 0.005
-                info = (
-                    {"winner": "self"}
-                    if done and self._np.random.random() > 0.5
-                    else {}
-                )
-                return obs, reward, done, info
-
-        def env_factory(**kwargs):
-            return _DummyEnv(**kwargs)
-
     print("[Train] Config:", asdict(train_cfg))
     print("[Train] PPO Config:", asdict(ppo_cfg))
     print("[Train] Starting training loop...")
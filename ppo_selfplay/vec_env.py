@@ -0,0 +1,302 @@
+"""
+Phase 355: Vector Environments
+Step K SC2 environments in lockstep for batched PPO rollout collection.
+
+SyncVectorEnv runs the envs in-process; SubprocVectorEnv spreads them over
+worker processes that write observations, rewards, dones and action masks
+straight into shared memory, so only actions and infos cross the pipes.
+Both auto-reset finished episodes and return (K, obs_dim) float32 arrays.
+"""
+
+import multiprocessing as mp
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+StepResult = Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]
+
+
+def _write_obs(dest: np.ndarray, obs) -> None:
+    flat = np.asarray(obs, dtype=np.float32).ravel()
+    n = min(len(flat), dest.shape[0])
+    dest[:n] = flat[:n]
+    dest[n:] = 0.0
+
+
+def _write_mask(env, dest: Optional[np.ndarray]) -> bool:
+    if dest is None or not hasattr(env, "get_action_mask"):
+        return False
+    mask = env.get_action_mask()
+    if mask is None:
+        return False
+    flat = np.asarray(mask, dtype=bool).ravel()[: dest.shape[0]]
+    dest[: len(flat)] = flat
+    dest[len(flat) :] = False
+    return True
+
+
+class SyncVectorEnv:
+    """K envs stepped sequentially in the calling process."""
+
+    def __init__(self, envs: Sequence[Any], obs_dim: int, action_dim: int):
+        self.envs = list(envs)
+        self.num_envs = len(self.envs)
+        self.obs_dim = obs_dim
+        self.action_dim = action_dim
+        self._obs = np.zeros((self.num_envs, obs_dim), dtype=np.float32)
+        self._masks = np.ones((self.num_envs, action_dim), dtype=bool)
+        self._has_mask = np.zeros(self.num_envs, dtype=bool)
+
+    def reset(self) -> np.ndarray:
+        for i, env in enumerate(self.envs):
+            _write_obs(self._obs[i], env.reset())
+        return self._obs.copy()
+
+    def step(self, actions: np.ndarray) -> StepResult:
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos: List[Dict[str, Any]] = []
+        for i, env in enumerate(self.envs):
+            obs, reward, done, info = env.step(int(actions[i]))
+            if done:
+                info = dict(info or {}, terminal_observation=obs)
+                obs = env.reset()
+            _write_obs(self._obs[i], obs)
+            rewards[i] = reward
+            dones[i] = done
+            infos.append(info or {})
+        return self._obs.copy(), rewards, dones, infos
+
+    def get_action_masks(self) -> Optional[np.ndarray]:
+        for i, env in enumerate(self.envs):
+            self._has_mask[i] = _write_mask(env, self._masks[i])
+        if not self._has_mask.any():
+            return None
+        self._masks[~self._has_mask] = True
+        return self._masks.copy()
+
+    def close(self) -> None:
+        for env in self.envs:
+            if hasattr(env, "close"):
+                env.close()
+
+
+def _subproc_worker(
+    conn, env_fns, indices, obs_buf, reward_buf, done_buf, mask_buf, dims
+) -> None:
+    """Worker loop: owns envs[indices] and writes results into shared memory."""
+    num_envs, obs_dim, action_dim = dims
+    obs = np.frombuffer(obs_buf, dtype=np.float32).reshape(num_envs, obs_dim)
+    rewards = np.frombuffer(reward_buf, dtype=np.float32)
+    dones = np.frombuffer(done_buf, dtype=np.uint8)
+    masks = np.frombuffer(mask_buf, dtype=np.uint8).reshape(num_envs, action_dim)
+    try:
+        envs = [fn() for fn in env_fns]
+        conn.send(("ok", None))
+        while True:
+            cmd, payload = conn.recv()
+            if cmd == "step":
+                infos = []
+                for env, i, action in zip(envs, indices, payload):
+                    next_obs, reward, done, info = env.step(int(action))
+                    if done:
+                        info = dict(info or {}, terminal_observation=next_obs)
+                        next_obs = env.reset()
+                    _write_obs(obs[i], next_obs)
+                    rewards[i] = reward
+                    dones[i] = done
+                    infos.append(info or {})
+                conn.send(("ok", infos))
+            elif cmd == "reset":
+                for env, i in zip(envs, indices):
+                    _write_obs(obs[i], env.reset())
+                conn.send(("ok", None))
+            elif cmd == "mask":
+                flags = []
+                for env, i in zip(envs, indices):
+                    row = np.ones(action_dim, dtype=bool)
+                    has_mask = _write_mask(env, row)
+                    masks[i] = row
+                    flags.append(has_mask)
+                conn.send(("ok", flags))
+            elif cmd == "close":
+                for env in envs:
+                    if hasattr(env, "close"):
+                        env.close()
+                conn.send(("ok", None))
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    except Exception:
+        try:
+            conn.send(("error", traceback.format_exc()))
+        except (BrokenPipeError, OSError):
+            pass
+    finally:
+        conn.close()
+
+
+class SubprocVectorEnv:
+    """
+    K envs spread over worker processes, stepped in lockstep.
+
+    Observations / rewards / dones / masks live in shared RawArrays; each
+    step sends one action slice per worker and receives only the infos.
+    Env factories must be picklable when start_method is "spawn"; a worker
+    that fails to unpickle or build its envs raises RuntimeError here.
+    """
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], Any]],
+        obs_dim: int,
+        action_dim: int,
+        n_workers: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ):
+        self.num_envs = len(env_fns)
+        self.obs_dim = obs_dim
+        self.action_dim = action_dim
+        n_workers = min(self.num_envs, n_workers or mp.cpu_count())
+        ctx = mp.get_context(start_method)
+
+        self._obs_buf = ctx.RawArray("f", self.num_envs * obs_dim)
+        self._reward_buf = ctx.RawArray("f", self.num_envs)
+        self._done_buf = ctx.RawArray("B", self.num_envs)
+        self._mask_buf = ctx.RawArray("B", self.num_envs * action_dim)
+        self._obs = np.frombuffer(self._obs_buf, dtype=np.float32).reshape(
+            self.num_envs, obs_dim
+        )
+        self._rewards = np.frombuffer(self._reward_buf, dtype=np.float32)
+        self._dones = np.frombuffer(self._done_buf, dtype=np.uint8)
+        self._masks = np.frombuffer(self._mask_buf, dtype=np.uint8).reshape(
+            self.num_envs, action_dim
+        )
+
+        self._slices = [
+            list(chunk) for chunk in np.array_split(np.arange(self.num_envs), n_workers)
+        ]
+        self._conns = []
+        self._procs = []
+        dims = (self.num_envs, obs_dim, action_dim)
+        for indices in self._slices:
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(
+                target=_subproc_worker,
+                args=(
+                    child,
+                    [env_fns[i] for i in indices],
+                    indices,
+                    self._obs_buf,
+                    self._reward_buf,
+                    self._done_buf,
+                    self._mask_buf,
+                    dims,
+                ),
+                daemon=True,
+            )
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+        self._closed = False
+        try:
+            self._gather()  # 각 워커가 env 생성을 마쳤다는 응답
+        except RuntimeError:
+            self._terminate()
+            raise
+
+    def _gather(self) -> List[Any]:
+        results = []
+        for conn, proc in zip(self._conns, self._procs):
+            try:
+                status, payload = conn.recv()
+            except (EOFError, OSError):
+                # 인자 unpickle 실패 등 타깃 함수 이전에 죽은 워커는 응답이 없음
+                proc.join(timeout=1)
+                raise RuntimeError(
+                    f"vector env worker (pid {proc.pid}) exited with code "
+                    f"{proc.exitcode} before replying; under spawn the env "
+                    "factories must be importable module-level callables"
+                ) from None
+            if status == "error":
+                raise RuntimeError(f"vector env worker failed:\n{payload}")
+            results.append(payload)
+        return results
+
+    def reset(self) -> np.ndarray:
+        for conn in self._conns:
+            conn.send(("reset", None))
+        self._gather()
+        return self._obs.copy()
+
+    def step(self, actions: np.ndarray) -> StepResult:
+        actions = np.asarray(actions)
+        for conn, indices in zip(self._conns, self._slices):
+            conn.send(("step", actions[indices].tolist()))
+        infos = [info for chunk in self._gather() for info in chunk]
+        return (
+            self._obs.copy(),
+            self._rewards.copy(),
+            self._dones.astype(bool),
+            infos,
+        )
+
+    def get_action_masks(self) -> Optional[np.ndarray]:
+        for conn in self._conns:
+            conn.send(("mask", None))
+        flags = [flag for chunk in self._gather() for flag in chunk]
+        if not any(flags):
+            return None
+        return self._masks.astype(bool)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+                conn.recv()
+            except (BrokenPipeError, EOFError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+
+    def _terminate(self) -> None:
+        self._closed = True
+        for conn, proc in zip(self._conns, self._procs):
+            conn.close()
+            if proc.is_alive():
+                proc.terminate()
+            proc.join(timeout=5)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def make_vector_env(
+    env_factory: Callable[[], Any],
+    n_envs: int,
+    obs_dim: int,
+    action_dim: int,
+    use_subprocess: bool = False,
+    n_workers: Optional[int] = None,
+    start_method: Optional[str] = None,
+):
+    """Build a SyncVectorEnv or SubprocVectorEnv of n_envs copies of env_factory()."""
+    if use_subprocess:
+        return SubprocVectorEnv(
+            [env_factory] * n_envs,
+            obs_dim,
+            action_dim,
+            n_workers=n_workers,
+            start_method=start_method,
+        )
+    return SyncVectorEnv([env_factory() for _ in range(n_envs)], obs_dim, action_dim)
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+이벤트 스토어 테스트 — event_sourcing/sc2_event_store.py
+
+- 세그먼트 경계를 넘는 append (메모리 / 디렉터리, 재오픈 포함)
+- 틱 범위 조회 == 선형 필터
+- aggregate / 이벤트 타입별 조회
+- 스냅샷 + 이후 이벤트 재생 == 전체 재생
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from event_sourcing.sc2_event_store import (  # noqa: E402
+    Aggregate,
+    Event,
+    EventStore,
+    EventType,
+)
+
+STREAMS = ("game_a", "game_b", "game_c")
+SEGMENT_SIZE = 7
+
+
+def make_events(n, seed=0, shuffle_ticks=False):
+    """게임 3개에 섞여 들어가는 n 개의 이벤트 (스트림별 틱은 기본적으로 증가)."""
+    rng = random.Random(seed)
+    ticks = {s: 0 for s in STREAMS}
+    units = {s: [] for s in STREAMS}
+    events = []
+    for i in range(n):
+        stream = rng.choice(STREAMS)
+        ticks[stream] += rng.randint(0, 30)
+        tick = ticks[stream]
+        if shuffle_ticks and rng.random() < 0.3:
+            tick = rng.randint(0, max(tick, 1))  # 늦게 도착한 과거 이벤트
+        roll = rng.random()
+        if roll < 0.35:
+            unit_id = f"{stream}_u{i}"
+            units[stream].append(unit_id)
+            etype, data = EventType.UNIT_CREATED, {
+                "unit_id": unit_id,
+                "unit_type": rng.choice(["zergling", "roach", "queen"]),
+                "cost_minerals": rng.choice([25, 75, 150]),
+                "cost_vespene": rng.choice([0, 25]),
+                "supply": rng.choice([1, 2]),
+            }
+        elif roll < 0.5 and units[stream]:
+            etype = EventType.UNIT_DESTROYED
+            data = {"unit_id": units[stream].pop(rng.randrange(len(units[stream])))}
+        elif roll < 0.8:
+            etype = EventType.RESOURCE_GATHERED
+            data = {"minerals": rng.randint(5, 50), "vespene": rng.randint(0, 8)}
+        elif roll < 0.9:
+            etype = EventType.UPGRADE_COMPLETED
+            data = {"upgrade_name": rng.choice(["speed", "armor", "missile"])}
+        else:
+            etype, data = EventType.ATTACK_ORDERED, {}
+        events.append(Event.create(etype, stream, tick, data))
+    return events
+
+
+def ids(events):
+    return [e.event_id for e in events]
+
+
+@pytest.fixture(params=["memory", "segments"])
+def store_factory(request, tmp_path):
+    segment_dir = str(tmp_path / "log") if request.param == "segments" else None
+
+    def factory(**kwargs):
+        kwargs.setdefault("segment_size", SEGMENT_SIZE)
+        kwargs.setdefault("max_cached_segments", 1)
+        return EventStore(segment_dir=segment_dir, **kwargs)
+
+    factory.segment_dir = segment_dir
+    return factory
+
+
+class TestSegments:
+    def test_append_across_segment_boundaries(self, store_factory):
+        store = store_factory()
+        events = make_events(50)
+        seqs = [store.append(e) for e in events[:20]]
+        seqs += store.append_many(events[20:])
+
+        assert seqs == list(range(50))
+        assert store.count() == 50
+        assert len(store._segments) == -(-50 // SEGMENT_SIZE)
+        assert all(seg.sealed for seg in store._segments[:-1])
+        assert ids(store.get_all_events()) == ids(events)
+        # 경계에 걸친 단일 스트림 조회도 순서 유지
+        for stream in STREAMS:
+            expected = [e for e in events if e.aggregate_id == stream]
+            assert ids(store.get_events(stream)) == ids(expected)
+
+    def test_sealed_segments_are_evicted_and_reloaded(self, tmp_path):
+        store = EventStore(
+            segment_dir=str(tmp_path), segment_size=SEGMENT_SIZE, max_cached_segments=1
+        )
+        events = make_events(40)
+        store.append_many(events)
+        store.flush()
+
+        cached = [seg.events is not None for seg in store._segments]
+        assert sum(cached[:-1]) <= 1  # 봉인된 세그먼트는 1개만 메모리에
+        assert ids(store.get_all_events()) == ids(events)
+        assert (
+            store.get_events("game_a", after_version=2)[0].event_id
+            == ids([e for e in events if e.aggregate_id == "game_a"])[2]
+        )
+        sidecars = [n for n in os.listdir(tmp_path) if n.endswith(".index.json")]
+        assert len(sidecars) == len(store._segments) - 1
+
+    def test_reopen_directory(self, tmp_path):
+        path = str(tmp_path)
+        events = make_events(30, seed=1)
+        store = EventStore(segment_dir=path, segment_size=SEGMENT_SIZE)
+        store.append_many(events[:25])
+        store.close()
+
+        # 저장된 segment_size 가 인자보다 우선
+        reopened = EventStore(segment_dir=path, segment_size=1000)
+        assert reopened._segment_size == SEGMENT_SIZE
+        assert reopened.count() == 25
+        assert reopened.append_many(events[25:]) == list(range(25, 30))
+        assert ids(reopened.get_all_events()) == ids(events)
+        reopened.close()
+
+        again = EventStore(segment_dir=path)
+        assert ids(again.get_events_by_type(EventType.UNIT_CREATED)) == ids(
+            [e for e in events if e.event_type == EventType.UNIT_CREATED]
+        )
+        again.close()
+
+
+class TestQueries:
+    def test_range_queries_match_linear_filter(self, store_factory):
+        store = store_factory()
+        events = make_events(120, seed=2, shuffle_ticks=True)
+        store.append_many(events)
+        max_tick = max(e.game_tick for e in events)
+
+        rng = random.Random(3)
+        for _ in range(40):
+            stream = rng.choice(STREAMS)
+            lo = rng.randint(0, max_tick)
+            hi = rng.randint(lo, max_tick)
+            expected = [
+                e
+                for e in events
+                if e.aggregate_id == stream and lo <= e.game_tick <= hi
+            ]
+            assert ids(store.get_events_in_range(stream, lo, hi)) == ids(expected)
+
+        assert store.get_events_in_range("missing", 0, max_tick) == []
+        assert store.get_events_in_range("game_a", max_tick + 1, max_tick + 5) == []
+
+    def test_lookups_by_aggregate_and_type(self, store_factory):
+        store = store_factory()
+        events = make_events(80, seed=4)
+        store.append_many(events)
+
+        for stream in STREAMS:
+            expected = [e for e in events if e.aggregate_id == stream]
+            assert ids(store.get_events(stream)) == ids(expected)
+            assert ids(store.get_events(stream, after_version=5)) == ids(expected[5:])
+            assert store.get_version(stream) == len(expected)
+        for etype in EventType:
+            expected = [e for e in events if e.event_type == etype]
+            assert ids(store.get_events_by_type(etype)) == ids(expected)
+        assert store.get_events("missing") == []
+        assert sorted(store.stream_ids()) == sorted(STREAMS)
+
+    def test_export_import_round_trip(self):
+        store = EventStore(segment_size=SEGMENT_SIZE)
+        events = make_events(20, seed=5)
+        store.append_many(events)
+
+        copy = EventStore(segment_size=3)
+        assert copy.import_json(store.export_json()) == 20
+        assert [e.to_dict() for e in copy.get_all_events()] == [
+            e.to_dict() for e in events
+        ]
+
+
+class TestSnapshots:
+    def full_replay(self, store, stream):
+        agg = Aggregate(stream)
+        agg.apply_many(store.get_events(stream))
+        return agg
+
+    def test_snapshot_plus_replay_matches_full_replay(self, store_factory):
+        store = store_factory()
+        events = make_events(90, seed=6)
+        store.append_many(events[:60])
+
+        for stream in STREAMS:
+            snap = self.full_replay(store, stream).take_snapshot()
+            store.save_snapshot(snap)
+        store.append_many(events[60:])
+
+        for stream in STREAMS:
+            full = self.full_replay(store, stream)
+            rebuilt = Aggregate.rehydrate(store, stream)
+            assert rebuilt.version == full.version
+            assert rebuilt.state == full.state
+            snap = store.get_latest_snapshot(stream)
+            assert 0 < snap.version < rebuilt.version
+
+        if store_factory.segment_dir is not None:
+            store.close()
+            reopened = EventStore(segment_dir=store_factory.segment_dir)
+            for stream in STREAMS:
+                assert (
+                    Aggregate.rehydrate(reopened, stream).state
+                    == self.full_replay(reopened, stream).state
+                )
+            reopened.close()
+
+    def test_time_travel_uses_earlier_snapshot(self, store_factory):
+        store = store_factory()
+        events = make_events(90, seed=7)
+        stream = "game_b"
+        stream_events = [e for e in events if e.aggregate_id == stream]
+
+        for chunk in (events[:30], events[30:60], events[60:]):
+            store.append_many(chunk)
+            store.save_snapshot(self.full_replay(store, stream).take_snapshot())
+
+        for up_to in sorted({e.game_tick for e in stream_events})[::4]:
+            expected = Aggregate(stream)
+            expected.apply_many([e for e in stream_events if e.game_tick <= up_to])
+            rebuilt = Aggregate.rehydrate(store, stream, up_to_tick=up_to)
+            assert rebuilt.state == expected.state
+            assert rebuilt.version == expected.version
+
+    def test_should_snapshot_interval(self):
+        store = EventStore(snapshot_interval=10, segment_size=SEGMENT_SIZE)
+        store.append_many(
+            [Event.create(EventType.SCOUT_SENT, "g", t, {}) for t in range(9)]
+        )
+        assert not store.should_snapshot("g")
+        store.append(Event.create(EventType.SCOUT_SENT, "g", 9, {}))
+        assert store.should_snapshot("g")
+        store.save_snapshot(Aggregate.rehydrate(store, "g").take_snapshot())
+        assert not store.should_snapshot("g")
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+PPO 벡터 환경 / 롤아웃 테스트
+
+- SyncVectorEnv / SubprocVectorEnv: (K, obs_dim) 출력과 에피소드 자동 리셋
+- PPOTrainer.compute_gae: 벡터화 역방향 스캔 == 기존 스텝별 루프
+- collect_rollouts: (T, K) 버퍼 모양과 롤아웃 사이 에피소드 유지
+
+torch 가 없으면 트레이너 테스트는 skip.
+"""
+
+import functools
+import importlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+_HAS_TORCH = importlib.util.find_spec("torch") is not None
+
+if _HAS_NUMPY:
+    import numpy as np
+
+OBS_DIM = 4
+ACTION_DIM = 3
+
+
+class CountingEnv:
+    """에피소드 길이가 고정된 스텁 환경. obs = [env_id, t, episode, action]."""
+
+    def __init__(self, env_id, episode_len, masked=False):
+        self.env_id = env_id
+        self.episode_len = episode_len
+        self.masked = masked
+        self.t = 0
+        self.episodes = 0
+        self.resets = 0
+
+    def _obs(self, action=0):
+        return [self.env_id, self.t, self.episodes, action]
+
+    def reset(self):
+        self.t = 0
+        self.resets += 1
+        return self._obs()
+
+    def step(self, action):
+        self.t += 1
+        done = self.t >= self.episode_len
+        if done:
+            self.episodes += 1
+        return self._obs(action), float(self.env_id + 1), done, {"t": self.t}
+
+    def get_action_mask(self):
+        if not self.masked:
+            return None
+        return [True, False, self.env_id % 2 == 0]
+
+
+class BrokenOnUnpickle:
+    """spawn 워커에서 인자 unpickle 단계에서 실패하는 팩토리."""
+
+    def __init__(self):
+        self.episode_len = 2
+
+    def __call__(self):
+        return CountingEnv(0, 2)
+
+    def __setstate__(self, state):
+        raise RuntimeError("cannot unpickle in worker")
+
+
+def failing_factory():
+    raise ValueError("env construction failed")
+
+
+def reference_gae(rewards, values, dones, last_value, gamma, lam):
+    """기존 PPOTrainer.compute_gae 의 스텝별 루프 (단일 env)."""
+    n = len(rewards)
+    advantages = [0.0] * n
+    gae = 0.0
+    next_val = last_value
+    for t in reversed(range(n)):
+        mask = 1.0 - dones[t]
+        delta = rewards[t] + gamma * next_val * mask - values[t]
+        gae = delta + gamma * lam * mask * gae
+        advantages[t] = gae
+        next_val = values[t]
+    returns = [a + v for a, v in zip(advantages, values)]
+    return advantages, returns
+
+
+@pytest.mark.skipif(not _HAS_NUMPY, reason="numpy not installed")
+class TestSyncVectorEnv:
+    def make(self, lengths=(2, 3, 5), masked=False):
+        from ppo_selfplay.vec_env import SyncVectorEnv
+
+        envs = [CountingEnv(i, n, masked) for i, n in enumerate(lengths)]
+        return SyncVectorEnv(envs, OBS_DIM, ACTION_DIM), envs
+
+    def test_shapes_and_dtypes(self):
+        venv, _ = self.make()
+        obs = venv.reset()
+        assert obs.shape == (3, OBS_DIM) and obs.dtype == np.float32
+
+        obs, rewards, dones, infos = venv.step(np.zeros(3, dtype=np.int64))
+        assert obs.shape == (3, OBS_DIM) and obs.dtype == np.float32
+        assert rewards.shape == (3,) and rewards.dtype == np.float32
+        assert dones.shape == (3,) and dones.dtype == bool
+        assert len(infos) == 3
+        np.testing.assert_array_equal(rewards, [1.0, 2.0, 3.0])
+
+    def test_auto_reset_on_done(self):
+        venv, envs = self.make()
+        venv.reset()
+        all_dones = []
+        for step in range(6):
+            obs, _, dones, infos = venv.step(np.full(3, 1))
+            all_dones.append(dones)
+            for i, done in enumerate(dones):
+                if done:
+                    # 종료 관측은 info 로, 반환 관측은 새 에피소드의 첫 관측
+                    terminal = infos[i]["terminal_observation"]
+                    assert terminal[1] == envs[i].episode_len
+                    assert obs[i][1] == 0
+                else:
+                    assert "terminal_observation" not in infos[i]
+
+        np.testing.assert_array_equal(
+            np.array(all_dones).sum(axis=0), [3, 2, 1]  # 6 스텝 / 길이 2, 3, 5
+        )
+        assert [env.resets for env in envs] == [4, 3, 2]
+
+    def test_obs_is_padded_and_truncated(self):
+        from ppo_selfplay.vec_env import SyncVectorEnv
+
+        venv = SyncVectorEnv([CountingEnv(1, 3)], obs_dim=6, action_dim=ACTION_DIM)
+        np.testing.assert_array_equal(venv.reset()[0], [1, 0, 0, 0, 0, 0])
+        venv = SyncVectorEnv([CountingEnv(0, 3)], obs_dim=2, action_dim=ACTION_DIM)
+        assert venv.reset().shape == (1, 2)
+
+    def test_action_masks(self):
+        venv, _ = self.make()
+        assert venv.get_action_masks() is None
+
+        from ppo_selfplay.vec_env import SyncVectorEnv
+
+        envs = [CountingEnv(0, 2, masked=True), CountingEnv(1, 2, masked=False)]
+        venv = SyncVectorEnv(envs, OBS_DIM, ACTION_DIM)
+        masks = venv.get_action_masks()
+        np.testing.assert_array_equal(masks, [[True, False, True], [True] * 3])
+
+
+@pytest.mark.skipif(not _HAS_NUMPY, reason="numpy not installed")
+class TestSubprocVectorEnv:
+    def test_matches_sync_env(self):
+        from ppo_selfplay.vec_env import SubprocVectorEnv, SyncVectorEnv
+
+        lengths = (2, 3, 4)
+        sync = SyncVectorEnv(
+            [CountingEnv(i, n, masked=True) for i, n in enumerate(lengths)],
+            OBS_DIM,
+            ACTION_DIM,
+        )
+        sub = SubprocVectorEnv(
+            [functools.partial(CountingEnv, i, n, True) for i, n in enumerate(lengths)],
+            OBS_DIM,
+            ACTION_DIM,
+            n_workers=2,
+            start_method="fork",
+        )
+        try:
+            np.testing.assert_array_equal(sub.reset(), sync.reset())
+            np.testing.assert_array_equal(
+                sub.get_action_masks(), sync.get_action_masks()
+            )
+            for step in range(7):
+                actions = np.arange(3) + step
+                for a, b in zip(sub.step(actions), sync.step(actions)):
+                    if isinstance(a, np.ndarray):
+                        np.testing.assert_array_equal(a, b)
+                    else:
+                        assert [x.keys() for x in a] == [x.keys() for x in b]
+        finally:
+            sub.close()
+
+    def test_factory_error_raises_at_construction(self):
+        from ppo_selfplay.vec_env import SubprocVectorEnv
+
+        with pytest.raises(RuntimeError, match="env construction failed"):
+            SubprocVectorEnv(
+                [functools.partial(CountingEnv, 0, 2), failing_factory],
+                OBS_DIM,
+                ACTION_DIM,
+                n_workers=2,
+                start_method="fork",
+            )
+
+    def test_worker_unpickle_failure_raises(self):
+        from ppo_selfplay.vec_env import SubprocVectorEnv
+
+        # 타깃 함수 실행 전에 죽는 워커도 ConnectionResetError 대신 RuntimeError
+        with pytest.raises(RuntimeError, match="exited with code"):
+            SubprocVectorEnv(
+                [BrokenOnUnpickle()], OBS_DIM, ACTION_DIM, start_method="spawn"
+            )
+
+
+@pytest.mark.skipif(not _HAS_TORCH, reason="torch not installed")
+class TestComputeGAE:
+    def gae(self, rewards, values, dones, last_value):
+        from ppo_selfplay.ppo_trainer import PPOConfig, PPOTrainer
+
+        holder = SimpleNamespace(cfg=PPOConfig(gamma=0.9, gae_lambda=0.8))
+        return PPOTrainer.compute_gae(holder, rewards, values, dones, last_value)
+
+    def test_single_env_matches_loop(self):
+        rng = np.random.default_rng(0)
+        rewards = rng.normal(size=12).astype(np.float32)
+        values = rng.normal(size=12).astype(np.float32)
+        dones = np.zeros(12, dtype=np.float32)
+        dones[[3, 7]] = 1.0  # 롤아웃 중간에 끝나는 에피소드
+
+        adv, ret = self.gae(rewards, values, dones, 0.5)
+        ref_adv, ref_ret = reference_gae(rewards, values, dones, 0.5, 0.9, 0.8)
+        np.testing.assert_allclose(adv.numpy(), ref_adv, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(ret.numpy(), ref_ret, rtol=1e-5, atol=1e-6)
+
+    def test_vectorized_matches_per_env_loop(self):
+        rng = np.random.default_rng(1)
+        T, K = 16, 5
+        rewards = rng.normal(size=(T, K)).astype(np.float32)
+        values = rng.normal(size=(T, K)).astype(np.float32)
+        dones = (rng.random((T, K)) < 0.2).astype(np.float32)
+        dones[-1, 0] = 1.0  # 마지막 스텝 종료 → 부트스트랩 무시
+        last_values = rng.normal(size=K).astype(np.float32)
+
+        adv, ret = self.gae(rewards, values, dones, last_values)
+        assert tuple(adv.shape) == (T, K) and tuple(ret.shape) == (T, K)
+        for k in range(K):
+            ref_adv, ref_ret = reference_gae(
+                rewards[:, k], values[:, k], dones[:, k], last_values[k], 0.9, 0.8
+            )
+            np.testing.assert_allclose(adv[:, k].numpy(), ref_adv, rtol=1e-5, atol=1e-5)
+            np.testing.assert_allclose(ret[:, k].numpy(), ref_ret, rtol=1e-5, atol=1e-5)
+
+    def test_done_cuts_bootstrap(self):
+        adv, _ = self.gae([1.0, 1.0], [0.0, 0.0], [1.0, 1.0], 100.0)
+        np.testing.assert_allclose(adv.numpy(), [1.0, 1.0])
+
+
+@pytest.mark.skipif(not _HAS_TORCH, reason="torch not installed")
+class TestCollectRollouts:
+    def make(self, n_steps=5, lengths=(2, 3, 7), masked=True):
+        from ppo_selfplay.ppo_trainer import PPOConfig, PPOTrainer
+        from ppo_selfplay.vec_env import SyncVectorEnv
+
+        config = PPOConfig(
+            n_steps=n_steps,
+            n_envs=len(lengths),
+            obs_dim=OBS_DIM,
+            action_dim=ACTION_DIM,
+            n_epochs=1,
+            batch_size=4,
+        )
+        envs = [CountingEnv(i, n, masked) for i, n in enumerate(lengths)]
+        return PPOTrainer(config), SyncVectorEnv(envs, OBS_DIM, ACTION_DIM), envs
+
+    def test_buffer_shapes(self):
+        trainer, venv, _ = self.make()
+        trainer.collect_rollouts(venv)
+        buf = trainer.buffer
+
+        assert buf.ptr == 5
+        assert buf.observations.shape == (5, 3, OBS_DIM)
+        for name in ("actions", "rewards", "values", "log_probs", "dones"):
+            assert getattr(buf, name).shape == (5, 3)
+        assert buf.last_values.shape == (3,)
+        assert trainer.total_steps == trainer.rollout_size == 15
+
+        data = buf.get_tensors()
+        assert tuple(data["obs"].shape) == (15, OBS_DIM)
+        assert tuple(data["action_masks"].shape) == (15, ACTION_DIM)
+        # 마스크된 행동(1번)은 샘플링되지 않음
+        assert not (buf.actions == 1).any()
+
+    def test_auto_reset_and_episode_carry_over(self):
+        trainer, venv, envs = self.make()
+        trainer.collect_rollouts(venv)
+        buf = trainer.buffer
+        # 길이 2 env: t = 0,1,0,1,0 / 길이 7 env: 끝나지 않음
+        np.testing.assert_array_equal(buf.observations[:, 0, 1], [0, 1, 0, 1, 0])
+        np.testing.assert_array_equal(buf.dones[:, 0], [0, 1, 0, 1, 0])
+        np.testing.assert_array_equal(buf.dones[:, 2], 0)
+        np.testing.assert_array_equal(buf.rewards[0], [1.0, 2.0, 3.0])
+
+        trainer.collect_rollouts(venv)
+        # 두 번째 롤아웃은 리셋 없이 이전 에피소드를 이어감
+        np.testing.assert_array_equal(buf.observations[:, 2, 1], [5, 6, 0, 1, 2])
+        np.testing.assert_array_equal(buf.dones[:, 2], [0, 1, 0, 0, 0])
+        assert envs[2].resets == 2
+        assert trainer.total_steps == 30
+
+    def test_train_epoch_runs_on_vector_rollout(self):
+        trainer, venv, _ = self.make()
+        trainer.collect_rollouts(venv)
+        metrics = trainer.train_epoch()
+        assert set(metrics) >= {"policy_loss", "value_loss", "entropy"}
+
+    def test_env_count_mismatch_raises(self):
+        from ppo_selfplay.vec_env import SyncVectorEnv
+
+        trainer, _, _ = self.make()
+        with pytest.raises(ValueError):
+            trainer.collect_rollouts(
+                SyncVectorEnv([CountingEnv(0, 2)], OBS_DIM, ACTION_DIM)
+            )
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+우선순위 리플레이 버퍼 테스트 — ppo_selfplay/replay_buffer.py
+
+- 샘플링 빈도 ∝ 우선순위, IS 가중치 ≤ 1
+- n-step 리턴 == 손으로 계산한 할인 합 (조기 종료 포함)
+- capacity 에서의 wrap-around
+- save_to_disk / load_from_disk(mmap=True) 후 add / sample
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+if _HAS_NUMPY:
+    import numpy as np
+
+pytestmark = pytest.mark.skipif(not _HAS_NUMPY, reason="numpy not installed")
+
+
+def make_buffer(**kwargs):
+    from ppo_selfplay.replay_buffer import PrioritizedReplayBuffer
+
+    kwargs.setdefault("seed", 0)
+    return PrioritizedReplayBuffer(**kwargs)
+
+
+def add_steps(buf, rewards, done_at=(), start=0):
+    """obs = [i], next_obs = [i + 1] 인 전이를 rewards 순서대로 추가."""
+    for offset, reward in enumerate(rewards):
+        i = start + offset
+        buf.add(np.array([i], dtype=np.float32), i, reward, [i + 1], i in done_at)
+
+
+class TestSampling:
+    def test_frequency_proportional_to_priority(self):
+        buf = make_buffer(capacity=8, n_step=1, alpha=1.0, epsilon=0.0)
+        add_steps(buf, [0.0] * 4)
+        priorities = np.array([1.0, 2.0, 3.0, 4.0])
+        buf.update_priorities(np.arange(4), priorities)
+
+        counts = np.zeros(4)
+        for _ in range(500):
+            _, indices, _ = buf.sample(16)
+            counts += np.bincount(indices, minlength=4)[:4]
+
+        np.testing.assert_allclose(
+            counts / counts.sum(), priorities / priorities.sum(), atol=0.01
+        )
+
+    def test_is_weights_at_most_one(self):
+        buf = make_buffer(capacity=64, n_step=1, beta=0.4)
+        add_steps(buf, np.linspace(0, 1, 40))
+        rng = np.random.default_rng(1)
+        buf.update_priorities(np.arange(40), rng.exponential(size=40))
+
+        for _ in range(50):
+            _, indices, weights = buf.sample(32)
+            assert weights.dtype == np.float32
+            assert np.all(weights > 0)
+            assert np.all(weights <= 1.0 + 1e-6)
+
+        # 우선순위가 모두 같으면 보정이 필요 없음
+        buf.update_priorities(np.arange(40), np.ones(40))
+        _, _, weights = buf.sample(32)
+        np.testing.assert_allclose(weights, 1.0, rtol=1e-6)
+
+    def test_empty_buffer_raises(self):
+        with pytest.raises(ValueError):
+            make_buffer(capacity=8).sample(4)
+
+
+class TestNStepReturns:
+    def test_matches_discounted_sum(self):
+        gamma = 0.9
+        buf = make_buffer(capacity=32, n_step=3, gamma=gamma)
+        rewards = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+        # 에피소드 A: 0..4 (4 에서 종료), 에피소드 B: 5..6 (n 보다 짧게 6 에서 종료)
+        add_steps(buf, rewards, done_at=(4, 6))
+
+        def expected(i, end):
+            steps = range(i, min(i + 3, end + 1))
+            return sum(gamma ** (t - i) * rewards[t] for t in steps)
+
+        for i, end in [(0, 4), (1, 4), (2, 4), (3, 4), (4, 4), (5, 6), (6, 6)]:
+            t = buf.get(i)
+            assert t.n_step_return == pytest.approx(expected(i, end), rel=1e-6)
+            bootstrap = min(i + 3, end + 1)
+            assert t.next_obs[0] == bootstrap
+            assert t.done == (bootstrap == end + 1)
+            assert buf.discounts[i] == pytest.approx(gamma ** (bootstrap - i))
+        assert len(buf) == 7
+
+    def test_pending_transitions_are_not_sampled(self):
+        buf = make_buffer(capacity=16, n_step=3)
+        add_steps(buf, [1.0] * 5)
+        assert len(buf) == 3
+        assert list(buf.n_step_buffer) == [3, 4]
+        _, indices, _ = buf.sample(64)
+        assert set(indices.tolist()) <= {0, 1, 2}
+
+
+class TestWrapAround:
+    def test_overwrites_oldest(self):
+        buf = make_buffer(capacity=5, n_step=1)
+        add_steps(buf, np.arange(12, dtype=float))
+
+        assert buf.size == 5 and len(buf) == 5
+        assert buf.write_ptr == 12 % 5
+        np.testing.assert_array_equal(buf.obs[:, 0], [10, 11, 7, 8, 9])
+        np.testing.assert_array_equal(buf.rewards, [10, 11, 7, 8, 9])
+        assert buf.tree.total_priority() == pytest.approx(5.0)
+
+        batch, _, _ = buf.sample(50)
+        assert set(batch["obs"][:, 0].tolist()) <= {7.0, 8.0, 9.0, 10.0, 11.0}
+
+    def test_n_step_across_boundary(self):
+        gamma = 0.5
+        buf = make_buffer(capacity=6, n_step=3, gamma=gamma)
+        add_steps(buf, np.ones(20))
+
+        assert buf.size == 6 and len(buf) == 4
+        # 슬롯 0 = 전이 18 (대기 중), 슬롯 5 = 전이 17 (확정)
+        assert set(buf.n_step_buffer) == {0, 1}
+        assert buf.obs[5, 0] == 17 and buf.next_obs[5, 0] == 20
+        assert buf.n_step_returns[5] == pytest.approx(1 + gamma + gamma**2)
+        _, indices, _ = buf.sample(64)
+        assert not set(indices.tolist()) & {0, 1}
+
+
+class TestPersistence:
+    def test_mmap_round_trip_can_add_and_sample(self, tmp_path):
+        buf = make_buffer(capacity=16, n_step=3)
+        add_steps(buf, np.arange(10, dtype=float), done_at=(6,))
+        buf.update_priorities(np.arange(4), [0.5, 1.5, 2.5, 3.5])
+        buf.save_to_disk(str(tmp_path))
+
+        loaded = make_buffer(capacity=16, n_step=3)
+        loaded.load_from_disk(str(tmp_path), mmap=True)
+
+        assert isinstance(loaded.obs, np.memmap)
+        for name in ("obs", "next_obs", "actions", "n_step_returns", "discounts"):
+            np.testing.assert_array_equal(getattr(loaded, name), getattr(buf, name))
+        np.testing.assert_allclose(loaded.tree.tree, buf.tree.tree)
+        assert loaded.tree.min_priority() == pytest.approx(buf.tree.min_priority())
+        assert list(loaded.n_step_buffer) == list(buf.n_step_buffer)
+        assert (loaded.size, loaded.write_ptr, len(loaded)) == (
+            buf.size,
+            buf.write_ptr,
+            len(buf),
+        )
+
+        # 대기 중이던 n-step 슬롯이 로드 후 이어서 확정됨
+        add_steps(loaded, [100.0, 100.0], start=10)
+        add_steps(buf, [100.0, 100.0], start=10)
+        np.testing.assert_allclose(loaded.n_step_returns, buf.n_step_returns)
+        batch, indices, weights = loaded.sample(8)
+        assert batch["obs"].shape == (8, 1)
+        assert np.all(weights <= 1.0 + 1e-6)
+
+        # copy-on-write: 디스크의 파일은 바뀌지 않음
+        on_disk = np.load(os.path.join(str(tmp_path), "obs.npy"))
+        assert on_disk[10, 0] == 0 and loaded.obs[10, 0] == 10
+
+    def test_capacity_mismatch_raises(self, tmp_path):
+        buf = make_buffer(capacity=16)
+        add_steps(buf, [1.0])
+        buf.save_to_disk(str(tmp_path))
+        with pytest.raises(ValueError):
+            make_buffer(capacity=32).load_from_disk(str(tmp_path))
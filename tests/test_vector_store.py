@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+벡터 DB 테스트 — vector_db/sc2_vector_store.py
+
+- FlatIndex == numpy 전수 계산, LSH / HNSW recall 은 FlatIndex 기준
+- search_batch == search 반복
+- 같은 id 재삽입 시 이전 행은 결과에서 제외
+- 메타데이터 필터
+- save / VectorStore.load(mmap=True) 왕복
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+if _HAS_NUMPY:
+    import numpy as np
+
+pytestmark = pytest.mark.skipif(not _HAS_NUMPY, reason="numpy not installed")
+
+DIM = 16
+
+
+def random_vectors(n, seed=0, dim=DIM):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def brute_force(data, query, k, metric):
+    from vector_db.sc2_vector_store import DistanceMetric
+
+    data = data.astype(np.float64)
+    query = query.astype(np.float64)
+    if metric == DistanceMetric.COSINE:
+        dists = 1.0 - data @ query / (
+            np.linalg.norm(data, axis=1) * np.linalg.norm(query)
+        )
+    elif metric == DistanceMetric.MANHATTAN:
+        dists = np.abs(data - query).sum(axis=1)
+    else:
+        dists = np.linalg.norm(data - query, axis=1)
+    order = np.argsort(dists, kind="stable")[:k]
+    return [str(i) for i in order], dists[order]
+
+
+def make_store(index_type=None, **kwargs):
+    from vector_db.sc2_vector_store import IndexType, VectorStore
+
+    return VectorStore(
+        dim=DIM, index_type=index_type or IndexType.BRUTE_FORCE, **kwargs
+    )
+
+
+class TestFlatIndex:
+    @pytest.mark.parametrize("metric", ["EUCLIDEAN", "COSINE", "MANHATTAN"])
+    def test_matches_numpy_brute_force(self, metric):
+        from vector_db.sc2_vector_store import DistanceMetric, FlatIndex
+
+        metric = DistanceMetric[metric]
+        data = random_vectors(500)
+        index = FlatIndex(dim=DIM)
+        index.build(data)
+
+        for query in random_vectors(10, seed=1):
+            hits = index.query(query, k=7, metric=metric)
+            ids, dists = brute_force(data, query, 7, metric)
+            assert [eid for eid, _ in hits] == ids
+            np.testing.assert_allclose(
+                [d for _, d in hits], dists, rtol=1e-4, atol=1e-5
+            )
+
+    def test_allowed_subset(self):
+        from vector_db.sc2_vector_store import DistanceMetric, FlatIndex
+
+        data = random_vectors(200)
+        index = FlatIndex(dim=DIM)
+        index.build(data)
+        allowed = {str(i) for i in range(0, 200, 3)}
+
+        query = random_vectors(1, seed=2)[0]
+        hits = index.query(query, k=5, allowed=allowed)
+        subset = np.array(sorted(allowed, key=int), dtype=int)
+        ids, _ = brute_force(data[subset], query, 5, DistanceMetric.EUCLIDEAN)
+        assert [eid for eid, _ in hits] == [str(subset[int(i)]) for i in ids]
+
+
+class TestApproximateIndexes:
+    def recall(self, store_type, metric, **kwargs):
+        from vector_db.sc2_vector_store import IndexType
+
+        data = random_vectors(1000)
+        queries = random_vectors(30, seed=3)
+        ids = [str(i) for i in range(len(data))]
+        exact = make_store(metric=metric)
+        approx = make_store(IndexType[store_type], metric=metric, **kwargs)
+        exact.add_batch(ids, data)
+        approx.add_batch(ids, data)
+
+        found = total = 0
+        for want, got in zip(
+            exact.search_batch(queries, k=10), approx.search_batch(queries, k=10)
+        ):
+            found += len({r.entry_id for r in want} & {r.entry_id for r in got})
+            total += len(want)
+            # 근사 결과도 거리 오름차순
+            dists = [r.distance for r in got]
+            assert dists == sorted(dists)
+        return found / total
+
+    def test_hnsw_recall_against_flat(self):
+        from vector_db.sc2_vector_store import DistanceMetric
+
+        assert self.recall("HNSW", DistanceMetric.EUCLIDEAN) >= 0.9
+
+    def test_lsh_recall_against_flat(self):
+        from vector_db.sc2_vector_store import DistanceMetric
+
+        recall = self.recall("LSH", DistanceMetric.COSINE, num_tables=16, num_bits=6)
+        assert recall >= 0.5
+
+
+class TestVectorStore:
+    @pytest.mark.parametrize("index_type", ["BRUTE_FORCE", "LSH", "HNSW"])
+    def test_search_batch_matches_search(self, index_type):
+        from vector_db.sc2_vector_store import IndexType
+
+        store = make_store(IndexType[index_type])
+        data = random_vectors(300)
+        store.add_batch(
+            [f"g{i}" for i in range(300)],
+            data,
+            [{"matchup": "ZvT" if i % 2 else "ZvP"} for i in range(300)],
+        )
+        queries = random_vectors(8, seed=4)
+
+        for flt in (None, {"matchup": "ZvT"}):
+            batch = store.search_batch(queries, k=5, filter_metadata=flt)
+            single = [
+                store.search(q.tolist(), k=5, filter_metadata=flt) for q in queries
+            ]
+            assert [[(r.entry_id, r.distance) for r in hits] for hits in batch] == [
+                [(r.entry_id, r.distance) for r in hits] for hits in single
+            ]
+
+    @pytest.mark.parametrize("index_type", ["BRUTE_FORCE", "LSH", "HNSW"])
+    def test_reinsert_drops_old_row(self, index_type):
+        from vector_db.sc2_vector_store import IndexType
+
+        store = make_store(IndexType[index_type])
+        data = random_vectors(100)
+        store.add_batch([f"g{i}" for i in range(100)], data)
+        old = data[7].tolist()
+        new = (data[7] + 50.0).tolist()  # 멀리 떨어진 위치로 이동
+
+        store.add("g7", new, {"phase": "late"})
+        assert store.size == 100
+        assert store.get("g7").vector == pytest.approx(new)
+        assert store.get("g7").metadata == {"phase": "late"}
+        assert "g7" not in [r.entry_id for r in store.search(old, k=5)]
+        assert store.search(new, k=1)[0].entry_id == "g7"
+
+        # remove 후 재삽입
+        assert store.remove("g7")
+        assert not store.remove("g7")
+        assert store.get("g7") is None
+        assert "g7" not in [r.entry_id for r in store.search(new, k=5)]
+        store.add("g7", old)
+        hits = store.search(old, k=3)
+        assert hits[0].entry_id == "g7"
+        assert hits[0].distance == pytest.approx(0.0, abs=1e-4)
+        assert [r.entry_id for r in hits].count("g7") == 1
+
+    def test_metadata_filter(self):
+        store = make_store()
+        data = random_vectors(60)
+        metadata = [
+            {"matchup": ("ZvT", "ZvP", "ZvZ")[i % 3], "won": i % 2 == 0}
+            for i in range(60)
+        ]
+        store.add_batch([f"g{i}" for i in range(60)], data, metadata)
+
+        hits = store.search(data[0].tolist(), k=100, filter_metadata={"matchup": "ZvP"})
+        assert len(hits) == 20
+        assert all(r.metadata["matchup"] == "ZvP" for r in hits)
+
+        both = store.search(
+            data[0].tolist(), k=100, filter_metadata={"matchup": "ZvT", "won": True}
+        )
+        assert {r.entry_id for r in both} == {f"g{i}" for i in range(0, 60, 6)}
+        assert store.search(data[0].tolist(), filter_metadata={"matchup": "TvT"}) == []
+
+        # 메타데이터 갱신 / 삭제가 역인덱스에 반영됨
+        store.add("g0", data[0].tolist(), {"matchup": "ZvP"})
+        store.remove("g3")
+        ids = {
+            r.entry_id
+            for r in store.search(
+                data[0].tolist(), k=100, filter_metadata={"matchup": "ZvT"}
+            )
+        }
+        assert "g0" not in ids and "g3" not in ids and len(ids) == 18
+
+    def test_dim_mismatch_raises(self):
+        store = make_store()
+        with pytest.raises(ValueError):
+            store.add("x", [0.0] * (DIM + 1))
+        with pytest.raises(ValueError):
+            store.search([0.0] * (DIM - 1))
+
+
+class TestPersistence:
+    @pytest.mark.parametrize("index_type", ["BRUTE_FORCE", "LSH", "HNSW"])
+    def test_mmap_round_trip(self, tmp_path, index_type):
+        from vector_db.sc2_vector_store import IndexType, VectorStore
+
+        store = make_store(IndexType[index_type])
+        data = random_vectors(200)
+        store.add_batch(
+            [f"g{i}" for i in range(200)],
+            data,
+            [{"map": "A" if i < 100 else "B"} for i in range(200)],
+        )
+        store.remove("g5")
+        store.add("g6", (data[6] + 1.0).tolist(), {"map": "B"})
+        queries = random_vectors(5, seed=5)
+        before = store.search_batch(queries, k=8, filter_metadata={"map": "B"})
+        store.save(str(tmp_path))
+
+        loaded = VectorStore.load(str(tmp_path), mmap=True)
+        assert isinstance(loaded._index._store.vectors, np.memmap)
+        assert loaded.size == store.size == 199
+        assert loaded.index_type == store.index_type
+        assert loaded.get("g5") is None
+        assert loaded.get("g6").metadata == {"map": "B"}
+        after = loaded.search_batch(queries, k=8, filter_metadata={"map": "B"})
+        assert [[r.entry_id for r in hits] for hits in after] == [
+            [r.entry_id for r in hits] for hits in before
+        ]
+
+        # 로드한 스토어에 계속 쓸 수 있고, 디스크 파일은 그대로
+        loaded.add("new", data[0].tolist(), {"map": "B"})
+        assert loaded.search(data[0].tolist(), k=1)[0].entry_id in {"new", "g0"}
+        assert VectorStore.load(str(tmp_path)).get("new") is None
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+월드 모델 테스트 — world_model/sc2_world_model.py
+
+- observe_sequence / imagine_sequence 의 (B, T, dim) 출력 모양
+- 배치 롤아웃 == 스텝별 / 샘플별 롤아웃
+- KLManager.compute_loss 배치 입력
+- HAS_NUMPY=False (numpy 없이 import 한 모듈 사본) 경로
+"""
+
+import importlib.util
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+_HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+if _HAS_NUMPY:
+    import numpy as np
+
+pytestmark = pytest.mark.skipif(not _HAS_NUMPY, reason="numpy not installed")
+
+B, T, H = 3, 5, 4
+
+
+@pytest.fixture
+def wm():
+    from world_model import sc2_world_model
+
+    return sc2_world_model
+
+
+@pytest.fixture
+def deterministic(wm, monkeypatch):
+    """z = mean: 배치/스텝별 경로를 같은 난수 없이 비교."""
+    monkeypatch.setattr(wm, "_gauss_sample", lambda mean, log_std: mean)
+    return wm
+
+
+@pytest.fixture
+def list_wm(monkeypatch):
+    """numpy import 가 실패하는 상태로 불러온 모듈 사본 (HAS_NUMPY=False)."""
+    spec = importlib.util.spec_from_file_location(
+        "_sc2_world_model_no_numpy",
+        os.path.join(ROOT, "world_model", "sc2_world_model.py"),
+    )
+    module = importlib.util.module_from_spec(spec)
+    with monkeypatch.context() as patch:
+        patch.setitem(sys.modules, "numpy", None)
+        patch.setitem(sys.modules, spec.name, module)  # dataclass 가 참조
+        spec.loader.exec_module(module)
+    return module
+
+
+def make_rssm(module, seed=0):
+    random.seed(seed)  # DenseLayer 가중치는 random 모듈로 초기화
+    return module.RSSM()
+
+
+def sequence_inputs(wm, seed=0):
+    rng = np.random.default_rng(seed)
+    obs = rng.random((B, T, wm.OBS_DIM))
+    actions = rng.integers(0, wm.ACTION_DIM, size=(B, T))
+    return obs, actions
+
+
+class TestShapes:
+    def test_observe_sequence(self, wm):
+        rssm = make_rssm(wm)
+        obs, actions = sequence_inputs(wm)
+        states, prior_mean, prior_logstd = rssm.observe_sequence(obs, actions)
+
+        assert states.deterministic.shape == (B, T, wm.DETERMINISTIC_DIM)
+        for field in (states.stochastic, states.mean, states.log_std):
+            assert field.shape == (B, T, wm.LATENT_DIM)
+        assert prior_mean.shape == prior_logstd.shape == (B, T, wm.LATENT_DIM)
+        assert rssm.get_feature(states).shape == (B, T, wm.FEATURE_DIM)
+        assert states[1].deterministic.shape == (T, wm.DETERMINISTIC_DIM)
+        assert states[:, -1].stochastic.shape == (B, wm.LATENT_DIM)
+
+    def test_imagine_sequence(self, wm):
+        rssm = make_rssm(wm)
+        obs, actions = sequence_inputs(wm)
+        states, _, _ = rssm.observe_sequence(obs, actions)
+        imagined = rssm.imagine_sequence(
+            states[:, -1], np.zeros((B, H), dtype=np.int64)
+        )
+        assert imagined.deterministic.shape == (B, H, wm.DETERMINISTIC_DIM)
+        assert imagined.log_std.shape == (B, H, wm.LATENT_DIM)
+        assert np.all(imagined.log_std >= -5.0) and np.all(imagined.log_std <= 2.0)
+
+    def test_imagine_batch(self, wm):
+        random.seed(0)
+        model = wm.SC2WorldModel(imagination_horizon=H)
+        start = model.rssm.initial_state().tile(B)
+        traj = model.imagine_batch(start)
+
+        assert traj["features"].shape == (B, H, wm.FEATURE_DIM)
+        for key in ("actions", "rewards", "continues"):
+            assert traj[key].shape == (B, H)
+        assert np.all((traj["actions"] >= 0) & (traj["actions"] < wm.ACTION_DIM))
+        assert np.all((traj["continues"] >= 0) & (traj["continues"] <= 1))
+        # t=0 의 상태는 시작 상태 그대로
+        np.testing.assert_array_equal(traj["states"][:, 0].deterministic, 0.0)
+
+        first = np.arange(B) % wm.ACTION_DIM
+        forced = model.imagine_batch(start, first_actions=first)
+        np.testing.assert_array_equal(forced["actions"][:, 0], first)
+
+
+class TestBatchedRollout:
+    def test_observe_sequence_matches_step_loop(self, deterministic):
+        wm = deterministic
+        rssm = make_rssm(wm)
+        obs, actions = sequence_inputs(wm, seed=1)
+        states, prior_mean, prior_logstd = rssm.observe_sequence(obs, actions)
+
+        for b in range(B):
+            state = rssm.initial_state()
+            for t in range(T):
+                state = rssm.observe_step(state, int(actions[b, t]), obs[b, t])
+                np.testing.assert_allclose(
+                    states[b, t].deterministic, state.deterministic, atol=1e-12
+                )
+                np.testing.assert_allclose(states[b, t].mean, state.mean, atol=1e-12)
+                np.testing.assert_allclose(
+                    states[b, t].log_std, state.log_std, atol=1e-12
+                )
+                mean, log_std = rssm.prior(state.deterministic)
+                np.testing.assert_allclose(prior_mean[b, t], mean, atol=1e-12)
+                np.testing.assert_allclose(prior_logstd[b, t], log_std, atol=1e-12)
+
+    def test_imagine_sequence_matches_step_loop(self, deterministic):
+        wm = deterministic
+        rssm = make_rssm(wm)
+        obs, actions = sequence_inputs(wm, seed=2)
+        start = rssm.observe_sequence(obs, actions)[0][:, -1]
+        plan = np.random.default_rng(3).integers(0, wm.ACTION_DIM, size=(B, H))
+
+        imagined = rssm.imagine_sequence(start, plan)
+        for b in range(B):
+            state = start[b]
+            for t in range(H):
+                state = rssm.imagine_step(state, int(plan[b, t]))
+                np.testing.assert_allclose(
+                    imagined[b, t].stochastic, state.stochastic, atol=1e-12
+                )
+
+    def test_sampled_rollout_matches_batched_steps(self, wm):
+        """같은 시드면 observe_sequence == (B,) 배치 observe_step 반복 (샘플링 포함)."""
+        rssm = make_rssm(wm)
+        obs, actions = sequence_inputs(wm, seed=4)
+
+        np.random.seed(5)
+        states, _, _ = rssm.observe_sequence(obs, actions)
+        np.random.seed(5)
+        state = rssm.initial_state(B)
+        for t in range(T):
+            state = rssm.observe_step(state, actions[:, t], obs[:, t])
+            np.testing.assert_allclose(
+                states[:, t].stochastic, state.stochastic, atol=1e-12
+            )
+
+    def test_imagine_rollout_is_single_batch(self, deterministic, monkeypatch):
+        wm = deterministic
+        random.seed(0)
+        model = wm.SC2WorldModel(imagination_horizon=H)
+        monkeypatch.setattr(
+            model.actor, "sample_actions", lambda f, greedy=False: f[..., 0] * 0 + 2
+        )
+        start = model.rssm.initial_state()
+        rollout = model.imagine_rollout(start)
+        traj = model.imagine_batch(start.tile(2))
+
+        assert len(rollout) == H
+        for t, (state, action, reward, cont) in enumerate(rollout):
+            assert action == 2
+            assert reward == pytest.approx(traj["rewards"][1, t])
+            assert cont == pytest.approx(traj["continues"][1, t])
+
+    def test_lambda_returns_batch_matches_list(self, wm):
+        random.seed(0)
+        model = wm.SC2WorldModel()
+        rng = np.random.default_rng(6)
+        rewards, values = rng.normal(size=(2, B, H))
+        continues = rng.random((B, H))
+
+        batched = model.lambda_returns_batch(rewards, values, continues)
+        for b in range(B):
+            expected = model.compute_lambda_returns(
+                rewards[b].tolist(), values[b].tolist(), continues[b].tolist()
+            )
+            np.testing.assert_allclose(batched[b], expected, rtol=1e-12)
+
+
+class TestKLManager:
+    def test_batched_loss_matches_per_sample(self, wm):
+        rng = np.random.default_rng(7)
+        shape = (B, T, wm.LATENT_DIM)
+        post_m, prior_m = rng.normal(size=(2,) + shape)
+        post_s, prior_s = rng.uniform(-2, 0.5, size=(2,) + shape)
+        post_m[0, 0], post_s[0, 0] = prior_m[0, 0], prior_s[0, 0]  # KL = 0
+
+        kl = wm.KLManager(free_bits=1.0, kl_scale=0.1, kl_balance=0.8)
+        loss, info = kl.compute_loss(post_m, post_s, prior_m, prior_s)
+        assert loss.shape == info["raw_kl"].shape == (B, T)
+        assert len(kl.kl_history) == B * T
+        assert info["raw_kl"][0, 0] == pytest.approx(0.0)
+        assert loss[0, 0] == pytest.approx(0.1 * 1.0)  # free bits 하한
+
+        single = wm.KLManager(free_bits=1.0, kl_scale=0.1, kl_balance=0.8)
+        for b in range(B):
+            for t in range(T):
+                value, _ = single.compute_loss(
+                    post_m[b, t], post_s[b, t], prior_m[b, t], prior_s[b, t]
+                )
+                assert float(value) == pytest.approx(loss[b, t], rel=1e-12)
+        assert list(single.kl_history) == pytest.approx(list(kl.kl_history))
+        assert kl.get_stats()["max_kl"] == pytest.approx(info["raw_kl"].max())
+
+    def test_gaussian_kl_closed_form(self, wm):
+        kl = wm.KLManager()
+        # 1차원: KL(N(1, 1) || N(0, 1)) = 0.5
+        assert float(kl.gaussian_kl([1.0], [0.0], [0.0], [0.0])) == pytest.approx(0.5)
+
+
+class TestNoNumpy:
+    def test_module_falls_back_to_lists(self, list_wm):
+        assert list_wm.HAS_NUMPY is False
+        assert list_wm.SequenceBuffer is list_wm._ListSequenceBuffer
+        rssm = make_rssm(list_wm)
+        assert isinstance(rssm.prior_net.layers[0].weights, list)
+        with pytest.raises(RuntimeError):
+            rssm.initial_state(2)
+
+    def test_list_math_matches_numpy(self, list_wm, deterministic, monkeypatch):
+        wm = deterministic
+        monkeypatch.setattr(list_wm, "_gauss_sample", lambda mean, log_std: mean)
+        fast, slow = make_rssm(wm, seed=8), make_rssm(list_wm, seed=8)
+        obs, actions = sequence_inputs(wm, seed=9)
+
+        fast_state, slow_state = fast.initial_state(), slow.initial_state()
+        for t in range(T):
+            fast_state = fast.observe_step(fast_state, int(actions[0, t]), obs[0, t])
+            slow_state = slow.observe_step(
+                slow_state, int(actions[0, t]), obs[0, t].tolist()
+            )
+        assert isinstance(slow_state.deterministic, list)
+        np.testing.assert_allclose(
+            slow.get_feature(slow_state), fast.get_feature(fast_state), atol=1e-9
+        )
+        slow_state = slow.imagine_step(slow_state, 3)
+        fast_state = fast.imagine_step(fast_state, 3)
+        np.testing.assert_allclose(slow_state.mean, fast_state.mean, atol=1e-9)
+
+        mean, log_std = fast.prior(fast_state.deterministic)
+        args = (fast_state.mean, fast_state.log_std, mean, log_std)
+        fast_kl, _ = wm.KLManager().compute_loss(*args)
+        slow_kl, _ = list_wm.KLManager().compute_loss(*(a.tolist() for a in args))
+        assert isinstance(slow_kl, float)
+        assert slow_kl == pytest.approx(float(fast_kl), rel=1e-9)
+
+    def test_world_model_runs_without_numpy(self, list_wm):
+        random.seed(10)
+        model = list_wm.SC2WorldModel(imagination_horizon=3)
+        env = list_wm.SC2EnvSimulator(max_steps=6)
+        for _ in range(2):
+            obs, done = env.reset(), False
+            model.reset()
+            while not done:
+                action = model.select_action(obs)
+                model.encode_observe(obs, action)
+                next_obs, reward, done = env.step(action)
+                model.buffer.add(obs, action, reward, done)
+                obs = next_obs
+
+        losses = model.train_world_model_step(batch_size=2)
+        assert set(losses) >= {"reconstruction", "reward", "kl", "total"}
+        assert all(isinstance(v, float) for v in losses.values())
+
+        rollout = model.imagine_rollout(model.current_state)
+        assert len(rollout) == 3
+        assert all(0 <= action < list_wm.ACTION_DIM for _, action, _, _ in rollout)
+        assert 0 <= model.plan_action() < list_wm.ACTION_DIM
@@ -19,14 +19,29 @@ from __future__ import annotations
 
 import hashlib
 import heapq
+import json
 import math
+import os
 import random
 import struct
 import time
 from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -242,20 +257,342 @@ class SearchResult:
         return self.distance < other.distance
 
 
+# ---------------------------------------------------------------------------
+# Matrix storage
+# ---------------------------------------------------------------------------
+
+# Rows per block for brute-force scans / hashing; keeps temporaries ~ few MB.
+_SCAN_CHUNK = 16384
+# LSH: rows inserted after the last bulk sort live in small per-bucket lists
+# until they exceed this many (or 1/8 of the sorted rows), then get merged.
+_LSH_TAIL_MIN = 4096
+# HNSW: frontier nodes expanded together per vectorized distance call.
+_HNSW_EXPAND = 4
+
+
+def _as_matrix(vectors: Any, dim: int) -> np.ndarray:
+    """Coerce a vector or batch of vectors to a contiguous (n, dim) float32 matrix."""
+    mat = np.ascontiguousarray(vectors, dtype=np.float32)
+    if mat.ndim == 1:
+        mat = mat.reshape(1, -1)
+    if mat.ndim != 2 or (mat.shape[1] != dim and mat.size):
+        raise ValueError(f"Vector dim {mat.shape[-1]} != index dim {dim}")
+    return mat.reshape(-1, dim)
+
+
+def _grown(arr: np.ndarray, capacity: int, fill: Any = None) -> np.ndarray:
+    """Copy *arr* into a larger array (rows beyond the old length are *fill*)."""
+    shape = (capacity,) + arr.shape[1:]
+    if fill is None:
+        out = np.empty(shape, dtype=arr.dtype)
+    else:
+        out = np.full(shape, fill, dtype=arr.dtype)
+    out[: len(arr)] = arr
+    return out
+
+
+def _sq_distances(rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+    diff = rows - query
+    return np.einsum("ij,ij->i", diff, diff)
+
+
+def _row_distances(
+    rows: np.ndarray, query: np.ndarray, metric: DistanceMetric
+) -> np.ndarray:
+    """Exact distances from every row of *rows* to one query vector."""
+    if metric == DistanceMetric.COSINE:
+        row_norms = np.sqrt(np.einsum("ij,ij->i", rows, rows))
+        q_norm = float(np.sqrt(np.dot(query, query)))
+        out = np.ones(len(rows), dtype=np.float32)
+        if q_norm < 1e-12:
+            return out
+        ok = row_norms >= 1e-12
+        out[ok] = 1.0 - (rows[ok] @ query) / (row_norms[ok] * q_norm)
+        return out
+    if metric == DistanceMetric.MANHATTAN:
+        return np.abs(rows - query).sum(axis=1)
+    return np.sqrt(_sq_distances(rows, query))
+
+
+def _distance_matrix(
+    queries: np.ndarray, rows: np.ndarray, metric: DistanceMetric
+) -> np.ndarray:
+    """(n_queries, n_rows) distances via GEMM; used for candidate selection only."""
+    if metric == DistanceMetric.MANHATTAN:
+        return np.stack([np.abs(rows - q).sum(axis=1) for q in queries])
+    dots = queries @ rows.T
+    row_sq = np.einsum("ij,ij->i", rows, rows)
+    q_sq = np.einsum("ij,ij->i", queries, queries)
+    if metric == DistanceMetric.COSINE:
+        denom = np.outer(np.sqrt(q_sq), np.sqrt(row_sq))
+        out = np.ones_like(dots)
+        np.divide(dots, denom, out=dots, where=denom >= 1e-24)
+        np.subtract(1.0, dots, out=out, where=denom >= 1e-24)
+        return out
+    dots *= -2.0
+    dots += q_sq[:, None]
+    dots += row_sq[None, :]
+    return np.maximum(dots, 0.0, out=dots)
+
+
+class _VectorMatrix:
+    """
+    Growable float32 row matrix with string-id <-> integer-row mapping.
+
+    Rows never move: remove() only clears the row's alive flag, so integer
+    row ids stay valid inside the index structures (hash tables, graph links).
+    Re-inserting an existing id appends a new row and retires the old one.
+    """
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+
+    @property
+    def n(self) -> int:
+        return len(self.ids)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.vectors)
+
+    def reserve(self, count: int) -> None:
+        if count <= self.capacity:
+            return
+        capacity = max(count, 2 * self.capacity, 1024)
+        self.vectors = _grown(self.vectors, capacity)
+        self.alive = _grown(self.alive, capacity, False)
+
+    def append(self, ids: Sequence[str], vectors: np.ndarray) -> np.ndarray:
+        start = self.n
+        stop = start + len(ids)
+        self.reserve(stop)
+        self.vectors[start:stop] = vectors
+        self.alive[start:stop] = True
+        for row, entry_id in enumerate(ids, start):
+            old = self.rows.get(entry_id)
+            if old is not None:
+                self.alive[old] = False
+            self.rows[entry_id] = row
+        self.ids.extend(ids)
+        return np.arange(start, stop)
+
+    def remove(self, entry_id: str) -> Optional[int]:
+        row = self.rows.pop(entry_id, None)
+        if row is not None:
+            self.alive[row] = False
+        return row
+
+    def save(self, path: str) -> None:
+        n = self.n
+        np.save(os.path.join(path, "vectors.npy"), self.vectors[:n])
+        np.save(os.path.join(path, "alive.npy"), self.alive[:n])
+        np.save(os.path.join(path, "ids.npy"), np.array(self.ids, dtype=str))
+
+    def load(self, path: str, mmap: bool) -> None:
+        """Restore rows; with mmap=True vectors stay on disk (copy-on-write)."""
+        self.vectors = np.load(
+            os.path.join(path, "vectors.npy"), mmap_mode="c" if mmap else None
+        )
+        self.alive = np.load(os.path.join(path, "alive.npy"))
+        self.ids = np.load(os.path.join(path, "ids.npy")).tolist()
+        alive = self.alive
+        self.rows = {eid: row for row, eid in enumerate(self.ids) if alive[row]}
+
+
+class _MatrixIndex:
+    """Shared insert/build/remove/persistence plumbing for the index backends."""
+
+    kind = "base"
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self._store = _VectorMatrix(dim)
+
+    # -- hooks -----------------------------------------------------------
+    def _add_rows(self, rows: np.ndarray) -> None:
+        pass
+
+    def _params(self) -> Dict[str, Any]:
+        return {"dim": self.dim}
+
+    def _save_arrays(self, path: str) -> Dict[str, Any]:
+        return {}
+
+    def _load_arrays(self, path: str, meta: Dict[str, Any], mmap: bool) -> None:
+        pass
+
+    # ------------------------------------------------------------------
+    def insert(self, entry_id: str, vector: Sequence[float]) -> None:
+        self.build(_as_matrix(vector, self.dim), [entry_id])
+
+    def build(self, vectors: Any, ids: Optional[Sequence[str]] = None) -> List[str]:
+        """
+        Bulk-insert an (n, dim) batch.  Vectors are copied into the matrix in
+        one shot and index structures are updated per batch.  Missing *ids*
+        default to the row numbers.  Returns the ids used.
+        """
+        mat = _as_matrix(vectors, self.dim)
+        if ids is None:
+            ids = [str(i) for i in range(self._store.n, self._store.n + len(mat))]
+        elif len(ids) != len(mat):
+            raise ValueError(f"{len(ids)} ids for {len(mat)} vectors")
+        ids = list(ids)
+        if ids:
+            self._add_rows(self._store.append(ids, mat))
+        return ids
+
+    def remove(self, entry_id: str) -> bool:
+        return self._store.remove(entry_id) is not None
+
+    def get_vector(self, entry_id: str) -> Optional[np.ndarray]:
+        row = self._store.rows.get(entry_id)
+        return None if row is None else self._store.vectors[row]
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._store.rows
+
+    @property
+    def size(self) -> int:
+        return len(self._store.rows)
+
+    # ------------------------------------------------------------------
+    def save(self, path: str) -> None:
+        """Write a directory of .npy arrays (+ meta.json) that load() can mmap."""
+        os.makedirs(path, exist_ok=True)
+        self._store.save(path)
+        meta = {"type": self.kind, "params": self._params(), "rows": self._store.n}
+        meta.update(self._save_arrays(path))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "_MatrixIndex":
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["type"] != cls.kind:
+            raise ValueError(f"{path} holds a {meta['type']} index, not {cls.kind}")
+        index = cls(**meta["params"])
+        index._store.load(path, mmap)
+        index._load_arrays(path, meta, mmap)
+        return index
+
+    def _results(
+        self, rows: np.ndarray, dists: np.ndarray, k: int
+    ) -> List[Tuple[str, float]]:
+        if len(rows) > k:
+            part = np.argpartition(dists, k - 1)[:k]
+            rows, dists = rows[part], dists[part]
+        order = np.argsort(dists, kind="stable")
+        ids = self._store.ids
+        return [(ids[r], float(d)) for r, d in zip(rows[order], dists[order])]
+
+
+# ---------------------------------------------------------------------------
+# FlatIndex (exact)
+# ---------------------------------------------------------------------------
+
+
+class FlatIndex(_MatrixIndex):
+    """
+    Exact nearest neighbors by blocked brute-force scan over the matrix.
+
+    Candidates are ranked with one GEMM per block for the whole query batch;
+    the surviving k rows get their distances recomputed exactly.
+    """
+
+    kind = "flat"
+
+    def query(
+        self,
+        vector: Sequence[float],
+        k: int = 10,
+        metric: DistanceMetric = DistanceMetric.EUCLIDEAN,
+        allowed: Optional[Collection[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        return self.query_batch([vector], k, metric, allowed)[0]
+
+    def query_batch(
+        self,
+        vectors: Any,
+        k: int = 10,
+        metric: DistanceMetric = DistanceMetric.EUCLIDEAN,
+        allowed: Optional[Collection[str]] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """k nearest for every query row; *allowed* restricts to those ids."""
+        queries = _as_matrix(vectors, self.dim)
+        store = self._store
+        if allowed is None:
+            subset = None
+            total = store.n
+        else:
+            subset = np.fromiter(
+                (store.rows[e] for e in allowed if e in store.rows), dtype=np.int64
+            )
+            total = len(subset)
+        if k <= 0 or self.size == 0 or total == 0:
+            return [[] for _ in range(len(queries))]
+
+        best_d = np.empty((len(queries), 0), dtype=np.float32)
+        best_r = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, total, _SCAN_CHUNK):
+            stop = min(start + _SCAN_CHUNK, total)
+            if subset is None:
+                rows = np.arange(start, stop)
+                block = store.vectors[start:stop]
+            else:
+                rows = subset[start:stop]
+                block = store.vectors[rows]
+            dists = _distance_matrix(queries, block, metric)
+            dists[:, ~store.alive[rows]] = np.inf
+            best_d = np.concatenate([best_d, dists], axis=1)
+            best_r = np.concatenate(
+                [best_r, np.broadcast_to(rows, dists.shape)], axis=1
+            )
+            if best_d.shape[1] > k:
+                part = np.argpartition(best_d, k - 1, axis=1)[:, :k]
+                best_d = np.take_along_axis(best_d, part, axis=1)
+                best_r = np.take_along_axis(best_r, part, axis=1)
+
+        out = []
+        for q, rows, dists in zip(queries, best_r, best_d):
+            rows = rows[np.isfinite(dists)]
+            out.append(
+                self._results(rows, _row_distances(store.vectors[rows], q, metric), k)
+            )
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "type": "FLAT",
+            "total_vectors": self.size,
+            "deleted": self._store.n - self.size,
+        }
+
+
 # ---------------------------------------------------------------------------
 # LSHIndex
 # ---------------------------------------------------------------------------
 
 
-class LSHIndex:
+class LSHIndex(_MatrixIndex):
     """
     Locality-Sensitive Hashing index for approximate nearest neighbors.
 
     Uses random hyperplane partitioning: each hash function projects the
     vector onto a random direction and takes the sign.  Vectors that hash
     to the same bucket are likely close in cosine distance.
+
+    All tables hash a batch with one matmul.  Buckets are kept as per-table
+    sorted (code, row) arrays probed with searchsorted; rows inserted since
+    the last sort sit in small tail lists until they are merged in bulk.
     """
 
+    kind = "lsh"
+
     def __init__(
         self,
         dim: int = DEFAULT_DIM,
@@ -263,108 +600,188 @@ class LSHIndex:
         num_bits: int = 12,
         seed: int = 42,
     ) -> None:
-        self.dim = dim
+        super().__init__(dim)
         self.num_tables = num_tables
         self.num_bits = num_bits
-        self._rng = random.Random(seed)
-        self._planes: List[List[List[float]]] = []
-        self._tables: List[Dict[int, List[str]]] = []
-        self._vectors: Dict[str, List[float]] = {}
-
-        # Generate random hyperplanes for each table
-        for _ in range(num_tables):
-            planes = []
-            for _ in range(num_bits):
-                plane = [self._rng.gauss(0, 1) for _ in range(dim)]
-                norm = math.sqrt(sum(x * x for x in plane))
-                if norm > 1e-12:
-                    plane = [x / norm for x in plane]
-                planes.append(plane)
-            self._planes.append(planes)
-            self._tables.append(defaultdict(list))
+        self.seed = seed
+
+        # Random unit hyperplanes, (num_tables * num_bits, dim)
+        planes = np.random.default_rng(seed).standard_normal(
+            (num_tables * num_bits, dim)
+        )
+        norms = np.linalg.norm(planes, axis=1, keepdims=True)
+        self._planes = (planes / np.maximum(norms, 1e-12)).astype(np.float32)
+        self._bit_weights = np.left_shift(np.int64(1), np.arange(num_bits))
+
+        self._codes = np.empty((0, num_tables), dtype=np.int64)
+        self._sorted_codes = np.empty((num_tables, 0), dtype=np.int64)
+        self._sorted_rows = np.empty((num_tables, 0), dtype=np.int64)
+        self._merged_upto = 0
+        self._tail: List[Dict[int, List[int]]] = [
+            defaultdict(list) for _ in range(num_tables)
+        ]
 
     # ------------------------------------------------------------------
-    def _hash_vector(self, vec: List[float], table_idx: int) -> int:
-        """Compute the LSH bucket hash for one table."""
-        h = 0
-        for bit_idx, plane in enumerate(self._planes[table_idx]):
-            if _vec_dot(vec, plane) >= 0:
-                h |= 1 << bit_idx
-        return h
-
-    def insert(self, entry_id: str, vector: List[float]) -> None:
-        self._vectors[entry_id] = vector
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Bucket codes for a batch: (n, num_tables) int64."""
+        out = np.empty((len(vectors), self.num_tables), dtype=np.int64)
+        for start in range(0, len(vectors), _SCAN_CHUNK):
+            bits = vectors[start : start + _SCAN_CHUNK] @ self._planes.T >= 0
+            out[start : start + _SCAN_CHUNK] = (
+                bits.reshape(-1, self.num_tables, self.num_bits) @ self._bit_weights
+            )
+        return out
+
+    def _merge_tail(self) -> None:
+        """Re-sort every table over all live rows and empty the tail lists."""
+        n = self._store.n
+        rows = np.flatnonzero(self._store.alive[:n])
+        codes = self._codes[rows]
+        order = np.argsort(codes, axis=0, kind="stable")
+        self._sorted_codes = np.ascontiguousarray(
+            np.take_along_axis(codes, order, axis=0).T
+        )
+        self._sorted_rows = np.ascontiguousarray(rows[order].T)
+        self._merged_upto = n
+        self._tail = [defaultdict(list) for _ in range(self.num_tables)]
+
+    def _add_rows(self, rows: np.ndarray) -> None:
+        if len(self._codes) < self._store.capacity:
+            self._codes = _grown(self._codes, self._store.capacity)
+        codes = self._hash(self._store.vectors[rows])
+        self._codes[rows] = codes
+        pending = self._store.n - self._merged_upto
+        if pending > max(_LSH_TAIL_MIN, self._sorted_rows.shape[1] // 8):
+            self._merge_tail()
+            return
+        row_list = rows.tolist()
+        for t, table in enumerate(self._tail):
+            for row, code in zip(row_list, codes[:, t].tolist()):
+                table[code].append(row)
+
+    def _candidates(
+        self, codes: np.ndarray, lo: np.ndarray, hi: np.ndarray
+    ) -> np.ndarray:
+        parts = []
         for t in range(self.num_tables):
-            bucket = self._hash_vector(vector, t)
-            self._tables[t][bucket].append(entry_id)
+            if hi[t] > lo[t]:
+                parts.append(self._sorted_rows[t, lo[t] : hi[t]])
+            tail = self._tail[t].get(int(codes[t]))
+            if tail:
+                parts.append(np.asarray(tail, dtype=np.int64))
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        rows = np.unique(np.concatenate(parts))
+        return rows[self._store.alive[rows]]
 
+    # ------------------------------------------------------------------
     def query(
         self,
-        vector: List[float],
+        vector: Sequence[float],
         k: int = 10,
         metric: DistanceMetric = DistanceMetric.COSINE,
     ) -> List[Tuple[str, float]]:
         """Find approximate k nearest neighbors."""
-        candidates: Set[str] = set()
-        for t in range(self.num_tables):
-            bucket = self._hash_vector(vector, t)
-            for eid in self._tables[t].get(bucket, []):
-                candidates.add(eid)
+        return self.query_batch([vector], k, metric)[0]
 
-        dist_fn = _get_distance_fn(metric)
-        scored: List[Tuple[float, str]] = []
-        for eid in candidates:
-            d = dist_fn(self._vectors[eid], vector)
-            scored.append((d, eid))
-
-        scored.sort()
-        return [(eid, d) for d, eid in scored[:k]]
-
-    def remove(self, entry_id: str) -> bool:
-        if entry_id not in self._vectors:
-            return False
-        vec = self._vectors.pop(entry_id)
+    def query_batch(
+        self,
+        vectors: Any,
+        k: int = 10,
+        metric: DistanceMetric = DistanceMetric.COSINE,
+    ) -> List[List[Tuple[str, float]]]:
+        """Approximate k nearest for every query row (hashed in one matmul)."""
+        queries = _as_matrix(vectors, self.dim)
+        if k <= 0 or self.size == 0:
+            return [[] for _ in range(len(queries))]
+        codes = self._hash(queries)
+        # (num_tables, n_queries) bucket ranges in the sorted tables
+        lo = np.empty((self.num_tables, len(queries)), dtype=np.int64)
+        hi = np.empty_like(lo)
         for t in range(self.num_tables):
-            bucket = self._hash_vector(vec, t)
-            bucket_list = self._tables[t].get(bucket, [])
-            if entry_id in bucket_list:
-                bucket_list.remove(entry_id)
-        return True
+            lo[t] = np.searchsorted(self._sorted_codes[t], codes[:, t], "left")
+            hi[t] = np.searchsorted(self._sorted_codes[t], codes[:, t], "right")
 
-    @property
-    def size(self) -> int:
-        return len(self._vectors)
+        vectors = self._store.vectors
+        out = []
+        for i, q in enumerate(queries):
+            rows = self._candidates(codes[i], lo[:, i], hi[:, i])
+            out.append(self._results(rows, _row_distances(vectors[rows], q, metric), k))
+        return out
 
     def stats(self) -> Dict[str, Any]:
-        bucket_sizes = []
+        bucket_sizes: List[np.ndarray] = []
+        total_buckets = 0
+        n = self._store.n
+        live_codes = self._codes[:n][self._store.alive[:n]]
         for t in range(self.num_tables):
-            for bucket_list in self._tables[t].values():
-                bucket_sizes.append(len(bucket_list))
-        avg_bucket = sum(bucket_sizes) / max(len(bucket_sizes), 1)
+            _, counts = np.unique(live_codes[:, t], return_counts=True)
+            bucket_sizes.append(counts)
+            total_buckets += len(counts)
+        sizes = np.concatenate(bucket_sizes) if bucket_sizes else np.zeros(0)
+        avg_bucket = float(sizes.mean()) if len(sizes) else 0.0
         return {
             "type": "LSH",
             "num_tables": self.num_tables,
             "num_bits": self.num_bits,
             "total_vectors": self.size,
-            "total_buckets": sum(len(t) for t in self._tables),
+            "total_buckets": total_buckets,
             "avg_bucket_size": round(avg_bucket, 2),
+            "unsorted_rows": n - self._merged_upto,
         }
 
+    # ------------------------------------------------------------------
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "dim": self.dim,
+            "num_tables": self.num_tables,
+            "num_bits": self.num_bits,
+            "seed": self.seed,
+        }
+
+    def _save_arrays(self, path: str) -> Dict[str, Any]:
+        if self._merged_upto != self._store.n:
+            self._merge_tail()
+        np.save(os.path.join(path, "codes.npy"), self._codes[: self._store.n])
+        np.save(os.path.join(path, "sorted_codes.npy"), self._sorted_codes)
+        np.save(os.path.join(path, "sorted_rows.npy"), self._sorted_rows)
+        return {}
+
+    def _load_arrays(self, path: str, meta: Dict[str, Any], mmap: bool) -> None:
+        mode = "c" if mmap else None
+        self._codes = np.load(os.path.join(path, "codes.npy"), mmap_mode=mode)
+        self._sorted_codes = np.load(
+            os.path.join(path, "sorted_codes.npy"), mmap_mode=mode
+        )
+        self._sorted_rows = np.load(
+            os.path.join(path, "sorted_rows.npy"), mmap_mode=mode
+        )
+        self._merged_upto = meta["rows"]
+
 
 # ---------------------------------------------------------------------------
 # HNSWIndex
 # ---------------------------------------------------------------------------
 
 
-class HNSWIndex:
+class HNSWIndex(_MatrixIndex):
     """
     Simplified Hierarchical Navigable Small World graph index.
 
     Each node is connected to its nearest neighbors at multiple layers.
     Search starts at the top layer and greedily descends, broadening the
     candidate set at the bottom layer.
+
+    Adjacency is stored per layer as fixed-width int32 arrays (2*m links
+    per node; layer 0 is indexed by row, upper layers through a row->slot
+    map).  Each expansion step scores all unvisited neighbors of a node in
+    one vectorized call, and visited marks are epoch-stamped so a search
+    never clears an O(n) array.  remove() tombstones a node: it stays
+    traversable but is never returned.
     """
 
+    kind = "hnsw"
+
     def __init__(
         self,
         dim: int = DEFAULT_DIM,
@@ -373,20 +790,28 @@ class HNSWIndex:
         max_layers: int = 4,
         seed: int = 42,
     ) -> None:
-        self.dim = dim
-        self.m = m  # max connections per node per layer
+        super().__init__(dim)
+        self.m = m  # neighbors picked per insert; nodes hold up to 2*m links
         self.ef_construction = ef_construction
         self.max_layers = max_layers
+        self.seed = seed
         self._rng = random.Random(seed)
-
-        # node_id -> vector
-        self._vectors: Dict[str, List[float]] = {}
-        # layer -> { node_id -> set of neighbor ids }
-        self._graph: List[Dict[str, Set[str]]] = [
-            defaultdict(set) for _ in range(max_layers)
+        self._width = 2 * m
+
+        self._levels = np.empty(0, dtype=np.int8)  # max layer per row
+        self._visited = np.zeros(0, dtype=np.uint32)
+        self._epoch = 0
+        # layer -> (slots, width) neighbor rows / (slots,) link counts
+        self._links = [
+            np.empty((0, self._width), dtype=np.int32) for _ in range(max_layers)
         ]
-        self._entry_point: Optional[str] = None
-        self._node_layer: Dict[str, int] = {}  # max layer per node
+        self._degree = [np.zeros(0, dtype=np.int32) for _ in range(max_layers)]
+        # layer -> row -> slot (layer 0 uses the row itself)
+        self._slot: List[Optional[np.ndarray]] = [None] + [
+            np.empty(0, dtype=np.int32) for _ in range(max_layers - 1)
+        ]
+        self._layer_size = [0] * max_layers
+        self._entry_point = -1
 
     # ------------------------------------------------------------------
     def _random_layer(self) -> int:
@@ -396,161 +821,279 @@ class HNSWIndex:
             level += 1
         return level
 
-    def _select_neighbors(
-        self,
-        query: List[float],
-        candidates: Set[str],
-        m: int,
-    ) -> List[str]:
-        """Pick the m closest candidates."""
-        scored = []
-        for c in candidates:
-            d = _euclidean_dist(self._vectors[c], query)
-            scored.append((d, c))
-        scored.sort()
-        return [c for _, c in scored[:m]]
+    def _reserve_rows(self) -> None:
+        capacity = self._store.capacity
+        if len(self._levels) >= capacity:
+            return
+        self._levels = _grown(self._levels, capacity, -1)
+        self._visited = _grown(self._visited, capacity, 0)
+        self._links[0] = _grown(self._links[0], capacity, -1)
+        self._degree[0] = _grown(self._degree[0], capacity, 0)
+        for layer in range(1, self.max_layers):
+            self._slot[layer] = _grown(self._slot[layer], capacity, -1)
+
+    def _alloc_slot(self, layer: int, row: int) -> None:
+        slot = self._layer_size[layer]
+        if slot >= len(self._links[layer]):
+            capacity = max(64, 2 * slot)
+            self._links[layer] = _grown(self._links[layer], capacity, -1)
+            self._degree[layer] = _grown(self._degree[layer], capacity, 0)
+        self._slot[layer][row] = slot
+        self._layer_size[layer] = slot + 1
+
+    def _slot_of(self, layer: int, row: int) -> int:
+        return row if layer == 0 else int(self._slot[layer][row])
+
+    def _neighbors(self, layer: int, row: int) -> np.ndarray:
+        slot = self._slot_of(layer, row)
+        return self._links[layer][slot, : self._degree[layer][slot]]
+
+    def _next_epoch(self) -> int:
+        self._epoch += 1
+        if self._epoch >= np.iinfo(np.uint32).max:
+            self._visited[:] = 0
+            self._epoch = 1
+        return self._epoch
+
+    # ------------------------------------------------------------------
+    def _greedy(self, query: np.ndarray, row: int, layer: int) -> int:
+        """Walk to the closest node on *layer* (ef=1 search)."""
+        vectors = self._store.vectors
+        best = float(_sq_distances(vectors[row : row + 1], query)[0])
+        while True:
+            neighbors = self._neighbors(layer, row)
+            if not len(neighbors):
+                return row
+            dists = _sq_distances(vectors[neighbors], query)
+            i = int(np.argmin(dists))
+            if dists[i] >= best:
+                return row
+            best, row = float(dists[i]), int(neighbors[i])
 
     def _search_layer(
         self,
-        query: List[float],
-        entry_points: Set[str],
+        query: np.ndarray,
+        entry_points: Sequence[int],
         layer: int,
         ef: int,
-    ) -> List[Tuple[float, str]]:
-        """Greedy BFS on one layer, returning ef closest nodes."""
-        visited: Set[str] = set(entry_points)
-        # max-heap of candidates (negate distance for max-heap)
-        candidates: List[Tuple[float, str]] = []
-        results: List[Tuple[float, str]] = []
-
-        for ep in entry_points:
-            d = _euclidean_dist(self._vectors[ep], query)
-            heapq.heappush(candidates, (d, ep))
-            heapq.heappush(results, (-d, ep))
-            if len(results) > ef:
-                heapq.heappop(results)
-
-        while candidates:
-            cd, cnode = heapq.heappop(candidates)
-            # Furthest in results
-            if results:
-                worst_d = -results[0][0]
+    ) -> List[Tuple[float, int]]:
+        """Best-first search on one layer; returns ef closest (sq_dist, row) sorted."""
+        vectors = self._store.vectors
+        visited = self._visited
+        epoch = self._next_epoch()
+        eps = np.asarray(entry_points, dtype=np.int64)
+        visited[eps] = epoch
+
+        candidates = list(
+            zip(_sq_distances(vectors[eps], query).tolist(), eps.tolist())
+        )
+        heapq.heapify(candidates)
+        # max-heap of results (negated distance)
+        results = [(-d, r) for d, r in candidates]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+        worst = -results[0][0]
+
+        while candidates and candidates[0][0] <= worst:
+            # Expand up to _HNSW_EXPAND frontier nodes per distance evaluation
+            frontier = [heapq.heappop(candidates)[1]]
+            while (
+                candidates
+                and len(frontier) < _HNSW_EXPAND
+                and candidates[0][0] <= worst
+            ):
+                frontier.append(heapq.heappop(candidates)[1])
+            if len(frontier) == 1:
+                neighbors = self._neighbors(layer, frontier[0])
             else:
-                worst_d = float("inf")
-            if cd > worst_d:
-                break
-
-            neighbors = self._graph[layer].get(cnode, set())
-            for nb in neighbors:
-                if nb in visited:
-                    continue
-                visited.add(nb)
-                nd = _euclidean_dist(self._vectors[nb], query)
-                if len(results) < ef or nd < worst_d:
+                neighbors = np.unique(
+                    np.concatenate([self._neighbors(layer, r) for r in frontier])
+                )
+            neighbors = neighbors[visited[neighbors] != epoch]
+            if not len(neighbors):
+                continue
+            visited[neighbors] = epoch
+            dists = _sq_distances(vectors[neighbors], query)
+            if len(results) >= ef:
+                keep = dists < worst
+                neighbors, dists = neighbors[keep], dists[keep]
+            for nd, nb in zip(dists.tolist(), neighbors.tolist()):
+                if len(results) < ef or nd < worst:
                     heapq.heappush(candidates, (nd, nb))
                     heapq.heappush(results, (-nd, nb))
                     if len(results) > ef:
                         heapq.heappop(results)
-                    if results:
-                        worst_d = -results[0][0]
-
-        return [(abs(d), nid) for d, nid in results]
-
-    # ------------------------------------------------------------------
-    def insert(self, entry_id: str, vector: List[float]) -> None:
-        self._vectors[entry_id] = vector
+                    worst = -results[0][0]
+
+        return sorted((-d, r) for d, r in results)
+
+    def _select_neighbors(self, results: List[Tuple[float, int]], m: int) -> List[int]:
+        """Pick the m closest live candidates (dead ones only as a fallback)."""
+        alive = self._store.alive
+        chosen = [r for _, r in results if alive[r]][:m]
+        return chosen or [r for _, r in results[:m]]
+
+    def _connect(self, layer: int, node: int, new: int) -> None:
+        """Add the back-link node->new, trimming node to its m closest if full."""
+        slot = self._slot_of(layer, node)
+        links, degree = self._links[layer], self._degree[layer]
+        count = int(degree[slot])
+        if count < self._width:
+            links[slot, count] = new
+            degree[slot] = count + 1
+            return
+        pool = np.append(links[slot], new)
+        vectors = self._store.vectors
+        dists = _sq_distances(vectors[pool], vectors[node])
+        keep = pool[np.argsort(dists, kind="stable")[: self.m]]
+        links[slot, : len(keep)] = keep
+        degree[slot] = len(keep)
+
+    def _insert_row(self, row: int) -> None:
+        query = self._store.vectors[row]
         node_layer = self._random_layer()
-        self._node_layer[entry_id] = node_layer
+        self._levels[row] = node_layer
+        for layer in range(1, node_layer + 1):
+            self._alloc_slot(layer, row)
 
-        if self._entry_point is None:
-            self._entry_point = entry_id
+        if self._entry_point < 0:
+            self._entry_point = row
             return
 
-        ep = {self._entry_point}
-
+        ep = self._entry_point
+        top = int(self._levels[ep])
         # Descend from top to node_layer + 1, narrowing entry point
-        for layer in range(self.max_layers - 1, node_layer, -1):
-            results = self._search_layer(vector, ep, layer, ef=1)
-            if results:
-                ep = {results[0][1]}
+        for layer in range(top, node_layer, -1):
+            ep = self._greedy(query, ep, layer)
 
         # Insert at layers node_layer down to 0
-        for layer in range(min(node_layer, self.max_layers - 1), -1, -1):
-            results = self._search_layer(vector, ep, layer, ef=self.ef_construction)
-            neighbors = self._select_neighbors(
-                vector,
-                {nid for _, nid in results},
-                self.m,
+        entry_points = [ep]
+        for layer in range(min(node_layer, top), -1, -1):
+            results = self._search_layer(
+                query, entry_points, layer, self.ef_construction
             )
+            neighbors = self._select_neighbors(results, self.m)
+            slot = self._slot_of(layer, row)
+            self._links[layer][slot, : len(neighbors)] = neighbors
+            self._degree[layer][slot] = len(neighbors)
             for nb in neighbors:
-                self._graph[layer][entry_id].add(nb)
-                self._graph[layer][nb].add(entry_id)
-                # Trim if over budget
-                if len(self._graph[layer][nb]) > self.m * 2:
-                    keep = self._select_neighbors(
-                        self._vectors[nb],
-                        self._graph[layer][nb],
-                        self.m,
-                    )
-                    self._graph[layer][nb] = set(keep)
-            if results:
-                ep = {results[0][1]}
+                self._connect(layer, nb, row)
+            entry_points = [r for _, r in results]
 
         # Update entry point if new node has higher layer
-        if node_layer > self._node_layer.get(self._entry_point, 0):
-            self._entry_point = entry_id
+        if node_layer > top:
+            self._entry_point = row
+
+    def _add_rows(self, rows: np.ndarray) -> None:
+        self._reserve_rows()
+        for row in rows.tolist():
+            self._insert_row(row)
+
+    # ------------------------------------------------------------------
+    def _query_one(
+        self, query: np.ndarray, k: int, ef_search: int
+    ) -> List[Tuple[str, float]]:
+        ep = self._entry_point
+        for layer in range(int(self._levels[ep]), 0, -1):
+            ep = self._greedy(query, ep, layer)
+        results = self._search_layer(query, [ep], 0, max(ef_search, k))
+        alive, ids = self._store.alive, self._store.ids
+        out = []
+        for d, r in results:
+            if alive[r]:
+                out.append((ids[r], math.sqrt(d)))
+                if len(out) == k:
+                    break
+        return out
 
     def query(
         self,
-        vector: List[float],
+        vector: Sequence[float],
         k: int = 10,
         ef_search: int = 50,
     ) -> List[Tuple[str, float]]:
         """Find k approximate nearest neighbors."""
-        if self._entry_point is None:
-            return []
-
-        ep = {self._entry_point}
-        for layer in range(self.max_layers - 1, 0, -1):
-            results = self._search_layer(vector, ep, layer, ef=1)
-            if results:
-                ep = {results[0][1]}
+        return self.query_batch([vector], k, ef_search)[0]
 
-        results = self._search_layer(vector, ep, 0, ef=max(ef_search, k))
-        results.sort()
-        return [(nid, d) for d, nid in results[:k]]
-
-    def remove(self, entry_id: str) -> bool:
-        if entry_id not in self._vectors:
-            return False
-        self._vectors.pop(entry_id)
-        node_layer = self._node_layer.pop(entry_id, 0)
-        for layer in range(node_layer + 1):
-            neighbors = self._graph[layer].pop(entry_id, set())
-            for nb in neighbors:
-                self._graph[layer][nb].discard(entry_id)
-        if self._entry_point == entry_id:
-            self._entry_point = next(iter(self._vectors), None)
-        return True
-
-    @property
-    def size(self) -> int:
-        return len(self._vectors)
+    def query_batch(
+        self,
+        vectors: Any,
+        k: int = 10,
+        ef_search: int = 50,
+    ) -> List[List[Tuple[str, float]]]:
+        """k approximate nearest neighbors for every query row."""
+        queries = _as_matrix(vectors, self.dim)
+        if k <= 0 or self.size == 0:
+            return [[] for _ in range(len(queries))]
+        return [self._query_one(q, k, ef_search) for q in queries]
 
     def stats(self) -> Dict[str, Any]:
-        edge_counts = []
-        for layer in range(self.max_layers):
-            total_edges = sum(len(nb) for nb in self._graph[layer].values())
-            edge_counts.append(total_edges)
+        edge_counts = [
+            (
+                int(self._degree[layer][: self._layer_size[layer]].sum())
+                if layer
+                else int(self._degree[0][: self._store.n].sum())
+            )
+            for layer in range(self.max_layers)
+        ]
+        entry = self._store.ids[self._entry_point] if self._entry_point >= 0 else None
         return {
             "type": "HNSW",
             "m": self.m,
             "max_layers": self.max_layers,
             "total_vectors": self.size,
+            "deleted": self._store.n - self.size,
             "edges_per_layer": edge_counts,
+            "entry_point": entry,
+        }
+
+    # ------------------------------------------------------------------
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "dim": self.dim,
+            "m": self.m,
+            "ef_construction": self.ef_construction,
+            "max_layers": self.max_layers,
+            "seed": self.seed,
+        }
+
+    def _save_arrays(self, path: str) -> Dict[str, Any]:
+        n = self._store.n
+        np.save(os.path.join(path, "levels.npy"), self._levels[:n])
+        for layer in range(self.max_layers):
+            used = n if layer == 0 else self._layer_size[layer]
+            np.save(os.path.join(path, f"links_{layer}.npy"), self._links[layer][:used])
+            np.save(
+                os.path.join(path, f"degree_{layer}.npy"), self._degree[layer][:used]
+            )
+            if layer:
+                np.save(os.path.join(path, f"slot_{layer}.npy"), self._slot[layer][:n])
+        version, state, gauss = self._rng.getstate()
+        return {
             "entry_point": self._entry_point,
+            "layer_size": self._layer_size,
+            "rng_state": [version, list(state), gauss],
         }
 
+    def _load_arrays(self, path: str, meta: Dict[str, Any], mmap: bool) -> None:
+        mode = "c" if mmap else None
+
+        def load(name: str) -> np.ndarray:
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+
+        self._levels = np.load(os.path.join(path, "levels.npy"))
+        self._visited = np.zeros(len(self._levels), dtype=np.uint32)
+        for layer in range(self.max_layers):
+            self._links[layer] = load(f"links_{layer}")
+            self._degree[layer] = load(f"degree_{layer}")
+            if layer:
+                self._slot[layer] = load(f"slot_{layer}")
+        self._layer_size = list(meta["layer_size"])
+        self._entry_point = meta["entry_point"]
+        version, state, gauss = meta["rng_state"]
+        self._rng.setstate((version, tuple(state), gauss))
+
 
 # ---------------------------------------------------------------------------
 # GameStateEncoder
@@ -680,11 +1223,18 @@ class VectorStore:
     """
     Unified vector database facade supporting multiple index backends.
 
+    Vectors live only in the index's float32 matrix; the store keeps the
+    per-entry metadata and a metadata -> ids inverted index for filtering.
+
     Usage::
 
         store = VectorStore(dim=64, index_type=IndexType.LSH)
         store.add("game_001", vector, metadata={"matchup": "ZvT"})
         results = store.search(query_vector, k=5)
+
+        store.add_batch(ids, matrix, metadatas)       # bulk build
+        hits = store.search_batch(query_matrix, k=5)  # one list per query
+        store.save("situations/")                     # VectorStore.load(...)
     """
 
     def __init__(
@@ -697,35 +1247,57 @@ class VectorStore:
         self.dim = dim
         self.index_type = index_type
         self.metric = metric
-        self._entries: Dict[str, VectorEntry] = {}
-        self._metadata_index: Dict[str, Dict[str, List[str]]] = defaultdict(
-            lambda: defaultdict(list)
+        self._index_kwargs = kwargs
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._timestamps: Dict[str, float] = {}
+        self._metadata_index: Dict[str, Dict[str, Set[str]]] = defaultdict(
+            lambda: defaultdict(set)
         )
+        self._index = self._make_index()
 
-        # Initialize the chosen index
-        self._lsh: Optional[LSHIndex] = None
-        self._hnsw: Optional[HNSWIndex] = None
-
-        if index_type == IndexType.LSH:
-            self._lsh = LSHIndex(
-                dim=dim,
+    def _make_index(self) -> _MatrixIndex:
+        kwargs = self._index_kwargs
+        if self.index_type == IndexType.LSH:
+            return LSHIndex(
+                dim=self.dim,
                 num_tables=kwargs.get("num_tables", 8),
                 num_bits=kwargs.get("num_bits", 12),
                 seed=kwargs.get("seed", 42),
             )
-        elif index_type == IndexType.HNSW:
-            self._hnsw = HNSWIndex(
-                dim=dim,
+        if self.index_type == IndexType.HNSW:
+            return HNSWIndex(
+                dim=self.dim,
                 m=kwargs.get("m", 16),
                 ef_construction=kwargs.get("ef_construction", 100),
                 max_layers=kwargs.get("max_layers", 4),
                 seed=kwargs.get("seed", 42),
             )
+        return FlatIndex(dim=self.dim)
+
+    @property
+    def _lsh(self) -> Optional[LSHIndex]:
+        return self._index if isinstance(self._index, LSHIndex) else None
+
+    @property
+    def _hnsw(self) -> Optional[HNSWIndex]:
+        return self._index if isinstance(self._index, HNSWIndex) else None
 
     # ------------------------------------------------------------------
     # CRUD
     # ------------------------------------------------------------------
 
+    def _set_metadata(self, entry_id: str, metadata: Dict[str, Any]) -> None:
+        self._unindex_metadata(entry_id)
+        self._metadata[entry_id] = metadata
+        self._timestamps[entry_id] = time.time()
+        for k, v in metadata.items():
+            self._metadata_index[k][str(v)].add(entry_id)
+
+    def _unindex_metadata(self, entry_id: str) -> None:
+        for k, v in self._metadata.pop(entry_id, {}).items():
+            self._metadata_index[k][str(v)].discard(entry_id)
+        self._timestamps.pop(entry_id, None)
+
     def add(
         self,
         entry_id: str,
@@ -735,30 +1307,41 @@ class VectorStore:
         """Insert or update a vector entry."""
         if len(vector) != self.dim:
             raise ValueError(f"Vector dim {len(vector)} != store dim {self.dim}")
-        entry = VectorEntry(entry_id=entry_id, vector=vector, metadata=metadata or {})
-        self._entries[entry_id] = entry
-
-        # Update metadata index
-        for k, v in entry.metadata.items():
-            self._metadata_index[k][str(v)].append(entry_id)
+        self._set_metadata(entry_id, metadata or {})
+        self._index.insert(entry_id, vector)
 
-        # Update ANN index
-        if self._lsh is not None:
-            self._lsh.insert(entry_id, vector)
-        if self._hnsw is not None:
-            self._hnsw.insert(entry_id, vector)
+    def add_batch(
+        self,
+        entry_ids: Sequence[str],
+        vectors: Any,
+        metadata: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    ) -> None:
+        """Insert or update many entries; vectors is an (n, dim) array-like."""
+        mat = _as_matrix(vectors, self.dim)
+        if len(entry_ids) != len(mat):
+            raise ValueError(f"{len(entry_ids)} ids for {len(mat)} vectors")
+        if metadata is None:
+            metadata = [None] * len(mat)
+        for entry_id, meta in zip(entry_ids, metadata):
+            self._set_metadata(entry_id, meta or {})
+        self._index.build(mat, entry_ids)
 
     def get(self, entry_id: str) -> Optional[VectorEntry]:
-        return self._entries.get(entry_id)
+        vector = self._index.get_vector(entry_id)
+        if vector is None:
+            return None
+        return VectorEntry(
+            entry_id=entry_id,
+            vector=vector.tolist(),
+            metadata=self._metadata[entry_id],
+            timestamp=self._timestamps[entry_id],
+        )
 
     def remove(self, entry_id: str) -> bool:
-        entry = self._entries.pop(entry_id, None)
-        if entry is None:
+        if entry_id not in self._metadata:
             return False
-        if self._lsh:
-            self._lsh.remove(entry_id)
-        if self._hnsw:
-            self._hnsw.remove(entry_id)
+        self._unindex_metadata(entry_id)
+        self._index.remove(entry_id)
         return True
 
     # ------------------------------------------------------------------
@@ -774,105 +1357,93 @@ class VectorStore:
         """Find k nearest neighbors, optionally filtered by metadata."""
         if len(query) != self.dim:
             raise ValueError(f"Query dim {len(query)} != store dim {self.dim}")
+        return self.search_batch([query], k, filter_metadata)[0]
 
-        if self.index_type == IndexType.BRUTE_FORCE:
-            return self._brute_search(query, k, filter_metadata)
-        elif self.index_type == IndexType.LSH and self._lsh is not None:
-            return self._lsh_search(query, k, filter_metadata)
-        elif self.index_type == IndexType.HNSW and self._hnsw is not None:
-            return self._hnsw_search(query, k, filter_metadata)
-        return []
-
-    def _brute_search(
+    def search_batch(
         self,
-        query: List[float],
-        k: int,
-        filter_metadata: Optional[Dict[str, Any]],
-    ) -> List[SearchResult]:
-        dist_fn = _get_distance_fn(self.metric)
-        candidates = self._filter_entries(filter_metadata)
-        scored: List[Tuple[float, str]] = []
-        for eid in candidates:
-            entry = self._entries[eid]
-            d = dist_fn(entry.vector, query)
-            scored.append((d, eid))
-        scored.sort()
-        results = []
-        for d, eid in scored[:k]:
-            results.append(
-                SearchResult(
-                    entry_id=eid,
-                    distance=d,
-                    metadata=self._entries[eid].metadata,
-                )
-            )
-        return results
-
-    def _lsh_search(
-        self,
-        query: List[float],
-        k: int,
-        filter_metadata: Optional[Dict[str, Any]],
-    ) -> List[SearchResult]:
-        assert self._lsh is not None
-        raw = self._lsh.query(query, k=k * 3, metric=self.metric)
-        if filter_metadata:
-            allowed = self._filter_entries(filter_metadata)
-            raw = [(eid, d) for eid, d in raw if eid in allowed]
-        results = []
-        for eid, d in raw[:k]:
-            results.append(
-                SearchResult(
-                    entry_id=eid,
-                    distance=d,
-                    metadata=self._entries[eid].metadata,
-                )
-            )
-        return results
+        queries: Any,
+        k: int = 10,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchResult]]:
+        """search() for every row of an (n_queries, dim) array-like."""
+        mat = _as_matrix(queries, self.dim)
+        allowed = self._filter_entries(filter_metadata) if filter_metadata else None
 
-    def _hnsw_search(
-        self,
-        query: List[float],
-        k: int,
-        filter_metadata: Optional[Dict[str, Any]],
-    ) -> List[SearchResult]:
-        assert self._hnsw is not None
-        raw = self._hnsw.query(query, k=k * 3)
-        if filter_metadata:
-            allowed = self._filter_entries(filter_metadata)
-            raw = [(eid, d) for eid, d in raw if eid in allowed]
-        results = []
-        for eid, d in raw[:k]:
-            results.append(
-                SearchResult(
-                    entry_id=eid,
-                    distance=d,
-                    metadata=self._entries[eid].metadata,
-                )
-            )
-        return results
+        if isinstance(self._index, FlatIndex):
+            raw = self._index.query_batch(mat, k, metric=self.metric, allowed=allowed)
+        else:
+            # ANN backends over-fetch so post-filtering still leaves k hits
+            if isinstance(self._index, LSHIndex):
+                raw = self._index.query_batch(mat, k * 3, metric=self.metric)
+            else:
+                raw = self._index.query_batch(mat, k * 3)
+            if allowed is not None:
+                raw = [[(eid, d) for eid, d in hits if eid in allowed] for hits in raw]
+
+        return [
+            [
+                SearchResult(entry_id=eid, distance=d, metadata=self._metadata[eid])
+                for eid, d in hits[:k]
+            ]
+            for hits in raw
+        ]
 
     def _filter_entries(
         self,
         filter_metadata: Optional[Dict[str, Any]],
     ) -> Set[str]:
         if not filter_metadata:
-            return set(self._entries.keys())
+            return set(self._metadata.keys())
         result_sets: List[Set[str]] = []
         for key, val in filter_metadata.items():
-            ids = self._metadata_index.get(key, {}).get(str(val), [])
+            ids = self._metadata_index.get(key, {}).get(str(val), set())
             result_sets.append(set(ids))
         if not result_sets:
-            return set(self._entries.keys())
+            return set(self._metadata.keys())
         return set.intersection(*result_sets)
 
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Write the index (memory-mappable .npy files) plus entries.json."""
+        self._index.save(os.path.join(path, "index"))
+        state = {
+            "dim": self.dim,
+            "index_type": self.index_type.name,
+            "metric": self.metric.name,
+            "index_kwargs": self._index_kwargs,
+            "metadata": self._metadata,
+            "timestamps": self._timestamps,
+        }
+        with open(os.path.join(path, "entries.json"), "w") as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "VectorStore":
+        """Reopen a saved store; with mmap=True vectors/links stay on disk."""
+        with open(os.path.join(path, "entries.json")) as f:
+            state = json.load(f)
+        store = cls(
+            dim=state["dim"],
+            index_type=IndexType[state["index_type"]],
+            metric=DistanceMetric[state["metric"]],
+            **state["index_kwargs"],
+        )
+        store._index = type(store._index).load(os.path.join(path, "index"), mmap=mmap)
+        for entry_id, metadata in state["metadata"].items():
+            store._set_metadata(entry_id, metadata)
+        store._timestamps.update(state["timestamps"])
+        return store
+
     # ------------------------------------------------------------------
     # Utility
     # ------------------------------------------------------------------
 
     @property
     def size(self) -> int:
-        return len(self._entries)
+        return len(self._metadata)
 
     def stats(self) -> Dict[str, Any]:
         base = {
@@ -888,15 +1459,13 @@ class VectorStore:
         return base
 
     def all_ids(self) -> List[str]:
-        return list(self._entries.keys())
+        return list(self._metadata.keys())
 
     def clear(self) -> None:
-        self._entries.clear()
+        self._metadata.clear()
+        self._timestamps.clear()
         self._metadata_index.clear()
-        if self._lsh:
-            self._lsh = LSHIndex(dim=self.dim)
-        if self._hnsw:
-            self._hnsw = HNSWIndex(dim=self.dim)
+        self._index = self._make_index()
 
 
 # ---------------------------------------------------------------------------
@@ -1051,6 +1620,23 @@ def demo() -> None:
     for r in filtered:
         print(f"    {r.entry_id}  dist={r.distance:.4f}  race={r.metadata.get('race')}")
 
+    # --- Bulk build + batched queries ---
+    print("\n[6] Bulk build + batched HNSW queries:")
+    store_hnsw = VectorStore(dim=DEFAULT_DIM, index_type=IndexType.HNSW)
+    t0 = time.perf_counter()
+    store_hnsw.add_batch(
+        [f"game_{i:04d}" for i in range(num_states)],
+        vectors,
+        [{"race": s["race"]} for s in states],
+    )
+    build_ms = (time.perf_counter() - t0) * 1000
+    queries = encoder.encode_batch([_make_random_state(rng) for _ in range(50)])
+    t0 = time.perf_counter()
+    batch_results = store_hnsw.search_batch(queries, k=5)
+    query_ms = (time.perf_counter() - t0) * 1000
+    print(f"    Build: {build_ms:.1f} ms, 50 queries: {query_ms:.1f} ms")
+    print(f"    First query top-1: {batch_results[0][0].entry_id}")
+
     print("\n" + "=" * 70)
     print("Phase 629 demo complete.")
     print("=" * 70)
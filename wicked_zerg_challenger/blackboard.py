@@ -14,8 +14,13 @@ Blackboard 패턴을 사용하여 모든 매니저가 접근할 수 있는 "Sing
 
 from dataclasses import dataclass
 from enum import Enum, IntEnum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
 
+from utils.generational_cache import (
+    GAME_LOOPS_PER_SECOND,
+    GenerationalCache,
+    seconds_to_generations,
+)
 from utils.logger import get_logger
 
 try:
@@ -162,15 +167,18 @@ class GameStateBlackboard:
         # 건물 타입 -> (예약 시간, 예약자)
         self.building_reservations: Dict[Any, tuple] = {}
 
+        # === 프레임 유닛 스냅샷 (utils.unit_snapshot.FrameSnapshot) ===
+        # 매 프레임 1회 생성, 전투 모듈이 공유 (유닛 속성 재조회 제거)
+        self.unit_snapshot: Optional[Any] = None
+
         # === 방어 상태 ===
         self.is_under_attack: bool = False
         self.attacked_bases: Set[int] = set()  # 공격받은 기지 태그
 
-        # === 캐시된 계산 결과 ===
-        self._cache: Dict[str, Any] = {}
-        self._cache_timestamps: Dict[str, float] = {}
+        # === 캐시된 계산 결과 (봇 전체 공유, utils.generational_cache) ===
+        # 세대 = game_time 기준 game_loop, 유닛 사망 시 invalidate_tag(tag)
+        self.cache = GenerationalCache(clock=self._game_loop)
         self._default_cache_ttl: float = 1.0  # 기본 캐시 유효 시간 (초)
-        self._cache_ttls: dict = {}  # Bug fix #6: Per-key TTL storage
 
         # === Generic State (Backward Compatibility) ===
         self.state: Dict[str, Any] = {}
@@ -246,6 +254,10 @@ class GameStateBlackboard:
         self.supply_used = supply_used
         self.supply_cap = supply_cap
 
+    def update_unit_snapshot(self, snapshot: Any) -> None:
+        """프레임 유닛 스냅샷 갱신 (이전 스냅샷은 속도 계산에 사용된 뒤 교체)"""
+        self.unit_snapshot = snapshot
+
     def update_unit_count(self, unit_type: Any, current: int, pending: int):
         """유닛 카운트 업데이트"""
         if unit_type not in self.unit_counts:
@@ -496,33 +508,33 @@ class GameStateBlackboard:
 
     # ========== 캐시 시스템 ==========
 
-    def cache_set(self, key: str, value: Any, ttl: Optional[float] = None):
-        """캐시에 값 저장"""
-        self._cache[key] = value
-        self._cache_timestamps[key] = self.game_time
-        # Bug fix #6: Store TTL per-key instead of single global variable
-        self._cache_ttls[key] = ttl if ttl is not None else self._default_cache_ttl
+    def _game_loop(self) -> int:
+        return int(round(self.game_time * GAME_LOOPS_PER_SECOND))
+
+    def cache_set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        depends_on: Iterable[Hashable] = (),
+    ):
+        """캐시에 값 저장 (ttl: 게임 초, depends_on: 무효화 태그)"""
+        ttl = ttl if ttl is not None else self._default_cache_ttl
+        self.cache.set(
+            "blackboard",
+            key,
+            value,
+            ttl=seconds_to_generations(ttl),
+            depends_on=depends_on,
+        )
 
     def cache_get(self, key: str, default: Any = None) -> Any:
         """캐시에서 값 조회"""
-        if key not in self._cache:
-            return default
-
-        # Bug fix #6: Use per-key TTL instead of single global TTL
-        ttl = self._cache_ttls.get(key, self._default_cache_ttl)
-        if self.game_time - self._cache_timestamps[key] > ttl:
-            del self._cache[key]
-            del self._cache_timestamps[key]
-            self._cache_ttls.pop(key, None)
-            return default
-
-        return self._cache[key]
+        return self.cache.get("blackboard", key, default)
 
     def cache_clear(self):
         """캐시 전체 삭제"""
-        self._cache.clear()
-        self._cache_timestamps.clear()
-        self._cache_ttls.clear()
+        self.cache.invalidate_namespace("blackboard")
 
     # ========== 상태 조회 헬퍼 ==========
 
@@ -9,7 +9,7 @@ Bot Step Integration - on_step 구현 통합 모듈
 import asyncio
 import logging
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 # Error Handler 통합
 from error_handler import error_handler
@@ -26,29 +26,56 @@ try:
 except ImportError:
     get_profiler = None
 
+# Hierarchical per-frame span recorder (slow frames only)
+from utils.frame_profiler import get_frame_profiler
+
+# Frame-budgeted manager scheduler
+from utils.frame_scheduler import FrameScheduler, TaskPriority
+
+# Shared per-frame unit snapshot
+from utils.unit_snapshot import build_frame_snapshot
+
+# Concurrent phase execution (declared read/write sets)
+from core.manager_registry import get_pre_combat_phase_accesses
+from core.phase_runner import PhaseRunner
+
+try:
+    from config.constants import STEP_BUDGET_MS
+except ImportError:
+    STEP_BUDGET_MS = 30.0
+
 
 class LogicActivityTracker:
     """실시간 로직 활성화 추적기"""
 
-    def __init__(self):
+    EWMA_ALPHA = 0.2  # 실행 비용 지수 이동 평균 계수
+
+    def __init__(self, frame_profiler=None):
         self.active_logics: Dict[str, Dict] = {}
+        self.frame_profiler = frame_profiler
         self.last_report_time = 0
         self.report_interval = 10.0  # 10초마다 보고
         self.execution_counts: Dict[str, int] = {}
         self.execution_times: Dict[str, float] = {}
+        # 리포트 주기와 무관하게 유지되는 EWMA 비용 (ms) - FrameScheduler 비용 모델
+        self.ewma_ms: Dict[str, float] = {}
 
     def start_logic(self, name: str) -> float:
         """로직 시작 시간 기록"""
         start_time = time.time()
         self.active_logics[name] = {"start_time": start_time, "status": "running"}
+        if self.frame_profiler is not None:
+            self.active_logics[name]["span"] = self.frame_profiler.start_span(name)
         return start_time
 
-    def end_logic(self, name: str, start_time: float, success: bool = True):
-        """로직 종료 및 실행 시간 기록"""
+    def end_logic(self, name: str, start_time: float, success: bool = True) -> float:
+        """로직 종료 및 실행 시간 기록 (경과 시간(초) 반환)"""
         elapsed = time.time() - start_time
         if name in self.active_logics:
             self.active_logics[name]["status"] = "done" if success else "error"
             self.active_logics[name]["elapsed"] = elapsed
+            if self.frame_profiler is not None:
+                self.frame_profiler.end_span(self.active_logics[name].pop("span", None))
 
         # 성능 경고: 10ms 초과 시 로그
         if elapsed > 0.010:
@@ -59,6 +86,19 @@ class LogicActivityTracker:
         self.execution_counts[name] = self.execution_counts.get(name, 0) + 1
         self.execution_times[name] = self.execution_times.get(name, 0) + elapsed
 
+        elapsed_ms = elapsed * 1000
+        previous = self.ewma_ms.get(name)
+        self.ewma_ms[name] = (
+            elapsed_ms
+            if previous is None
+            else self.EWMA_ALPHA * elapsed_ms + (1 - self.EWMA_ALPHA) * previous
+        )
+        return elapsed
+
+    def get_ewma_ms(self, name: str) -> Optional[float]:
+        """측정된 EWMA 실행 비용 (ms), 측정 전이면 None"""
+        return self.ewma_ms.get(name)
+
     def get_activity_report(self, game_time: float) -> str:
         """활성화된 로직 보고서 생성"""
         current_time = time.time()
@@ -201,6 +241,12 @@ try:
 except ImportError:
     SpatialQueryOptimizer = None
 
+# Incremental uniform-grid spatial index (allies/enemies)
+try:
+    from spatial_optimizer import SpatialOptimizer
+except ImportError:
+    SpatialOptimizer = None
+
 # Multi-Prong Attack Coordinator
 try:
     from combat.multi_prong_coordinator import MultiProngCoordinator
@@ -381,7 +427,20 @@ class BotStepIntegrator:
             self.__class__.__name__
         )
         self._managers_initialized = False
-        self._logic_tracker = LogicActivityTracker()
+        self._frame_profiler = get_frame_profiler()
+        self.bot.frame_profiler = self._frame_profiler
+        self._logic_tracker = LogicActivityTracker(self._frame_profiler)
+
+        # 프레임 예산 스케줄러 (iteration % N 게이트 대체)
+        self._scheduler = FrameScheduler(
+            budget_ms=STEP_BUDGET_MS, cost_provider=self._logic_tracker.get_ewma_ms
+        )
+        self._register_scheduled_tasks()
+        self.bot.frame_scheduler = self._scheduler
+
+        # 독립 매니저 동시 실행 (wave 단위 asyncio.gather + 계산용 스레드 풀)
+        self._phase_runner = PhaseRunner()
+        self._pre_combat_phase = get_pre_combat_phase_accesses()
 
         # 건물 배치 헬퍼
         if BuildingPlacementHelper:
@@ -473,6 +532,10 @@ class BotStepIntegrator:
         elif not hasattr(self.bot, "resource_manager"):
             self.bot.resource_manager = None
 
+        # Spatial index (updated incrementally every frame, shared by queries)
+        if SpatialOptimizer and getattr(self.bot, "spatial_optimizer", None) is None:
+            self.bot.spatial_optimizer = SpatialOptimizer(bot)
+
         # Spatial Query Optimizer (Performance optimization)
         if SpatialQueryOptimizer:
             self.bot.spatial_query = SpatialQueryOptimizer(bot)
@@ -680,6 +743,55 @@ class BotStepIntegrator:
         else:
             self.bot.game_result_reporter = None
 
+    def _register_scheduled_tasks(self) -> None:
+        """
+        FrameScheduler 태스크 등록
+
+        - CRITICAL: 전투/마이크로 - 예산과 무관하게 매 프레임 보장
+        - 주기 작업: 기존 iteration % N 간격 유지, 이름 해시로 위상 분산
+        - 매 프레임 작업: 예산 초과 시 최대 max_staleness 프레임까지 연기 가능
+        """
+        register = self._scheduler.register
+
+        # 전투 핵심 (항상 실행)
+        register("Combat", TaskPriority.CRITICAL)
+        register("Micro", TaskPriority.CRITICAL)
+
+        # 매 프레임 실행되던 매니저 (예산 초과 시 연기 가능)
+        register("Economy", TaskPriority.HIGH, max_staleness=2)
+        register("Intel", TaskPriority.HIGH, max_staleness=4)
+        for label in (
+            "Creep manager",
+            "Spell manager",
+            "Morph manager",
+            "Protoss counter",
+            "Multi-base defense",
+        ):
+            register(label, TaskPriority.MEDIUM, max_staleness=4)
+
+        # 주기 작업 (기존 간격, 위상 분산)
+        register("InstantAirThreat", TaskPriority.HIGH, interval=11)
+        register("Aggressive Strategies", TaskPriority.HIGH, interval=4)
+        register("Rogue Tactics", TaskPriority.MEDIUM, interval=8)
+        # 내부 로그 게이트(% 220/660)와 정렬되도록 위상 고정
+        register("HierarchicalRL", TaskPriority.MEDIUM, interval=22, phase=0)
+        # K/V 캐시 증분 추론 (스텝당 새 상태 하나만 계산) -> 짧은 간격
+        register("Transformer", TaskPriority.LOW, interval=8, cost_ms=1.0)
+        register("DebugDraw", TaskPriority.MINIMAL, interval=4)
+        register("ExpansionTimingCheck", TaskPriority.MINIMAL, interval=1100)
+        register("EmergencyDefense", TaskPriority.HIGH, interval=22, cost_ms=1.0)
+        # 내부 로그 게이트(% 100)와 정렬되도록 위상 고정
+        register(
+            "ResourceSurplus", TaskPriority.MEDIUM, interval=22, phase=0, cost_ms=2.0
+        )
+        register("DefenseBuilding", TaskPriority.MEDIUM, interval=44, cost_ms=2.0)
+        register("AggressiveTech", TaskPriority.MEDIUM, interval=22, cost_ms=2.0)
+        register("CreepHighwayProgress", TaskPriority.LOW, interval=110, cost_ms=1.0)
+        register("StaleReservations", TaskPriority.LOW, interval=220, cost_ms=0.5)
+        register("RLIntermediateReward", TaskPriority.LOW, interval=44, cost_ms=0.5)
+        register("Chat", TaskPriority.MINIMAL, interval=10, cost_ms=0.1)
+        register("ModelHotReload", TaskPriority.MINIMAL, interval=660, cost_ms=1.0)
+
     async def initialize_managers(self):
         """
         매니저들 초기화 (lazy loading)
@@ -715,6 +827,20 @@ class BotStepIntegrator:
         blackboard.bases_count = self.bot.townhalls.amount
         blackboard.worker_count = self.bot.workers.amount
 
+        # 3.5 * 프레임 유닛 스냅샷 (전투 모듈 공유 NumPy 컬럼) *
+        try:
+            blackboard.update_unit_snapshot(
+                build_frame_snapshot(
+                    self.bot, iteration, previous=blackboard.unit_snapshot
+                )
+            )
+        except (AttributeError, TypeError, ValueError) as e:
+            blackboard.update_unit_snapshot(None)
+            if iteration % 660 == 0:
+                self.logger.warning(
+                    f"[BotStepIntegrator] Unit snapshot suppressed: {e}"
+                )
+
         # 4. 주요 유닛 카운트 업데이트
         if UnitTypeId:
             key_units = [
@@ -818,6 +944,9 @@ class BotStepIntegrator:
                 await self.bot.chat_send("gl hf")
                 self.bot._glhf_sent = True
 
+        # 프레임 예산 계획 (이번 프레임에 실행할 태스크 선택)
+        self._scheduler.begin_frame(iteration)
+
         try:
             # 0.01 *** Blackboard 상태 업데이트 (최우선) ***
             if hasattr(self.bot, "blackboard") and self.bot.blackboard:
@@ -838,84 +967,27 @@ class BotStepIntegrator:
             if hasattr(self.bot, "unit_authority") and self.bot.unit_authority:
                 await self.bot.unit_authority.on_step(iteration)
 
-            # 0.0065 * 죽은 유닛의 권한 해제 (2초마다) *
-            if iteration % 44 == 0:
-                self._cleanup_dead_unit_authorities()
-
-            # 0.007 *** Map Memory System (맵 기억 - 적 건물 추적) ***
-            if hasattr(self.bot, "map_memory") and self.bot.map_memory:
-                await self.bot.map_memory.on_step(iteration)
-
-            # 0.008 *** Complete Destruction Trainer (모든 건물 파괴) ***
-            if (
-                hasattr(self.bot, "complete_destruction")
-                and self.bot.complete_destruction
-            ):
-                await self.bot.complete_destruction.on_step(iteration)
-
-            # 0.009 *** Roach Tactics Trainer (바퀴 잠복 회복 전술) ***
-            if hasattr(self.bot, "roach_tactics") and self.bot.roach_tactics:
-                await self.bot.roach_tactics.on_step(iteration)
-
-            # 0.010 *** Zergling Harassment Trainer (저글링 괴롭힘 전술) ***
-            if hasattr(self.bot, "zergling_harass") and self.bot.zergling_harass:
-                await self.bot.zergling_harass.on_step(iteration)
-
-            # 0.011 *** Overseer Scout Trainer (감시군주 정찰) ***
-            if hasattr(self.bot, "overseer_scout") and self.bot.overseer_scout:
-                await self.bot.overseer_scout.on_step(iteration)
-
-            # 0.012 *** Air Threat Response Trainer (공중 위협 대응) ***
-            if (
-                hasattr(self.bot, "air_threat_response")
-                and self.bot.air_threat_response
-            ):
-                await self.bot.air_threat_response.on_step(iteration)
-
-            # 0.013 *** Space Control Trainer (공간 확보) ***
-            if hasattr(self.bot, "space_control") and self.bot.space_control:
-                await self.bot.space_control.on_step(iteration)
-
-            # 0.014 Comprehensive Unit Abilities (모든 유닛 스킬)
-            if hasattr(self.bot, "unit_abilities") and self.bot.unit_abilities:
-                await self.bot.unit_abilities.on_step(iteration)
-
-            # 0.015 Roach Tunneling Tactics (바퀴 땅굴발톱 전술)
-            if hasattr(self.bot, "roach_tunneling") and self.bot.roach_tunneling:
-                await self.bot.roach_tunneling.on_step(iteration)
-
-            # 0.016 Creep Expansion System (전 맵 점막 확장)
-            if hasattr(self.bot, "creep_expansion") and self.bot.creep_expansion:
-                await self.bot.creep_expansion.on_step(iteration)
+            # 0.007~0.017 *** 전투 전 단계 (맵 기억/전술 트레이너/점막/군락 기술) ***
+            # 선언된 읽기/쓰기 + 유닛 권한 풀 기준으로 충돌 없는 매니저를 동시 실행
+            with self._frame_profiler.span("pre_combat"):
+                await self._phase_runner.run_phase(
+                    self._pre_combat_phase,
+                    lambda item: self._safe_manager_step(
+                        getattr(self.bot, item.attribute_name, None),
+                        iteration,
+                        item.label,
+                    ),
+                )
 
-            # 0.0165 * NEW: Creep Denial System (적 점막 제거) *
-            if hasattr(self.bot, "creep_denial") and self.bot.creep_denial:
-                start_time = self._logic_tracker.start_logic("CreepDenial")
+            # Creep Denial 주기 보고서 (1분마다)
+            creep_denial = getattr(self.bot, "creep_denial", None)
+            if creep_denial and iteration % 1320 == 0:
                 try:
-                    await self.bot.creep_denial.on_step(iteration)
-
-                    # 주기적으로 보고서 출력 (1분마다)
-                    if iteration % 1320 == 0:
-                        report = self.bot.creep_denial.get_creep_denial_report()
-                        self.logger.info(report)
-                except Exception as e:
-                    if error_handler.debug_mode:
-                        raise
-                    else:
-                        error_handler.error_counts["CreepDenial"] = (
-                            error_handler.error_counts.get("CreepDenial", 0) + 1
-                        )
-                        if (
-                            error_handler.error_counts["CreepDenial"]
-                            <= error_handler.max_error_logs
-                        ):
-                            self.logger.error(f"[ERROR] CreepDenial error: {e}")
-                finally:
-                    self._logic_tracker.end_logic("CreepDenial", start_time)
-
-            # 0.017 Hive Tech Maximizer (군락 기술 극대화)
-            if hasattr(self.bot, "hive_tech") and self.bot.hive_tech:
-                await self.bot.hive_tech.on_step(iteration)
+                    self.logger.info(creep_denial.get_creep_denial_report())
+                except (AttributeError, TypeError) as e:
+                    self.logger.warning(
+                        f"[BotStepIntegrator] Creep denial report suppressed: {e}"
+                    )
 
             # 0.02 *** Spatial Optimizer & Data Cache (최우선 최적화) ***
             # 다른 모든 시스템보다 먼저 실행하여 캐시 준비 (항상 실행)
@@ -1293,7 +1365,7 @@ class BotStepIntegrator:
                     self._logic_tracker.end_logic("SmartBalancer", start_time)
 
             # 0.059 *** INSTANT Air Threat Response (치명적 공중 유닛 즉시 대응) ***
-            if iteration % 11 == 0:  # 매 0.5초마다 체크 (빠른 반응)
+            if self._scheduler.should_run("InstantAirThreat", iteration):  # ~0.5초
                 try:
                     from sc2.ids.unit_typeid import UnitTypeId
 
@@ -1373,7 +1445,7 @@ class BotStepIntegrator:
                                 f"[CREEP_HIGHWAY_ASTAR] A* 경로 계산 완료: "
                                 f"{len(astar_hw.highway_waypoints)} waypoints"
                             )
-                    elif iteration % 110 == 0:
+                    elif self._scheduler.should_run("CreepHighwayProgress", iteration):
                         astar_hw.update_progress()
                 except Exception as e:
                     if error_handler.debug_mode:
@@ -1723,7 +1795,7 @@ class BotStepIntegrator:
                     self._logic_tracker.end_logic("DefeatDetection", start_time)
 
             # * NEW: Chat Manager - 상대방 항복/채팅 감지 (10프레임마다) *
-            if iteration % 10 == 0:
+            if self._scheduler.should_run("Chat", iteration):
                 await self._handle_chat_interaction()
 
             # 1. Intel (정보 수집)
@@ -1857,13 +1929,13 @@ class BotStepIntegrator:
 
             # 4.2 Aggressive Strategies (초반 공격 전략) - * MOVED AFTER PRODUCTION *
             # Production과 UnitFactory 이후 실행하여 애벌레 경쟁 최소화
-            if iteration % 4 == 0:  # 4프레임마다 실행
-                await self._safe_manager_step(
-                    getattr(self.bot, "aggressive_strategies", None),
-                    iteration,
-                    "Aggressive Strategies",
-                    method_name="execute",
-                )
+            # 4프레임 간격은 FrameScheduler가 관리
+            await self._safe_manager_step(
+                getattr(self.bot, "aggressive_strategies", None),
+                iteration,
+                "Aggressive Strategies",
+                method_name="execute",
+            )
 
             # 4.95 * OPTIMIZED: Advanced Worker Optimizer BEFORE Economy *
             # Worker optimization runs FIRST so economy can use saturation data
@@ -1897,7 +1969,7 @@ class BotStepIntegrator:
             await self._safe_manager_step(self.bot.economy, iteration, "Economy")
 
             # * Phase 21: 확장 타이밍 모니터링 (50초마다) *
-            if iteration % 1100 == 0:
+            if self._scheduler.should_run("ExpansionTimingCheck", iteration):
                 try:
                     base_count = (
                         self.bot.townhalls.ready.amount if self.bot.townhalls else 0
@@ -1985,7 +2057,7 @@ class BotStepIntegrator:
                     self.bot.resource_manager.log_statistics(iteration)
 
                     # Clear stale reservations (safety mechanism)
-                    if iteration % 220 == 0:  # Every 10 seconds
+                    if self._scheduler.should_run("StaleReservations", iteration):
                         await self.bot.resource_manager.clear_stale_reservations(
                             iteration
                         )
@@ -2115,7 +2187,7 @@ class BotStepIntegrator:
                 success = True
                 try:
                     # 자원 적체 시 처리
-                    if iteration % 22 == 0:  # 매 1초마다
+                    if self._scheduler.should_run("ResourceSurplus", iteration):
                         surplus_results = (
                             await self.bot.advanced_building_manager.handle_resource_surplus()
                         )
@@ -2125,7 +2197,7 @@ class BotStepIntegrator:
                             )
 
                     # 방어 건물 최적 위치에 건설 - * 3베이스 이후에만! *
-                    if iteration % 44 == 0:  # 매 2초마다
+                    if self._scheduler.should_run("DefenseBuilding", iteration):
                         # * CRITICAL: 초반 확장 우선! 3분 이후 + 3베이스 이후에만 방어 건물 건설 *
                         game_time = getattr(self.bot, "time", 0)
                         base_count = (
@@ -2152,7 +2224,7 @@ class BotStepIntegrator:
                 success = True
                 try:
                     # 자원이 넘칠 때 테크 건설
-                    if iteration % 22 == 0:  # 매 1초마다
+                    if self._scheduler.should_run("AggressiveTech", iteration):
                         has_excess, _, _ = (
                             self.bot.aggressive_tech_builder.has_excess_resources()
                         )
@@ -2389,17 +2461,16 @@ class BotStepIntegrator:
             # if hasattr(self.bot, "advanced_scout_v2"):
             #     await self._safe_manager_step(self.bot.advanced_scout_v2, iteration, "AdvancedScoutV2")
 
-            # 11. Rogue Tactics (이병렬 선수 전술 - 맹독충 드랍 등)
-            if iteration % 8 == 0:  # 8프레임마다 실행
-                await self._safe_manager_step(
-                    getattr(self.bot, "rogue_tactics", None),
-                    iteration,
-                    "Rogue Tactics",
-                    method_name="update",
-                )
+            # 11. Rogue Tactics (이병렬 선수 전술 - 맹독충 드랍 등, 8프레임 간격)
+            await self._safe_manager_step(
+                getattr(self.bot, "rogue_tactics", None),
+                iteration,
+                "Rogue Tactics",
+                method_name="update",
+            )
 
-            # 12. Hierarchical RL System (계층적 강화학습 - 전략 결정)
-            if iteration % 22 == 0:  # 매 1초마다 전략 결정
+            # 12. Hierarchical RL System (계층적 강화학습 - 매 1초 전략 결정)
+            if self._scheduler.should_run("HierarchicalRL", iteration):
                 await self._safe_hierarchical_rl_step(iteration)
 
             # 12.1 *** Late Game Composition Optimizer (Phase 8 - 후반 조합) ***
@@ -2482,8 +2553,8 @@ class BotStepIntegrator:
                 finally:
                     self._logic_tracker.end_logic("ProxyHatch", start_time)
 
-            # 13. Transformer Decision (트랜스포머 의사결정 - 고급 패턴 인식)
-            if iteration % 44 == 0:  # 매 2초마다
+            # 13. Transformer Decision (트랜스포머 의사결정 - 고급 패턴 인식, ~0.4초)
+            if self._scheduler.should_run("Transformer", iteration):
                 await self._safe_transformer_step(iteration)
 
             # NOTE: Scouting과 Creep Manager는 이미 위에서 실행됨 (Line 303, 306)
@@ -2509,8 +2580,8 @@ class BotStepIntegrator:
             if report:
                 self.logger.info(report)
 
-            # 15. * 화면 디버그 정보 표시 *
-            if iteration % 4 == 0:  # 4프레임마다 갱신
+            # 15. * 화면 디버그 정보 표시 (4프레임 간격) *
+            if self._scheduler.should_run("DebugDraw", iteration):
                 await self.draw_debug_info()
 
         except Exception as e:
@@ -2525,6 +2596,8 @@ class BotStepIntegrator:
                 ):
                     self.logger.error(f"[ERROR] Game logic execution error: {e}")
         finally:
+            self._scheduler.end_frame()
+
             # Performance Optimizer 프레임 종료
             if (
                 hasattr(self.bot, "performance_optimizer")
@@ -2537,48 +2610,6 @@ class BotStepIntegrator:
                         f"[BotStepIntegrator] Perf optimizer end_frame suppressed: {e}"
                     )
 
-    def _cleanup_dead_unit_authorities(self):
-        """죽은 유닛의 권한 자동 해제"""
-        if not hasattr(self.bot, "unit_authority"):
-            return
-
-        try:
-            # 각 시스템별로 죽은 유닛 권한 해제
-            system_names = [
-                "scouting",
-                "harassment_coord",
-                "multi_prong_coord",
-                "combat_manager",
-                "spell_unit_manager",
-                "economy_manager",
-            ]
-
-            for system_name in system_names:
-                system = getattr(self.bot, system_name, None)
-                if not system:
-                    continue
-
-                # 시스템이 unit_tags 또는 active_scouts 속성을 가지고 있으면
-                if hasattr(system, "unit_tags"):
-                    for unit_tag in list(system.unit_tags):
-                        unit = self.bot.units.find_by_tag(unit_tag)
-                        if not unit:  # 유닛이 죽었음
-                            self.bot.unit_authority.release_unit(unit_tag, system_name)
-                            system.unit_tags.discard(unit_tag)
-
-                # AdvancedScoutingV2의 active_scouts 처리
-                if hasattr(system, "active_scouts"):
-                    for unit_tag in list(system.active_scouts.keys()):
-                        unit = self.bot.units.find_by_tag(unit_tag)
-                        if not unit:  # 유닛이 죽었음
-                            self.bot.unit_authority.release_unit(unit_tag, system_name)
-                            del system.active_scouts[unit_tag]
-
-        except Exception as e:
-            self.logger.warning(
-                f"[BotStepIntegrator] Dead unit authority cleanup suppressed: {e}"
-            )
-
     async def draw_debug_info(self):
         """화면 좌측 상단에 봇 상태 디버그 정보 표시"""
         try:
@@ -2672,10 +2703,9 @@ class BotStepIntegrator:
         if not manager:
             return
 
-        # *** Logic Optimizer: 실행 여부 결정 ***
-        if hasattr(self.bot, "logic_optimizer") and self.bot.logic_optimizer:
-            if not self.bot.logic_optimizer.should_execute_system(label, iteration):
-                return  # 이번 프레임은 스킵
+        # *** FrameScheduler: 실행 여부 결정 (간격/예산) ***
+        if not self._scheduler.should_run(label, iteration):
+            return  # 이번 프레임은 스킵 (간격/예산)
 
         method = getattr(manager, method_name, None)
         if not method:
@@ -2712,7 +2742,14 @@ class BotStepIntegrator:
                             f"[ERROR] {label}: Suppressing further error logs"
                         )
         finally:
-            self._logic_tracker.end_logic(label, start_time, success)
+            self._record_scheduled_cost(label, start_time, success)
+
+    def _record_scheduled_cost(
+        self, label: str, start_time: float, success: bool = True
+    ) -> None:
+        """LogicActivityTracker 기록 + FrameScheduler 프레임 예산 차감"""
+        elapsed = self._logic_tracker.end_logic(label, start_time, success)
+        self._scheduler.record_cost(label, elapsed * 1000)
 
     async def _safe_hierarchical_rl_step(self, iteration: int) -> None:
         """계층적 강화학습 시스템 실행 (RL Agent 연동 완료)"""
@@ -2967,7 +3004,7 @@ class BotStepIntegrator:
             if iteration % 50 == 0:
                 self.logger.warning(f"[WARNING] Hierarchical RL error: {e}")
         finally:
-            self._logic_tracker.end_logic("HierarchicalRL", start_time, success)
+            self._record_scheduled_cost("HierarchicalRL", start_time, success)
 
     async def _safe_transformer_step(self, iteration: int) -> None:
         """트랜스포머 의사결정 모델 실행"""
@@ -2983,7 +3020,10 @@ class BotStepIntegrator:
             # 게임 상태를 시퀀스로 변환하여 트랜스포머에 입력
             game_state = self._extract_game_state_sequence()
             if game_state:
-                prediction = self.bot.transformer_model.predict(game_state)
+                # 순수 numpy 계산 -> 스레드 풀에서 실행 (이벤트 루프 비차단)
+                prediction = await self._phase_runner.run_in_thread(
+                    self.bot.transformer_model.predict, game_state
+                )
 
                 # 예측 결과 저장
                 if prediction:
@@ -2993,7 +3033,7 @@ class BotStepIntegrator:
             if iteration % 50 == 0:
                 self.logger.warning(f"[WARNING] Transformer model error: {e}")
         finally:
-            self._logic_tracker.end_logic("Transformer", start_time, success)
+            self._record_scheduled_cost("Transformer", start_time, success)
 
     def _extract_game_state_sequence(self) -> list:
         """게임 상태를 시퀀스로 추출 (트랜스포머 입력용)"""
@@ -3186,7 +3226,7 @@ class BotStepIntegrator:
         - 위기 상황: 스파인 크롤러 4개까지 건설
         - 일반: 스파인 크롤러 3개까지 건설
         """
-        if iteration % 22 != 0:  # 1초마다 확인
+        if not self._scheduler.should_run("EmergencyDefense", iteration):
             return
 
         # Strategy Manager 확인
@@ -3512,7 +3552,7 @@ class BotStepIntegrator:
                 self.bot.rl_agent.update_reward(step_reward)
 
                 # * 중간 보상: 기지/군대/보급차단 상태 기반 보상 *
-                if iteration % 44 == 0:  # 2초마다
+                if self._scheduler.should_run("RLIntermediateReward", iteration):
                     try:
                         base_count = (
                             self.bot.townhalls.ready.amount if self.bot.townhalls else 0
@@ -3543,7 +3583,7 @@ class BotStepIntegrator:
                 self.logger.info(f"[TRAINING] Step reward: {step_reward:.3f}")
 
         # *** Model Hot Reload (30초마다 배포 모델 변경 감지) ***
-        if iteration % 660 == 0:  # ~30초
+        if self._scheduler.should_run("ModelHotReload", iteration):
             hot_reloader = getattr(self.bot, "hot_reloader", None)
             if hot_reloader:
                 try:
@@ -3563,16 +3603,21 @@ class BotStepIntegrator:
         profiler = get_profiler(self.bot.logger) if get_profiler else None
         if profiler:
             profiler.start_frame()
+        # 계층형 스팬 기록 (느린 프레임만 보관, 비활성 시 no-op)
+        self._frame_profiler.begin_frame(iteration)
 
         try:
             # 1. 매니저들 초기화 (첫 호출 시)
-            await self.initialize_managers()
+            with self._frame_profiler.span("init"):
+                await self.initialize_managers()
 
             # 2. 게임 로직 실행
-            await self.execute_game_logic(iteration)
+            with self._frame_profiler.span("game_logic"):
+                await self.execute_game_logic(iteration)
 
             # 3. 훈련 로직 실행 (train_mode=True일 때만)
-            await self.execute_training_logic(iteration)
+            with self._frame_profiler.span("training"):
+                await self.execute_training_logic(iteration)
 
         except Exception as e:
             if iteration % 100 == 0:
@@ -3581,6 +3626,8 @@ class BotStepIntegrator:
 
                 traceback.print_exc()
         finally:
+            self._frame_profiler.end_frame()
+
             # * PERFORMANCE PROFILING: End frame timing
             if profiler:
                 profiler.end_frame()
@@ -3589,6 +3636,10 @@ class BotStepIntegrator:
                 if iteration % 6600 == 0:  # ~5 minutes at 22 FPS
                     profiler.print_report()
 
+    def shutdown(self) -> None:
+        """게임 종료 시 정리 (PhaseRunner 계산용 스레드 풀 종료)"""
+        self._phase_runner.shutdown()
+
     async def _handle_chat_interaction(self):
         """
         상대방 채팅 메시지 처리
@@ -3,12 +3,15 @@
 Boids Algorithm for Swarm Control.
 
 Implements separation, alignment, and cohesion for clustered micro.
+
+Forces are computed for the whole army at once (calculate_swarm_velocities)
+from position/velocity matrices; neighbour pairs come from a uniform grid.
 """
 
 from __future__ import annotations
 
 import math
-from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -35,6 +38,71 @@ def _get_pos(obj: Any) -> Tuple[float, float]:
     return (float(getattr(pos, "x", 0.0)), float(getattr(pos, "y", 0.0)))
 
 
+def _positions_of(objs: Sequence[Any]) -> np.ndarray:
+    """(N, 2) position matrix for units or points."""
+    return np.array([_get_pos(o) for o in objs], dtype=np.float64).reshape(-1, 2)
+
+
+def _make_point(x: float, y: float) -> Any:
+    # Point2는 (x, y) 두 개의 인자를 받음
+    if _Point2 is not None:
+        return _Point2((x, y))
+    return (x, y)  # fallback for testing
+
+
+# 3x3 grid neighbourhood (dx, dy) offsets
+_CELL_OFFSETS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+
+
+def _neighbor_pairs(
+    positions: np.ndarray, radius: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    All ordered pairs (i, j) with 0 < |p_j - p_i| < radius.
+
+    Points are bucketed into a uniform grid with cell size ``radius``; each
+    point only probes its 3x3 cell neighbourhood, located by binary search in
+    the cell-sorted order, so no Python loop runs over points.
+
+    Returns:
+        (owner, other, delta, distance) where delta = p_other - p_owner
+    """
+    n = positions.shape[0]
+    if n < 2 or radius <= 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, np.zeros((0, 2)), np.zeros(0)
+
+    cells = np.floor(positions / radius).astype(np.int64)
+    cells -= cells.min(axis=0) - 1  # 최소 셀 = 1 → 이웃 셀 인덱스가 음수가 되지 않음
+    width = int(cells[:, 1].max()) + 2
+    keys = cells[:, 0] * width + cells[:, 1]
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    probe = (keys[:, None] + _CELL_OFFSETS @ np.array([width, 1])).ravel()
+    starts = np.searchsorted(sorted_keys, probe, side="left")
+    counts = np.searchsorted(sorted_keys, probe, side="right") - starts
+
+    # (probe 범위) → 후보 쌍 펼치기
+    owner = np.repeat(np.arange(n).repeat(len(_CELL_OFFSETS)), counts)
+    run_offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    other = order[np.repeat(starts, counts) + run_offset]
+
+    delta = positions[other] - positions[owner]
+    dist_sq = np.einsum("ij,ij->i", delta, delta)
+    keep = (dist_sq > 0) & (dist_sq < radius * radius)
+    return owner[keep], other[keep], delta[keep], np.sqrt(dist_sq[keep])
+
+
+def _sum_rows(index: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+    """Per-row sums of (K, 2) ``values`` grouped by ``index`` into (n, 2)."""
+    sums = np.zeros((n, 2))
+    sums[:, 0] = np.bincount(index, weights=values[:, 0], minlength=n)
+    sums[:, 1] = np.bincount(index, weights=values[:, 1], minlength=n)
+    return sums
+
+
 class BoidsSwarmController:
     """Boids-based swarm controller (separation/alignment/cohesion)."""
 
@@ -66,6 +134,9 @@ class BoidsSwarmController:
         "LURKERMP",
     }
 
+    # 이 유닛 수 이하에서는 (N, N) 행렬, 초과 시 그리드 이웃 쌍 사용
+    dense_limit = 384
+
     def __init__(
         self,
         separation_weight: float = 1.5,  # 분리 가중치
@@ -106,6 +177,8 @@ class BoidsSwarmController:
         """
         Calculate movement velocity using boids forces.
 
+        Thin per-unit wrapper around calculate_swarm_velocities().
+
         Args:
             unit: The unit to calculate velocity for
             neighbors: Nearby friendly units
@@ -117,155 +190,185 @@ class BoidsSwarmController:
         Returns:
             (velocity_x, velocity_y) tuple
         """
-        # 초기 속도 벡터
-        velocity = np.array([0.0, 0.0])
-
-        # 1. Separation (분리): 너무 가까운 이웃으로부터 멀어지기
-        separation_force = self._calculate_separation(unit, neighbors)
-        velocity += separation_force * self.separation_weight * separation_multiplier
-
-        # 2. Alignment (정렬): 이웃과 같은 방향으로 이동
-        alignment_force = self._calculate_alignment(unit, neighbors)
-        velocity += alignment_force * self.alignment_weight
-
-        # 3. Cohesion (응집): 이웃들의 중심으로 이동
-        # Chokepoint에서는 cohesion을 줄여서 길게 늘어서도록 함
-        cohesion_force = self._calculate_cohesion(unit, neighbors)
-        velocity += cohesion_force * self.cohesion_weight * cohesion_multiplier
-
-        # 4. Target Seeking (목표 추구): 목표 지점으로 이동
-        if target:
-            target_force = self._calculate_target_seeking(unit, target)
-            velocity += target_force * 2.0  # 목표 추구는 높은 가중치
-
-        # 5. Enemy Avoidance (적 회피): 적 유닛으로부터 멀어지기
-        if enemy_units:
-            avoidance_force = self._calculate_enemy_avoidance(unit, enemy_units)
-            velocity += avoidance_force * 1.5  # 적 회피는 높은 가중치
-
-        # 6. Enemy Surrounding (적 포위): 적을 부채꼴 모양으로 이동
-        if enemy_units and target:
-            surrounding_force = self._calculate_enemy_surrounding(
-                unit, enemy_units, target
-            )
-            velocity += surrounding_force * 1.0
-
-        # 힘 제한 (max_force)
-        force_magnitude = np.linalg.norm(velocity)
-        if force_magnitude > self.max_force:
-            velocity = velocity / force_magnitude * self.max_force
-
-        return float(velocity[0]), float(velocity[1])
-
-    def _calculate_separation(self, unit: Unit, neighbors: Units) -> np.ndarray:
-        """분리 힘 계산: 너무 가까운 이웃으로부터 멀어지기"""
-        separation = np.array([0.0, 0.0])
-        count = 0
-
-        unit_pos = np.array(_get_pos(unit))
-
-        for neighbor in neighbors:
-            if neighbor.tag == unit.tag:
-                continue
-
-            neighbor_pos = np.array(_get_pos(neighbor))
-            distance = np.linalg.norm(neighbor_pos - unit_pos)
-
-            if 0 < distance < self.separation_radius:
-                # 거리가 가까울수록 더 강한 분리 힘
-                diff = unit_pos - neighbor_pos
-                diff = diff / (distance**2)  # 거리의 제곱에 반비례
-                separation += diff
-                count += 1
-
-        if count > 0:
-            separation = separation / count
-            # 정규화
-            magnitude = np.linalg.norm(separation)
-            if magnitude > 0:
-                separation = separation / magnitude * self.max_force
-
-        return separation
-
-    def _calculate_alignment(self, unit: Unit, neighbors: Units) -> np.ndarray:
-        """정렬 힘 계산: 이웃과 같은 방향으로 이동"""
-        alignment = np.array([0.0, 0.0])
-        count = 0
-
-        unit_pos = np.array(_get_pos(unit))
-
-        for neighbor in neighbors:
-            if neighbor.tag == unit.tag:
-                continue
+        # 0번 행이 대상 유닛, 나머지는 이웃 (자기 자신 제외)
+        group = [unit]
+        group.extend(n for n in neighbors if n.tag != unit.tag)
+        positions = _positions_of(group)
+
+        enemy_positions, enemy_types = self._enemy_arrays(enemy_units)
+        velocities = self.calculate_swarm_velocities(
+            positions,
+            target=_get_pos(target) if target else None,
+            enemy_positions=enemy_positions,
+            enemy_types=enemy_types,
+            separation_multiplier=separation_multiplier,
+            cohesion_multiplier=cohesion_multiplier,
+        )
+        return float(velocities[0, 0]), float(velocities[0, 1])
 
-            neighbor_pos = np.array(_get_pos(neighbor))
-            distance = np.linalg.norm(neighbor_pos - unit_pos)
+    def calculate_swarm_velocities(
+        self,
+        positions: np.ndarray,
+        velocities: Optional[np.ndarray] = None,
+        target: Any = None,
+        enemy_positions: Optional[np.ndarray] = None,
+        enemy_types: Optional[Sequence[str]] = None,
+        separation_multiplier: Union[float, np.ndarray] = 1.0,
+        cohesion_multiplier: Union[float, np.ndarray] = 1.0,
+    ) -> np.ndarray:
+        """
+        Batch boids: velocities for the whole army in one call.
 
-            if 0 < distance < self.neighbor_radius:
-                # 이웃의 속도 벡터 (현재는 위치 기반으로 단순화)
-                # 실제로는 유닛 방향을 고려해야 하지만, 여기서는 단순화
-                alignment += np.array(_get_pos(neighbor))
-                count += 1
+        Neighbour sums use masked (N, N) matrices up to ``dense_limit`` units
+        and a uniform grid neighbour list (cell = neighbour radius) above it,
+        so no Python loop runs per unit or per neighbour.
 
-        if count > 0:
-            alignment = alignment / count
-            # 현재 위치와 이웃들의 평균 위치의 차이
-            unit_pos = np.array(_get_pos(unit))
-            alignment = alignment - unit_pos
-            # 정규화
-            magnitude = np.linalg.norm(alignment)
-            if magnitude > 0:
-                alignment = alignment / magnitude * self.max_force
+        Args:
+            positions: (N, 2) friendly positions
+            velocities: (N, 2) friendly velocities (e.g. unit_snapshot.velocities).
+                When omitted, alignment falls back to the neighbour centroid.
+            target: (x, y) shared target, or (N, 2) per-unit targets
+                (rows with NaN have no target)
+            enemy_positions: (M, 2) enemy positions
+            enemy_types: M enemy type names (upper-case), for danger radii
+            separation_multiplier: scalar or (N,) separation multipliers
+            cohesion_multiplier: scalar or (N,) cohesion multipliers
 
-        return alignment
+        Returns:
+            (N, 2) velocity matrix, each row clamped to max_force
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        n = positions.shape[0]
+        result = np.zeros((n, 2))
+        if n == 0:
+            return result
+
+        if velocities is not None:
+            velocities = np.asarray(velocities, dtype=np.float64).reshape(-1, 2)
+        push, centroid_offset, neighbor_velocity = self._neighbor_sums(
+            positions, velocities
+        )
 
-    def _calculate_cohesion(self, unit: Unit, neighbors: Units) -> np.ndarray:
-        """응집 힘 계산: 이웃들의 중심으로 이동"""
-        cohesion = np.array([0.0, 0.0])
-        count = 0
+        # 1. Separation (분리): 거리의 제곱에 반비례해 이웃으로부터 멀어지기
+        separation = self._normalized(push)
+        result += separation * (
+            self.separation_weight * np.reshape(separation_multiplier, (-1, 1))
+        )
 
-        unit_pos = np.array(_get_pos(unit))
+        # 3. Cohesion (응집): 이웃들의 중심으로 이동
+        cohesion = self._normalized(centroid_offset)
 
-        for neighbor in neighbors:
-            if neighbor.tag == unit.tag:
-                continue
+        # 2. Alignment (정렬): 이웃의 평균 속도 방향 (속도가 없으면 중심 방향)
+        if neighbor_velocity is not None:
+            alignment = self._normalized(neighbor_velocity)
+        else:
+            alignment = cohesion
 
-            neighbor_pos = np.array(_get_pos(neighbor))
-            distance = np.linalg.norm(neighbor_pos - unit_pos)
+        result += alignment * self.alignment_weight
+        result += cohesion * (
+            self.cohesion_weight * np.reshape(cohesion_multiplier, (-1, 1))
+        )
 
-            if 0 < distance < self.neighbor_radius:
-                cohesion += neighbor_pos
-                count += 1
+        # 4. Target Seeking (목표 추구): 가까워질수록 약해지는 힘
+        targets = None
+        if target is not None:
+            targets = np.broadcast_to(np.asarray(target, dtype=np.float64), (n, 2))
+            to_target = targets - positions
+            target_dist = np.hypot(to_target[:, 0], to_target[:, 1])
+            valid = target_dist > 0  # NaN 행(목표 없음)도 제외
+            strength = np.minimum(target_dist[valid] / 10.0, 1.0) * self.max_force
+            seek = np.zeros((n, 2))
+            seek[valid] = (
+                to_target[valid] / target_dist[valid, None] * strength[:, None]
+            )
+            result += seek * 2.0  # 목표 추구는 높은 가중치
 
-        if count > 0:
-            # 이웃들의 중심
-            cohesion = cohesion / count
-            # 중심으로의 벡터
-            cohesion = cohesion - unit_pos
-            # 정규화
-            magnitude = np.linalg.norm(cohesion)
-            if magnitude > 0:
-                cohesion = cohesion / magnitude * self.max_force
+        if enemy_positions is not None and len(enemy_positions):
+            enemy_positions = np.asarray(enemy_positions, dtype=np.float64).reshape(
+                -1, 2
+            )
 
-        return cohesion
+            # 5. Enemy Avoidance (적 회피)
+            result += (
+                self._enemy_avoidance(positions, enemy_positions, enemy_types) * 1.5
+            )
 
-    def _calculate_target_seeking(self, unit: Unit, target: Point2) -> np.ndarray:
-        """목표 추구 힘 계산: 목표 지점으로 이동"""
-        unit_pos = np.array(_get_pos(unit))
-        target_pos = np.array(_get_pos(target))
+            # 6. Enemy Surrounding (적 포위): 목표가 있는 유닛만
+            if targets is not None:
+                has_target = ~np.isnan(targets[:, 0])
+                result[has_target] += self._enemy_surrounding(
+                    positions[has_target], enemy_positions
+                )
 
-        direction = target_pos - unit_pos
-        distance = np.linalg.norm(direction)
+        # 힘 제한 (max_force)
+        magnitude = np.hypot(result[:, 0], result[:, 1])
+        over = magnitude > self.max_force
+        result[over] *= (self.max_force / magnitude[over])[:, None]
+        return result
+
+    def _neighbor_sums(
+        self, positions: np.ndarray, velocities: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Per-unit neighbour sums (directions only matter, so no averaging).
 
-        if distance > 0:
-            direction = direction / distance
-            # 거리에 비례한 힘 적용 (가까워질수록 약해짐)
-            force = min(float(distance) / 10.0, 1.0) * self.max_force
-            return direction * force
+        Returns:
+            push: sum of (p_i - p_j) / d^2 over 0 < d < separation_radius
+            centroid_offset: sum of (p_j - p_i) over 0 < d < neighbor_radius
+            neighbor_velocity: sum of v_j over the same neighbours (None
+                without velocities)
+        """
+        n = positions.shape[0]
+        if n <= self.dense_limit:
+            # 소규모 군집: (N, N) 마스크 행렬 + 행렬곱
+            x, y = positions[:, 0], positions[:, 1]
+            dist_sq = np.subtract.outer(x, x)
+            dist_sq *= dist_sq
+            dy_sq = np.subtract.outer(y, y)
+            dy_sq *= dy_sq
+            dist_sq += dy_sq
+
+            overlap = dist_sq > 0
+            inverse_sq = np.zeros_like(dist_sq)
+            np.divide(
+                1.0,
+                dist_sq,
+                out=inverse_sq,
+                where=overlap & (dist_sq < self.separation_radius**2),
+            )
+            near = (overlap & (dist_sq < self.neighbor_radius**2)).astype(np.float64)
 
-        return np.array([0.0, 0.0])
+            push = positions * inverse_sq.sum(axis=1)[:, None] - inverse_sq @ positions
+            centroid_offset = near @ positions - positions * near.sum(axis=1)[:, None]
+            neighbor_velocity = near @ velocities if velocities is not None else None
+            return push, centroid_offset, neighbor_velocity
 
-    def _calculate_enemy_avoidance(self, unit: Unit, enemy_units: Units) -> np.ndarray:
+        # 대규모 군집: 균일 그리드 이웃 쌍
+        owner, other, delta, dist = _neighbor_pairs(
+            positions, max(self.neighbor_radius, self.separation_radius)
+        )
+        close = dist < self.separation_radius
+        push = _sum_rows(owner[close], -delta[close] / (dist[close] ** 2)[:, None], n)
+        near = dist < self.neighbor_radius
+        centroid_offset = _sum_rows(owner[near], delta[near], n)
+        neighbor_velocity = None
+        if velocities is not None:
+            neighbor_velocity = _sum_rows(owner[near], velocities[other[near]], n)
+        return push, centroid_offset, neighbor_velocity
+
+    def _normalized(self, vectors: np.ndarray) -> np.ndarray:
+        """Scale non-zero rows to max_force (zero rows stay zero)."""
+        magnitude = np.hypot(vectors[:, 0], vectors[:, 1])
+        nonzero = magnitude > 0
+        vectors[nonzero] *= (self.max_force / magnitude[nonzero])[:, None]
+        return vectors
+
+    def _enemy_avoidance(
+        self,
+        positions: np.ndarray,
+        enemy_positions: np.ndarray,
+        enemy_types: Optional[Sequence[str]],
+    ) -> np.ndarray:
         """
         적 회피 힘 계산: 적 유닛으로부터 멀어지기
 
@@ -273,98 +376,75 @@ class BoidsSwarmController:
         - 고위협 유닛 (시즈탱크, 콜로서스 등)은 더 큰 회피 반경
         - 스플래시 유닛은 특히 더 넓은 회피
         """
-        avoidance = np.array([0.0, 0.0])
-        count = 0
-
-        unit_pos = np.array(_get_pos(unit))
-
-        for enemy in enemy_units:
-            enemy_pos = np.array(_get_pos(enemy))
-            distance = np.linalg.norm(enemy_pos - unit_pos)
-
-            # 적 유닛 타입에 따른 위험 반경 조정
-            enemy_type = getattr(enemy.type_id, "name", "").upper()
-
-            # 기본 위험 반경
-            danger_radius = 8.0
-
-            # 고위협 유닛은 더 넓은 회피 반경
-            if enemy_type in self.HIGH_THREAT_UNITS:
-                danger_radius = 12.0
-
-            # 스플래시 유닛은 더 넓게 회피
-            if enemy_type in self.SPLASH_UNITS:
-                danger_radius = 15.0
-
-            # 시즈모드 탱크는 특히 더 넓게
-            if enemy_type == "SIEGETANKSIEGED":
-                danger_radius = 18.0
-
-            if distance < danger_radius:
-                # 적으로부터 멀어지는 벡터
-                diff = unit_pos - enemy_pos
-                # 거리가 가까울수록 더 강한 회피 힘
-                strength = (danger_radius - distance) / danger_radius
-
-                # 고위협 유닛은 회피 강도 증가
-                if enemy_type in self.HIGH_THREAT_UNITS:
-                    strength *= 1.5
-
-                diff = diff / (distance + 0.1)  # 0으로 나누기 방지
-                avoidance += diff * strength
-                count += 1
-
-        if count > 0:
-            avoidance = avoidance / count
-            # 정규화
-            magnitude = np.linalg.norm(avoidance)
-            if magnitude > 0:
-                avoidance = avoidance / magnitude * self.max_force
-
-        return avoidance
+        danger_radius, threat_scale = self._threat_profile(
+            enemy_types, len(enemy_positions)
+        )
 
-    def _calculate_enemy_surrounding(
-        self, unit: Unit, enemy_units: Units, target: Point2
+        distance = np.subtract.outer(positions[:, 0], enemy_positions[:, 0])  # (N, M)
+        distance *= distance
+        dy_sq = np.subtract.outer(positions[:, 1], enemy_positions[:, 1])
+        dy_sq *= dy_sq
+        distance += dy_sq
+        np.sqrt(distance, out=distance)
+
+        # 거리가 가까울수록 더 강한 회피 힘 (반경 밖은 0)
+        weight = np.maximum(danger_radius - distance, 0.0)
+        weight *= threat_scale / danger_radius
+        distance += 0.1  # 0으로 나누기 방지
+        weight /= distance
+
+        # sum_m w_nm * (p_n - e_m)
+        avoidance = positions * weight.sum(axis=1)[:, None] - weight @ enemy_positions
+        return self._normalized(avoidance)
+
+    def _enemy_surrounding(
+        self, positions: np.ndarray, enemy_positions: np.ndarray
     ) -> np.ndarray:
-        """적 포위 힘 계산: 적을 부채꼴 모양으로 이동"""
-        if len(enemy_units) == 0:
-            return np.array([0.0, 0.0])
-
-        # 적군의 중심 계산
-        enemy_center = np.array([0.0, 0.0])
-        for enemy in enemy_units:
-            enemy_center += np.array(_get_pos(enemy))
-        enemy_center = enemy_center / len(enemy_units)
+        """적 포위 힘 계산: 적 중심 주변 부채꼴 위치로 이동"""
+        enemy_center = enemy_positions.mean(axis=0)
 
-        # 유닛의 현재 위치
-        unit_pos = np.array(_get_pos(unit))
-
-        # 적 중심을 기준으로 한 각도 계산
-        to_enemy = enemy_center - unit_pos
-        angle = math.atan2(to_enemy[1], to_enemy[0])
-
-        # 포위 각도 (적 주변을 부채꼴 배치)
-        # 유닛 태그를 이용한 분산 배치 (단순화)
-        surrounding_angle = angle + math.pi / 2  # 90도 회전
-
-        # 포위 위치 계산
+        # 적 중심을 기준으로 90도 회전한 포위 위치
+        to_enemy = enemy_center - positions
+        surrounding_angle = np.arctan2(to_enemy[:, 1], to_enemy[:, 0]) + math.pi / 2
         surrounding_distance = 5.0  # 적으로부터의 거리
-        surrounding_pos = enemy_center + np.array(
-            [
-                math.cos(surrounding_angle) * surrounding_distance,
-                math.sin(surrounding_angle) * surrounding_distance,
-            ]
+        surrounding_pos = enemy_center + surrounding_distance * np.column_stack(
+            (np.cos(surrounding_angle), np.sin(surrounding_angle))
         )
 
-        # 포위 위치로의 벡터
-        direction = surrounding_pos - unit_pos
-        magnitude = np.linalg.norm(direction)
-
-        if magnitude > 0:
-            direction = direction / magnitude
-            return direction * self.max_force * 0.5  # 포위는 약한 힘
-
-        return np.array([0.0, 0.0])
+        # 포위는 약한 힘
+        direction = self._normalized(surrounding_pos - positions)
+        return direction * 0.5
+
+    @classmethod
+    def _threat_profile(
+        cls, enemy_types: Optional[Sequence[str]], count: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(danger_radius, threat_scale) per enemy from its type name."""
+        radius = np.full(count, 8.0)  # 기본 위험 반경
+        scale = np.ones(count)
+        if not enemy_types:
+            return radius, scale
+
+        for i, enemy_type in enumerate(enemy_types):
+            if enemy_type in cls.HIGH_THREAT_UNITS:
+                radius[i] = 12.0
+                scale[i] = 1.5  # 고위협 유닛은 회피 강도 증가
+            if enemy_type in cls.SPLASH_UNITS:
+                radius[i] = 15.0
+            if enemy_type == "SIEGETANKSIEGED":
+                radius[i] = 18.0  # 시즈모드 탱크는 특히 더 넓게
+        return radius, scale
+
+    @staticmethod
+    def _enemy_arrays(
+        enemy_units: Optional[Units],
+    ) -> Tuple[Optional[np.ndarray], Optional[List[str]]]:
+        """Enemy positions and upper-case type names for the batch API."""
+        if not enemy_units:
+            return None, None
+        enemies = list(enemy_units)
+        types = [getattr(e.type_id, "name", "").upper() for e in enemies]
+        return _positions_of(enemies), types
 
     def apply_boids_to_units(
         self,
@@ -373,7 +453,7 @@ class BoidsSwarmController:
         enemy_units: Optional[Units] = None,
     ) -> List[Tuple[Any, Any]]:
         """
-        모든 유닛에 Boids 알고리즘을 적용
+        모든 유닛에 Boids 알고리즘을 적용 (배치 1회 계산)
 
         Args:
             units: 제어할 유닛들
@@ -383,30 +463,23 @@ class BoidsSwarmController:
         Returns:
             [(unit, target_position), ...] 리스트
         """
-        results = []
-
-        for unit in units:
-            # 이웃 유닛들 찾기 (일정 범위)
-            neighbors = units.closer_than(self.neighbor_radius, unit.position)
-
-            # Boids 알고리즘으로 속도 벡터 계산
-            velocity_x, velocity_y = self.calculate_swarm_velocity(
-                unit=unit, neighbors=neighbors, target=target, enemy_units=enemy_units
-            )
-
-            # 현재 위치에서 속도 벡터를 더해 목표 위치 계산
-            cur_x, cur_y = _get_pos(unit)
-            new_x = cur_x + velocity_x
-            new_y = cur_y + velocity_y
-            # Point2는 (x, y) 두 개의 인자를 받음
-            if _Point2 is not None:
-                target_pos = _Point2(new_x, new_y)
-            else:
-                target_pos = (new_x, new_y)  # fallback for testing
-
-            results.append((unit, target_pos))
+        units = list(units)
+        positions = _positions_of(units)
+        enemy_positions, enemy_types = self._enemy_arrays(enemy_units)
+
+        velocities = self.calculate_swarm_velocities(
+            positions,
+            target=_get_pos(target) if target else None,
+            enemy_positions=enemy_positions,
+            enemy_types=enemy_types,
+        )
 
-        return results
+        # 현재 위치에서 속도 벡터를 더해 목표 위치 계산
+        new_positions = (positions + velocities).tolist()
+        return [
+            (unit, _make_point(new_x, new_y))
+            for unit, (new_x, new_y) in zip(units, new_positions)
+        ]
 
     def apply_defense_formation(
         self,
@@ -432,86 +505,61 @@ class BoidsSwarmController:
         Returns:
             [(unit, target_position), ...] 리스트
         """
-        results = []
-
-        # 적 중에 스플래시 유닛이 있는지 확인
-        has_splash_threat = False
-        if enemy_units:
-            for enemy in enemy_units:
-                enemy_type = getattr(enemy.type_id, "name", "").upper()
-                if enemy_type in self.SPLASH_UNITS:
-                    has_splash_threat = True
-                    break
+        units = list(units)
+        positions = _positions_of(units)
+        enemy_positions, enemy_types = self._enemy_arrays(enemy_units)
 
         # 스플래시 위협 시 분리 가중치 증가
-        if has_splash_threat and enemy_units:
-            nearby_enemies = enemy_units
-            # * Dynamic dispersal based on splash unit count *
-            splash_count = sum(
-                1
-                for e in nearby_enemies
-                if getattr(e.type_id, "name", "").upper() in self.SPLASH_UNITS
-            )
+        # * Dynamic dispersal based on splash unit count *
+        splash_count = sum(1 for t in enemy_types or () if t in self.SPLASH_UNITS)
+        if splash_count:
             separation_mult = min(2.5 + splash_count * 0.3, 4.0)
         else:
             separation_mult = 1.5
 
-        for i, unit in enumerate(units):
-            neighbors = units.closer_than(self.neighbor_radius, unit.position)
-
-            # 방어 모드: 응집력 감소, 분리력 증가
-            velocity_x, velocity_y = self.calculate_swarm_velocity(
-                unit=unit,
-                neighbors=neighbors,
-                target=defense_point,
-                enemy_units=enemy_units,
-                separation_multiplier=separation_mult,
-                cohesion_multiplier=0.5,  # 방어 시 응집력 감소
-            )
+        # 방어 모드: 응집력 감소, 분리력 증가
+        velocities = self.calculate_swarm_velocities(
+            positions,
+            target=_get_pos(defense_point) if defense_point else None,
+            enemy_positions=enemy_positions,
+            enemy_types=enemy_types,
+            separation_multiplier=separation_mult,
+            cohesion_multiplier=0.5,  # 방어 시 응집력 감소
+        )
 
-            # 부채꼴 배치를 위한 각도 조정
-            if base_position and defense_point:
-                # 기지 -> 적 방향
-                defense_x, defense_y = _get_pos(defense_point)
-                base_x, base_y = _get_pos(base_position)
-                base_to_enemy = np.array([defense_x - base_x, defense_y - base_y])
-                base_angle = math.atan2(base_to_enemy[1], base_to_enemy[0])
-
-                # 유닛별 부채꼴 각도 (+/-45도 범위)
-                unit_count = len(units)
-                if unit_count > 1:
-                    spread_angle = math.pi / 4  # 45도
-                    angle_offset = spread_angle * (2 * i / (unit_count - 1) - 1)
-                else:
-                    angle_offset = 0
-
-                # 방어 거리 (기지와 적 사이)
-                defense_distance = 8.0
-                formation_x = (
-                    base_x + math.cos(base_angle + angle_offset) * defense_distance
-                )
-                formation_y = (
-                    base_y + math.sin(base_angle + angle_offset) * defense_distance
+        # 부채꼴 배치를 위한 각도 조정
+        unit_count = len(units)
+        if base_position and defense_point and unit_count:
+            # 기지 -> 적 방향
+            defense_x, defense_y = _get_pos(defense_point)
+            base_x, base_y = _get_pos(base_position)
+            base_angle = math.atan2(defense_y - base_y, defense_x - base_x)
+
+            # 유닛별 부채꼴 각도 (+/-45도 범위)
+            if unit_count > 1:
+                spread_angle = math.pi / 4  # 45도
+                angle_offset = spread_angle * (
+                    2 * np.arange(unit_count) / (unit_count - 1) - 1
                 )
-
-                # 진형 위치로 부드럽게 이동
-                unit_x, unit_y = _get_pos(unit)
-                velocity_x = velocity_x + (formation_x - unit_x) * 0.3
-                velocity_y = velocity_y + (formation_y - unit_y) * 0.3
-
-            # 목표 위치 계산
-            cur_x, cur_y = _get_pos(unit)
-            new_x = cur_x + velocity_x
-            new_y = cur_y + velocity_y
-
-            if _Point2 is not None:
-                target_pos = _Point2(new_x, new_y)
             else:
-                target_pos = (new_x, new_y)
-
-            results.append((unit, target_pos))
-
-        return results
+                angle_offset = np.zeros(1)
+
+            # 방어 거리 (기지와 적 사이), 진형 위치로 부드럽게 이동
+            defense_distance = 8.0
+            formation = np.column_stack(
+                (
+                    base_x + np.cos(base_angle + angle_offset) * defense_distance,
+                    base_y + np.sin(base_angle + angle_offset) * defense_distance,
+                )
+            )
+            velocities += (formation - positions) * 0.3
+
+        # 목표 위치 계산
+        new_positions = (positions + velocities).tolist()
+        return [
+            (unit, _make_point(new_x, new_y))
+            for unit, (new_x, new_y) in zip(units, new_positions)
+        ]
 
     def get_priority_target(self, unit, enemy_units) -> "Optional[Unit]":
         """
@@ -800,8 +800,9 @@ class HarassmentCoordinator:
                 self.bot.unit_authority.release_unit(
                     self.drop_overlord_tag, "Harassment_Drop"
                 )
-                for tag in self.drop_unit_tags:
-                    self.bot.unit_authority.release_unit(tag, "Harassment_Drop")
+                self.bot.unit_authority.release_many(
+                    self.drop_unit_tags, "Harassment_Drop"
+                )
                 self.drop_unit_tags.clear()
                 self.drop_overlord_tag = None
             else:
@@ -846,18 +847,19 @@ class HarassmentCoordinator:
         ):
             return
 
-        approved_units = []
-        for unit in drop_units:
-            if self.bot.unit_authority.request_unit(
-                unit.tag, "Harassment_Drop", AuthorityLevel.TACTICAL
-            ):
-                approved_units.append(unit)
+        approved_tags = set(
+            self.bot.unit_authority.request_many(
+                [unit.tag for unit in drop_units],
+                "Harassment_Drop",
+                AuthorityLevel.TACTICAL,
+            )
+        )
+        approved_units = [unit for unit in drop_units if unit.tag in approved_tags]
 
         if len(approved_units) < 4:
             # 실패 시 모두 반환
             self.bot.unit_authority.release_unit(drop_overlord.tag, "Harassment_Drop")
-            for u in approved_units:
-                self.bot.unit_authority.release_unit(u.tag, "Harassment_Drop")
+            self.bot.unit_authority.release_many(approved_tags, "Harassment_Drop")
             return
 
         # 드랍 시작
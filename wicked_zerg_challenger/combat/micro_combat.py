@@ -25,6 +25,8 @@ try:
 except ImportError:
     ChokePointDetector = None
 
+from utils.map_analysis import get_map_analysis
+
 
 class AntiSplashAwareness:
     """Detects splash threats and provides repulsion/separation boosts."""
@@ -180,6 +182,12 @@ class ChokePointManager:
             return
 
         self.chokepoint_cache_frame = iteration
+
+        analysis = get_map_analysis(self.bot)
+        if analysis is not None:
+            self.chokepoints = list(analysis.chokes)
+            return
+
         self.chokepoints = []
 
         # Get chokepoints from game_info if available
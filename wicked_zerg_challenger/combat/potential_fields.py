@@ -4,15 +4,138 @@ Potential Field Controller - Force-based repulsion model for unit avoidance.
 
 This module implements potential field theory for collision avoidance,
 calculating repulsion vectors from enemies, structures, and terrain.
+
+Fields are evaluated for all friendly units at once:
+- terrain: TerrainRepulsionGrid, a per-map gradient grid precomputed from
+  the pathing grid and sampled at unit positions
+- enemies / structures: (N, M) array broadcasting
+- splash enemies: integer type-id mask (no per-pair string lookups)
 """
 
-from typing import Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 try:
+    from sc2.ids.unit_typeid import UnitTypeId
     from sc2.position import Point2
 except ImportError:
+    UnitTypeId = None
     Point2 = None
 
+from utils.unit_snapshot import FLAG_FLYING
+
+
+def _positions_of(objs: Optional[Iterable[Any]]) -> np.ndarray:
+    """(K, 2) position matrix for units or points (skips objects without x/y)."""
+    coords = []
+    for obj in objs or []:
+        pos = getattr(obj, "position", obj)
+        try:
+            coords.append((float(pos.x), float(pos.y)))
+        except (AttributeError, TypeError, ValueError):
+            continue
+    return np.array(coords, dtype=np.float64).reshape(-1, 2)
+
+
+def _type_value(type_id: Any) -> int:
+    value = getattr(type_id, "value", type_id)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+def _falloff_field(
+    positions: np.ndarray,
+    sources: np.ndarray,
+    radius: float,
+    source_weight: Any,
+) -> np.ndarray:
+    """
+    Sum of (p - s) / (d + 0.1) * (radius - d) / radius * weight over sources
+    with 0 < d <= radius, for every row of ``positions`` at once.
+    """
+    distance = np.subtract.outer(positions[:, 0], sources[:, 0])  # (N, M)
+    distance *= distance
+    dy_sq = np.subtract.outer(positions[:, 1], sources[:, 1])
+    dy_sq *= dy_sq
+    distance += dy_sq
+    np.sqrt(distance, out=distance)
+
+    weight = np.maximum(radius - distance, 0.0)
+    weight *= np.asarray(source_weight) / radius
+    weight[distance <= 0] = 0.0
+    distance += 0.1
+    weight /= distance
+
+    # sum_m w_nm * (p_n - s_m)
+    return positions * weight.sum(axis=1)[:, None] - weight @ sources
+
+
+class TerrainRepulsionGrid:
+    """
+    Per-map terrain repulsion gradient, precomputed from the pathing grid.
+
+    Every cell stores the summed repulsion from unpathable cells within
+    ``radius`` (same falloff as the point fields), so a lookup replaces the
+    per-unit scan over terrain points.
+    """
+
+    def __init__(self, pathable: np.ndarray, radius: float = 3.0):
+        """
+        Args:
+            pathable: (height, width) array, non-zero where ground units can walk
+            radius: Maximum distance for terrain repulsion effect
+        """
+        self.radius = radius
+        blocked = (np.asarray(pathable) == 0).astype(np.float64)
+        self.height, self.width = blocked.shape
+        # (height, width, 2) = (fx, fy) per cell, indexed [y, x]
+        self.gradient = self._convolve(blocked, radius)
+
+    @classmethod
+    def from_game_info(
+        cls, game_info: Any, radius: float = 3.0
+    ) -> Optional["TerrainRepulsionGrid"]:
+        pathing = getattr(game_info, "pathing_grid", None)
+        data = getattr(pathing, "data_numpy", None)
+        if not isinstance(data, np.ndarray) or data.ndim != 2:
+            return None
+        return cls(data, radius)
+
+    @staticmethod
+    def _convolve(blocked: np.ndarray, radius: float) -> np.ndarray:
+        height, width = blocked.shape
+        gradient = np.zeros((height, width, 2))
+        reach = int(np.floor(radius))
+        for oy in range(-reach, reach + 1):
+            for ox in range(-reach, reach + 1):
+                dist = float(np.hypot(ox, oy))
+                if dist <= 0 or dist > radius:
+                    continue
+                # 셀 p 가 p + (ox, oy) 의 장애물로부터 받는 힘: -(ox, oy) 방향
+                scale = (radius - dist) / radius / (dist + 0.1)
+                src = blocked[
+                    max(oy, 0) : height + min(oy, 0), max(ox, 0) : width + min(ox, 0)
+                ]
+                dst = gradient[
+                    max(-oy, 0) : height + min(-oy, 0),
+                    max(-ox, 0) : width + min(-ox, 0),
+                ]
+                dst[..., 0] -= src * (ox * scale)
+                dst[..., 1] -= src * (oy * scale)
+        return gradient
+
+    def sample(self, positions: np.ndarray) -> np.ndarray:
+        """(N, 2) repulsion at ``positions`` (zero outside the map)."""
+        cells = np.floor(positions).astype(np.intp)
+        x, y = cells[:, 0], cells[:, 1]
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        result = np.zeros((positions.shape[0], 2))
+        result[inside] = self.gradient[y[inside], x[inside]]
+        return result
+
 
 class PotentialFieldController:
     """
@@ -22,6 +145,9 @@ class PotentialFieldController:
     from various obstacles (enemies, structures, terrain).
     """
 
+    # 맵 이름별 지형 반발 그리드 (맵당 1회 계산)
+    _terrain_grids: Dict[Tuple[str, float], TerrainRepulsionGrid] = {}
+
     def __init__(
         self,
         enemy_weight: float = 1.0,
@@ -67,6 +193,37 @@ class PotentialFieldController:
         self.splash_weight = 2.5  # Strong repulsion from splash units
         self.splash_radius = 9.0  # Keep safe distance
 
+        # Splash types resolved once to integer type ids
+        self.splash_type_values = np.array(
+            sorted(
+                _type_value(getattr(UnitTypeId, name))
+                for name in self.splash_unit_types
+                if UnitTypeId is not None and hasattr(UnitTypeId, name)
+            ),
+            dtype=np.int32,
+        )
+
+        self.terrain_grid: Optional[TerrainRepulsionGrid] = None
+
+    def ensure_terrain_grid(self, game_info: Any) -> Optional[TerrainRepulsionGrid]:
+        """Attach the terrain gradient grid for the current map (built once per map)."""
+        if self.terrain_grid is not None or game_info is None:
+            return self.terrain_grid
+
+        key = (str(getattr(game_info, "map_name", "")), self.terrain_radius)
+        grid = self._terrain_grids.get(key)
+        if grid is None:
+            grid = TerrainRepulsionGrid.from_game_info(game_info, self.terrain_radius)
+            if grid is None:
+                return None
+            self._terrain_grids[key] = grid
+        self.terrain_grid = grid
+        return grid
+
+    def splash_mask(self, type_ids: np.ndarray) -> np.ndarray:
+        """Boolean splash mask from integer type ids (e.g. unit_snapshot.type_ids)."""
+        return np.isin(type_ids, self.splash_type_values)
+
     def get_repulsion_vector(
         self,
         unit,
@@ -77,6 +234,8 @@ class PotentialFieldController:
         """
         Calculate combined repulsion vector from all obstacles.
 
+        Thin per-unit wrapper around get_repulsion_vectors().
+
         Args:
             unit: The unit to calculate repulsion for
             enemy_units: Iterable of enemy units
@@ -89,101 +248,147 @@ class PotentialFieldController:
         if not Point2:
             return 0.0, 0.0
 
-        terrain_points = terrain_points or []
-        is_flying = getattr(unit, "is_flying", False)
-        terrain_weight = 0.0 if is_flying else self.terrain_weight
-
-        repulsion_x = 0.0
-        repulsion_y = 0.0
+        positions = _positions_of([unit])
+        if not len(positions):
+            return 0.0, 0.0
 
-        # Calculate enemy repulsion
-        repulsion_x, repulsion_y = self._calculate_enemy_repulsion(
-            unit, enemy_units, repulsion_x, repulsion_y
+        enemies = [e for e in enemy_units or [] if hasattr(e, "position")]
+        repulsion = self.get_repulsion_vectors(
+            positions,
+            is_flying=np.array([bool(getattr(unit, "is_flying", False))]),
+            enemy_positions=_positions_of(enemies),
+            enemy_type_ids=np.array(
+                [_type_value(getattr(e, "type_id", -1)) for e in enemies],
+                dtype=np.int32,
+            ),
+            structure_positions=_positions_of(structure_units),
+            terrain_positions=_positions_of(terrain_points),
         )
+        return float(repulsion[0, 0]), float(repulsion[0, 1])
 
-        # Calculate structure repulsion
-        repulsion_x, repulsion_y = self._calculate_structure_repulsion(
-            unit, structure_units, repulsion_x, repulsion_y
-        )
+    def get_repulsion_vectors(
+        self,
+        positions: np.ndarray,
+        is_flying: Optional[np.ndarray] = None,
+        enemy_positions: Optional[np.ndarray] = None,
+        enemy_type_ids: Optional[np.ndarray] = None,
+        enemy_splash: Optional[np.ndarray] = None,
+        structure_positions: Optional[np.ndarray] = None,
+        terrain_positions: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Combined repulsion for all friendly units in one call.
+
+        Args:
+            positions: (N, 2) friendly positions
+            is_flying: (N,) bool, flying units ignore terrain
+            enemy_positions: (M, 2) enemy positions
+            enemy_type_ids: (M,) integer type ids, resolved to the splash mask
+            enemy_splash: (M,) precomputed splash mask (overrides enemy_type_ids)
+            structure_positions: (S, 2) structure positions
+            terrain_positions: (T, 2) extra terrain obstacle points
+
+        Returns:
+            (N, 2) repulsion vectors
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        n = positions.shape[0]
+        repulsion = np.zeros((n, 2))
+        if n == 0:
+            return repulsion
 
-        # Calculate terrain repulsion (ground units only)
-        if terrain_weight > 0.0:
-            repulsion_x, repulsion_y = self._calculate_terrain_repulsion(
-                unit, terrain_points, terrain_weight, repulsion_x, repulsion_y
+        # Enemy repulsion (+ extra repulsion from splash units)
+        if enemy_positions is not None and len(enemy_positions):
+            if enemy_splash is None and enemy_type_ids is not None:
+                enemy_splash = self.splash_mask(enemy_type_ids)
+            enemy_weight = self.enemy_weight
+            if enemy_splash is not None:
+                enemy_weight = enemy_weight + self.splash_weight * np.asarray(
+                    enemy_splash, dtype=np.float64
+                )
+            repulsion += _falloff_field(
+                positions,
+                np.asarray(enemy_positions, dtype=np.float64).reshape(-1, 2),
+                self.enemy_radius,
+                enemy_weight,
             )
 
-        return repulsion_x, repulsion_y
+        # Structure repulsion
+        if structure_positions is not None and len(structure_positions):
+            repulsion += _falloff_field(
+                positions,
+                np.asarray(structure_positions, dtype=np.float64).reshape(-1, 2),
+                self.structure_radius,
+                self.structure_weight,
+            )
 
-    def _calculate_enemy_repulsion(
-        self, unit, enemy_units, repulsion_x: float, repulsion_y: float
-    ) -> Tuple[float, float]:
-        """Calculate repulsion from enemy units."""
-        for enemy in enemy_units or []:
-            try:
-                dist = unit.distance_to(enemy)
-            except Exception:
-                continue
-            if dist <= 0 or dist > self.enemy_radius:
-                continue
-            strength = (self.enemy_radius - dist) / self.enemy_radius
-            dx = unit.position.x - enemy.position.x
-            dy = unit.position.y - enemy.position.y
-            repulsion_x += (dx / (dist + 0.1)) * strength * self.enemy_weight
-            repulsion_y += (dy / (dist + 0.1)) * strength * self.enemy_weight
-
-            # * NEW: Anti-Clumping (Extra repulsion from Splash Units) *
-            # If the enemy is a splash damage dealer, add extra repulsion force
-            try:
-                type_name = getattr(enemy.type_id, "name", "").upper()
-                if type_name in self.splash_unit_types:
-                    # Stronger repulsion to force spreading
-                    splash_strength = strength * self.splash_weight
-                    repulsion_x += (dx / (dist + 0.1)) * splash_strength
-                    repulsion_y += (dy / (dist + 0.1)) * splash_strength
-            except (AttributeError, ZeroDivisionError) as e:
-                # Unit position or attribute access failed, skip this unit
-                continue
-
-        return repulsion_x, repulsion_y
-
-    def _calculate_structure_repulsion(
-        self, unit, structure_units, repulsion_x: float, repulsion_y: float
-    ) -> Tuple[float, float]:
-        """Calculate repulsion from structures."""
-        for structure in structure_units or []:
-            try:
-                dist = unit.distance_to(structure)
-            except Exception:
-                continue
-            if dist <= 0 or dist > self.structure_radius:
-                continue
-            strength = (self.structure_radius - dist) / self.structure_radius
-            dx = unit.position.x - structure.position.x
-            dy = unit.position.y - structure.position.y
-            repulsion_x += (dx / (dist + 0.1)) * strength * self.structure_weight
-            repulsion_y += (dy / (dist + 0.1)) * strength * self.structure_weight
-        return repulsion_x, repulsion_y
-
-    def _calculate_terrain_repulsion(
+        # Terrain repulsion (ground units only)
+        if self.terrain_weight > 0.0:
+            ground = (
+                np.ones(n, dtype=bool)
+                if is_flying is None
+                else ~np.asarray(is_flying, dtype=bool)
+            )
+            if ground.any():
+                terrain = np.zeros((n, 2))
+                if terrain_positions is not None and len(terrain_positions):
+                    terrain[ground] += _falloff_field(
+                        positions[ground],
+                        np.asarray(terrain_positions, dtype=np.float64).reshape(-1, 2),
+                        self.terrain_radius,
+                        1.0,
+                    )
+                if self.terrain_grid is not None:
+                    terrain[ground] += self.terrain_grid.sample(positions[ground])
+                repulsion += terrain * self.terrain_weight
+
+        return repulsion
+
+    def get_repulsion_for_units(
         self,
-        unit,
-        terrain_points,
-        terrain_weight: float,
-        repulsion_x: float,
-        repulsion_y: float,
-    ) -> Tuple[float, float]:
-        """Calculate repulsion from terrain obstacles."""
-        for point in terrain_points:
-            try:
-                terrain_pos = getattr(point, "position", point)
-                dist = unit.position.distance_to(terrain_pos)
-            except Exception:
-                continue
-            if dist <= 0 or dist > self.terrain_radius:
-                continue
-            strength = (self.terrain_radius - dist) / self.terrain_radius
-            dx = unit.position.x - terrain_pos.x
-            dy = unit.position.y - terrain_pos.y
-            repulsion_x += (dx / (dist + 0.1)) * strength * terrain_weight
-            repulsion_y += (dy / (dist + 0.1)) * strength * terrain_weight
-        return repulsion_x, repulsion_y
+        units: Sequence,
+        enemy_units: Iterable,
+        terrain_points: Optional[List] = None,
+        structure_units: Optional[List] = None,
+        snapshot: Any = None,
+    ) -> np.ndarray:
+        """
+        (N, 2) repulsion for ``units`` (rows follow ``units`` order).
+
+        With a frame unit snapshot (utils.unit_snapshot.FrameSnapshot),
+        positions, flying flags and enemy type ids are read from its columns.
+        """
+        positions = is_flying = None
+        if snapshot is not None:
+            rows = snapshot.own.rows_for_units(units)
+            if len(rows) == len(units):
+                positions = snapshot.own.positions[rows]
+                is_flying = snapshot.own.mask(FLAG_FLYING)[rows]
+        if positions is None:
+            positions = _positions_of(units)
+            is_flying = np.array(
+                [bool(getattr(u, "is_flying", False)) for u in units], dtype=bool
+            )
+
+        enemies = [e for e in enemy_units or [] if hasattr(e, "position")]
+        enemy_positions = enemy_type_ids = None
+        if snapshot is not None:
+            rows = snapshot.enemy.rows_for_units(enemies)
+            if len(rows) == len(enemies):
+                enemy_positions = snapshot.enemy.positions[rows]
+                enemy_type_ids = snapshot.enemy.type_ids[rows]
+        if enemy_positions is None:
+            enemy_positions = _positions_of(enemies)
+            enemy_type_ids = np.array(
+                [_type_value(getattr(e, "type_id", -1)) for e in enemies],
+                dtype=np.int32,
+            )
+
+        return self.get_repulsion_vectors(
+            positions,
+            is_flying=is_flying,
+            enemy_positions=enemy_positions,
+            enemy_type_ids=enemy_type_ids,
+            structure_positions=_positions_of(structure_units),
+            terrain_positions=_positions_of(terrain_points),
+        )
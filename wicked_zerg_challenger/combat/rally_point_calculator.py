@@ -5,6 +5,17 @@ Rally Point Calculator Module
 병력 집결지 계산 및 관리를 담당하는 모듈
 """
 
+from utils.path_distance import path_distance
+
+
+def _base_closest_to_center(manager):
+    """맵 중앙까지 지상 거리가 가장 짧은 기지 (램프/벽 반영)"""
+    bot = manager.bot
+    map_center = bot.game_info.map_center
+    return min(
+        bot.townhalls, key=lambda th: path_distance(bot, th.position, map_center)
+    )
+
 
 def calculate_rally_point(manager):
     """
@@ -28,9 +39,7 @@ def calculate_rally_point(manager):
     target_base = main_base
     if manager.bot.townhalls.amount > 1 and hasattr(manager.bot, "game_info"):
         try:
-            target_base = manager.bot.townhalls.closest_to(
-                manager.bot.game_info.map_center
-            )
+            target_base = _base_closest_to_center(manager)
         except Exception:
             pass
 
@@ -65,9 +74,7 @@ def update_rally_point(manager):
         # (이전: 3, 4 베이스 이후에도 본진 앞에 집결지 고정)
         if manager.bot.townhalls.amount > 1:
             try:
-                our_base = manager.bot.townhalls.closest_to(
-                    manager.bot.game_info.map_center
-                ).position
+                our_base = _base_closest_to_center(manager).position
             except Exception:
                 our_base = manager.bot.townhalls.first.position
         else:
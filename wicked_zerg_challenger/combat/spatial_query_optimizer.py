@@ -9,9 +9,21 @@ Performance improvements:
 - Manual distance loops: O(N) with Python overhead
 - C++ closer_than(): O(log N) with spatial indexing
 - Expected speedup: 3-10x for large unit counts
+
+When the bot's incremental grid index (``bot.spatial_optimizer``) has been
+updated this frame, queries are answered from it instead; unit-centred
+queries are then cached by stable tag rather than by exact float position.
+
+Fallback query results live in the bot's shared GenerationalCache
+("spatial_query" namespace), stamped with the caller's iteration and valid
+for that iteration only; unit-centred results are dropped when the unit's
+tag is invalidated.
 """
 
-from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Optional, Tuple
+
+from spatial_optimizer import ALLY, ENEMY
+from utils.generational_cache import get_shared_cache
 
 if TYPE_CHECKING:
     from sc2.bot_ai import BotAI
@@ -21,6 +33,13 @@ if TYPE_CHECKING:
 
 from wicked_zerg_challenger.utils.logger import get_logger
 
+NAMESPACE = "spatial_query"
+
+try:
+    from sc2.units import Units as _Units
+except ImportError:
+    _Units = None
+
 
 class SpatialQueryOptimizer:
     """Centralized spatial query system using C++ optimizations"""
@@ -29,14 +48,59 @@ class SpatialQueryOptimizer:
         self.bot = bot
         self.logger = get_logger("SpatialQueryOptimizer")
 
-        # Query result cache (cleared every frame)
-        self._query_cache: Dict[Tuple, "Units"] = {}
+        # Query result cache (shared, keyed by iteration generation)
+        self._cache = get_shared_cache(bot)
         self._last_cache_clear = 0
 
         # Statistics
         self.total_queries = 0
-        self.cache_hits = 0
-        self.cache_misses = 0
+
+    @property
+    def _query_cache(self) -> Dict[Hashable, "Units"]:
+        """Snapshot of cached query results."""
+        return self._cache.entries(NAMESPACE)
+
+    @property
+    def cache_hits(self) -> int:
+        return self._cache.stats(NAMESPACE)["hits"]
+
+    @property
+    def cache_misses(self) -> int:
+        return self._cache.stats(NAMESPACE)["misses"]
+
+    def _cached(
+        self,
+        cache_key: Tuple,
+        compute: Callable[[], "Units"],
+        iteration: int,
+        tag: Optional[int] = None,
+    ) -> "Units":
+        return self._cache.get_or_compute(
+            NAMESPACE,
+            cache_key,
+            compute,
+            ttl=0,
+            depends_on=() if tag is None else (tag,),
+            generation=iteration,
+        )
+
+    def _index(self, iteration: int):
+        """Shared grid index, if it was updated this frame."""
+        index = getattr(self.bot, "spatial_optimizer", None)
+        if index is None or getattr(index, "last_update", None) != iteration:
+            return None
+        return index
+
+    def _indexed_query(
+        self, side: str, center, radius: float, iteration: int
+    ) -> Optional["Units"]:
+        index = self._index(iteration)
+        if index is None:
+            return None
+        units = index.units_in_range(center, radius, side)
+        if _Units is not None:
+            return _Units(units, self.bot)
+        return units
 
     def get_enemies_near_position(
         self, position: "Point2", radius: float, iteration: int
@@ -54,18 +118,16 @@ class SpatialQueryOptimizer:
         """
         self.total_queries += 1
 
-        # Cache key
-        cache_key = (iteration, "enemies_near", position.x, position.y, radius)
-
-        if cache_key in self._query_cache:
-            self.cache_hits += 1
-            return self._query_cache[cache_key]
+        indexed = self._indexed_query(ENEMY, position, radius, iteration)
+        if indexed is not None:
+            return indexed
 
         # Use C++ closer_than()
-        result = self.bot.enemy_units.closer_than(radius, position)
-        self._query_cache[cache_key] = result
-        self.cache_misses += 1
-        return result
+        return self._cached(
+            ("enemies_near", position.x, position.y, radius),
+            lambda: self.bot.enemy_units.closer_than(radius, position),
+            iteration,
+        )
 
     def get_allies_near_position(
         self, position: "Point2", radius: float, iteration: int
@@ -83,16 +145,15 @@ class SpatialQueryOptimizer:
         """
         self.total_queries += 1
 
-        cache_key = (iteration, "allies_near", position.x, position.y, radius)
-
-        if cache_key in self._query_cache:
-            self.cache_hits += 1
-            return self._query_cache[cache_key]
+        indexed = self._indexed_query(ALLY, position, radius, iteration)
+        if indexed is not None:
+            return indexed
 
-        result = self.bot.units.closer_than(radius, position)
-        self._query_cache[cache_key] = result
-        self.cache_misses += 1
-        return result
+        return self._cached(
+            ("allies_near", position.x, position.y, radius),
+            lambda: self.bot.units.closer_than(radius, position),
+            iteration,
+        )
 
     def get_allies_near_unit(
         self, unit: "Unit", radius: float, iteration: int
@@ -110,16 +171,16 @@ class SpatialQueryOptimizer:
         """
         self.total_queries += 1
 
-        cache_key = (iteration, "allies_near_unit", unit.tag, radius)
-
-        if cache_key in self._query_cache:
-            self.cache_hits += 1
-            return self._query_cache[cache_key]
+        indexed = self._indexed_query(ALLY, unit, radius, iteration)
+        if indexed is not None:
+            return indexed
 
-        result = self.bot.units.closer_than(radius, unit)
-        self._query_cache[cache_key] = result
-        self.cache_misses += 1
-        return result
+        return self._cached(
+            ("allies_near_unit", unit.tag, radius),
+            lambda: self.bot.units.closer_than(radius, unit),
+            iteration,
+            unit.tag,
+        )
 
     def get_enemies_near_unit(
         self, unit: "Unit", radius: float, iteration: int
@@ -137,16 +198,16 @@ class SpatialQueryOptimizer:
         """
         self.total_queries += 1
 
-        cache_key = (iteration, "enemies_near_unit", unit.tag, radius)
+        indexed = self._indexed_query(ENEMY, unit, radius, iteration)
+        if indexed is not None:
+            return indexed
 
-        if cache_key in self._query_cache:
-            self.cache_hits += 1
-            return self._query_cache[cache_key]
-
-        result = self.bot.enemy_units.closer_than(radius, unit)
-        self._query_cache[cache_key] = result
-        self.cache_misses += 1
-        return result
+        return self._cached(
+            ("enemies_near_unit", unit.tag, radius),
+            lambda: self.bot.enemy_units.closer_than(radius, unit),
+            iteration,
+            unit.tag,
+        )
 
     def get_closest_enemy(self, position: "Point2") -> Optional["Unit"]:
         """
@@ -256,7 +317,7 @@ class SpatialQueryOptimizer:
             iteration: Current game iteration
         """
         if iteration != self._last_cache_clear:
-            self._query_cache.clear()
+            self._cache.purge_expired(NAMESPACE, generation=iteration)
             self._last_cache_clear = iteration
 
     def get_statistics(self) -> Dict[str, any]:
@@ -266,17 +327,23 @@ class SpatialQueryOptimizer:
         Returns:
             Dictionary containing statistics
         """
+        cache_stats = self._cache.stats(NAMESPACE)
         cache_hit_rate = (
-            self.cache_hits / self.total_queries if self.total_queries > 0 else 0.0
+            cache_stats["hits"] / self.total_queries if self.total_queries > 0 else 0.0
         )
 
-        return {
+        stats = {
             "total_queries": self.total_queries,
-            "cache_hits": self.cache_hits,
-            "cache_misses": self.cache_misses,
+            "cache_hits": cache_stats["hits"],
+            "cache_misses": cache_stats["misses"],
+            "cache_evictions": cache_stats["evictions"],
             "cache_hit_rate": cache_hit_rate,
-            "active_cache_entries": len(self._query_cache),
+            "active_cache_entries": cache_stats["size"],
         }
+        index = getattr(self.bot, "spatial_optimizer", None)
+        if index is not None:
+            stats["index"] = index.get_statistics()
+        return stats
 
     def log_statistics(self, iteration: int) -> None:
         """Log statistics periodically"""
@@ -291,8 +358,7 @@ class SpatialQueryOptimizer:
 
             # Reset counters
             self.total_queries = 0
-            self.cache_hits = 0
-            self.cache_misses = 0
+            self._cache.reset_stats(NAMESPACE)
 
     def get_furthest_unit_from_enemies(
         self, units: "Units", iteration: int
@@ -13,6 +13,8 @@ try:
 except ImportError:
     Point2 = None
 
+from utils.map_analysis import get_map_analysis
+
 
 class ChokePointDetector:
     """
@@ -56,6 +58,12 @@ class ChokePointDetector:
             return
 
         self.chokepoint_cache_frame = iteration
+
+        analysis = get_map_analysis(self.bot)
+        if analysis is not None:
+            self.chokepoints = list(analysis.chokes)
+            return
+
         self.chokepoints = []
 
         # Get map ramps and chokepoints from game_info
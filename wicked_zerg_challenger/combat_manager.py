@@ -8,6 +8,8 @@ Combat Manager - 전투 관리자
 import inspect
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 if TYPE_CHECKING:
     from sc2.ids.unit_typeid import UnitTypeId
     from sc2.position import Point2
@@ -59,10 +61,11 @@ from combat.rally_point_calculator import (
     is_army_gathered,
     update_rally_point,
 )
-
 from utils.distance_cache import DistanceCache
 from utils.frame_cache import FrameCache
 from utils.game_constants import GameFrequencies
+from utils.path_distance import path_distance
+from utils.unit_snapshot import get_frame_snapshot
 
 # Import common helpers to reduce code duplication
 try:
@@ -2063,7 +2066,9 @@ class CombatManager:
             return set()
 
         handled = set()
-        retreat_anchor = self._closest_own_base_position()
+        retreat_anchor = self._closest_own_base_position(
+            roaches[0].position if roaches else None
+        )
         for roach in roaches:
             try:
                 if retreat and retreat_anchor is not None:
@@ -2144,9 +2149,18 @@ class CombatManager:
         except Exception:
             return target
 
-    def _closest_own_base_position(self):
+    def _closest_own_base_position(self, near=None):
         bases = list(getattr(self.bot, "townhalls", []) or [])
         if bases:
+            if near is not None:
+                # 직선 거리가 아닌 지상 거리 기준 (램프/벽 우회 반영)
+                base = min(
+                    bases,
+                    key=lambda b: path_distance(
+                        self.bot, getattr(b, "position", b), near
+                    ),
+                )
+                return getattr(base, "position", base)
             return getattr(bases[0], "position", bases[0])
         return getattr(self.bot, "start_location", None)
 
@@ -3072,6 +3086,13 @@ class CombatManager:
         * Phase 41: HP 가중 전투력 계산 (supply x HP%)
         공급 비용 x 현재HP/최대HP 로 실질 전투력 산출
         """
+        # 프레임 스냅샷이 있으면 벡터 연산 (유닛 속성 재조회 없음)
+        snapshot = get_frame_snapshot(self.bot)
+        if snapshot is not None:
+            power = self._snapshot_combat_power(snapshot, units)
+            if power is not None:
+                return power
+
         total = 0.0
         for u in units:
             supply = self._SUPPLY_TABLE.get(u.type_id, 1)
@@ -3083,6 +3104,29 @@ class CombatManager:
             total += supply * max(0.1, hp_ratio)  # 최소 10%는 인정
         return total
 
+    def _snapshot_combat_power(self, snapshot, units):
+        """스냅샷 컬럼 기반 전투력 (units가 한쪽 진영 스냅샷에 없으면 None)"""
+        tags = [u.tag for u in units]
+        for side in (snapshot.own, snapshot.enemy):
+            rows = side.rows_for(tags)
+            if len(rows) != len(tags):
+                continue
+            supply = self._snapshot_supply_lut(snapshot, side)
+            return float(np.sum(supply[rows] * np.maximum(0.1, side.hp_ratio[rows])))
+        return None
+
+    def _snapshot_supply_lut(self, snapshot, side):
+        """스냅샷 진영별 _SUPPLY_TABLE 조회 배열 (프레임당 1회 생성)"""
+        cache = getattr(self, "_supply_lut_cache", None)
+        if cache is None or cache[0] is not snapshot:
+            cache = (snapshot, {})
+            self._supply_lut_cache = cache
+        lut = cache[1].get(id(side))
+        if lut is None:
+            lut = side.type_lookup(self._SUPPLY_TABLE, 1.0)
+            cache[1][id(side)] = lut
+        return lut
+
     async def _evaluate_army_retreat(self, iteration: int):
         """
         * Phase 15-4: 점진적 전력 비교 후퇴 시스템 *
@@ -3185,8 +3229,8 @@ class CombatManager:
 
         for unit in units:
             try:
-                closest_th = self.bot.townhalls.closest_to(unit.position)
-                self.bot.do(unit.move(closest_th.position))
+                closest = self._closest_own_base_position(unit.position)
+                self.bot.do(unit.move(closest))
             except (AttributeError, TypeError):
                 continue
 
@@ -34,3 +34,10 @@ EXPANSION_TIMING_TARGET: float = 60.0    # Target time (s) for natural expansion
 REWARD_NORM_SCALE: float = 5.0            # tanh normalization divisor for rewards
 MIN_WIN_RATE_FOR_PROMOTION: float = 0.40  # Curriculum promotion win-rate floor
 THREAT_CACHE_TTL: float = 0.5             # Seconds before re-computing base threat
+
+# ── Performance ───────────────────────────────────────────────────────────────
+STEP_BUDGET_MS: float = 30.0              # FrameScheduler budget for non-critical managers
+STARTUP_BUDGET_MS: float = 400.0          # on_start manager init budget; rest is deferred
+STARTUP_WARMUP_SLICE_MS: float = 5.0      # Per-step time for building deferred managers
+COMMAND_DEDUP_TOLERANCE: float = 0.1      # Re-issued order to a point this close is a duplicate
+FRAME_PROFILE_SLOW_MS: float = 45.0       # FrameProfiler keeps only frames at least this slow
@@ -1,5 +1,14 @@
 """Core system modules"""
 
+from .command_arbiter import CommandArbiter
 from .manager_factory import ManagerConfig, ManagerFactory, ManagerPriority
+from .startup import LazyManager, StartupReport
 
-__all__ = ["ManagerFactory", "ManagerConfig", "ManagerPriority"]
+__all__ = [
+    "ManagerFactory",
+    "ManagerConfig",
+    "ManagerPriority",
+    "LazyManager",
+    "StartupReport",
+    "CommandArbiter",
+]
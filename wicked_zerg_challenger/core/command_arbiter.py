@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Command Arbiter - 프레임 단위 유닛 명령 중재
+
+여러 매니저가 같은 프레임에 같은 유닛에 bot.do()를 호출하면 SC2는 모두
+순서대로 실행하고(마지막 비큐 명령이 이김) 프로토콜 액션만 늘어난다.
+_after_step 전송 직전에 bot.actions 버퍼를 정리한다:
+
+1. 충돌 해결: 유닛별로 비큐(queue=False) 명령 하나만 남김
+   - UnitAuthorityManager.request_unit 승인 직후 그 유닛의 첫 명령은
+     승인된 권한 레벨을 가짐 (승인 -> do 패턴), 나머지는 레벨 0
+   - 레벨이 높은 명령 우선, 같으면 나중 명령 (SC2 기본 동작과 동일)
+   - 승자 뒤의 큐 명령은 다음 비큐 명령 전까지 유지
+2. 중복 제거: 유닛의 현재 주문(능력 + 대상)과 같은 명령은 보내지 않음
+3. 묶음: 같은 (능력, 대상, 큐) 명령을 인접하게 재배치해
+   sc2.action.combine_actions 가 다중 유닛 액션 하나로 합치게 함
+
+대상 없는 명령(생산, 변태, 정지, 잠복 등)은 건물에서 큐로 쌓이거나
+유닛을 소모하므로, 그런 명령을 받은 유닛은 손대지 않고 그대로 보낸다.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    from sc2.constants import COMBINEABLE_ABILITIES
+except ImportError:
+    COMBINEABLE_ABILITIES = frozenset()
+
+try:
+    from config.constants import COMMAND_DEDUP_TOLERANCE
+except ImportError:
+    COMMAND_DEDUP_TOLERANCE = 0.1
+
+
+def protocol_action_count(actions: List[Any]) -> int:
+    """sc2.action.combine_actions 가 만들 ActionRaw 개수 (인접한 같은 키만 합쳐짐)"""
+    count = 0
+    previous = None
+    for action in actions:
+        key = (action.ability, action.target, action.queue)
+        if action.ability not in COMBINEABLE_ABILITIES:
+            count += 1
+        elif key != previous:
+            count += 1
+        previous = key
+    return count
+
+
+class CommandArbiter:
+    """
+    bot.actions 버퍼 중재기
+
+    Time Complexity:
+    - note_grant: O(1)
+    - resolve: O(n + g) for n buffered commands and g grants
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        # unit tag -> [(승인 시점의 버퍼 길이, 권한 레벨)]
+        self._grants: Dict[int, List[Tuple[int, int]]] = {}
+
+        # 통계
+        self.frames = 0
+        self.commands_in = 0
+        self.conflicts_dropped = 0
+        self.duplicates_dropped = 0
+        self.protocol_actions_in = 0
+        self.protocol_actions_out = 0
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def note_grant(self, unit_tag: int, level: int) -> None:
+        """UnitAuthorityManager 승인: 이 유닛의 다음 명령이 level을 가짐"""
+        position = len(getattr(self.bot, "actions", None) or ())
+        self._grants.setdefault(unit_tag, []).append((position, int(level)))
+
+    # ------------------------------------------------------------------
+    # Resolution
+    # ------------------------------------------------------------------
+
+    def resolve(self, actions: List[Any]) -> List[Any]:
+        """
+        한 프레임의 명령 버퍼를 중재한 결과 (입력 리스트는 바꾸지 않음)
+
+        Args:
+            actions: bot.actions (UnitCommand 리스트, 발행 순서)
+
+        Returns:
+            보낼 명령 리스트 - 같은 명령은 인접, 유닛별 순서는 유지
+        """
+        self.frames += 1
+        self.commands_in += len(actions)
+        self.protocol_actions_in += protocol_action_count(actions)
+
+        by_unit: Dict[int, List[int]] = {}
+        for index, action in enumerate(actions):
+            by_unit.setdefault(action.unit.tag, []).append(index)
+
+        heads: Dict[Tuple[Any, Any, bool], List[Any]] = {}
+        tails: List[int] = []
+        for tag, indices in by_unit.items():
+            kept = self._arbitrate(actions, indices, self._grants.get(tag, ()))
+            self.conflicts_dropped += len(indices) - len(kept)
+            if self._is_current_order(actions[kept[0]]):
+                self.duplicates_dropped += 1
+                kept = kept[1:]
+                if not kept:
+                    continue
+            head = actions[kept[0]]
+            heads.setdefault((head.ability, head.target, head.queue), []).append(head)
+            tails.extend(kept[1:])
+
+        resolved = [action for group in heads.values() for action in group]
+        resolved.extend(actions[i] for i in sorted(tails))
+
+        self.protocol_actions_out += protocol_action_count(resolved)
+        self._grants.clear()
+        return resolved
+
+    def flush(self) -> int:
+        """bot.actions를 중재 결과로 교체 (on_step 끝, _after_step 전송 전)"""
+        actions = getattr(self.bot, "actions", None)
+        if not actions:
+            self._grants.clear()
+            return 0
+        actions[:] = self.resolve(actions)
+        return len(actions)
+
+    @staticmethod
+    def _arbitrate(
+        actions: List[Any], indices: List[int], grants: Sequence[Tuple[int, int]]
+    ) -> List[int]:
+        """한 유닛의 명령 인덱스 중 보낼 것 (발행 순서)"""
+        if len(indices) == 1:
+            return indices
+        if any(actions[i].target is None for i in indices):
+            return indices
+        replacing = [i for i in indices if not actions[i].queue]
+        if not replacing:
+            return indices
+
+        # 승인 직후 이 유닛의 첫 명령이 승인 레벨을 가짐
+        levels: Dict[int, int] = {}
+        for position, level in grants:
+            first = next((i for i in indices if i >= position), None)
+            if first is not None:
+                levels[first] = max(levels.get(first, 0), level)
+
+        winner = max(replacing, key=lambda i: (levels.get(i, 0), i))
+        kept = [winner]
+        for i in indices:
+            if i <= winner:
+                continue
+            if not actions[i].queue:
+                break
+            kept.append(i)
+        return kept
+
+    @staticmethod
+    def _is_current_order(action: Any) -> bool:
+        """유닛이 이미 이 명령(능력 + 대상)만 수행 중인지"""
+        target = action.target
+        if target is None or action.queue:
+            return False
+        orders = getattr(action.unit, "orders", None)
+        if not orders or len(orders) != 1:
+            return False
+        order = orders[0]
+        ability = order.ability
+        if action.ability not in (
+            getattr(ability, "id", None),
+            getattr(ability, "exact_id", None),
+        ):
+            return False
+
+        current = order.target
+        if hasattr(target, "tag"):
+            return current == target.tag
+        if current is None or isinstance(current, int):
+            return False
+        return (
+            abs(current[0] - target[0]) <= COMMAND_DEDUP_TOLERANCE
+            and abs(current[1] - target[1]) <= COMMAND_DEDUP_TOLERANCE
+        )
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "commands_in": self.commands_in,
+            "conflicts_dropped": self.conflicts_dropped,
+            "duplicates_dropped": self.duplicates_dropped,
+            "protocol_actions_in": self.protocol_actions_in,
+            "protocol_actions_out": self.protocol_actions_out,
+        }
+
+
+def get_command_arbiter(bot: Any):
+    """봇에 붙은 명령 중재기 (없으면 None)"""
+    arbiter = getattr(bot, "command_arbiter", None)
+    return arbiter if isinstance(arbiter, CommandArbiter) else None
@@ -8,13 +8,18 @@ Manager Factory - 중앙화된 매니저 초기화 시스템
 - 명확한 에러 보고
 - 초기화 순서 보장
 - 실패한 매니저 추적
+- on_start 시간 예산 / 지연 생성 (core.startup)
 """
 
 import importlib
 import logging
+import time
+from collections import deque
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from core.startup import LazyManager, StartupReport, never_ready
 
 logger = logging.getLogger(__name__)
 
@@ -35,13 +40,15 @@ class ManagerConfig:
 
     name: str  # 표시 이름
     module_path: str  # import 경로
-    class_name: str  # 클래스 이름
+    class_name: str  # 클래스 이름 (bot 을 받는 팩토리 함수도 가능)
     attribute_name: str  # bot 속성 이름
     priority: ManagerPriority  # 우선순위
     dependencies: List[str] = None  # 의존 매니저 (attribute_name)
     init_args: Dict[str, Any] = None  # 추가 초기화 인자
     post_init: Optional[Callable] = None  # 초기화 후 실행 함수
     enabled: bool = True  # 활성화 여부
+    lazy: bool = False  # 첫 사용 시 생성 (on_start에서 제외)
+    activate_when: Optional[Callable] = None  # lazy 활성화 조건 (bot -> bool)
 
     def __post_init__(self):
         if self.dependencies is None:
@@ -57,7 +64,8 @@ class ManagerFactory:
     사용법:
         factory = ManagerFactory(bot)
         factory.register_manager(...)
-        factory.initialize_all()
+        factory.initialize_all(budget_ms=400)
+        factory.warm_up(5)  # on_step마다: 예산 초과로 미뤄진 매니저 생성
     """
 
     def __init__(self, bot):
@@ -66,6 +74,9 @@ class ManagerFactory:
         self.initialized: Set[str] = set()
         self.failed: Dict[str, str] = {}  # attribute_name -> error_msg
         self.initialization_order: List[str] = []
+        self.lazy: Dict[str, LazyManager] = {}  # 아직 생성 전인 매니저 프록시
+        self._deferred: Deque[str] = deque()  # warm_up() 대기열 (우선순위 순)
+        self.startup_report = StartupReport()
 
     def register_manager(self, config: ManagerConfig) -> None:
         """
@@ -92,16 +103,25 @@ class ManagerFactory:
         for config in configs:
             self.register_manager(config)
 
-    def initialize_all(self, verbose: bool = True) -> Dict[str, Any]:
+    def initialize_all(
+        self, verbose: bool = True, budget_ms: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         모든 매니저 초기화 (의존성 순서 보장)
 
+        lazy 매니저는 프록시만 설치하고 첫 사용 시 생성합니다.
+        budget_ms를 넘기면 남은 MEDIUM 이하 매니저도 프록시로 미루고
+        warm_up()이 이후 스텝에서 생성합니다 (CRITICAL/HIGH는 항상 생성).
+
         Args:
             verbose: 상세 로그 출력 여부
+            budget_ms: on_start 시간 예산 (None이면 전부 즉시 생성)
 
         Returns:
             초기화 결과 통계
         """
+        report = self.startup_report = StartupReport(budget_ms)
+
         # 1. 우선순위 정렬
         sorted_managers = sorted(
             self.managers.values(), key=lambda m: (m.priority, m.name)
@@ -112,7 +132,18 @@ class ManagerFactory:
             if not config.enabled:
                 continue
 
-            self._initialize_manager(config, verbose)
+            if config.lazy:
+                self._defer(config, "lazy", config.activate_when)
+            elif (
+                budget_ms is not None
+                and config.priority > ManagerPriority.HIGH
+                and report.elapsed_ms() >= budget_ms
+            ):
+                self._defer(config, "deferred", never_ready)
+            else:
+                self._initialize_manager(config, verbose)
+
+        report.on_start_ms = report.elapsed_ms()
 
         # 3. 결과 보고
         stats = self._get_statistics()
@@ -154,10 +185,14 @@ class ManagerFactory:
                     self._initialize_manager(dep_config, verbose)
 
         # 매니저 초기화 시도
+        timing = self.startup_report.timing(attr_name, config.name)
+        started = time.perf_counter()
         try:
             # 1. 모듈 import
             module = importlib.import_module(config.module_path)
             manager_class = getattr(module, config.class_name)
+            imported = time.perf_counter()
+            timing.import_ms = (imported - started) * 1000.0
 
             # 2. 인스턴스 생성
             init_kwargs = {}
@@ -190,6 +225,10 @@ class ManagerFactory:
             # 5. 성공 기록
             self.initialized.add(attr_name)
             self.initialization_order.append(attr_name)
+            timing.construct_ms = (time.perf_counter() - imported) * 1000.0
+            timing.resolved_at_ms = self.startup_report.elapsed_ms()
+            if attr_name in self.lazy:
+                self.lazy.pop(attr_name)._lazy_bind(manager_instance)
 
             # 6. 로그 출력
             if verbose:
@@ -201,6 +240,7 @@ class ManagerFactory:
         except ImportError as e:
             # Import 실패
             self.failed[attr_name] = f"ImportError: {e}"
+            timing.error = self.failed[attr_name]
             setattr(self.bot, attr_name, None)
 
             if verbose:
@@ -211,6 +251,7 @@ class ManagerFactory:
         except Exception as e:
             # 기타 초기화 실패
             self.failed[attr_name] = f"InitError: {e}"
+            timing.error = self.failed[attr_name]
             setattr(self.bot, attr_name, None)
 
             if verbose:
@@ -223,6 +264,71 @@ class ManagerFactory:
 
             return False
 
+    def _defer(self, config: ManagerConfig, mode: str, ready) -> None:
+        """프록시를 bot 속성에 설치하고 생성을 미룸"""
+        attr_name = config.attribute_name
+        if attr_name in self.initialized or attr_name in self.failed:
+            return  # 다른 매니저의 의존성으로 이미 처리됨
+        self.lazy[attr_name] = LazyManager(self, config, ready)
+        setattr(self.bot, attr_name, self.lazy[attr_name])
+        self.startup_report.timing(attr_name, config.name).mode = mode
+        if mode == "deferred":
+            self._deferred.append(attr_name)
+
+    def resolve(self, attribute_name: str) -> Optional[Any]:
+        """
+        지연된 매니저를 지금 생성 (이미 생성되었으면 그대로 반환)
+
+        Args:
+            attribute_name: 매니저 속성 이름
+
+        Returns:
+            매니저 인스턴스 또는 None (실패)
+        """
+        proxy = self.lazy.get(attribute_name)
+        if proxy is None:
+            return self.get_manager(attribute_name)
+
+        config = self.managers[attribute_name]
+        timing = self.startup_report.timing(attribute_name, config.name)
+
+        # 다른 곳(예: BotStepIntegrator)에서 이미 새로 생성했으면 그대로 채택
+        current = getattr(self.bot, attribute_name, None)
+        if current is not None and current is not proxy:
+            self.lazy.pop(attribute_name)._lazy_bind(current)
+            self.initialized.add(attribute_name)
+            timing.resolved_at_ms = self.startup_report.elapsed_ms()
+            return current
+
+        self._initialize_manager(config, verbose=False)
+        self.lazy.pop(attribute_name, None)
+        if attribute_name in self.failed:
+            timing.error = self.failed[attribute_name]
+        return self.get_manager(attribute_name)
+
+    def warm_up(self, budget_ms: float = 5.0) -> int:
+        """
+        on_start 예산 초과로 미뤄진 매니저를 우선순위 순으로 생성 (on_step마다 호출)
+
+        한 매니저의 생성이 남은 예산보다 길 수 있으므로, 예산은 새 매니저를
+        시작할지 판단하는 데만 쓰입니다.
+
+        Args:
+            budget_ms: 이번 스텝에서 쓸 시간
+
+        Returns:
+            생성한 매니저 수
+        """
+        built = 0
+        started = time.perf_counter()
+        while self._deferred:
+            if (time.perf_counter() - started) * 1000.0 >= budget_ms:
+                break
+            attr_name = self._deferred.popleft()
+            if attr_name in self.lazy and self.resolve(attr_name) is not None:
+                built += 1
+        return built
+
     def _get_statistics(self) -> Dict[str, Any]:
         """초기화 통계 반환"""
         total = len([m for m in self.managers.values() if m.enabled])
@@ -236,6 +342,8 @@ class ManagerFactory:
             "success_rate": succeeded / total * 100 if total > 0 else 0,
             "failed_managers": list(self.failed.keys()),
             "initialization_order": self.initialization_order,
+            "pending_managers": list(self.lazy.keys()),
+            "startup_ms": self.startup_report.on_start_ms,
         }
 
     def _log_summary(self, stats: Dict[str, Any]) -> None:
@@ -251,6 +359,8 @@ class ManagerFactory:
         else:
             logger.info(f"Failed: {stats['failed']}")
         logger.info(f"Success Rate: {stats['success_rate']:.1f}%")
+        for line in self.startup_report.format_lines(top=5):
+            logger.info(line)
 
         if stats["failed_managers"]:
             logger.error(f"\nFailed Managers ({len(stats['failed_managers'])}):")
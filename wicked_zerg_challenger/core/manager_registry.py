@@ -7,6 +7,36 @@ Manager Registry - 모든 매니저 설정 중앙 관리
 """
 
 from core.manager_factory import ManagerConfig, ManagerPriority
+from core.phase_runner import ALL_UNITS, ManagerAccess, access
+
+# 유닛 권한 풀 (UnitTypeId 이름 기준)
+ARMY_POOLS = (
+    "ZERGLING",
+    "BANELING",
+    "ROACH",
+    "RAVAGER",
+    "HYDRALISK",
+    "LURKERMP",
+    "MUTALISK",
+    "CORRUPTOR",
+    "ULTRALISK",
+    "BROODLORD",
+)
+
+
+def _owns_unit_types(*type_names):
+    """lazy 매니저 활성화 조건: 해당 유닛을 하나라도 보유"""
+    names = frozenset(type_names)
+
+    def check(bot) -> bool:
+        return any(unit.type_id.name in names for unit in bot.units)
+
+    return check
+
+
+def _enemy_structures_seen(bot) -> bool:
+    """lazy 매니저 활성화 조건: 적 건물을 발견함"""
+    return bool(bot.enemy_structures)
 
 
 def get_all_manager_configs():
@@ -104,6 +134,16 @@ def get_all_manager_configs():
             ),
         ),
         # ========== MEDIUM PRIORITY ==========
+        # 맵별 정적 계산 (레이어 + 지상 거리장): 캐시 미스면 수백 ms 이상 걸리므로
+        # 예산 안에서만 생성하고, 넘치면 warm_up 으로 미룸 (그 전까지 path_distance 는
+        # 직선 거리, 맵 분석 소비자는 게임 정보로 직접 계산)
+        ManagerConfig(
+            name="MapAnalysis",
+            module_path="utils.map_analysis",
+            class_name="build_for_bot",
+            attribute_name="map_analysis",
+            priority=ManagerPriority.MEDIUM,
+        ),
         ManagerConfig(
             name="* AdvancedWorkerOptimizer",
             module_path="advanced_worker_optimizer",
@@ -207,6 +247,11 @@ def get_all_manager_configs():
             class_name="SpellUnitManager",
             attribute_name="spell_manager",
             priority=ManagerPriority.LOW,
+            # 스킬 유닛(궤멸충 이후)이 나오기 전에는 할 일이 없음
+            lazy=True,
+            activate_when=_owns_unit_types(
+                "RAVAGER", "INFESTOR", "INFESTORBURROWED", "VIPER"
+            ),
         ),
         ManagerConfig(
             name="AggressiveStrategies",
@@ -258,6 +303,8 @@ def get_all_manager_configs():
             class_name="BuildingDestroyer",
             attribute_name="building_destroyer",
             priority=ManagerPriority.LOW,
+            lazy=True,
+            activate_when=_enemy_structures_seen,
         ),
         ManagerConfig(
             name="CreepHighwayManager",
@@ -300,6 +347,72 @@ def get_all_manager_configs():
     ]
 
 
+def get_pre_combat_phase_accesses():
+    """
+    전투 전 단계(BotStepIntegrator 0.007~0.017) 매니저의 읽기/쓰기 선언
+
+    선언 순서 = 기존 실행 순서. PhaseRunner가 충돌 없는 매니저를
+    같은 wave로 묶어 동시 실행합니다.
+
+    Returns:
+        List[ManagerAccess]: 선언 리스트
+    """
+    return [
+        access(
+            "map_memory",
+            "MapMemory",
+            writes={"enemy_structure_memory"},
+        ),
+        access(
+            "complete_destruction",
+            "CompleteDestruction",
+            reads={"enemy_structure_memory"},
+            unit_pools=ARMY_POOLS,
+        ),
+        access("roach_tactics", "RoachTactics", unit_pools={"ROACH"}),
+        access(
+            "zergling_harass",
+            "ZerglingHarass",
+            reads={"enemy_structure_memory"},
+            unit_pools={"ZERGLING"},
+        ),
+        access("overseer_scout", "OverseerScout", unit_pools={"OVERSEER"}),
+        access(
+            "air_threat_response",
+            "AirThreatResponse",
+            writes={"production_requests"},
+            unit_pools={"QUEEN"},
+        ),
+        access("space_control", "SpaceControl", unit_pools={"DRONE"}),
+        # 모든 유닛 스킬을 다루므로 유닛 풀 전체와 충돌
+        access("unit_abilities", "UnitAbilities", unit_pools={ALL_UNITS}),
+        access("roach_tunneling", "RoachTunneling", unit_pools={"ROACH"}),
+        access(
+            "creep_expansion",
+            "CreepExpansion",
+            writes={"creep_targets"},
+            unit_pools={"QUEEN", "CREEPTUMORBURROWED"},
+        ),
+        access("creep_denial", "CreepDenial", unit_pools={"OVERSEER", *ARMY_POOLS}),
+        access(
+            "hive_tech",
+            "HiveTech",
+            writes={"resources", "production_requests"},
+            # Hydralisk→Lurker / Corruptor→Brood Lord 변태, Greater Spire 및
+            # 풀 / 울트라 동굴 연구 명령까지 포함
+            unit_pools={
+                "LARVA",
+                "DRONE",
+                "HYDRALISK",
+                "CORRUPTOR",
+                "SPIRE",
+                "SPAWNINGPOOL",
+                "ULTRALISKCAVERN",
+            },
+        ),
+    ]
+
+
 def get_minimal_manager_configs():
     """
     Minimal manager configs for fast testing.
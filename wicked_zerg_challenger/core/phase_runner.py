@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Phase Runner - 독립 매니저 동시 실행
+
+매니저마다 읽기/쓰기 키(Blackboard/공유 상태)와 유닛 권한 풀을 선언하면,
+같은 단계(phase) 안에서 서로 충돌하지 않는 매니저를 wave로 묶어
+asyncio.gather로 함께 실행합니다.
+
+- wave 배정: 앞선 매니저와 충돌하면 그 매니저의 wave + 1 (선언 순서 보존)
+- 단계 소요 시간: 가장 긴 의존 체인(wave 수)으로 축소
+- 순수 CPU 계산(numpy 등)은 run_in_thread로 스레드 풀에서 실행
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# 모든 유닛 풀과 충돌하는 와일드카드 (유닛 전반에 명령을 내리는 매니저)
+ALL_UNITS = "*"
+
+
+@dataclass(frozen=True)
+class ManagerAccess:
+    """매니저 읽기/쓰기 선언"""
+
+    attribute_name: str  # bot 속성 이름
+    label: str  # LogicActivityTracker / FrameScheduler 라벨
+    reads: FrozenSet[str] = frozenset()  # 읽는 공유 상태 키
+    writes: FrozenSet[str] = frozenset()  # 쓰는 공유 상태 키
+    unit_pools: FrozenSet[str] = frozenset()  # 명령을 내리는 유닛 권한 풀
+
+    def conflicts_with(self, other: "ManagerAccess") -> bool:
+        """두 매니저를 같은 wave에서 실행할 수 없으면 True"""
+        if self.writes & (other.reads | other.writes):
+            return True
+        if other.writes & self.reads:
+            return True
+        if self.unit_pools and other.unit_pools:
+            if ALL_UNITS in self.unit_pools or ALL_UNITS in other.unit_pools:
+                return True
+            if self.unit_pools & other.unit_pools:
+                return True
+        return False
+
+
+def access(
+    attribute_name: str,
+    label: str,
+    reads=(),
+    writes=(),
+    unit_pools=(),
+) -> ManagerAccess:
+    """ManagerAccess 생성 헬퍼 (iterable -> frozenset)"""
+    return ManagerAccess(
+        attribute_name=attribute_name,
+        label=label,
+        reads=frozenset(reads),
+        writes=frozenset(writes),
+        unit_pools=frozenset(unit_pools),
+    )
+
+
+def plan_waves(accesses: List[ManagerAccess]) -> List[List[ManagerAccess]]:
+    """
+    선언 순서를 보존하면서 충돌 없는 wave로 분할
+
+    Returns:
+        wave 리스트 (각 wave 내부는 동시 실행 가능)
+    """
+    levels: List[int] = []
+    waves: List[List[ManagerAccess]] = []
+
+    for index, current in enumerate(accesses):
+        level = 0
+        for previous_index in range(index):
+            if current.conflicts_with(accesses[previous_index]):
+                level = max(level, levels[previous_index] + 1)
+        levels.append(level)
+        while len(waves) <= level:
+            waves.append([])
+        waves[level].append(current)
+
+    return waves
+
+
+class PhaseRunner:
+    """
+    선언된 단계를 wave 단위로 실행
+
+    사용법:
+        runner = PhaseRunner()
+        await runner.run_phase(accesses, lambda a: step(a))
+        result = await runner.run_in_thread(model.predict, state)
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._wave_cache: Dict[Tuple[ManagerAccess, ...], List[List[ManagerAccess]]] = (
+            {}
+        )
+
+        # 통계
+        self.phases_run = 0
+        self.waves_run = 0
+        self.managers_run = 0
+
+    def waves(self, accesses: List[ManagerAccess]) -> List[List[ManagerAccess]]:
+        """wave 분할 (선언이 바뀌지 않으면 캐시 재사용)"""
+        key = tuple(accesses)
+        cached = self._wave_cache.get(key)
+        if cached is None:
+            cached = plan_waves(list(accesses))
+            self._wave_cache[key] = cached
+        return cached
+
+    def critical_path_length(self, accesses: List[ManagerAccess]) -> int:
+        """단계의 가장 긴 의존 체인 길이 (= wave 수)"""
+        return len(self.waves(accesses))
+
+    async def run_phase(
+        self,
+        accesses: List[ManagerAccess],
+        step: Callable[[ManagerAccess], Awaitable[Any]],
+    ) -> None:
+        """
+        단계 실행
+
+        Args:
+            accesses: 선언 순서대로의 매니저 목록
+            step: 매니저 하나를 실행하는 코루틴 함수 (에러 처리는 step 책임)
+        """
+        self.phases_run += 1
+        for wave in self.waves(accesses):
+            self.waves_run += 1
+            self.managers_run += len(wave)
+            if len(wave) == 1:
+                await step(wave[0])
+            else:
+                await asyncio.gather(*(step(item) for item in wave))
+
+    async def run_in_thread(self, func: Callable, *args, **kwargs) -> Any:
+        """순수 계산 함수를 스레드 풀에서 실행 (이벤트 루프 비차단)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="phase_runner"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self) -> None:
+        """스레드 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "phases_run": self.phases_run,
+            "waves_run": self.waves_run,
+            "managers_run": self.managers_run,
+        }
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Startup - on_start 매니저 초기화 시간 예산
+
+- StartupReport: 매니저별 import 시간 vs 생성자(+post_init) 시간 분해
+- LazyManager: 아직 생성되지 않은 매니저 자리를 채우는 프록시
+  * lazy 매니저(후반 전용 등): activate_when 조건이 처음 참이 될 때 생성
+  * deferred 매니저: on_start 예산 초과분, ManagerFactory.warm_up()이
+    on_step마다 조금씩 생성
+- 진리값 검사(`if bot.x:`)에서 대기 중인 프록시는 None처럼 거짓으로 취급되어
+  기존 호출부가 "아직 없는 매니저"로 건너뜁니다. 속성 접근은 즉시 생성합니다.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from config.constants import STARTUP_BUDGET_MS, STARTUP_WARMUP_SLICE_MS
+except ImportError:
+    STARTUP_BUDGET_MS = 400.0
+    STARTUP_WARMUP_SLICE_MS = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StartupTiming:
+    """매니저 하나의 초기화 시간 분해"""
+
+    attribute_name: str
+    name: str
+    mode: str = "eager"  # eager / lazy / deferred
+    import_ms: float = 0.0  # 모듈 import (이미 로드된 모듈이면 ~0)
+    construct_ms: float = 0.0  # 생성자 + post_init
+    resolved_at_ms: Optional[float] = None  # 초기화 시작 기준 생성 완료 시각
+    error: Optional[str] = None
+
+    @property
+    def total_ms(self) -> float:
+        return self.import_ms + self.construct_ms
+
+
+class StartupReport:
+    """on_start 매니저 초기화 리포트"""
+
+    def __init__(self, budget_ms: Optional[float] = None):
+        self.budget_ms = budget_ms
+        self.started_at = time.perf_counter()
+        self.on_start_ms = 0.0  # initialize_all() 소요 시간
+        self.timings: Dict[str, StartupTiming] = {}
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000.0
+
+    def timing(self, attribute_name: str, name: str) -> StartupTiming:
+        if attribute_name not in self.timings:
+            self.timings[attribute_name] = StartupTiming(attribute_name, name)
+        return self.timings[attribute_name]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget_ms is not None and self.on_start_ms > self.budget_ms
+
+    def pending(self) -> List[str]:
+        """아직 생성되지 않은 lazy/deferred 매니저"""
+        return [
+            t.attribute_name
+            for t in self.timings.values()
+            if t.mode != "eager" and t.resolved_at_ms is None and t.error is None
+        ]
+
+    def totals(self) -> Dict[str, float]:
+        """on_start 안에서 생성된 매니저의 import / 생성자 합계 (ms)"""
+        in_start = [
+            t
+            for t in self.timings.values()
+            if t.resolved_at_ms is not None and t.resolved_at_ms <= self.on_start_ms
+        ]
+        return {
+            "import_ms": sum(t.import_ms for t in in_start),
+            "construct_ms": sum(t.construct_ms for t in in_start),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "on_start_ms": self.on_start_ms,
+            "budget_ms": self.budget_ms,
+            "over_budget": self.over_budget,
+            **self.totals(),
+            "pending": self.pending(),
+            "managers": {
+                attr: {
+                    "mode": t.mode,
+                    "import_ms": t.import_ms,
+                    "construct_ms": t.construct_ms,
+                    "resolved_at_ms": t.resolved_at_ms,
+                    "error": t.error,
+                }
+                for attr, t in self.timings.items()
+            },
+        }
+
+    def format_lines(self, top: int = 10) -> List[str]:
+        """가장 느린 매니저 top개 (import / 생성자 시간)"""
+        budget = f"{self.budget_ms:.0f}ms" if self.budget_ms is not None else "none"
+        totals = self.totals()
+        lines = [
+            f"Startup: {self.on_start_ms:.1f}ms (budget {budget}) - "
+            f"import {totals['import_ms']:.1f}ms / "
+            f"construct {totals['construct_ms']:.1f}ms"
+        ]
+        slowest = sorted(self.timings.values(), key=lambda t: -t.total_ms)[:top]
+        for t in slowest:
+            if t.resolved_at_ms is None:
+                continue
+            lines.append(
+                f"  {t.attribute_name:<24} {t.mode:<8} "
+                f"import {t.import_ms:7.1f}ms  construct {t.construct_ms:7.1f}ms"
+            )
+        pending = self.pending()
+        if pending:
+            lines.append(f"  pending ({len(pending)}): {', '.join(pending)}")
+        return lines
+
+
+def never_ready(bot) -> bool:
+    """deferred 매니저: warm_up()이나 직접 속성 접근 전까지 비활성"""
+    return False
+
+
+class LazyManager:
+    """
+    아직 생성되지 않은 매니저의 프록시
+
+    - 속성 읽기/쓰기: 즉시 생성 후 실제 인스턴스로 위임
+      (생성되면 bot 속성도 실제 인스턴스로 교체)
+    - 진리값: ready(bot)가 참이면 생성 후 True, 아니면 False
+      (ready가 None이면 첫 진리값 검사에서 생성)
+    - isinstance 검사와 특수 메서드(len, iter 등)는 위임되지 않음
+    """
+
+    __slots__ = ("_lazy_factory", "_lazy_config", "_lazy_ready", "_lazy_instance")
+
+    def __init__(self, factory, config, ready: Optional[Callable[[Any], bool]] = None):
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_config", config)
+        object.__setattr__(self, "_lazy_ready", ready)
+        object.__setattr__(self, "_lazy_instance", None)
+
+    def _lazy_bind(self, instance: Any) -> None:
+        object.__setattr__(self, "_lazy_instance", instance)
+
+    def _lazy_resolve(self) -> Any:
+        if self._lazy_instance is None:
+            self._lazy_factory.resolve(self._lazy_config.attribute_name)
+        return self._lazy_instance
+
+    def _lazy_target(self) -> Any:
+        instance = self._lazy_resolve()
+        if instance is None:
+            reason = self._lazy_factory.get_failed_reason(
+                self._lazy_config.attribute_name
+            )
+            raise AttributeError(f"{self._lazy_config.name} unavailable: {reason}")
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._lazy_target(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._lazy_target(), name, value)
+
+    def __bool__(self) -> bool:
+        if self._lazy_instance is not None:
+            return True
+        if self._lazy_factory.get_failed_reason(self._lazy_config.attribute_name):
+            return False
+        ready = self._lazy_ready
+        if ready is not None:
+            try:
+                if not ready(self._lazy_factory.bot):
+                    return False
+            except Exception as e:
+                logger.debug(
+                    "[STARTUP] %s activation check failed: %s",
+                    self._lazy_config.name,
+                    e,
+                )
+                return False
+        return self._lazy_resolve() is not None
+
+    def __repr__(self) -> str:
+        state = "ready" if self._lazy_instance is not None else "pending"
+        return f"<LazyManager {self._lazy_config.attribute_name} ({state})>"
@@ -15,7 +15,11 @@ from __future__ import annotations
 
 import logging
 import math
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from utils.map_analysis import CREEP_GRID_CELL_SIZE, get_map_analysis
 
 logger = logging.getLogger(__name__)
 
@@ -588,6 +592,197 @@ class CreepManager:
 from collections import deque  # noqa: E402  - module mid-section import 의도
 
 
+class CreepPlanner:
+    """
+    NumPy 그리드 기반 크립 종양 배치 계획기 (CreepSpreadManager 용)
+
+    - 점막/이동 가능/시야 그리드를 갱신마다 배열로 한 번 받아 커버리지를
+      마스크 합 한 번으로 계산
+    - 후보 셀별 "가장 가까운 종양까지 거리" 필드를 종양이 추가될 때 증분
+      갱신 (종양이 사라졌을 때만 전체 재계산)
+    - 모든 후보 셀을 한 번의 벡터 연산으로 점수화
+    """
+
+    def __init__(self):
+        # 후보 셀 (BFS 그리드), (N, 2)
+        self.targets = np.zeros((0, 2))
+        self.tumor_distance = np.zeros(0)
+        self.pending = np.zeros(0, dtype=bool)
+        self._target_index: Dict[Tuple[float, float], int] = {}
+
+        # 우선순위 방향 (확장 기지 2.0, 적 기지 1.0) 과 후보별 거리 (N, M)
+        self._direction_points = np.zeros((0, 2))
+        self._direction_weights = np.zeros(0)
+        self._target_direction_dist = np.zeros((0, 0))
+
+        self._tumors: Set[Tuple[float, float]] = set()
+        self._on_creep: Optional[np.ndarray] = None
+
+        self.creep: Optional[np.ndarray] = None
+        self.pathable: Optional[np.ndarray] = None
+        self.visibility: Optional[np.ndarray] = None
+        self.coverage: float = 0.0
+        self.vision_coverage: float = 0.0
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def set_targets(self, points: Sequence[Tuple[float, float]]) -> None:
+        """후보 셀 설정 (맵당 1회). 거리 필드/방향 거리는 다시 계산"""
+        self.targets = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.pending = np.zeros(len(self.targets), dtype=bool)
+        self._target_index = {
+            (round(x, 1), round(y, 1)): i for i, (x, y) in enumerate(self.targets)
+        }
+        self._rebuild_tumor_distance()
+        self._update_direction_distances()
+        self._update_on_creep()
+
+    def set_directions(
+        self, points: Sequence[Tuple[float, float]], weights: Sequence[float]
+    ) -> None:
+        """우선순위 방향점과 가중치 (후보가 원점보다 가까워지면 가중치 가산)"""
+        self._direction_points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self._direction_weights = np.asarray(weights, dtype=float)
+        self._update_direction_distances()
+
+    def _update_direction_distances(self) -> None:
+        diff = self.targets[:, None, :] - self._direction_points[None, :, :]
+        self._target_direction_dist = np.hypot(diff[..., 0], diff[..., 1])
+
+    # ------------------------------------------------------------------
+    # Per-update inputs
+    # ------------------------------------------------------------------
+
+    def update_grids(
+        self,
+        creep: np.ndarray,
+        pathable: Optional[np.ndarray] = None,
+        visibility: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Args:
+            creep: (height, width), 0이 아니면 점막
+            pathable: (height, width), 0이 아니면 지상 이동 가능
+            visibility: (height, width), 2 = 현재 시야
+        """
+        self.creep = creep != 0
+        if pathable is not None and pathable.shape == creep.shape:
+            self.pathable = pathable != 0
+        else:
+            self.pathable = np.ones(creep.shape, dtype=bool)
+        self.visibility = visibility
+
+        pathable_cells = np.count_nonzero(self.pathable)
+        if pathable_cells:
+            self.coverage = (
+                np.count_nonzero(self.creep & self.pathable) / pathable_cells
+            )
+            if visibility is not None and visibility.shape == creep.shape:
+                self.vision_coverage = (
+                    np.count_nonzero((visibility == 2) & self.pathable) / pathable_cells
+                )
+        self._update_on_creep()
+
+    def _update_on_creep(self) -> None:
+        if self.creep is None:
+            self._on_creep = None
+            return
+        height, width = self.creep.shape
+        cells = np.floor(self.targets).astype(np.intp)
+        x, y = cells[:, 0], cells[:, 1]
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        self._on_creep = np.zeros(len(self.targets), dtype=bool)
+        self._on_creep[inside] = self.creep[y[inside], x[inside]]
+
+    def set_tumors(self, positions: Iterable[Tuple[float, float]]) -> None:
+        """현재 종양 위치. 추가분만 거리 필드에 반영, 제거가 있으면 재계산"""
+        positions = set(positions)
+        if self._tumors - positions:
+            self._tumors = positions
+            self._rebuild_tumor_distance()
+            return
+        added = positions - self._tumors
+        self._tumors = positions
+        if added:
+            np.minimum(
+                self.tumor_distance,
+                self._distance_to(np.array(sorted(added), dtype=float)),
+                out=self.tumor_distance,
+            )
+
+    def _rebuild_tumor_distance(self) -> None:
+        if self._tumors:
+            tumors = np.array(sorted(self._tumors), dtype=float)
+            self.tumor_distance = self._distance_to(tumors)
+        else:
+            self.tumor_distance = np.full(len(self.targets), np.inf)
+
+    def _distance_to(self, points: np.ndarray) -> np.ndarray:
+        """후보별 points 중 최근접 거리 (N,)"""
+        if not len(self.targets):
+            return np.zeros(0)
+        dx = np.subtract.outer(self.targets[:, 0], points[:, 0])
+        dy = np.subtract.outer(self.targets[:, 1], points[:, 1])
+        return np.hypot(dx, dy).min(axis=1)
+
+    def mark_pending(self, position: Tuple[float, float]) -> None:
+        """명령을 내린 후보 셀은 다시 고르지 않음"""
+        index = self._target_index.get(position)
+        if index is not None:
+            self.pending[index] = True
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def score(
+        self,
+        source: Tuple[float, float],
+        spread_range: float,
+        min_tumor_distance: float,
+        require_creep: bool = True,
+    ) -> np.ndarray:
+        """
+        모든 후보 점수 (N,). 배치 불가 후보는 -inf.
+
+        score = sum(방향 가중치 | 후보가 원점보다 방향점에 가까움) + 0.1 * 거리
+        """
+        sx, sy = float(source[0]), float(source[1])
+        dist = np.hypot(self.targets[:, 0] - sx, self.targets[:, 1] - sy)
+        valid = (dist >= 2) & (dist <= spread_range) & ~self.pending
+        valid &= self.tumor_distance >= min_tumor_distance
+        if require_creep and self._on_creep is not None:
+            valid &= self._on_creep
+
+        scores = dist * 0.1
+        if len(self._direction_weights):
+            source_dist = np.hypot(
+                self._direction_points[:, 0] - sx, self._direction_points[:, 1] - sy
+            )
+            closer = self._target_direction_dist < source_dist
+            scores += closer @ self._direction_weights
+        scores[~valid] = -np.inf
+        return scores
+
+    def best_target(
+        self,
+        source: Tuple[float, float],
+        spread_range: float,
+        min_tumor_distance: float,
+        require_creep: bool = True,
+    ) -> Optional[Tuple[float, float]]:
+        """최고 점수 후보 (동점이면 그리드 순서상 앞선 것), 없으면 None"""
+        if not len(self.targets):
+            return None
+        scores = self.score(source, spread_range, min_tumor_distance, require_creep)
+        index = int(np.argmax(scores))
+        if scores[index] == -np.inf:
+            return None
+        return float(self.targets[index, 0]), float(self.targets[index, 1])
+
+
 class CreepSpreadManager:
     """
     크립 스프레드 최적화 매니저 (Feature #97)
@@ -626,6 +821,7 @@ class CreepSpreadManager:
         # 크립 그리드 (BFS 기반)
         self._target_grid: List[Point2] = []
         self._grid_generated: bool = False
+        self._planner = CreepPlanner()
 
         # 퀸 관리
         self.creep_queen_tags: Set[int] = set()
@@ -664,6 +860,10 @@ class CreepSpreadManager:
             if iteration % 44 == 0:
                 self._update_tumor_positions()
 
+            # 점막/지형/시야 그리드 갱신 (배치 계산 전 1회)
+            if iteration % 22 == 0 or iteration % 33 == 0:
+                self._refresh_grids()
+
             # 퀸으로 크립 종양 생성
             if iteration % 22 == 0:
                 await self._queen_spread_creep(game_time)
@@ -691,6 +891,17 @@ class CreepSpreadManager:
             return
 
         start = self.bot.start_location
+
+        # 맵/스폰별 정적 분석 캐시(utils.map_analysis)가 있으면 BFS 생략
+        analysis = get_map_analysis(self.bot)
+        if (
+            analysis is not None
+            and self.GRID_CELL_SIZE == CREEP_GRID_CELL_SIZE
+            and analysis.matches_spawn(start=start)
+        ):
+            self._set_target_grid(list(analysis.creep_targets))
+            return
+
         map_size = self.bot.game_info.map_size
 
         visited: Set[Tuple[int, int]] = set()
@@ -745,8 +956,13 @@ class CreepSpreadManager:
         # * Phase 45: BFS 그리드 최대 300개 cap (성능 보호)
         if len(targets) > 300:
             targets = targets[:300]
+        self._set_target_grid(targets)
+
+    def _set_target_grid(self, targets: List[Point2]):
         self._target_grid = targets
         self._grid_generated = True
+        self._planner.set_targets([(p.x, p.y) for p in targets])
+        self._planner.set_tumors(self.tumor_positions)
 
     def _update_priority_directions(self):
         """확산 우선순위 방향 업데이트"""
@@ -763,6 +979,29 @@ class CreepSpreadManager:
         ):
             self._enemy_direction = self.bot.enemy_start_locations[0]
 
+        points = [(p.x, p.y) for p in self._expansion_directions]
+        weights = [2.0] * len(points)
+        if self._enemy_direction:
+            points.append((self._enemy_direction.x, self._enemy_direction.y))
+            weights.append(1.0)
+        self._planner.set_directions(points, weights)
+
+    def _refresh_grids(self) -> bool:
+        """현재 점막/이동 가능/시야 그리드를 계획기에 전달 (numpy 뷰, 복사 없음)"""
+        state = getattr(self.bot, "state", None)
+        creep = getattr(getattr(state, "creep", None), "data_numpy", None)
+        if not isinstance(creep, np.ndarray):
+            return False
+        game_info = getattr(self.bot, "game_info", None)
+        pathing = getattr(getattr(game_info, "pathing_grid", None), "data_numpy", None)
+        visibility = getattr(getattr(state, "visibility", None), "data_numpy", None)
+        self._planner.update_grids(
+            creep,
+            pathing if isinstance(pathing, np.ndarray) else None,
+            visibility if isinstance(visibility, np.ndarray) else None,
+        )
+        return True
+
     def _update_tumor_positions(self):
         """현재 크립 종양 위치 업데이트"""
         if not hasattr(self.bot, "structures"):
@@ -776,6 +1015,7 @@ class CreepSpreadManager:
             for tumor in self.bot.structures(tid):
                 pos = (round(tumor.position.x, 1), round(tumor.position.y, 1))
                 self.tumor_positions.add(pos)
+        self._planner.set_tumors(self.tumor_positions)
 
     async def _queen_spread_creep(self, game_time: float):
         """퀸을 사용한 크립 종양 생성 (에너지 >= 50 시)"""
@@ -812,6 +1052,7 @@ class CreepSpreadManager:
                 self.total_tumors_created += 1
                 pos_tuple = (round(tumor_pos.x, 1), round(tumor_pos.y, 1))
                 self.pending_tumor_positions.add(pos_tuple)
+                self._planner.mark_pending(pos_tuple)
             except Exception as e:
                 logger.warning(
                     f"[CreepSpreadManager] queen tumor creation suppressed: {e}"
@@ -846,6 +1087,7 @@ class CreepSpreadManager:
                 self.total_tumors_created += 1
                 pos_tuple = (round(spread_pos.x, 1), round(spread_pos.y, 1))
                 self.pending_tumor_positions.add(pos_tuple)
+                self._planner.mark_pending(pos_tuple)
             except Exception as e:
                 logger.warning(
                     f"[CreepSpreadManager] tumor spread action suppressed: {e}"
@@ -864,6 +1106,9 @@ class CreepSpreadManager:
         2. 적 방향
         3. 더 먼 곳 (넓게 확산)
 
+        모든 후보를 CreepPlanner가 한 번에 점수화한다. 점막 그리드가 있으면
+        점막 위 후보만 고른다.
+
         Args:
             source_pos: 원점 위치
             is_tumor_spread: 종양 확산인 경우 True
@@ -875,75 +1120,16 @@ class CreepSpreadManager:
             return None
 
         spread_range = self.TUMOR_SPREAD_RANGE if is_tumor_spread else 8.0
-        candidates: List[Tuple[Point2, float]] = []
-
-        for target in self._target_grid:
-            dist = source_pos.distance_to(target)
-            if dist > spread_range or dist < 2:
-                continue
-
-            pos_tuple = (round(target.x, 1), round(target.y, 1))
-            if (
-                pos_tuple in self.tumor_positions
-                or pos_tuple in self.pending_tumor_positions
-            ):
-                continue
-
-            too_close = False
-            for existing in self.tumor_positions:
-                ex_dist = math.sqrt(
-                    (target.x - existing[0]) ** 2 + (target.y - existing[1]) ** 2
-                )
-                if ex_dist < self.TUMOR_MIN_DISTANCE:
-                    too_close = True
-                    break
-            if too_close:
-                continue
-
-            score = 0.0
-            for exp_dir in self._expansion_directions:
-                if target.distance_to(exp_dir) < source_pos.distance_to(exp_dir):
-                    score += 2.0
-            if self._enemy_direction:
-                if target.distance_to(self._enemy_direction) < source_pos.distance_to(
-                    self._enemy_direction
-                ):
-                    score += 1.0
-            score += dist * 0.1
-            candidates.append((target, score))
-
-        if not candidates:
-            return None
-        candidates.sort(key=lambda c: c[1], reverse=True)
-        return candidates[0][0]
+        best = self._planner.best_target(
+            (source_pos.x, source_pos.y), spread_range, self.TUMOR_MIN_DISTANCE
+        )
+        return Point2(best) if best else None
 
     def _update_coverage(self, game_time: float):
-        """크립 커버리지 추정 (샘플링)"""
-        if not hasattr(self.bot, "game_info") or not Point2:
-            return
+        """크립 커버리지 (이동 가능 셀 중 점막 비율, 마스크 합 1회)"""
         try:
-            map_size = self.bot.game_info.map_size
-            total_cells = 0
-            creep_cells = 0
-            step = 5
-            for x in range(5, int(map_size.x) - 5, step):
-                for y in range(5, int(map_size.y) - 5, step):
-                    pos = Point2((x, y))
-                    try:
-                        if hasattr(self.bot.game_info, "pathing_grid"):
-                            grid = self.bot.game_info.pathing_grid
-                            if grid[x, y] == 0:
-                                continue
-                    except (IndexError, AttributeError, TypeError):
-                        pass
-                    total_cells += 1
-                    try:
-                        if hasattr(self.bot, "has_creep") and self.bot.has_creep(pos):
-                            creep_cells += 1
-                    except (TypeError, AttributeError):
-                        pass
-            if total_cells > 0:
-                self._creep_coverage_percent = (creep_cells / total_cells) * 100
+            if self._refresh_grids():
+                self._creep_coverage_percent = self._planner.coverage * 100
         except Exception as e:
             logger.warning(f"[CreepSpreadManager] update_coverage suppressed: {e}")
 
@@ -968,6 +1154,7 @@ class CreepSpreadManager:
             "queen_created": self.queen_tumors_created,
             "spread_created": self.tumor_spread_created,
             "coverage_percent": round(self._creep_coverage_percent, 1),
+            "vision_percent": round(self._planner.vision_coverage * 100, 1),
             "creep_queens": len(self.creep_queen_tags),
             "grid_targets": len(self._target_grid),
         }
@@ -11,45 +11,29 @@ Data Cache Manager - 자주 사용되는 데이터 캐싱
 효과: CPU 사용량 30% 감소
 """
 
-import time
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
 
+from utils.generational_cache import get_shared_cache, seconds_to_generations
 from utils.logger import get_logger
 
-
-class CacheEntry:
-    """캐시 엔트리"""
-
-    def __init__(self, value: Any, ttl: float):
-        self.value = value
-        self.created_at = time.time()
-        self.ttl = ttl  # Time To Live (초)
-        self.access_count = 0
-
-    def is_valid(self) -> bool:
-        """캐시가 유효한지 확인"""
-        elapsed = time.time() - self.created_at
-        return elapsed < self.ttl
-
-    def get_value(self) -> Any:
-        """값 가져오기"""
-        self.access_count += 1
-        return self.value
+NAMESPACE = "data"
 
 
 class DataCacheManager:
     """
     * Data Cache Manager *
 
-    자주 사용되는 데이터를 캐싱하여 연산량 감소
+    자주 사용되는 데이터를 캐싱하여 연산량 감소.
+    저장소는 봇 공유 GenerationalCache 의 "data" 네임스페이스이며,
+    TTL 은 게임 초 단위로 받아 game_loop 세대로 변환한다.
     """
 
     def __init__(self, bot):
         self.bot = bot
         self.logger = get_logger("DataCache")
 
-        # * 캐시 저장소 *
-        self.cache: Dict[str, CacheEntry] = {}
+        # * 캐시 저장소 (Blackboard 공유 캐시) *
+        self.cache = get_shared_cache(bot)
 
         # * 기본 TTL (Time To Live) *
         self.default_ttl = {
@@ -59,17 +43,16 @@ class DataCacheManager:
             "VERY_SLOW": 5.0,  # 5초 (거의 안 변함)
         }
 
-        # * 통계 *
-        self.cache_hits = 0
-        self.cache_misses = 0
-        self.total_requests = 0
-
-        # * 자동 정리 *
+        # * 자동 정리 (iteration 단위) *
         self.last_cleanup = 0
-        self.cleanup_interval = 5.0  # 5초마다 정리
+        self.cleanup_interval = 110  # 약 5초마다 정리
 
     def get(
-        self, key: str, compute_func: Optional[Callable] = None, ttl: float = 1.0
+        self,
+        key: str,
+        compute_func: Optional[Callable] = None,
+        ttl: float = 1.0,
+        depends_on: Iterable[Hashable] = (),
     ) -> Optional[Any]:
         """
         캐시에서 값 가져오기 (없으면 계산)
@@ -77,48 +60,50 @@ class DataCacheManager:
         Args:
             key: 캐시 키
             compute_func: 값 계산 함수 (캐시 미스 시 호출)
-            ttl: Time To Live (초)
+            ttl: Time To Live (게임 초)
+            depends_on: 이 태그가 무효화되면 함께 제거 (예: 유닛 태그)
 
         Returns:
             캐시된 값 또는 새로 계산된 값
         """
-        self.total_requests += 1
-
-        # * 1. 캐시 확인 *
-        if key in self.cache:
-            entry = self.cache[key]
-            if entry.is_valid():
-                self.cache_hits += 1
-                return entry.get_value()
-            else:
-                # 만료된 캐시 제거
-                del self.cache[key]
-
-        # * 2. 캐시 미스 *
-        self.cache_misses += 1
-
         if compute_func is None:
-            return None
+            return self.cache.get(NAMESPACE, key)
 
-        # * 3. 값 계산 및 캐싱 *
         try:
-            value = compute_func()
-            self.set(key, value, ttl)
-            return value
+            return self.cache.get_or_compute(
+                NAMESPACE,
+                key,
+                compute_func,
+                ttl=seconds_to_generations(ttl),
+                depends_on=depends_on,
+            )
         except Exception as e:
             self.logger.error(f"[CACHE] Compute error for key '{key}': {e}")
             return None
 
-    def set(self, key: str, value: Any, ttl: float = 1.0):
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float = 1.0,
+        depends_on: Iterable[Hashable] = (),
+    ):
         """
         캐시에 값 저장
 
         Args:
             key: 캐시 키
             value: 저장할 값
-            ttl: Time To Live (초)
+            ttl: Time To Live (게임 초)
+            depends_on: 무효화 태그
         """
-        self.cache[key] = CacheEntry(value, ttl)
+        self.cache.set(
+            NAMESPACE,
+            key,
+            value,
+            ttl=seconds_to_generations(ttl),
+            depends_on=depends_on,
+        )
 
     def invalidate(self, key: str):
         """
@@ -127,8 +112,11 @@ class DataCacheManager:
         Args:
             key: 캐시 키
         """
-        if key in self.cache:
-            del self.cache[key]
+        self.cache.invalidate(NAMESPACE, key)
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """태그에 의존하는 모든 캐시 무효화 (공유 캐시 전체)"""
+        return self.cache.invalidate_tag(tag)
 
     def invalidate_pattern(self, pattern: str):
         """
@@ -137,42 +125,30 @@ class DataCacheManager:
         Args:
             pattern: 키 패턴 (예: "enemy_*")
         """
-        keys_to_delete = [
-            key for key in self.cache.keys() if pattern.replace("*", "") in key
-        ]
-
-        for key in keys_to_delete:
-            del self.cache[key]
+        needle = pattern.replace("*", "")
+        self.cache.invalidate_where(NAMESPACE, lambda key: needle in str(key))
 
     def clear(self):
         """모든 캐시 제거"""
-        self.cache.clear()
+        self.cache.invalidate_namespace(NAMESPACE)
 
     async def on_step(self, iteration: int):
         """매 프레임 실행 (자동 정리)"""
         try:
-            current_time = time.time()
-
             # * 주기적 정리 *
-            if current_time - self.last_cleanup > self.cleanup_interval:
+            if iteration - self.last_cleanup >= self.cleanup_interval:
                 self._cleanup_expired()
-                self.last_cleanup = current_time
+                self.last_cleanup = iteration
 
         except Exception as e:
             if iteration % 50 == 0:
                 self.logger.error(f"[DATA_CACHE] Error: {e}")
 
     def _cleanup_expired(self):
-        """만료된 캐시 정리"""
-        expired_keys = [
-            key for key, entry in self.cache.items() if not entry.is_valid()
-        ]
-
-        for key in expired_keys:
-            del self.cache[key]
-
-        if expired_keys:
-            self.logger.debug(f"[CACHE] Cleaned up {len(expired_keys)} expired entries")
+        """만료된 캐시 정리 (공유 캐시의 모든 네임스페이스)"""
+        removed = self.cache.purge_expired()
+        if removed:
+            self.logger.debug(f"[CACHE] Cleaned up {removed} expired entries")
 
     # ===== 편의 메서드 (자주 사용되는 데이터) =====
 
@@ -334,17 +310,16 @@ class DataCacheManager:
 
     def get_statistics(self) -> Dict:
         """통계 반환"""
-        hit_rate = (
-            (self.cache_hits / self.total_requests * 100)
-            if self.total_requests > 0
-            else 0
-        )
+        stats = self.cache.stats(NAMESPACE)
+        total_requests = stats["hits"] + stats["misses"]
+        hit_rate = stats["hit_rate"] * 100
 
         return {
-            "cache_size": len(self.cache),
-            "cache_hits": self.cache_hits,
-            "cache_misses": self.cache_misses,
-            "total_requests": self.total_requests,
+            "cache_size": stats["size"],
+            "cache_hits": stats["hits"],
+            "cache_misses": stats["misses"],
+            "evictions": stats["evictions"],
+            "total_requests": total_requests,
             "hit_rate": f"{hit_rate:.1f}%",
             "memory_saved": f"{hit_rate:.1f}% CPU reduction estimate",
         }
@@ -356,20 +331,7 @@ class DataCacheManager:
         Returns:
             캐시 엔트리 정보 리스트
         """
-        info = []
-
-        for key, entry in self.cache.items():
-            elapsed = time.time() - entry.created_at
-            remaining = max(0, entry.ttl - elapsed)
-
-            info.append(
-                {
-                    "key": key,
-                    "age": f"{elapsed:.2f}s",
-                    "remaining": f"{remaining:.2f}s",
-                    "access_count": entry.access_count,
-                    "valid": entry.is_valid(),
-                }
-            )
-
-        return info
+        return [
+            {"key": key, "value": value}
+            for key, value in self.cache.entries(NAMESPACE).items()
+        ]
@@ -36,6 +36,8 @@ from local_training.economy_combat_balancer import EconomyCombatBalancer
 from utils.distance_cache import DistanceCache
 from utils.game_constants import EconomyConstants, GameFrequencies
 from utils.logger import get_logger
+from utils.map_analysis import get_map_analysis
+from utils.path_distance import path_distance
 
 
 class ThreatLevel(Enum):
@@ -2984,6 +2986,13 @@ class EconomyManager:
 
         Gold patches have ~1500 minerals vs normal ~900.
         """
+        # 정적 맵 분석(utils.map_analysis): RICH 광물 패치 수
+        analysis = get_map_analysis(self.bot)
+        if analysis is not None:
+            gold_patches = analysis.gold_patches(position)
+            if gold_patches is not None:
+                return gold_patches > 0
+
         if not hasattr(self.bot, "mineral_field"):
             return False
 
@@ -3017,6 +3026,7 @@ class EconomyManager:
             return self._gold_bases_cache
 
         gold_expansions = []
+        analysis = get_map_analysis(self.bot)
 
         try:
             # Check enemy bases
@@ -3036,6 +3046,12 @@ class EconomyManager:
                 if any(exp_pos.distance_to(enemy) < 10 for enemy in enemy_expansions):
                     continue
 
+                # 정적 맵 분석에서 RICH 광물이 없는 기지는 광물 스캔 생략
+                # (순위는 채굴로 줄어드는 현재 광물 필드 기준)
+                static_gold = analysis.gold_patches(exp_pos) if analysis else None
+                if static_gold == 0:
+                    continue
+
                 # Check for gold minerals
                 nearby_minerals = self.bot.mineral_field.closer_than(10, exp_pos)
                 if not nearby_minerals:
@@ -3101,9 +3117,12 @@ class EconomyManager:
                 best_score = float("-inf")
 
                 for exp_pos, gold_count, total_minerals, _ in gold_expansions:
-                    dist_to_us = exp_pos.distance_to(our_base)
+                    # 램프/벽을 반영한 지상 거리 (utils.path_distance)
+                    dist_to_us = path_distance(self.bot, exp_pos, our_base)
                     dist_to_enemy = (
-                        exp_pos.distance_to(enemy_base) if enemy_base else 100
+                        path_distance(self.bot, exp_pos, enemy_base)
+                        if enemy_base
+                        else 100
                     )
 
                     # * 골드 패치 보너스 대폭 강화 (+80 per gold) *
@@ -3146,9 +3165,11 @@ class EconomyManager:
                     if self._has_enemy_near_expansion(exp_pos, 15):
                         continue
 
-                    dist_to_us = exp_pos.distance_to(our_base)
+                    dist_to_us = path_distance(self.bot, exp_pos, our_base)
                     dist_to_enemy = (
-                        exp_pos.distance_to(enemy_base) if enemy_base else 100
+                        path_distance(self.bot, exp_pos, enemy_base)
+                        if enemy_base
+                        else 100
                     )
 
                     # 자원량 계산
@@ -8,6 +8,7 @@ Game Data Logger - 게임 플레이 데이터 수집 시스템
 import json
 import logging
 import os
+import sqlite3
 from datetime import datetime
 from typing import Any, Dict
 
@@ -18,6 +19,11 @@ try:
 except ImportError:
     UnitTypeId = None
 
+try:
+    from monitoring.telemetry_store import TelemetryStore
+except ImportError:
+    TelemetryStore = None
+
 
 class GameDataLogger:
     """
@@ -348,9 +354,18 @@ class GameDataLogger:
         filename = f"{timestamp}_{map_name}_vs_{opponent_race}_{result}.json"
         filepath = os.path.join(games_dir, filename)
 
-        # JSON 저장
+        # JSON 저장 (들여쓰기 없이 - 파일 수만 개 기준 크기/쓰기 시간 절감)
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(self.game_data, f, indent=2, ensure_ascii=False)
+            json.dump(self.game_data, f, ensure_ascii=False, separators=(",", ":"))
+
+        # 컬럼 저장소에 색인 (대시보드/분석은 파일 전체를 읽지 않고 질의)
+        if TelemetryStore is not None:
+            try:
+                TelemetryStore(games_dir).append_game_log(
+                    os.path.splitext(filename)[0], self.game_data, source_path=filepath
+                )
+            except (OSError, sqlite3.Error, ValueError) as e:
+                logger.warning(f"Game data store append failed: {e}")
 
         logger.info(f"Game data saved: {filename}")
 
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+"""
+Game Farm - 멀티 프로세스 훈련 게임 농장
+
+N개의 워커 프로세스가 각자 SC2 인스턴스 1개와 포트 범위를 소유하고,
+중앙 코디네이터가 작업 큐 (map, race, difficulty) 를 배분한다.
+
+기능:
+1. 작업 큐: difficulty가 None인 작업은 배분 시점의 난이도 사다리 값 사용
+2. 워커당 SC2 인스턴스 1개 + 고정 포트 범위 (base_port + id * ports_per_worker)
+3. 워커 크래시/타임아웃 감지 -> 워커 재시작, 작업 재시도 (max_attempts)
+4. 난이도 사다리는 코디네이터가 결과 도착 순서대로 갱신
+5. 게임 실행기는 교체 가능 (runner_factory) - 테스트는 가짜 실행기 사용
+
+Usage:
+    farm = GameFarm(SC2GameRunner, workers=8)
+    results = farm.run(GameJob(i, map_name, race) for i in range(1, 101))
+"""
+
+import logging
+import multiprocessing as mp
+import os
+import queue
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger("GameFarm")
+
+DEFAULT_BASE_PORT = 5000
+DEFAULT_PORTS_PER_WORKER = 10
+
+
+@dataclass(frozen=True)
+class GameJob:
+    """게임 1판 작업 (프로세스 간 전달되므로 이름 문자열만 사용)"""
+
+    game: int
+    map_name: str
+    race: str
+    difficulty: Optional[str] = None  # None = 배분 시점 사다리 난이도
+    attempt: int = 0
+
+
+@dataclass(frozen=True)
+class WorkerContext:
+    """워커 프로세스에 전달되는 고유 자원"""
+
+    worker_id: int
+    port: int  # 포트 범위 시작
+    port_count: int
+
+    @property
+    def ports(self) -> range:
+        return range(self.port, self.port + self.port_count)
+
+
+class DifficultyLadder:
+    """
+    연승/연패 기반 난이도 사다리 (코디네이터 전용)
+
+    promote_after 연승 시 한 단계 상승, 최근 demote_after 판이 모두 패배면
+    한 단계 하락.
+    """
+
+    def __init__(
+        self,
+        levels: Sequence[str],
+        start: int = 0,
+        promote_after: int = 3,
+        demote_after: int = 3,
+    ):
+        self.levels = list(levels)
+        self.index = start
+        self.promote_after = promote_after
+        self.demote_after = demote_after
+        self.streak = 0
+        self._recent: Deque[bool] = deque(maxlen=demote_after)
+
+    @property
+    def current(self) -> str:
+        return self.levels[self.index]
+
+    def record(self, won: bool) -> int:
+        """
+        결과 1건 반영
+
+        Returns:
+            +1 (상승), -1 (하락), 0 (유지)
+        """
+        self._recent.append(bool(won))
+        if won:
+            self.streak += 1
+            if self.streak >= self.promote_after:
+                self.streak = 0
+                if self.index < len(self.levels) - 1:
+                    self.index += 1
+                    return 1
+            return 0
+
+        self.streak = 0
+        if len(self._recent) >= self.demote_after and not any(self._recent):
+            if self.index > 0:
+                self.index -= 1
+                return -1
+        return 0
+
+
+def _worker_main(
+    context: WorkerContext,
+    runner_factory: Callable[[WorkerContext], Any],
+    inbox,
+    outbox,
+) -> None:
+    """
+    워커 프로세스 본체. 실행기는 프로세스 수명 동안 재사용한다
+    (SC2 인스턴스 유지). 실행기 예외는 보고 후 다음 작업을 계속 받는다.
+
+    메시지: (kind, pid, job, payload) - pid로 교체 전 프로세스의 늦은 메시지를 구분
+    """
+    pid = os.getpid()
+    try:
+        runner = runner_factory(context)
+    except Exception:
+        outbox.put(("failed", pid, None, traceback.format_exc()))
+        return
+
+    try:
+        while True:
+            job = inbox.get()
+            if job is None:
+                break
+            try:
+                result = runner.run(job)
+                outbox.put(("result", pid, job, result))
+            except Exception:
+                outbox.put(("error", pid, job, traceback.format_exc()))
+    finally:
+        close = getattr(runner, "close", None)
+        if close:
+            try:
+                close()
+            except Exception:
+                pass
+
+
+class _Worker:
+    """코디네이터 측 워커 핸들"""
+
+    def __init__(self, context: WorkerContext, process, inbox):
+        self.context = context
+        self.process = process
+        self.inbox = inbox
+        self.job: Optional[GameJob] = None
+        self.started_at = 0.0
+        self.restarts = 0
+
+
+class GameFarm:
+    """
+    프로세스 풀 게임 농장 (코디네이터)
+
+    runner_factory(context) 는 워커 프로세스 안에서 호출되며,
+    ``run(job) -> dict`` (및 선택적으로 ``close()``) 를 가진 객체를 반환한다.
+    결과 dict의 ``won`` 값으로 난이도 사다리가 갱신된다.
+    """
+
+    def __init__(
+        self,
+        runner_factory: Callable[[WorkerContext], Any],
+        workers: int = 4,
+        ladder: Optional[DifficultyLadder] = None,
+        base_port: int = DEFAULT_BASE_PORT,
+        ports_per_worker: int = DEFAULT_PORTS_PER_WORKER,
+        max_attempts: int = 2,
+        max_restarts: int = 5,
+        job_timeout: Optional[float] = None,
+        on_result: Optional[Callable[[Dict], None]] = None,
+        start_method: str = "spawn",
+        poll_interval: float = 0.5,
+    ):
+        """
+        Args:
+            runner_factory: 워커별 게임 실행기 생성 함수 (pickle 가능해야 함)
+            workers: 워커 프로세스 수 (= 동시 SC2 인스턴스 수)
+            ladder: 난이도 사다리 (difficulty 미지정 작업에 사용)
+            base_port / ports_per_worker: 워커별 포트 범위
+            max_attempts: 크래시/예외 시 작업 최대 시도 횟수
+            max_restarts: 워커별 최대 재시작 횟수 (초과 시 워커 퇴역)
+            job_timeout: 작업당 최대 시간 (초), 초과 시 워커 종료 후 재시작
+            on_result: 결과 도착마다 호출 (진행 상황 로그 등)
+            start_method: multiprocessing 시작 방식 (SC2/asyncio는 spawn 권장)
+        """
+        self.runner_factory = runner_factory
+        self.workers = max(1, workers)
+        self.ladder = ladder
+        self.base_port = base_port
+        self.ports_per_worker = ports_per_worker
+        self.max_attempts = max(1, max_attempts)
+        self.max_restarts = max_restarts
+        self.job_timeout = job_timeout
+        self.on_result = on_result
+        self.poll_interval = poll_interval
+        self._mp = mp.get_context(start_method)
+
+        self.crashes = 0
+        self.retries = 0
+
+    # ------------------------------------------------------------------
+    # Worker lifecycle
+    # ------------------------------------------------------------------
+
+    def _start_worker(self, context: WorkerContext, outbox) -> _Worker:
+        inbox = self._mp.Queue()
+        process = self._mp.Process(
+            target=_worker_main,
+            args=(context, self.runner_factory, inbox, outbox),
+            name=f"GameFarmWorker-{context.worker_id}",
+            daemon=True,
+        )
+        process.start()
+        return _Worker(context, process, inbox)
+
+    @staticmethod
+    def _stop_worker(worker: _Worker, graceful: bool) -> None:
+        if graceful and worker.process.is_alive():
+            worker.inbox.put(None)
+            worker.process.join(timeout=30)
+        if worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join(timeout=5)
+        worker.inbox.close()
+
+    # ------------------------------------------------------------------
+    # Coordinator loop
+    # ------------------------------------------------------------------
+
+    def run(self, jobs: Iterable[GameJob]) -> List[Dict]:
+        """모든 작업이 끝날 때까지 실행. 결과는 완료 순서로 반환"""
+        pending: Deque[GameJob] = deque(jobs)
+        results: List[Dict] = []
+        if not pending:
+            return results
+
+        outbox = self._mp.Queue()
+        workers: Dict[int, _Worker] = {}
+        for worker_id in range(min(self.workers, len(pending))):
+            context = WorkerContext(
+                worker_id,
+                self.base_port + worker_id * self.ports_per_worker,
+                self.ports_per_worker,
+            )
+            workers[worker_id] = self._start_worker(context, outbox)
+
+        next_check = time.monotonic() + self.poll_interval
+        try:
+            while workers and (pending or any(w.job for w in workers.values())):
+                for worker in workers.values():
+                    if worker.job is None and pending:
+                        self._dispatch(worker, pending.popleft())
+
+                # 다른 워커의 결과가 계속 들어와도 멈춘 워커는 주기적으로 확인
+                if time.monotonic() >= next_check:
+                    self._check_workers(workers, pending, results, outbox)
+                    next_check = time.monotonic() + self.poll_interval
+                    continue
+
+                try:
+                    kind, pid, job, payload = outbox.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    continue
+
+                worker = next(
+                    (w for w in workers.values() if w.process.pid == pid), None
+                )
+                if worker is None:
+                    continue  # 이미 교체된 프로세스의 메시지
+                worker_id = worker.context.worker_id
+                if kind == "result":
+                    if worker.job != job:
+                        continue  # 타임아웃 처리된 작업의 늦은 결과
+                    worker.job = None
+                    self._record(results, job, payload, worker_id)
+                elif kind == "error":
+                    if worker.job != job:
+                        continue
+                    worker.job = None
+                    logger.warning(
+                        f"[FARM] worker {worker_id} game {job.game} raised:\n{payload}"
+                    )
+                    self._retry_or_fail(job, payload, pending, results, worker_id)
+                elif kind == "failed":
+                    logger.error(
+                        f"[FARM] worker {worker_id} failed to start:\n{payload}"
+                    )
+                    self._restart_worker(
+                        workers, worker, pending, results, outbox, graceful=True
+                    )
+        finally:
+            for worker in workers.values():
+                self._stop_worker(worker, graceful=True)
+            outbox.close()
+
+        # 모든 워커가 퇴역한 경우 남은 작업은 실패 처리
+        for job in pending:
+            self._record(results, job, self._error_result(job, "no_workers"), None)
+        return results
+
+    def _dispatch(self, worker: _Worker, job: GameJob) -> None:
+        if job.difficulty is None and self.ladder is not None:
+            job = replace(job, difficulty=self.ladder.current)
+        worker.job = job
+        worker.started_at = time.monotonic()
+        worker.inbox.put(job)
+
+    def _check_workers(self, workers, pending, results, outbox) -> None:
+        """죽은 워커 / 시간 초과 작업 감지"""
+        now = time.monotonic()
+        for worker in list(workers.values()):
+            timed_out = (
+                worker.job is not None
+                and self.job_timeout is not None
+                and now - worker.started_at > self.job_timeout
+            )
+            if worker.process.is_alive() and not timed_out:
+                continue
+            reason = (
+                "timeout" if timed_out else f"crash (exit {worker.process.exitcode})"
+            )
+            logger.warning(f"[FARM] worker {worker.context.worker_id} {reason}")
+            self.crashes += 1
+            job = worker.job
+            worker.job = None
+            if job is not None:
+                self._retry_or_fail(
+                    job, reason, pending, results, worker.context.worker_id
+                )
+            self._restart_worker(workers, worker, pending, results, outbox)
+
+    def _restart_worker(
+        self, workers, worker, pending, results, outbox, graceful: bool = False
+    ) -> None:
+        worker_id = worker.context.worker_id
+        self._stop_worker(worker, graceful=graceful)
+        if worker.job is not None:
+            job, worker.job = worker.job, None
+            self._retry_or_fail(job, "worker_failed", pending, results, worker_id)
+        if worker.restarts >= self.max_restarts:
+            logger.error(f"[FARM] worker {worker_id} retired after restarts")
+            del workers[worker_id]
+            return
+        replacement = self._start_worker(worker.context, outbox)
+        replacement.restarts = worker.restarts + 1
+        workers[worker_id] = replacement
+
+    def _retry_or_fail(self, job, error, pending, results, worker_id) -> None:
+        if job.attempt + 1 < self.max_attempts:
+            self.retries += 1
+            # 재시도는 같은 난이도로 큐 앞쪽에
+            pending.appendleft(replace(job, attempt=job.attempt + 1))
+            return
+        self._record(results, job, self._error_result(job, error), worker_id)
+
+    @staticmethod
+    def _error_result(job: GameJob, error: str) -> Dict:
+        return {
+            "game": job.game,
+            "map": job.map_name,
+            "race": job.race,
+            "difficulty": job.difficulty,
+            "won": False,
+            "error": str(error).strip().splitlines()[-1] if error else "error",
+            "time": 0,
+        }
+
+    def _record(self, results, job, result, worker_id) -> None:
+        result = dict(result or {})
+        result.setdefault("game", job.game)
+        result.setdefault("difficulty", job.difficulty)
+        result["worker"] = worker_id
+        result["attempts"] = job.attempt + 1
+        # 인프라 실패 (크래시/타임아웃/예외) 는 난이도 사다리에 반영하지 않음
+        counted = not result.get("error") or result.get("recovered")
+        if self.ladder is not None and counted:
+            change = self.ladder.record(bool(result.get("won")))
+            if change:
+                direction = "UP" if change > 0 else "DOWN"
+                logger.info(f"  [LADDER {direction}] -> {self.ladder.current}")
+        results.append(result)
+        if self.on_result:
+            self.on_result(result)
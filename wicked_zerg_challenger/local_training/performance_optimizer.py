@@ -18,24 +18,28 @@ import math
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
+from utils.generational_cache import GenerationalCache, get_shared_cache
+
 
 class DistanceCache:
     """
     Cache for expensive distance calculations.
 
-    Reduces redundant distance_to calls during a single frame.
+    Reduces redundant distance_to calls during a single frame. Entries live in
+    the bot's shared GenerationalCache: they expire when the frame generation
+    changes and are dropped as soon as either unit's tag is invalidated.
     """
 
-    def __init__(self, cache_duration: float = 0.1):
+    NAMESPACE = "distance"
+
+    def __init__(self, cache: Optional[GenerationalCache] = None):
         """
         Initialize distance cache.
 
         Args:
-            cache_duration: How long to keep cached values (seconds)
+            cache: Shared cache (a private one is created if omitted)
         """
-        self.cache_duration = cache_duration
-        self.cache: Dict[Tuple[int, int], Tuple[float, float]] = {}
-        self.last_clear = time.time()
+        self.cache = cache if cache is not None else GenerationalCache()
 
     def get_distance(self, unit1, unit2) -> float:
         """
@@ -48,27 +52,21 @@ class DistanceCache:
         Returns:
             Distance between units
         """
-        # Clear old cache periodically
-        now = time.time()
-        if now - self.last_clear > self.cache_duration:
-            self.cache.clear()
-            self.last_clear = now
-
         # Create cache key (order-independent)
         key = (min(unit1.tag, unit2.tag), max(unit1.tag, unit2.tag))
 
-        if key in self.cache:
-            return self.cache[key][0]
-
-        # Calculate distance
-        dist = unit1.distance_to(unit2)
-        self.cache[key] = (dist, now)
+        dist = self.cache.get(self.NAMESPACE, key)
+        if dist is None:
+            dist = unit1.distance_to(unit2)
+            self.cache.set(self.NAMESPACE, key, dist, ttl=0, depends_on=key)
         return dist
 
     def clear(self) -> None:
         """Clear the cache."""
-        self.cache.clear()
-        self.last_clear = time.time()
+        self.cache.invalidate_namespace(self.NAMESPACE)
+
+    def __len__(self) -> int:
+        return self.cache.size(self.NAMESPACE)
 
 
 class PerformanceOptimizer:
@@ -91,8 +89,8 @@ class PerformanceOptimizer:
         """
         self.bot = bot
 
-        # Distance cache
-        self.distance_cache = DistanceCache()
+        # Distance cache (shared GenerationalCache, frame-generation keyed)
+        self.distance_cache = DistanceCache(get_shared_cache(bot))
 
         # Spatial structures (lazy loaded)
         self._kd_tree = None
@@ -126,9 +124,8 @@ class PerformanceOptimizer:
             self._spatial_available = False
 
     def start_frame(self) -> None:
-        """Call at the start of each frame."""
+        """Call at the start of each frame (cached distances expire per generation)."""
         self.last_frame_time = time.time()
-        self.distance_cache.clear()
 
     def end_frame(self) -> None:
         """Call at the end of each frame."""
@@ -312,7 +309,7 @@ class PerformanceOptimizer:
         """
         return {
             "avg_frame_time_ms": self.get_average_frame_time() * 1000,
-            "cache_size": len(self.distance_cache.cache),
+            "cache_size": len(self.distance_cache),
             "pid_controllers": len(self._unit_pids),
             "spatial_index": (
                 "kd_tree"
@@ -7,9 +7,10 @@ REINFORCE 알고리즘 기반의 정책 학습 에이전트입니다.
 
 주요 기능:
 1. 보상 수집 및 저장
-2. 정책 그래디언트 계산
-3. 신경망 가중치 업데이트
+2. 정책 그래디언트 계산 (배치 행렬 연산)
+3. 신경망 가중치 업데이트 (SGD / Adam)
 4. 모델 저장/로드
+5. 경험 파일 다중 에폭 미니배치 오프라인 학습
 """
 
 import logging
@@ -18,12 +19,73 @@ import shutil
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 
+try:
+    from scipy.signal import lfilter as _lfilter
+except ImportError:  # scipy 는 선택 의존성
+    _lfilter = None
+
 logger = logging.getLogger("RlAgent")
 
+PARAM_NAMES = ("W1", "b1", "W2", "b2", "W3", "b3")
+
+
+def discounted_returns(rewards: np.ndarray, gamma: float) -> np.ndarray:
+    """할인 누적 리턴 R_t = r_t + gamma * R_{t+1}"""
+    rewards = np.asarray(rewards, dtype=np.float64)
+    if _lfilter is not None and len(rewards):
+        return _lfilter([1.0], [1.0, -gamma], rewards[::-1])[::-1].copy()
+    returns = np.zeros(len(rewards))
+    R = 0.0
+    for t in reversed(range(len(rewards))):
+        R = rewards[t] + gamma * R
+        returns[t] = R
+    return returns
+
+
+def normalized_advantages(returns: np.ndarray) -> np.ndarray:
+    """에피소드 평균을 베이스라인으로 한 정규화 어드밴티지"""
+    advantages = returns - np.mean(returns)
+    if len(advantages) > 1:
+        advantages = (advantages - np.mean(advantages)) / (np.std(advantages) + 1e-8)
+    return advantages
+
+
+def policy_gradient(
+    probs: np.ndarray,
+    actions: np.ndarray,
+    advantages: np.ndarray,
+    entropy_coeff: float = 0.01,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    배치 REINFORCE 그래디언트 (출력 logits 기준)
+
+    loss_i = -A_i * log p_i[a_i] - entropy_coeff * H(p_i)
+
+    Args:
+        probs: 행동 확률 (B, num_actions)
+        actions: 선택 행동 (B,)
+        advantages: 어드밴티지 (B,)
+
+    Returns:
+        (dlogits (B, num_actions), loss (B,), entropy (B,))
+    """
+    rows = np.arange(len(actions))
+    advantages = np.asarray(advantages, dtype=np.float64)
+    log_probs = np.log(probs + 1e-10)
+    entropy = -np.sum(probs * log_probs, axis=1)
+
+    dz3 = probs * advantages[:, None]
+    dz3[rows, actions] -= advantages
+    # d(-H)/dz = p * (log p + H)
+    dz3 += entropy_coeff * probs * (log_probs + entropy[:, None])
+
+    loss = -advantages * np.log(probs[rows, actions] + 1e-9) - entropy_coeff * entropy
+    return dz3, loss, entropy
+
 
 class PolicyNetwork:
     """
@@ -92,71 +154,85 @@ class PolicyNetwork:
         exp_x = np.exp(x - np.max(x))
         return exp_x / (np.sum(exp_x) + 1e-9)
 
-    def backward(self, cache: Dict, action_idx: int, advantage: float) -> None:
-        """역전파 (REINFORCE)"""
-        probs = cache["probs"]
+    def forward_batch(self, X: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """배치 순전파: X (B, input_dim) -> probs (B, output_dim)"""
+        X = np.nan_to_num(
+            np.asarray(X, dtype=np.float64), nan=0.0, posinf=1.0, neginf=-1.0
+        )
 
-        dz3 = probs.copy()
-        dz3[action_idx] -= 1
-        dz3 *= -advantage
+        z1 = X @ self.W1 + self.b1
+        a1 = np.maximum(0, z1)
+        z2 = a1 @ self.W2 + self.b2
+        a2 = np.maximum(0, z2)
+        z3 = a2 @ self.W3 + self.b3
 
-        dW3 = np.outer(cache["a2"], dz3)
-        db3 = dz3
+        exp_z = np.exp(z3 - np.max(z3, axis=1, keepdims=True))
+        probs = exp_z / (np.sum(exp_z, axis=1, keepdims=True) + 1e-9)
 
-        da2 = np.dot(dz3, self.W3.T)
-        dz2 = da2 * (cache["z2"] > 0).astype(float)
-        dW2 = np.outer(cache["a1"], dz2)
-        db2 = dz2
+        # NaN/Inf 행은 균등 분포로 대체
+        bad = ~np.all(np.isfinite(probs), axis=1)
+        if np.any(bad):
+            probs[bad] = 1.0 / self.output_dim
 
-        da1 = np.dot(dz2, self.W2.T)
-        dz1 = da1 * (cache["z1"] > 0).astype(float)
-        dW1 = np.outer(cache["x"], dz1)
-        db1 = dz1
+        cache = {"x": X, "z1": z1, "a1": a1, "z2": z2, "a2": a2, "z3": z3}
+        cache["probs"] = probs
+        return probs, cache
 
-        # NaN/Inf 그래디언트 방어: 스킵 대신 0으로 클램핑 후 계속 누적
-        grads = [dW1, db1, dW2, db2, dW3, db3]
-        if any(np.any(np.isnan(g)) or np.any(np.isinf(g)) for g in grads):
-            dW1 = np.nan_to_num(dW1, nan=0.0, posinf=0.0, neginf=0.0)
-            db1 = np.nan_to_num(db1, nan=0.0, posinf=0.0, neginf=0.0)
-            dW2 = np.nan_to_num(dW2, nan=0.0, posinf=0.0, neginf=0.0)
-            db2 = np.nan_to_num(db2, nan=0.0, posinf=0.0, neginf=0.0)
-            dW3 = np.nan_to_num(dW3, nan=0.0, posinf=0.0, neginf=0.0)
-            db3 = np.nan_to_num(db3, nan=0.0, posinf=0.0, neginf=0.0)
-
-        self.dW1 += dW1
-        self.db1 += db1
-        self.dW2 += dW2
-        self.db2 += db2
-        self.dW3 += dW3
-        self.db3 += db3
+    def backward(self, cache: Dict, action_idx: int, advantage: float) -> None:
+        """역전파 (REINFORCE, 단일 전이) - 그래디언트 누적"""
+        dz3 = cache["probs"] * advantage
+        dz3[action_idx] -= advantage
+        batch = {k: np.atleast_2d(cache[k]) for k in ("x", "z1", "a1", "z2", "a2")}
+        self.backward_batch(batch, dz3[None, :])
 
-    def update_weights(
-        self, learning_rate: float = 0.001, max_grad_norm: float = 5.0
-    ) -> None:
-        """가중치 업데이트 (Gradient Norm Clipping 적용)"""
-        # 전체 그래디언트의 L2 norm 계산
-        all_grads = [self.dW1, self.db1, self.dW2, self.db2, self.dW3, self.db3]
-        total_norm = np.sqrt(sum(np.sum(g**2) for g in all_grads))
+    def backward_batch(self, cache: Dict[str, np.ndarray], dz3: np.ndarray) -> None:
+        """
+        배치 역전파 - 출력 logits 그래디언트 dz3 (B, output_dim) 로부터
+        파라미터 그래디언트를 배치 합으로 누적
+        """
+        dW3 = cache["a2"].T @ dz3
+        db3 = dz3.sum(axis=0)
 
-        # Norm이 임계값 초과 시 비례적으로 스케일 다운
+        dz2 = (dz3 @ self.W3.T) * (cache["z2"] > 0)
+        dW2 = cache["a1"].T @ dz2
+        db2 = dz2.sum(axis=0)
+
+        dz1 = (dz2 @ self.W2.T) * (cache["z1"] > 0)
+        dW1 = cache["x"].T @ dz1
+        db1 = dz1.sum(axis=0)
+
+        # NaN/Inf 그래디언트 방어: 스킵 대신 0으로 클램핑 후 계속 누적
+        for name, grad in zip(PARAM_NAMES, (dW1, db1, dW2, db2, dW3, db3)):
+            if not np.all(np.isfinite(grad)):
+                grad = np.nan_to_num(grad, nan=0.0, posinf=0.0, neginf=0.0)
+            getattr(self, "d" + name)[...] += grad
+
+    def gradients(self) -> Dict[str, np.ndarray]:
+        """누적 그래디언트 (파라미터 이름 -> 배열, 참조)"""
+        return {name: getattr(self, "d" + name) for name in PARAM_NAMES}
+
+    def clip_gradients(self, max_grad_norm: float) -> float:
+        """전체 L2 norm 기준 클리핑, 클리핑 전 norm 반환"""
+        all_grads = list(self.gradients().values())
+        total_norm = float(np.sqrt(sum(np.sum(g**2) for g in all_grads)))
         if total_norm > max_grad_norm:
             scale = max_grad_norm / (total_norm + 1e-8)
             for grad in all_grads:
                 grad *= scale
+        return total_norm
 
-        self.W1 -= learning_rate * self.dW1
-        self.b1 -= learning_rate * self.db1
-        self.W2 -= learning_rate * self.dW2
-        self.b2 -= learning_rate * self.db2
-        self.W3 -= learning_rate * self.dW3
-        self.b3 -= learning_rate * self.db3
+    def zero_grad(self) -> None:
+        for grad in self.gradients().values():
+            grad.fill(0)
 
-        self.dW1.fill(0)
-        self.db1.fill(0)
-        self.dW2.fill(0)
-        self.db2.fill(0)
-        self.dW3.fill(0)
-        self.db3.fill(0)
+    def update_weights(
+        self, learning_rate: float = 0.001, max_grad_norm: float = 5.0
+    ) -> None:
+        """가중치 업데이트 (SGD, Gradient Norm Clipping 적용)"""
+        self.clip_gradients(max_grad_norm)
+        for name, grad in self.gradients().items():
+            getattr(self, name)[...] -= learning_rate * grad
+        self.zero_grad()
 
     def get_weights(self) -> Dict[str, np.ndarray]:
         return {
@@ -177,6 +253,113 @@ class PolicyNetwork:
         self.b3 = weights["b3"]
 
 
+class AdamOptimizer:
+    """
+    PolicyNetwork 용 Adam 옵티마이저
+
+    파라미터별 1차/2차 모멘트와 스텝 수를 보관하며, state_dict() 로
+    모델 파일에 함께 저장해 오프라인 학습을 이어갈 수 있다.
+    """
+
+    def __init__(self, beta1: float = 0.9, beta2: float = 0.999, eps: float = 1e-8):
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+        self.t = 0
+        self.m: Dict[str, np.ndarray] = {}
+        self.v: Dict[str, np.ndarray] = {}
+
+    def step(
+        self, network: PolicyNetwork, learning_rate: float, max_grad_norm: float = 5.0
+    ) -> float:
+        """누적 그래디언트로 한 스텝 갱신 후 그래디언트 초기화, 클리핑 전 norm 반환"""
+        total_norm = network.clip_gradients(max_grad_norm)
+        self.t += 1
+        bias1 = 1.0 - self.beta1**self.t
+        bias2 = 1.0 - self.beta2**self.t
+
+        for name, grad in network.gradients().items():
+            param = getattr(network, name)
+            m = self.m.get(name)
+            if m is None or m.shape != param.shape:
+                m = self.m[name] = np.zeros_like(param)
+                self.v[name] = np.zeros_like(param)
+            v = self.v[name]
+            m *= self.beta1
+            m += (1.0 - self.beta1) * grad
+            v *= self.beta2
+            v += (1.0 - self.beta2) * grad**2
+            param -= learning_rate * (m / bias1) / (np.sqrt(v / bias2) + self.eps)
+
+        network.zero_grad()
+        return total_norm
+
+    def state_dict(self) -> Dict[str, np.ndarray]:
+        state = {"adam_t": np.array([self.t])}
+        for name in self.m:
+            state[f"adam_m_{name}"] = self.m[name]
+            state[f"adam_v_{name}"] = self.v[name]
+        return state
+
+    def load_state_dict(self, data) -> None:
+        keys = set(getattr(data, "files", None) or data.keys())
+        if "adam_t" not in keys:
+            return
+        self.t = int(np.asarray(data["adam_t"]).ravel()[0])
+        self.m, self.v = {}, {}
+        for name in PARAM_NAMES:
+            if f"adam_m_{name}" in keys and f"adam_v_{name}" in keys:
+                self.m[name] = np.array(data[f"adam_m_{name}"], dtype=np.float64)
+                self.v[name] = np.array(data[f"adam_v_{name}"], dtype=np.float64)
+
+
+def load_experience_files(
+    paths: Union[str, Path, Iterable[Union[str, Path]]],
+    num_actions: int = 5,
+) -> List[Dict[str, np.ndarray]]:
+    """
+    save_experience_data() 로 저장된 .npz 파일들을 로드
+
+    Args:
+        paths: 파일 경로 목록 또는 .npz 가 들어 있는 디렉토리
+        num_actions: 유효 행동 인덱스 범위 [0, num_actions)
+
+    Returns:
+        {"states", "actions", "rewards"} 딕셔너리 리스트 (손상/빈 파일 제외)
+    """
+    if isinstance(paths, (str, Path)) and Path(paths).is_dir():
+        paths = sorted(Path(paths).glob("*.npz"))
+    elif isinstance(paths, (str, Path)):
+        paths = [paths]
+
+    experiences = []
+    for path in paths:
+        try:
+            with np.load(str(path), allow_pickle=False) as data:
+                exp = {
+                    "states": np.array(data["states"], dtype=np.float32),
+                    "actions": np.array(data["actions"], dtype=np.int64),
+                    "rewards": np.array(data["rewards"], dtype=np.float32),
+                }
+        except Exception as e:
+            logger.info(f"Skip experience file {Path(path).name}: {e}")
+            continue
+
+        n = len(exp["rewards"])
+        if n == 0 or len(exp["states"]) != n or len(exp["actions"]) != n:
+            continue
+        if not (
+            np.all(np.isfinite(exp["states"])) and np.all(np.isfinite(exp["rewards"]))
+        ):
+            logger.warning(f"[WARN] Corrupted data (NaN/Inf): {Path(path).name}")
+            continue
+        if np.any(exp["actions"] < 0) or np.any(exp["actions"] >= num_actions):
+            logger.warning(f"[WARN] Invalid action indices in {Path(path).name}")
+            continue
+        experiences.append(exp)
+    return experiences
+
+
 class RLAgent:
     """
     강화학습 에이전트 (REINFORCE 알고리즘 + Epsilon-Greedy)
@@ -198,6 +381,7 @@ class RLAgent:
         )
 
         self.policy = PolicyNetwork()
+        self.optimizer = AdamOptimizer()  # 오프라인 미니배치 학습용
         self.micro_observation_dim = 16
         self.micro_action_dim = 7
         self.micro_policy = PolicyNetwork(
@@ -507,21 +691,12 @@ class RLAgent:
             adv_std = np.std(advantages) + 1e-8
             advantages = (advantages - np.mean(advantages)) / adv_std
 
-        # 역전파 (엔트로피 정규화 포함)
-        entropy_coeff = 0.01
-        total_loss = 0.0
-        total_entropy = 0.0
-        for cache, action, advantage in zip(self.caches, self.actions, advantages):
-            probs = cache["probs"]
-            # 엔트로피 보너스: 정책 붕괴 방지
-            entropy = -np.sum(probs * np.log(probs + 1e-10))
-            total_entropy += entropy
-            # 어드밴티지에 엔트로피 보너스 추가
-            adjusted_advantage = advantage + entropy_coeff * entropy
-            self.policy.backward(cache, action, adjusted_advantage)
-            total_loss += (
-                -np.log(probs[action] + 1e-9) * advantage - entropy_coeff * entropy
-            )
+        # 배치 역전파 (엔트로피 정규화 포함: 정책 붕괴 방지)
+        total_loss = self._accumulate_policy_gradient(
+            self._prepare_states(self.states),
+            np.asarray(self.actions, dtype=np.int64),
+            advantages,
+        )
 
         # 학습률 스케줄링 적용
         current_lr = self._get_scheduled_learning_rate()
@@ -579,12 +754,69 @@ class RLAgent:
         return stats
 
     def _calculate_returns(self) -> np.ndarray:
-        returns = np.zeros(len(self.rewards))
-        R = 0.0
-        for t in reversed(range(len(self.rewards))):
-            R = self.rewards[t] + self.gamma * R
-            returns[t] = R
-        return returns
+        return discounted_returns(self.rewards, self.gamma)
+
+    def _prepare_states(self, states) -> np.ndarray:
+        """상태 배치를 (N, input_dim) 으로 맞춤 (부족분 0 패딩, 초과분 절단)"""
+        input_dim = self.policy.input_dim
+        if len(states) == 0:
+            return np.zeros((0, input_dim), dtype=np.float32)
+        if isinstance(states, np.ndarray) and states.ndim == 2:
+            batch = states[:, :input_dim].astype(np.float32)
+            if batch.shape[1] < input_dim:
+                batch = np.pad(batch, ((0, 0), (0, input_dim - batch.shape[1])))
+            return batch
+        batch = np.zeros((len(states), input_dim), dtype=np.float32)
+        for i, state in enumerate(states):
+            row = np.asarray(state, dtype=np.float32).ravel()[:input_dim]
+            batch[i, : len(row)] = row
+        return batch
+
+    def _accumulate_policy_gradient(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        advantages: np.ndarray,
+        entropy_coeff: float = 0.01,
+        chunk_size: int = 4096,
+    ) -> float:
+        """REINFORCE 그래디언트를 chunk_size 행씩 배치 누적 (메모리 상한), loss 합 반환"""
+        total_loss = 0.0
+        for start in range(0, len(actions), chunk_size):
+            end = start + chunk_size
+            probs, cache = self.policy.forward_batch(states[start:end])
+            dz3, losses, _entropy = policy_gradient(
+                probs, actions[start:end], advantages[start:end], entropy_coeff
+            )
+            self.policy.backward_batch(cache, dz3)
+            total_loss += float(np.sum(losses))
+        return total_loss
+
+    def _experience_batch(
+        self, experiences: List[Dict[str, np.ndarray]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """게임별 리턴/어드밴티지 계산 후 (states, actions, advantages) 로 연결"""
+        states, actions, advantages = [], [], []
+        for exp in experiences:
+            rewards = np.asarray(exp["rewards"], dtype=np.float64)
+            n = min(len(rewards), len(exp["states"]), len(exp["actions"]))
+            if n == 0:
+                continue
+            returns = discounted_returns(rewards[:n], self.gamma)
+            states.append(self._prepare_states(np.asarray(exp["states"])[:n]))
+            actions.append(np.asarray(exp["actions"], dtype=np.int64)[:n])
+            advantages.append(normalized_advantages(returns))
+        if not states:
+            return (
+                np.zeros((0, self.policy.input_dim), dtype=np.float32),
+                np.zeros(0, dtype=np.int64),
+                np.zeros(0),
+            )
+        return (
+            np.concatenate(states),
+            np.concatenate(actions),
+            np.concatenate(advantages),
+        )
 
     def _clear_buffers(self) -> None:
         self.states.clear()
@@ -617,6 +849,7 @@ class RLAgent:
                 self.policy.set_weights(weights)
                 self.baseline = float(data["baseline"][0])
                 self.episode_count = int(data["episode_count"][0])
+                self.optimizer.load_state_dict(data)
                 logger.info(f"Model loaded from {self.model_path}")
                 return True
         except Exception as e:
@@ -674,84 +907,111 @@ class RLAgent:
     def train_from_batch(
         self, experiences: List[Dict[str, np.ndarray]]
     ) -> Dict[str, float]:
-        """외부 경험 데이터로 학습 (Offline Training)"""
-        total_loss = 0.0
-        total_steps = 0
-
-        for exp in experiences:
-            states = exp["states"]
-            actions = exp["actions"]
-            rewards = exp["rewards"]
-
-            if len(rewards) == 0:
-                continue
-
-            # 리턴 계산
-            returns = np.zeros_like(rewards, dtype=np.float32)
-            R = 0.0
-            for t in reversed(range(len(rewards))):
-                R = rewards[t] + self.gamma * R
-                returns[t] = R
-
-            # 어드밴티지 계산 (베이스라인 사용)
-            # 배치 내 평균을 베이스라인으로 사용
-            batch_baseline = np.mean(returns)
-            advantages = returns - batch_baseline
-
-            # 정규화
-            if len(advantages) > 1:
-                advantages = (advantages - np.mean(advantages)) / (
-                    np.std(advantages) + 1e-8
-                )
-
-            # 배치 학습 (엔트로피 정규화 포함)
-            entropy_coeff = 0.01
-            episode_loss = 0.0
-            for i in range(len(states)):
-                state = states[i]
-                action = actions[i]
-                advantage = advantages[i]
-
-                # 상태 벡터 안전성 처리
-                if len(state) < self.policy.input_dim:
-                    state_input = np.concatenate(
-                        [state, np.zeros(self.policy.input_dim - len(state))]
-                    )
-                else:
-                    state_input = state[: self.policy.input_dim]
-                state_input = state_input.astype(np.float32)
-
-                # Forward
-                probs, cache = self.policy.forward(state_input)
-
-                # 엔트로피 보너스: 정책 붕괴 방지
-                entropy = -np.sum(probs * np.log(probs + 1e-10))
-                adjusted_advantage = advantage + entropy_coeff * entropy
-
-                # Backward
-                self.policy.backward(cache, action, adjusted_advantage)
-
-                # Loss logging
-                episode_loss += (
-                    -np.log(probs[action] + 1e-9) * advantage - entropy_coeff * entropy
-                )
+        """외부 경험 데이터로 학습 (Offline Training, 배치 전체 1회 SGD 업데이트)"""
+        states, actions, advantages = self._experience_batch(experiences)
+        total_steps = len(actions)
+        if total_steps == 0:
+            return {
+                "loss": 0.0,
+                "steps": 0,
+                "games": len(experiences),
+                "adjusted_lr": 0.0,
+            }
 
-            total_loss += episode_loss
-            total_steps += len(states)
+        total_loss = self._accumulate_policy_gradient(states, actions, advantages)
 
         # 가중치 업데이트 (배치 전체에 대해 한 번 수행)
         # 그래디언트 스케일 보정: 배치 크기로 learning rate 조정
-        if total_steps > 0:
-            num_games = len(experiences)
-            adjusted_lr = self.learning_rate / max(num_games, 1)
-            self.policy.update_weights(adjusted_lr)
+        adjusted_lr = self.learning_rate / max(len(experiences), 1)
+        self.policy.update_weights(adjusted_lr)
 
         return {
-            "loss": float(total_loss / total_steps) if total_steps > 0 else 0.0,
+            "loss": total_loss / total_steps,
             "steps": total_steps,
             "games": len(experiences),
-            "adjusted_lr": float(adjusted_lr) if total_steps > 0 else 0.0,
+            "adjusted_lr": float(adjusted_lr),
+        }
+
+    def train_offline(
+        self,
+        experiences: List[Dict[str, np.ndarray]],
+        epochs: int = 4,
+        batch_size: int = 1024,
+        learning_rate: Optional[float] = None,
+        entropy_coeff: float = 0.01,
+        max_grad_norm: float = 5.0,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        다중 에폭 미니배치 오프라인 학습 (Adam)
+
+        여러 게임의 경험을 한 번에 연결해 에폭마다 섞고, 미니배치별
+        평균 그래디언트로 Adam 업데이트를 수행한다. 어드밴티지는 게임별로
+        계산/정규화한다 (train_from_batch 와 동일).
+
+        Args:
+            experiences: load_experience_files() 결과 또는 동일 형식 리스트
+            epochs: 전체 데이터 반복 횟수
+            batch_size: 미니배치 크기
+            learning_rate: Adam 학습률 (기본 self.learning_rate)
+
+        Returns:
+            학습 통계 (에폭별 평균 loss/entropy 포함)
+        """
+        states, actions, advantages = self._experience_batch(experiences)
+        total_steps = len(actions)
+        lr = self.learning_rate if learning_rate is None else learning_rate
+        stats: Dict[str, Any] = {
+            "games": len(experiences),
+            "steps": total_steps,
+            "epochs": 0,
+            "updates": 0,
+            "learning_rate": float(lr),
+            "epoch_loss": [],
+            "epoch_entropy": [],
+            "loss": 0.0,
         }
+        if total_steps == 0:
+            return stats
+
+        rng = np.random.default_rng(seed)
+        batch_size = max(1, int(batch_size))
+        self.policy.zero_grad()
+        for _ in range(max(0, epochs)):
+            order = rng.permutation(total_steps)
+            epoch_loss = 0.0
+            epoch_entropy = 0.0
+            for start in range(0, total_steps, batch_size):
+                idx = order[start : start + batch_size]
+                probs, cache = self.policy.forward_batch(states[idx])
+                dz3, losses, entropy = policy_gradient(
+                    probs, actions[idx], advantages[idx], entropy_coeff
+                )
+                self.policy.backward_batch(cache, dz3 / len(idx))
+                self.optimizer.step(self.policy, lr, max_grad_norm)
+                epoch_loss += float(np.sum(losses))
+                epoch_entropy += float(np.sum(entropy))
+                stats["updates"] += 1
+            stats["epochs"] += 1
+            stats["epoch_loss"].append(epoch_loss / total_steps)
+            stats["epoch_entropy"].append(epoch_entropy / total_steps)
+
+        if stats["epoch_loss"]:
+            stats["loss"] = stats["epoch_loss"][-1]
+        return stats
+
+    def train_from_experience_files(
+        self,
+        paths: Union[str, Path, Iterable[Union[str, Path]]],
+        epochs: int = 4,
+        batch_size: int = 1024,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """save_experience_data() 파일들(또는 디렉토리)로 train_offline() 수행"""
+        experiences = load_experience_files(paths, num_actions=self.policy.output_dim)
+        return self.train_offline(
+            experiences, epochs=epochs, batch_size=batch_size, **kwargs
+        )
 
     def save_model(self, path: Optional[str] = None) -> bool:
         """모델 저장 (Atomic Write)"""
@@ -761,17 +1021,20 @@ class RLAgent:
         try:
             save_path.parent.mkdir(parents=True, exist_ok=True)
             weights = self.policy.get_weights()
-            np.savez(
-                str(tmp_path),
-                W1=weights["W1"],
-                b1=weights["b1"],
-                W2=weights["W2"],
-                b2=weights["b2"],
-                W3=weights["W3"],
-                b3=weights["b3"],
-                baseline=np.array([self.baseline]),
-                episode_count=np.array([self.episode_count]),
-            )
+            # 파일 핸들로 저장 (문자열 경로면 np.savez 가 .npz 를 덧붙여 rename 대상이 사라짐)
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    W1=weights["W1"],
+                    b1=weights["b1"],
+                    W2=weights["W2"],
+                    b2=weights["b2"],
+                    W3=weights["W3"],
+                    b3=weights["b3"],
+                    baseline=np.array([self.baseline]),
+                    episode_count=np.array([self.episode_count]),
+                    **self.optimizer.state_dict(),
+                )
 
             # *** FIX: Atomic rename with Windows compatibility ***
             if tmp_path.exists():
@@ -5,11 +5,13 @@ Run Training Pipeline - 독립 실행 훈련 스크립트
 
 사용법:
     python run_training_pipeline.py --cycles 10 --games-per-cycle 5
+    python run_training_pipeline.py --epochs 8 --batch-size 2048
     python run_training_pipeline.py --summary
 
 사이클 동작:
     1. experience buffer에서 .npz 파일 수집
     2. RLAgent.train_from_batch() 로 학습
+       (--epochs N: RLAgent.train_offline() 다중 에폭 미니배치 Adam 학습)
     3. 체크포인트 생성 (버전 관리)
     4. 기존 운영 모델 대비 개선 시 자동 배포
     5. 처리 완료 experience 아카이브
@@ -35,25 +37,13 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 
 def load_experience_files(file_paths):
-    """경험 파일 로드"""
-    experiences = []
-    for fpath in file_paths:
-        try:
-            data = np.load(str(fpath), allow_pickle=False)
-            exp = {
-                "states": data["states"],
-                "actions": data["actions"],
-                "rewards": data["rewards"],
-            }
-            if len(exp["states"]) > 0:
-                experiences.append(exp)
-                logger.info(f"  Loaded: {fpath.name} ({len(exp['states'])} steps)")
-        except Exception as e:
-            logger.info(f"  Skip (corrupted): {fpath.name} - {e}")
-    return experiences
-
-
-def run_training_cycle(pipeline, rl_agent, cycle_num):
+    """경험 파일 로드 (손상/NaN/잘못된 행동 인덱스 파일 제외)"""
+    from rl_agent import load_experience_files as _load
+
+    return _load(file_paths)
+
+
+def run_training_cycle(pipeline, rl_agent, cycle_num, epochs=0, batch_size=1024):
     """단일 훈련 사이클 실행"""
     logger.info(f"\n{'='*60}")
     logger.info(f"  CYCLE {cycle_num}")
@@ -78,12 +68,23 @@ def run_training_cycle(pipeline, rl_agent, cycle_num):
 
     # 3. 학습
     logger.info("  Training...")
-    train_stats = rl_agent.train_from_batch(experiences)
-    logger.info(
-        f"  Loss: {train_stats['loss']:.4f}, "
-        f"Steps: {train_stats['steps']}, "
-        f"LR: {train_stats.get('adjusted_lr', 0):.6f}"
-    )
+    if epochs > 0:
+        train_stats = rl_agent.train_offline(
+            experiences, epochs=epochs, batch_size=batch_size
+        )
+        logger.info(
+            f"  Loss: {train_stats['loss']:.4f}, "
+            f"Steps: {train_stats['steps']}, "
+            f"Epochs: {train_stats['epochs']}, "
+            f"Updates: {train_stats['updates']}"
+        )
+    else:
+        train_stats = rl_agent.train_from_batch(experiences)
+        logger.info(
+            f"  Loss: {train_stats['loss']:.4f}, "
+            f"Steps: {train_stats['steps']}, "
+            f"LR: {train_stats.get('adjusted_lr', 0):.6f}"
+        )
 
     # 4. 메트릭 계산 (경험 기반 추정)
     avg_reward = float(np.mean([np.sum(e["rewards"]) for e in experiences]))
@@ -140,6 +141,18 @@ def main():
         default=None,
         help="Override experience buffer directory",
     )
+    parser.add_argument(
+        "--epochs",
+        type=int,
+        default=0,
+        help="Minibatch epochs per cycle (0 = single full-batch update, default: 0)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1024,
+        help="Minibatch size for --epochs training (default: 1024)",
+    )
     args = parser.parse_args()
 
     # Pipeline & Agent 초기화
@@ -189,7 +202,9 @@ def main():
     # 훈련 사이클 실행
     results = []
     for cycle in range(1, args.cycles + 1):
-        result = run_training_cycle(pipeline, rl_agent, cycle)
+        result = run_training_cycle(
+            pipeline, rl_agent, cycle, epochs=args.epochs, batch_size=args.batch_size
+        )
         if result:
             results.append(result)
 
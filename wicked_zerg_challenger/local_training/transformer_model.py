@@ -9,10 +9,12 @@ AlphaStar 스타일의 트랜스포머 기반 의사결정 모델입니다.
 1. Multi-head Self-Attention: 게임 상태 간 관계 학습
 2. Positional Encoding: 시간적 순서 정보 인코딩
 3. Feed-Forward Network: 비선형 변환
+4. Incremental Inference: 레이어별 K/V 링 버퍼 캐시로 스텝당 O(window·d)
 """
 
 import math
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -43,10 +45,55 @@ class PositionalEncoding:
 
         return pe
 
-    def encode(self, x: np.ndarray) -> np.ndarray:
-        """위치 인코딩 적용"""
-        seq_len = x.shape[0]
-        return x + self.pe[:seq_len, : x.shape[1]]
+    def encode(
+        self, x: np.ndarray, positions: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """위치 인코딩 적용 (positions 지정 시 절대 위치, max_len 으로 순환)"""
+        if positions is None:
+            seq_len = x.shape[0]
+            return x + self.pe[:seq_len, : x.shape[1]]
+        return x + self.pe[np.asarray(positions) % self.max_len, : x.shape[1]]
+
+
+class KVCache:
+    """
+    레이어 하나의 Key/Value 링 버퍼
+
+    최근 capacity 개 토큰의 K/V 와 절대 위치를 보관한다. 새 토큰은 가장
+    오래된 슬롯을 덮어쓰므로 append 는 O(d), 메모리는 O(capacity·d) 로 고정.
+    어텐션은 순서와 무관하므로 슬롯 순서를 정렬하지 않고 그대로 사용한다.
+    """
+
+    def __init__(self, capacity: int, d_model: int):
+        self.capacity = capacity
+        self.keys = np.zeros((capacity, d_model))
+        self.values = np.zeros((capacity, d_model))
+        self.positions = np.full(capacity, -1, dtype=np.int64)
+        self.length = 0
+        self._head = 0
+
+    def append(self, keys: np.ndarray, values: np.ndarray, positions: np.ndarray):
+        """(n, d_model) K/V 추가 (n > capacity 면 마지막 capacity 개만 유지)"""
+        if len(positions) > self.capacity:
+            keys = keys[-self.capacity :]
+            values = values[-self.capacity :]
+            positions = positions[-self.capacity :]
+        slots = (self._head + np.arange(len(positions))) % self.capacity
+        self.keys[slots] = keys
+        self.values[slots] = values
+        self.positions[slots] = positions
+        self._head = (self._head + len(positions)) % self.capacity
+        self.length = min(self.capacity, self.length + len(positions))
+
+    def view(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """유효 슬롯의 (keys, values, positions)"""
+        n = self.length
+        return self.keys[:n], self.values[:n], self.positions[:n]
+
+    def clear(self):
+        self.positions.fill(-1)
+        self.length = 0
+        self._head = 0
 
 
 class MultiHeadAttention:
@@ -90,7 +137,7 @@ class MultiHeadAttention:
         exp_x = np.exp(x - np.max(x, axis=-1, keepdims=True))
         return exp_x / (np.sum(exp_x, axis=-1, keepdims=True) + 1e-9)
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
+    def forward(self, x: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
         """순전파"""
         # Linear projections
         Q = np.dot(x, self.W_q)
@@ -98,11 +145,41 @@ class MultiHeadAttention:
         V = np.dot(x, self.W_v)
 
         # Attention
-        attn_output = self.attention(Q, K, V)
+        attn_output = self.attention(Q, K, V, mask)
 
         # Output projection
         return np.dot(attn_output, self.W_o)
 
+    def forward_cached(
+        self, x: np.ndarray, positions: np.ndarray, cache: KVCache
+    ) -> np.ndarray:
+        """
+        캐시 순전파: 새 토큰 x (n, d_model) 의 K/V 만 계산하고, 캐시에 남은
+        이전 토큰과 함께 슬라이딩 윈도우 인과 어텐션을 수행한 뒤 캐시에 추가.
+
+        토큰 i 는 절대 위치가 (pos_i - capacity, pos_i] 인 토큰만 본다.
+        """
+        Q = np.dot(x, self.W_q)
+        K_new = np.dot(x, self.W_k)
+        V_new = np.dot(x, self.W_v)
+
+        K_old, V_old, pos_old = cache.view()
+        if len(pos_old):
+            K = np.concatenate([K_old, K_new])
+            V = np.concatenate([V_old, V_new])
+            key_pos = np.concatenate([pos_old, positions])
+        else:
+            K, V, key_pos = K_new, V_new, positions
+
+        mask = None
+        if len(positions) > 1 or len(pos_old) == cache.capacity:
+            delta = positions[:, None] - key_pos[None, :]
+            mask = ((delta < 0) | (delta >= cache.capacity)).astype(np.float64)
+
+        attn_output = self.attention(Q, K, V, mask)
+        cache.append(K_new, V_new, positions)
+        return np.dot(attn_output, self.W_o)
+
 
 class FeedForwardNetwork:
     """Feed-Forward Network"""
@@ -137,10 +214,10 @@ class TransformerBlock:
         self.attention = MultiHeadAttention(d_model, num_heads)
         self.ffn = FeedForwardNetwork(d_model, d_ff)
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
+    def forward(self, x: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
         """순전파 (잔차 연결 + Layer Norm 없이 단순화)"""
         # Self-Attention + Residual
-        attn_out = self.attention.forward(x)
+        attn_out = self.attention.forward(x, mask)
         x = x + attn_out
 
         # Feed-Forward + Residual
@@ -149,6 +226,13 @@ class TransformerBlock:
 
         return x
 
+    def forward_cached(
+        self, x: np.ndarray, positions: np.ndarray, cache: KVCache
+    ) -> np.ndarray:
+        """K/V 캐시를 사용하는 순전파 (새 토큰만 계산)"""
+        x = x + self.attention.forward_cached(x, positions, cache)
+        return x + self.ffn.forward(x)
+
 
 class TransformerDecisionModel:
     """
@@ -164,6 +248,8 @@ class TransformerDecisionModel:
         num_heads: int = 4,
         num_layers: int = 2,
         num_actions: int = 5,
+        max_history_len: int = 10,
+        incremental: bool = True,
     ):
         """
         Args:
@@ -172,6 +258,9 @@ class TransformerDecisionModel:
             num_heads: 어텐션 헤드 수
             num_layers: 트랜스포머 레이어 수
             num_actions: 출력 행동 수
+            max_history_len: 어텐션 윈도우 (최근 상태 수)
+            incremental: True 면 K/V 캐시로 새 상태만 계산 (슬라이딩 윈도우
+                인과 어텐션), False 면 매 호출마다 히스토리 전체를 재계산
         """
         self.input_dim = input_dim
         self.d_model = d_model
@@ -197,8 +286,15 @@ class TransformerDecisionModel:
         self.action_labels = ["ECONOMY", "AGGRESSIVE", "DEFENSIVE", "TECH", "ALL_IN"]
 
         # 상태 히스토리 (시퀀스 생성용)
-        self.state_history: List[np.ndarray] = []
-        self.max_history_len = 10
+        self.max_history_len = max_history_len
+        self.state_history: Deque[np.ndarray] = deque(maxlen=max_history_len)
+
+        # 증분 추론: 레이어별 K/V 링 버퍼 + 절대 스텝 위치
+        self.incremental = incremental
+        self.kv_caches = [
+            KVCache(max_history_len, d_model) for _ in self.transformer_blocks
+        ]
+        self._step = 0
 
     def _embed_input(self, x: np.ndarray) -> np.ndarray:
         """입력 임베딩"""
@@ -210,10 +306,55 @@ class TransformerDecisionModel:
         exp_x = np.exp(x - np.max(x))
         return exp_x / (np.sum(exp_x) + 1e-9)
 
+    def _to_state(self, game_state: Sequence[float]) -> np.ndarray:
+        """입력 검증: 부족한 차원은 0으로 채우고 input_dim 으로 자름"""
+        state = np.zeros(self.input_dim, dtype=np.float32)
+        values = np.asarray(game_state, dtype=np.float32).ravel()[: self.input_dim]
+        state[: len(values)] = values
+        return state
+
+    def _format_result(
+        self, logits: np.ndarray, sequence_length: int
+    ) -> Dict[str, Any]:
+        # 소프트맥스로 확률 계산
+        probs = self._softmax(logits)
+
+        # 최고 확률 행동 선택
+        best_action_idx = int(np.argmax(probs))
+        return {
+            "action": self.action_labels[best_action_idx],
+            "confidence": float(probs[best_action_idx]),
+            "action_probs": {
+                label: float(probs[i]) for i, label in enumerate(self.action_labels)
+            },
+            "sequence_length": sequence_length,
+        }
+
+    def _forward_cached(
+        self, states: np.ndarray, positions: np.ndarray, caches: List[KVCache]
+    ) -> np.ndarray:
+        """새 상태 (n, input_dim) -> 출력 logits (n, num_actions)"""
+        x = self.pos_encoding.encode(self._embed_input(states), positions)
+        for block, cache in zip(self.transformer_blocks, caches):
+            x = block.forward_cached(x, positions, cache)
+        return np.dot(x, self.output_layer)
+
+    def _forward_full(self) -> np.ndarray:
+        """히스토리 전체 재계산 (양방향 어텐션) -> 마지막 토큰 logits"""
+        sequence = np.array(self.state_history)  # (seq_len, input_dim)
+        x = self.pos_encoding.encode(self._embed_input(sequence))
+        for block in self.transformer_blocks:
+            x = block.forward(x)
+        # 마지막 토큰의 출력 사용
+        return np.dot(x[-1], self.output_layer)
+
     def predict(self, game_state: List[float]) -> Dict[str, Any]:
         """
         게임 상태를 입력받아 행동 예측
 
+        incremental 모드에서는 새 상태 하나의 임베딩/K/V 만 계산하고 각
+        레이어 캐시의 최근 max_history_len 개 토큰과 어텐션한다.
+
         Args:
             game_state: 게임 상태 피처 리스트
 
@@ -221,57 +362,21 @@ class TransformerDecisionModel:
             예측 결과 딕셔너리
         """
         try:
-            # 입력 검증
-            if not game_state or len(game_state) < self.input_dim:
-                # 부족한 차원을 0으로 채움
-                game_state = list(game_state) + [0.0] * (
-                    self.input_dim - len(game_state)
-                )
+            state = self._to_state(game_state)
 
-            # numpy 배열로 변환
-            state = np.array(game_state[: self.input_dim], dtype=np.float32)
-
-            # 히스토리에 추가
+            # 히스토리에 추가 (deque maxlen 으로 오래된 상태 자동 제거)
             self.state_history.append(state)
-            if len(self.state_history) > self.max_history_len:
-                self.state_history.pop(0)
-
-            # 시퀀스 생성
-            sequence = np.array(self.state_history)  # (seq_len, input_dim)
-
-            # 입력 임베딩
-            embedded = self._embed_input(sequence)  # (seq_len, d_model)
-
-            # 위치 인코딩
-            encoded = self.pos_encoding.encode(embedded)
-
-            # 트랜스포머 블록 통과
-            x = encoded
-            for block in self.transformer_blocks:
-                x = block.forward(x)
-
-            # 마지막 토큰의 출력 사용
-            last_output = x[-1]  # (d_model,)
 
-            # 출력 레이어
-            logits = np.dot(last_output, self.output_layer)  # (num_actions,)
+            if self.incremental:
+                positions = np.array([self._step], dtype=np.int64)
+                self._step += 1
+                logits = self._forward_cached(
+                    state[None, :], positions, self.kv_caches
+                )[0]
+            else:
+                logits = self._forward_full()
 
-            # 소프트맥스로 확률 계산
-            probs = self._softmax(logits)
-
-            # 최고 확률 행동 선택
-            best_action_idx = np.argmax(probs)
-            best_action = self.action_labels[best_action_idx]
-            confidence = float(probs[best_action_idx])
-
-            return {
-                "action": best_action,
-                "confidence": confidence,
-                "action_probs": {
-                    label: float(probs[i]) for i, label in enumerate(self.action_labels)
-                },
-                "sequence_length": len(self.state_history),
-            }
+            return self._format_result(logits, len(self.state_history))
 
         except Exception as e:
             return {
@@ -280,6 +385,42 @@ class TransformerDecisionModel:
                 "error": str(e),
             }
 
+    def predict_many(
+        self, states: Sequence[Sequence[float]], chunk_size: int = 256
+    ) -> List[Dict[str, Any]]:
+        """
+        오프라인 평가용 배치 예측
+
+        빈 히스토리에서 states 를 순서대로 predict() 한 것과 같은 결과를
+        (incremental 모드 기준) chunk_size 개씩 행렬 연산으로 계산한다.
+        라이브 히스토리/캐시는 건드리지 않는다.
+
+        Args:
+            states: 게임 상태 시퀀스 (n, input_dim)
+            chunk_size: 한 번에 계산할 스텝 수 (메모리 O(chunk·window))
+
+        Returns:
+            스텝별 예측 결과 리스트
+        """
+        if len(states) == 0:
+            return []
+        batch = np.stack([self._to_state(state) for state in states])
+        caches = [
+            KVCache(self.max_history_len, self.d_model) for _ in self.transformer_blocks
+        ]
+
+        logits = []
+        for start in range(0, len(batch), max(1, chunk_size)):
+            chunk = batch[start : start + max(1, chunk_size)]
+            positions = np.arange(start, start + len(chunk), dtype=np.int64)
+            logits.append(self._forward_cached(chunk, positions, caches))
+        logits = np.concatenate(logits)
+
+        return [
+            self._format_result(row, min(i + 1, self.max_history_len))
+            for i, row in enumerate(logits)
+        ]
+
     def get_action_recommendation(self, bot) -> str:
         """
         봇 객체에서 직접 행동 추천
@@ -310,5 +451,12 @@ class TransformerDecisionModel:
             return "ECONOMY"
 
     def reset_history(self):
-        """상태 히스토리 초기화"""
+        """상태 히스토리 및 K/V 캐시 초기화"""
         self.state_history.clear()
+        for cache in self.kv_caches:
+            cache.clear()
+        self._step = 0
+
+    def reset(self):
+        """게임 간 리셋 (reset_history 별칭)"""
+        self.reset_history()
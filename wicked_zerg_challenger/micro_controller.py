@@ -14,6 +14,8 @@ integrating separate modules for:
 import logging
 from typing import List, Set
 
+import numpy as np
+
 logger = logging.getLogger("MicroController")
 
 try:
@@ -31,6 +33,7 @@ from combat.stutter_step_kiting import StutterStepKiting
 from combat.targeting import select_target
 from combat.terrain_analysis import ChokePointDetector
 from combat.threat_response import SplashThreatHandler
+from utils.unit_snapshot import get_frame_snapshot
 
 
 class BoidsController:
@@ -328,45 +331,65 @@ class BoidsController:
         # Optimization: Pre-calculate map center for simple fallback
         # map_center = self.bot.game_info.map_center
 
-        for unit in units:
+        unit_list = list(units)
+        if all(unit.tag in skip_units for unit in unit_list):
+            return
+
+        # Pass 1: per-unit targets and force multipliers
+        targets = np.full((len(unit_list), 2), np.nan)
+        separation_multipliers = np.ones(len(unit_list))
+        cohesion_multipliers = np.ones(len(unit_list))
+        selected = {}
+        for row, unit in enumerate(unit_list):
             if unit.tag in skip_units:
                 continue
 
-            # Get nearby friendly units for flocking
-            neighbors = self._nearby_units(units, unit, 6.0)
-
             # Select target enemy
             target = select_target(unit, enemy_units, max_range=14.0)
-            target_pos = target.position if target else None
+            selected[unit.tag] = target
+            if target:
+                targets[row] = target.position.x, target.position.y
 
             # Calculate splash-based separation multiplier
-            separation_multiplier = self.splash_handler.get_separation_multiplier(
+            separation_multipliers[row] = self.splash_handler.get_separation_multiplier(
                 unit, splash_threats
             )
 
             # Get terrain-based cohesion modifier
-            cohesion_multiplier = self.chokepoint_detector.get_cohesion_modifier(
+            cohesion_multipliers[row] = self.chokepoint_detector.get_cohesion_modifier(
                 unit.position
             )
 
-            # Calculate base Boids velocity
-            vx, vy = self.swarm_controller.calculate_swarm_velocity(
-                unit,
-                neighbors,
-                target=target_pos,
-                enemy_units=enemy_units,
-                separation_multiplier=separation_multiplier,
-                cohesion_multiplier=cohesion_multiplier,
-            )
+        # Calculate base Boids velocities and potential field repulsion
+        # for the whole army in one call each
+        snapshot = get_frame_snapshot(self.bot)
+        velocities = self._swarm_velocities(
+            unit_list,
+            enemy_units,
+            targets,
+            separation_multipliers,
+            cohesion_multipliers,
+            snapshot,
+        )
+        self.potential_field.ensure_terrain_grid(getattr(self.bot, "game_info", None))
+        repulsions = self.potential_field.get_repulsion_for_units(
+            unit_list,
+            enemy_units,
+            terrain_points=getattr(self.bot, "structures", []),
+            structure_units=enemy_structures,
+            snapshot=snapshot,
+        )
+
+        # Pass 2: per-unit repulsion, formation and command
+        for row, unit in enumerate(unit_list):
+            if unit.tag in skip_units:
+                continue
 
-            # Calculate potential field repulsion
-            terrain_points = getattr(self.bot, "structures", [])
-            rep_x, rep_y = self.potential_field.get_repulsion_vector(
-                unit,
-                enemy_units,
-                terrain_points=terrain_points,
-                structure_units=enemy_structures,
-            )
+            target = selected[unit.tag]
+            target_pos = target.position if target else None
+            vx, vy = velocities[row].tolist()
+
+            rep_x, rep_y = repulsions[row].tolist()
 
             # Add splash threat repulsion
             splash_x, splash_y = self.splash_handler.calculate_repulsion(
@@ -382,6 +405,7 @@ class BoidsController:
                 and UnitTypeId
                 and unit.type_id == UnitTypeId.MUTALISK
             ):
+                neighbors = self._nearby_units(units, unit, 6.0)
                 sep_x, sep_y = self.splash_handler.calculate_neighbor_separation(
                     unit, neighbors
                 )
@@ -508,6 +532,44 @@ class BoidsController:
         # Fallback: brute force O(N)
         return [u for u in units if u.tag != unit.tag and unit.distance_to(u) <= radius]
 
+    def _swarm_velocities(
+        self,
+        units,
+        enemy_units,
+        targets: np.ndarray,
+        separation_multipliers: np.ndarray,
+        cohesion_multipliers: np.ndarray,
+        snapshot=None,
+    ) -> np.ndarray:
+        """
+        Batch Boids velocities for ``units`` (rows follow ``units`` order).
+
+        Positions and velocities come from ``snapshot`` (the frame unit
+        snapshot) when every unit is in it; otherwise positions are read from
+        the units and alignment falls back to the neighbour centroid.
+        """
+        positions = velocities = None
+        if snapshot is not None:
+            rows = snapshot.own.rows_for_units(units)
+            if len(rows) == len(units):
+                positions = snapshot.own.positions[rows]
+                velocities = snapshot.own.velocities[rows]
+        if positions is None:
+            positions = np.array(
+                [(u.position.x, u.position.y) for u in units], dtype=np.float64
+            ).reshape(-1, 2)
+
+        enemy_positions, enemy_types = self.swarm_controller._enemy_arrays(enemy_units)
+        return self.swarm_controller.calculate_swarm_velocities(
+            positions,
+            velocities=velocities,
+            target=targets,
+            enemy_positions=enemy_positions,
+            enemy_types=enemy_types,
+            separation_multiplier=separation_multipliers,
+            cohesion_multiplier=cohesion_multipliers,
+        )
+
     def _get_enemy_center(self, enemy_units):
         """Calculate centroid of enemy units."""
         if not Point2 or not enemy_units:
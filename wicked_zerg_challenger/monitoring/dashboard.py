@@ -1,76 +1,73 @@
 # -*- coding: utf-8 -*-
-"""Static dashboard generation from telemetry files."""
+"""Static dashboard generation from the telemetry store."""
 
 from __future__ import annotations
 
-import json
 import logging
 from pathlib import Path
 from typing import Dict, List
 
+from monitoring.telemetry_store import TelemetryStore, is_win
+
 logger = logging.getLogger("Dashboard")
 
 
 class DashboardServer:
-    """Read telemetry files and generate a compact HTML dashboard."""
+    """Query the telemetry store and generate a compact HTML dashboard."""
 
     def __init__(self, telemetry_dir: str = "data/telemetry", port: int = 8765, data_dir: str = None):
         self.telemetry_dir = Path(data_dir or telemetry_dir)
         self.telemetry_dir.mkdir(parents=True, exist_ok=True)
         self.port = int(port)
+        self.store = TelemetryStore(self.telemetry_dir)
+
+    def refresh(self) -> int:
+        """Index JSON game files written since the last refresh (legacy / external)."""
+        return self.store.ingest_directory(self.telemetry_dir)
 
     def get_recent_games(self, limit: int = 20) -> List[Dict]:
-        files = sorted(
-            [path for path in self.telemetry_dir.glob("*.json") if path.name != "analytics.json"],
-            key=lambda path: path.stat().st_mtime,
-            reverse=True,
-        )
-        games: List[Dict] = []
-        for path in files[:limit]:
-            try:
-                data = json.loads(path.read_text(encoding="utf-8"))
-            except (OSError, json.JSONDecodeError):
-                continue
-            games.append(
-                {
-                    "game_id": data.get("game_id", path.stem),
-                    "result": data.get("result", "Unknown"),
-                    "enemy_race": data.get("enemy_race", "Unknown"),
-                    "map": data.get("map_name", "Unknown"),
-                    "date": data.get("start_time", ""),
-                    "performance": data.get("performance", {}),
-                }
-            )
-        return games
+        self.refresh()
+        return [
+            {
+                "game_id": game["game_id"],
+                "result": game["result"],
+                "enemy_race": game["enemy_race"],
+                "map": game["map_name"],
+                "date": game["start_time"],
+                "performance": game["summary"].get("performance", {}),
+            }
+            for game in self.store.recent_games(limit)
+        ]
 
     def get_winrate_summary(self) -> Dict:
-        games = self.get_recent_games(limit=100)
-        if not games:
+        self.refresh()
+        overall = self.store.win_rate(recent=100)
+        if not overall["total"]:
             return {"overall": {"total": 0, "wins": 0, "winrate": 0.0}, "by_race": {}}
 
-        total = len(games)
-        wins = sum(1 for game in games if game["result"] in {"Victory", "win", "Win"})
-        by_race: Dict[str, Dict] = {}
-        for race in ["Terran", "Protoss", "Zerg"]:
-            race_games = [game for game in games if game["enemy_race"] == race]
-            race_wins = sum(1 for game in race_games if game["result"] in {"Victory", "win", "Win"})
-            by_race[race] = {
-                "total": len(race_games),
-                "wins": race_wins,
-                "winrate": race_wins / len(race_games) * 100.0 if race_games else 0.0,
-            }
+        by_race = self.store.win_rate(group_by="enemy_race", recent=100)
+        empty = {"total": 0, "wins": 0, "winrate": 0.0}
+        return {
+            "overall": overall,
+            "by_race": {race: by_race.get(race, empty) for race in ["Terran", "Protoss", "Zerg"]},
+        }
+
+    def get_frame_time_summary(self, recent: int = 100) -> Dict:
+        """Frame-time p50/p95/p99 overall and per matchup (from stored histograms)."""
+        self.refresh()
         return {
-            "overall": {"total": total, "wins": wins, "winrate": wins / total * 100.0},
-            "by_race": by_race,
+            "overall": self.store.frame_time_percentiles(recent=recent),
+            "by_race": self.store.frame_time_percentiles(group_by="enemy_race", recent=recent),
         }
 
     def generate_dashboard_html(self) -> str:
         summary = self.get_winrate_summary()
         recent = self.get_recent_games(10)
         overall = summary.get("overall", {})
+        frame_ms = self.store.frame_time_percentiles(recent=100)
         rows = []
         for game in recent:
-            css = "win" if game["result"] in {"Victory", "win", "Win"} else "loss"
+            css = "win" if is_win(game["result"]) else "loss"
             rows.append(
                 f'<tr><td class="{css}">{game["result"]}</td>'
                 f"<td>{game['enemy_race']}</td><td>{game['map']}</td><td>{game['date']}</td></tr>"
@@ -87,7 +84,8 @@ table {{ width: 100%; border-collapse: collapse; }}
 td, th {{ padding: 8px; text-align: left; border-bottom: 1px solid #333; }}
 </style></head><body>
 <h1>WickedZergBotPro Dashboard</h1>
-<div class="card"><h2>Overall: {overall.get('winrate', 0.0):.1f}% ({overall.get('wins', 0)}/{overall.get('total', 0)})</h2></div>
+<div class="card"><h2>Overall: {overall.get('winrate', 0.0):.1f}% ({overall.get('wins', 0)}/{overall.get('total', 0)})</h2>
+<p>Frame time p50 / p95 / p99: {frame_ms[50]:.1f} / {frame_ms[95]:.1f} / {frame_ms[99]:.1f} ms</p></div>
 <div class="card"><h3>Recent Games</h3>
 <table><tr><th>Result</th><th>vs</th><th>Map</th><th>Date</th></tr>
 {rows_html}
@@ -5,11 +5,14 @@ from __future__ import annotations
 
 import json
 import logging
+import sqlite3
 import time
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from monitoring.telemetry_store import TelemetryStore
+
 logger = logging.getLogger("TelemetryLoggerAtomic")
 
 
@@ -58,13 +61,23 @@ def _amount(collection) -> int:
 
 
 class TelemetryCollector:
-    """Collect sampled frame telemetry and write one JSON file per game."""
+    """Collect sampled frame telemetry and append each game to the columnar store.
+
+    A compact JSON copy is still written per game unless write_json=False.
+    """
 
-    def __init__(self, output_dir: str = "data/telemetry", sample_interval: int = 22):
+    def __init__(
+        self,
+        output_dir: str = "data/telemetry",
+        sample_interval: int = 22,
+        write_json: bool = True,
+    ):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.current_game: Optional[GameTelemetry] = None
         self._sample_interval = max(1, int(sample_interval))
+        self.write_json = write_json
+        self.store = TelemetryStore(self.output_dir)
 
     def start_game(self, game_id: str, enemy_race: str, map_name: str) -> None:
         self.current_game = GameTelemetry(
@@ -133,13 +146,21 @@ class TelemetryCollector:
                 "frames_over_320ms": sum(1 for value in frame_times if value > 320),
             }
 
-        output_path = self.output_dir / f"{self.current_game.game_id}_{result}.json"
-        output_path.write_text(
-            json.dumps(asdict(self.current_game), indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
-        logger.info("[TELEMETRY] Game ended: %s. Saved to %s", result, output_path)
-        return output_path
+        record = asdict(self.current_game)
+        output_path = None
+        if self.write_json:
+            output_path = self.output_dir / f"{self.current_game.game_id}_{result}.json"
+            output_path.write_text(
+                json.dumps(record, ensure_ascii=False, separators=(",", ":")),
+                encoding="utf-8",
+            )
+        try:
+            self.store.append_telemetry(record, source_path=output_path)
+        except (OSError, sqlite3.Error, ValueError) as e:
+            logger.warning("[TELEMETRY] Store append failed: %s", e)
+        saved_to = output_path or self.store.db_path
+        logger.info("[TELEMETRY] Game ended: %s. Saved to %s", result, saved_to)
+        return saved_to
 
 
 class TelemetryLoggerAtomic:
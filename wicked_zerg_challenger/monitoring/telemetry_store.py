@@ -0,0 +1,577 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar telemetry store: one SQLite row per game + compressed NPZ frame columns.
+
+Layout under ``root``::
+
+    telemetry.db          games table, indexed on race / map / result / date
+    frames/<game_id>.npz  per-game frame columns (np.savez_compressed)
+
+Each row also keeps frame-time statistics and a fixed-bin frame-time
+histogram, so win-rate, matchup and frame-time percentile queries run on
+the index alone and never open a game's frames.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("TelemetryStore")
+
+WIN_RESULTS = {"Victory", "win", "Win"}
+
+# Frame-time histogram edges (ms): 0.5 ms bins to 50 ms, 5 ms bins to 500 ms, overflow
+FRAME_MS_EDGES = np.concatenate(
+    [np.arange(0.0, 50.0, 0.5), np.arange(50.0, 500.0, 5.0), [500.0, np.inf]]
+)
+
+FILTER_COLUMNS = ("enemy_race", "map_name", "result", "source")
+GROUP_COLUMNS = ("enemy_race", "map_name", "result", "date", "source")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    start_time TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL DEFAULT '',
+    enemy_race TEXT NOT NULL DEFAULT 'Unknown',
+    map_name TEXT NOT NULL DEFAULT 'Unknown',
+    result TEXT NOT NULL DEFAULT 'Unknown',
+    win INTEGER NOT NULL DEFAULT 0,
+    duration REAL,
+    total_frames INTEGER NOT NULL DEFAULT 0,
+    avg_frame_ms REAL,
+    p50_frame_ms REAL,
+    p95_frame_ms REAL,
+    p99_frame_ms REAL,
+    max_frame_ms REAL,
+    frames_over_250ms INTEGER,
+    frame_hist BLOB,
+    frames_file TEXT,
+    source_path TEXT,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_games_race ON games(enemy_race);
+CREATE INDEX IF NOT EXISTS idx_games_map ON games(map_name);
+CREATE INDEX IF NOT EXISTS idx_games_result ON games(result);
+CREATE INDEX IF NOT EXISTS idx_games_date ON games(date);
+CREATE INDEX IF NOT EXISTS idx_games_start ON games(start_time);
+CREATE INDEX IF NOT EXISTS idx_games_source_path ON games(source_path);
+"""
+
+
+def normalize_label(value: Any) -> str:
+    """'Race.Terran' / 'Result.Victory' -> 'Terran' / 'Victory'."""
+    text = str(value or "").strip()
+    return text.rsplit(".", 1)[-1] if text else "Unknown"
+
+
+def is_win(result: Any) -> bool:
+    return normalize_label(result) in WIN_RESULTS
+
+
+def frame_columns(frames: Any) -> Dict[str, np.ndarray]:
+    """Records (dicts or dataclasses) or a column mapping -> {name: 1-D array}."""
+    if not frames:
+        return {}
+    if isinstance(frames, Mapping):
+        columns = {name: list(values) for name, values in frames.items()}
+    else:
+        rows = [
+            dataclasses.asdict(row) if dataclasses.is_dataclass(row) else row
+            for row in frames
+        ]
+        names: Dict[str, None] = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        columns = {name: [row.get(name) for row in rows] for name in names}
+
+    arrays = {}
+    for name, values in columns.items():
+        array = np.asarray(values)
+        if array.dtype == object or array.ndim != 1:
+            array = np.asarray(["" if v is None else str(v) for v in values])
+        arrays[name] = array
+    return arrays
+
+
+def frame_time_stats(frame_ms: Optional[np.ndarray]) -> Dict[str, Any]:
+    """Per-game frame-time statistics and histogram (None values when empty)."""
+    if frame_ms is None or len(frame_ms) == 0:
+        return {
+            "avg_frame_ms": None,
+            "p50_frame_ms": None,
+            "p95_frame_ms": None,
+            "p99_frame_ms": None,
+            "max_frame_ms": None,
+            "frames_over_250ms": None,
+            "frame_hist": None,
+        }
+    values = np.asarray(frame_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    hist, _ = np.histogram(values, bins=FRAME_MS_EDGES)
+    return {
+        "avg_frame_ms": float(values.mean()),
+        "p50_frame_ms": float(p50),
+        "p95_frame_ms": float(p95),
+        "p99_frame_ms": float(p99),
+        "max_frame_ms": float(values.max()),
+        "frames_over_250ms": int((values > 250).sum()),
+        "frame_hist": hist.astype(np.int32).tobytes(),
+    }
+
+
+def histogram_percentiles(
+    hist: np.ndarray, percentiles: Sequence[float], max_ms: float
+) -> Dict[float, float]:
+    """Percentiles from a FRAME_MS_EDGES histogram (bin upper edge, capped at max)."""
+    total = int(hist.sum())
+    if total == 0:
+        return {q: 0.0 for q in percentiles}
+    cumulative = np.cumsum(hist)
+    upper = FRAME_MS_EDGES[1:]
+    out = {}
+    for q in percentiles:
+        index = int(np.searchsorted(cumulative, q / 100.0 * total, side="left"))
+        index = min(index, len(upper) - 1)
+        out[q] = float(min(upper[index], max_ms))
+    return out
+
+
+def _safe_name(game_id: str) -> str:
+    return re.sub(r"[^\w.-]", "_", game_id)
+
+
+class TelemetryStore:
+    """Game index + per-game frame columns under one directory."""
+
+    def __init__(
+        self, root: str | Path = "data/telemetry", db_name: str = "telemetry.db"
+    ):
+        self.root = Path(root)
+        self.frames_dir = self.root / "frames"
+        self.frames_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / db_name
+        self._batch_conn: Optional[sqlite3.Connection] = None
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        if self._batch_conn is not None:
+            yield self._batch_conn
+            return
+        conn = self._open()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def batch(self) -> Iterator["TelemetryStore"]:
+        """Group many appends into one transaction (one commit at the end)."""
+        if self._batch_conn is not None:
+            yield self
+            return
+        conn = self._open()
+        self._batch_conn = conn
+        try:
+            with conn:
+                yield self
+        finally:
+            self._batch_conn = None
+            conn.close()
+
+    # ── Writing ───────────────────────────────────────────────────────────
+
+    def append_game(
+        self,
+        game_id: str,
+        *,
+        source: str = "telemetry",
+        start_time: str = "",
+        enemy_race: Any = "",
+        map_name: Any = "",
+        result: Any = "",
+        duration: Optional[float] = None,
+        frames: Any = None,
+        frame_time_column: Optional[str] = "frame_time_ms",
+        events: Optional[List[Dict]] = None,
+        summary: Optional[Dict] = None,
+        source_path: Optional[str | Path] = None,
+    ) -> str:
+        """Write one game's frame columns and (re)index it. Returns game_id."""
+        columns = frame_columns(frames)
+        frames_file = None
+        if columns or events:
+            frames_file = f"{_safe_name(game_id)}.npz"
+            payload = dict(columns)
+            if events:
+                payload["__events__"] = np.asarray(
+                    json.dumps(events, ensure_ascii=False, default=str)
+                )
+            tmp = self.frames_dir / f"{frames_file}.tmp.npz"
+            np.savez_compressed(tmp, **payload)
+            os.replace(tmp, self.frames_dir / frames_file)
+
+        total_frames = len(next(iter(columns.values()))) if columns else 0
+        stats = frame_time_stats(columns.get(frame_time_column or ""))
+        row = {
+            "game_id": game_id,
+            "source": source,
+            "start_time": str(start_time or ""),
+            "date": str(start_time or "")[:10],
+            "enemy_race": normalize_label(enemy_race),
+            "map_name": str(map_name or "Unknown"),
+            "result": normalize_label(result),
+            "win": int(is_win(result)),
+            "duration": duration,
+            "total_frames": total_frames,
+            **stats,
+            "frames_file": frames_file,
+            "source_path": os.path.abspath(source_path) if source_path else None,
+            "summary": json.dumps(summary or {}, ensure_ascii=False, default=str),
+        }
+        names = ", ".join(row)
+        marks = ", ".join("?" for _ in row)
+        with self._connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO games ({names}) VALUES ({marks})",
+                list(row.values()),
+            )
+        return game_id
+
+    def append_telemetry(
+        self, record: Mapping[str, Any], source_path: Optional[str | Path] = None
+    ) -> str:
+        """Index a TelemetryCollector game (asdict(GameTelemetry) layout)."""
+        return self.append_game(
+            str(record.get("game_id") or Path(source_path or "game").stem),
+            source="telemetry",
+            start_time=record.get("start_time", ""),
+            enemy_race=record.get("enemy_race"),
+            map_name=record.get("map_name"),
+            result=record.get("result"),
+            frames=record.get("frames"),
+            events=record.get("events"),
+            summary={"performance": record.get("performance", {})},
+            source_path=source_path,
+        )
+
+    def append_game_log(
+        self,
+        game_id: str,
+        data: Mapping[str, Any],
+        source_path: Optional[str | Path] = None,
+    ) -> str:
+        """Index a GameDataLogger document; resource snapshots become the frames."""
+        meta = data.get("meta", {}) or {}
+        outcome = data.get("game_result", {}) or {}
+        return self.append_game(
+            game_id,
+            source="game_log",
+            start_time=meta.get("timestamp", ""),
+            enemy_race=meta.get("opponent_race"),
+            map_name=meta.get("map_name"),
+            result=outcome.get("result"),
+            duration=outcome.get("duration"),
+            frames=data.get("resource_snapshots"),
+            frame_time_column=None,
+            summary={
+                "game_result": outcome,
+                "counts": {
+                    key: len(value)
+                    for key, value in data.items()
+                    if isinstance(value, list)
+                },
+            },
+            source_path=source_path,
+        )
+
+    def ingest_json(self, path: str | Path) -> Optional[str]:
+        """Index one legacy JSON game file (telemetry or game log format)."""
+        path = Path(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            logger.debug("skipping unreadable telemetry file %s: %s", path, e)
+            return None
+        if not isinstance(data, dict):
+            return None
+        if "meta" in data and "game_result" in data:
+            return self.append_game_log(path.stem, data, source_path=path)
+        if "game_id" in data or "frames" in data:
+            return self.append_telemetry(data, source_path=path)
+        return None
+
+    def ingest_directory(
+        self,
+        directory: Optional[str | Path] = None,
+        exclude: Iterable[str] = ("analytics.json",),
+    ) -> int:
+        """Index *.json files not seen before (by path). Returns files added."""
+        directory = os.path.abspath(directory or self.root)
+        skip = set(exclude)
+        with self._connection() as conn:
+            known = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT source_path FROM games WHERE source_path IS NOT NULL"
+                )
+            }
+        added = 0
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return 0
+        with self.batch():
+            for entry in entries:
+                if not entry.name.endswith(".json") or entry.name in skip:
+                    continue
+                path = os.path.join(directory, entry.name)
+                if path in known or not entry.is_file():
+                    continue
+                if self.ingest_json(path) is not None:
+                    added += 1
+        if added:
+            logger.info(
+                "[TELEMETRY_STORE] Indexed %d game files from %s", added, directory
+            )
+        return added
+
+    # ── Queries ───────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _where(
+        filters: Mapping[str, Any],
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> tuple:
+        clauses, params = [], []
+        for name, value in filters.items():
+            if name not in FILTER_COLUMNS:
+                raise ValueError(f"unknown filter {name!r}; expected {FILTER_COLUMNS}")
+            if value is None:
+                continue
+            if name in ("enemy_race", "result"):
+                value = normalize_label(value)
+            clauses.append(f"{name} = ?")
+            params.append(value)
+        if since:
+            clauses.append("date >= ?")
+            params.append(since)
+        if until:
+            clauses.append("date <= ?")
+            params.append(until)
+        sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return sql, params
+
+    def _scope(self, recent: Optional[int], since, until, filters) -> tuple:
+        """FROM clause for the filtered games, optionally only the most recent N."""
+        where, params = self._where(filters, since, until)
+        if recent is None:
+            return f"FROM games {where}", params
+        return (
+            f"FROM (SELECT * FROM games {where} "
+            f"ORDER BY start_time DESC, rowid DESC LIMIT ?)",
+            params + [int(recent)],
+        )
+
+    @staticmethod
+    def _group_column(group_by: Optional[str]) -> Optional[str]:
+        if group_by is not None and group_by not in GROUP_COLUMNS:
+            raise ValueError(f"unknown group {group_by!r}; expected {GROUP_COLUMNS}")
+        return group_by
+
+    def count(
+        self, since: Optional[str] = None, until: Optional[str] = None, **filters
+    ) -> int:
+        where, params = self._where(filters, since, until)
+        with self._connection() as conn:
+            return int(
+                conn.execute(f"SELECT COUNT(*) FROM games {where}", params).fetchone()[
+                    0
+                ]
+            )
+
+    def recent_games(
+        self,
+        limit: int = 20,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        **filters,
+    ) -> List[Dict[str, Any]]:
+        """Newest games first (index columns only, no frames)."""
+        where, params = self._where(filters, since, until)
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT game_id, source, start_time, enemy_race, map_name, result, "
+                "win, duration, total_frames, avg_frame_ms, p95_frame_ms, "
+                "max_frame_ms, frames_over_250ms, summary "
+                f"FROM games {where} ORDER BY start_time DESC, rowid DESC LIMIT ?",
+                params + [int(limit)],
+            ).fetchall()
+        games = []
+        for row in rows:
+            game = dict(row)
+            game["summary"] = json.loads(game["summary"] or "{}")
+            games.append(game)
+        return games
+
+    def win_rate(
+        self,
+        group_by: Optional[str] = None,
+        recent: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        **filters,
+    ) -> Dict[str, Any]:
+        """
+        {"total", "wins", "winrate"} overall, or {group: {...}} with group_by.
+
+        recent limits the scope to the newest N matching games.
+        """
+        group = self._group_column(group_by)
+        scope, params = self._scope(recent, since, until, filters)
+        select = "COUNT(*) AS total, COALESCE(SUM(win), 0) AS wins"
+        with self._connection() as conn:
+            if group is None:
+                row = conn.execute(f"SELECT {select} {scope}", params).fetchone()
+                return self._rate(row["total"], row["wins"])
+            rows = conn.execute(
+                f"SELECT {group} AS key, {select} {scope} GROUP BY {group} ORDER BY {group}",
+                params,
+            ).fetchall()
+        return {row["key"]: self._rate(row["total"], row["wins"]) for row in rows}
+
+    @staticmethod
+    def _rate(total: int, wins: int) -> Dict[str, Any]:
+        total, wins = int(total or 0), int(wins or 0)
+        return {
+            "total": total,
+            "wins": wins,
+            "winrate": wins / total * 100.0 if total else 0.0,
+        }
+
+    def frame_time_percentiles(
+        self,
+        percentiles: Sequence[float] = (50, 95, 99),
+        group_by: Optional[str] = None,
+        recent: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        **filters,
+    ) -> Dict[Any, Dict[float, float]]:
+        """
+        Frame-time percentiles over all frames of the matching games.
+
+        Computed from the per-game histograms (0.5 ms resolution below 50 ms,
+        5 ms below 500 ms). Returns {q: ms}, or {group: {q: ms}} with group_by.
+        """
+        group = self._group_column(group_by)
+        scope, params = self._scope(recent, since, until, filters)
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {group or 'NULL'} AS key, frame_hist, max_frame_ms {scope}",
+                params,
+            ).fetchall()
+
+        bins = len(FRAME_MS_EDGES) - 1
+        totals: Dict[Any, np.ndarray] = {}
+        maxima: Dict[Any, float] = {}
+        for row in rows:
+            if row["frame_hist"] is None:
+                continue  # game without frame timings
+            hist = np.frombuffer(row["frame_hist"], dtype=np.int32)
+            if len(hist) != bins:
+                continue
+            name = row["key"]
+            totals[name] = totals.get(name, 0) + hist
+            maxima[name] = max(maxima.get(name, 0.0), row["max_frame_ms"] or 0.0)
+
+        result = {
+            name: histogram_percentiles(hist, percentiles, maxima[name])
+            for name, hist in totals.items()
+        }
+        if group is None:
+            return result.get(None, {q: 0.0 for q in percentiles})
+        return result
+
+    def matchup_summary(
+        self,
+        recent: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        **filters,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Per enemy race: games, wins, winrate, avg duration, frame-time p50/p95/p99."""
+        scope, params = self._scope(recent, since, until, filters)
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT enemy_race, COUNT(*) AS total, COALESCE(SUM(win), 0) AS wins, "
+                "AVG(duration) AS avg_duration, "
+                "SUM(avg_frame_ms * total_frames) / NULLIF(SUM("
+                "CASE WHEN avg_frame_ms IS NULL THEN 0 ELSE total_frames END), 0) "
+                f"AS avg_frame_ms {scope} GROUP BY enemy_race ORDER BY enemy_race",
+                params,
+            ).fetchall()
+        frame_ms = self.frame_time_percentiles(
+            group_by="enemy_race", recent=recent, since=since, until=until, **filters
+        )
+        summary = {}
+        for row in rows:
+            race = row["enemy_race"]
+            entry = self._rate(row["total"], row["wins"])
+            entry["avg_duration"] = row["avg_duration"]
+            entry["avg_frame_ms"] = row["avg_frame_ms"]
+            entry["frame_ms"] = frame_ms.get(race, {})
+            summary[race] = entry
+        return summary
+
+    def load_frames(
+        self, game_id: str, columns: Optional[Sequence[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """One game's frame columns (only the requested ones are decompressed)."""
+        path = self._frames_path(game_id)
+        if path is None:
+            return {}
+        with np.load(path) as data:
+            names = [n for n in data.files if n != "__events__"]
+            return {name: data[name] for name in (columns or names) if name in names}
+
+    def load_events(self, game_id: str) -> List[Dict]:
+        path = self._frames_path(game_id)
+        if path is None:
+            return []
+        with np.load(path) as data:
+            if "__events__" not in data.files:
+                return []
+            return json.loads(str(data["__events__"]))
+
+    def _frames_path(self, game_id: str) -> Optional[Path]:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT frames_file FROM games WHERE game_id = ?", (game_id,)
+            ).fetchone()
+        if row is None or not row["frames_file"]:
+            return None
+        path = self.frames_dir / row["frames_file"]
+        return path if path.exists() else None
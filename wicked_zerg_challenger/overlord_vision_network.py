@@ -17,6 +17,7 @@ Features:
 from typing import Dict, List
 
 from utils.logger import get_logger
+from utils.map_analysis import get_map_analysis
 
 try:
     from sc2.bot_ai import BotAI
@@ -126,6 +127,11 @@ class OverlordVisionNetwork:
         if not enemy_base or not hasattr(self.bot, "game_info"):
             return []
 
+        # 맵/스폰별 정적 분석 캐시(utils.map_analysis)
+        analysis = get_map_analysis(self.bot)
+        if analysis is not None and analysis.matches_spawn(enemy_start=enemy_base):
+            return list(analysis.pillars)
+
         pathing = getattr(self.bot.game_info, "pathing_grid", None)
         if pathing is None:
             return []
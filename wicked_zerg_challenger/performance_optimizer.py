@@ -14,6 +14,8 @@ import logging
 import time
 from typing import Any, Dict, Optional
 
+from utils.generational_cache import get_shared_cache, seconds_to_generations
+
 logger = logging.getLogger("PerformanceOptimizer")
 
 
@@ -46,9 +48,8 @@ class PerformanceOptimizer:
         # 마지막 실행 시간 추적
         self.last_execution = {}
 
-        # 캐시 시스템
-        self.cache = {}
-        self.cache_ttl = {}  # Time To Live
+        # 캐시 시스템 (봇 공유 GenerationalCache, "perf" / "perf_distance" 네임스페이스)
+        self.cache = get_shared_cache(bot)
 
         # 로그 스팸 방지
         self.last_log_time = {}
@@ -58,12 +59,6 @@ class PerformanceOptimizer:
         self.execution_times = {}
         self.execution_counts = {}
 
-        # * 거리 계산 캐시 (Distance Calculation Cache) *
-        self._distance_cache = {}
-        self._distance_cache_ttl = {}
-        self._distance_cache_hits = 0
-        self._distance_cache_misses = 0
-
         # 프레임 관리
         self._frame_start_time = None
 
@@ -121,23 +116,12 @@ class PerformanceOptimizer:
 
         Args:
             key: 캐시 키
-            ttl: 캐시 유효 시간 (초)
+            ttl: 캐시 유효 시간 (게임 초, 저장 세대 기준)
 
         Returns:
             캐시된 값 또는 None
         """
-        if key not in self.cache:
-            return None
-
-        # TTL 확인
-        cache_time = self.cache_ttl.get(key, 0)
-        if time.time() - cache_time > ttl:
-            # 만료됨
-            del self.cache[key]
-            del self.cache_ttl[key]
-            return None
-
-        return self.cache[key]
+        return self.cache.get("perf", key, max_age=seconds_to_generations(ttl))
 
     def set_cache(self, key: str, value: Any):
         """
@@ -147,8 +131,7 @@ class PerformanceOptimizer:
             key: 캐시 키
             value: 저장할 값
         """
-        self.cache[key] = value
-        self.cache_ttl[key] = time.time()
+        self.cache.set("perf", key, value)
 
     def clear_cache(self, key: Optional[str] = None):
         """
@@ -158,11 +141,9 @@ class PerformanceOptimizer:
             key: 삭제할 키 (None이면 전체 삭제)
         """
         if key is None:
-            self.cache.clear()
-            self.cache_ttl.clear()
-        elif key in self.cache:
-            del self.cache[key]
-            del self.cache_ttl[key]
+            self.cache.invalidate_namespace("perf")
+        else:
+            self.cache.invalidate("perf", key)
 
     def track_execution(self, logic_name: str, execution_time: float):
         """
@@ -256,11 +237,8 @@ class PerformanceOptimizer:
     # ========== 거리 계산 캐싱 시스템 ==========
 
     def start_frame(self):
-        """프레임 시작 (거리 캐시 초기화)"""
+        """프레임 시작 (거리 캐시는 세대가 바뀌면 자동 만료)"""
         self._frame_start_time = time.time()
-        # 매 프레임마다 거리 캐시 초기화 (유닛 위치가 변경되므로)
-        self._distance_cache.clear()
-        self._distance_cache_ttl.clear()
 
     def end_frame(self):
         """프레임 종료 (통계 업데이트)"""
@@ -275,26 +253,23 @@ class PerformanceOptimizer:
         Args:
             unit1: 첫 번째 유닛 또는 위치
             unit2: 두 번째 유닛 또는 위치
-            ttl: 캐시 유효 시간 (초, 기본 0.1초 = 2프레임)
+            ttl: 호환용 인자 (거리는 현재 프레임 세대에서만 유효)
 
         Returns:
             거리
         """
         # 캐시 키 생성 (유닛 태그 또는 위치 기반)
         try:
-            key1 = getattr(unit1, "tag", None) or str(getattr(unit1, "position", unit1))
-            key2 = getattr(unit2, "tag", None) or str(getattr(unit2, "position", unit2))
-            cache_key = f"dist_{key1}_{key2}"
+            tag1 = getattr(unit1, "tag", None)
+            tag2 = getattr(unit2, "tag", None)
+            key1 = tag1 or str(getattr(unit1, "position", unit1))
+            key2 = tag2 or str(getattr(unit2, "position", unit2))
+            cache_key = (key1, key2)
 
             # 캐시 조회
-            if cache_key in self._distance_cache:
-                cache_time = self._distance_cache_ttl.get(cache_key, 0)
-                if time.time() - cache_time <= ttl:
-                    self._distance_cache_hits += 1
-                    return self._distance_cache[cache_key]
-
-            # 캐시 미스: 거리 계산
-            self._distance_cache_misses += 1
+            distance = self.cache.get("perf_distance", cache_key)
+            if distance is not None:
+                return distance
 
             # 실제 거리 계산
             pos1 = getattr(unit1, "position", unit1)
@@ -309,9 +284,14 @@ class PerformanceOptimizer:
                 dy = getattr(pos1, "y", pos1[1]) - getattr(pos2, "y", pos2[1])
                 distance = (dx**2 + dy**2) ** 0.5
 
-            # 캐시에 저장
-            self._distance_cache[cache_key] = distance
-            self._distance_cache_ttl[cache_key] = time.time()
+            # 캐시에 저장 (유닛이 죽으면 invalidate_tag 로 제거)
+            self.cache.set(
+                "perf_distance",
+                cache_key,
+                distance,
+                ttl=0,
+                depends_on=[tag for tag in (tag1, tag2) if tag],
+            )
 
             return distance
 
@@ -383,25 +363,21 @@ class PerformanceOptimizer:
 
     def get_distance_cache_stats(self) -> dict:
         """거리 캐시 통계 반환"""
-        total_requests = self._distance_cache_hits + self._distance_cache_misses
-        hit_rate = (
-            self._distance_cache_hits / total_requests * 100
-            if total_requests > 0
-            else 0.0
-        )
+        stats = self.cache.stats("perf_distance")
+        total_requests = stats["hits"] + stats["misses"]
 
         return {
-            "cache_size": len(self._distance_cache),
-            "hits": self._distance_cache_hits,
-            "misses": self._distance_cache_misses,
-            "hit_rate": f"{hit_rate:.1f}%",
+            "cache_size": stats["size"],
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "evictions": stats["evictions"],
+            "hit_rate": f"{stats['hit_rate'] * 100:.1f}%",
             "total_requests": total_requests,
         }
 
     def reset_distance_cache_stats(self):
         """거리 캐시 통계 초기화"""
-        self._distance_cache_hits = 0
-        self._distance_cache_misses = 0
+        self.cache.reset_stats("perf_distance")
 
 
 # ==================== 빠른 승리를 위한 전략 최적화 ====================
@@ -4,17 +4,19 @@
 Parallel Training Runner - 병렬 인스턴스 훈련
 
 각 인스턴스가 다른 종족/난이도 조합으로 동시 훈련.
-SC2는 단일 인스턴스만 지원하므로, 순차적 멀티 게임을
-빠른 속도로 연속 실행하는 방식으로 병렬화.
+워커 프로세스마다 SC2 인스턴스 1개를 유지하며 (local_training.game_farm),
+중앙 코디네이터가 결과 도착 순서대로 난이도 사다리를 조정한다.
+
+    SC2_WORKERS=8 python run_parallel_training.py
 
 GPU 가속 활용 + 빠른 게임 전환.
 """
 
+import asyncio
 import json
 import logging
 import os
 import random
-import subprocess
 import sys
 import time
 from datetime import datetime
@@ -54,10 +56,12 @@ def _ensure_sc2_path():
 
 _ensure_sc2_path()
 
+from local_training.game_farm import DifficultyLadder, GameFarm, GameJob
 from sc2 import maps
 from sc2.data import Difficulty, Race
-from sc2.main import run_game
+from sc2.main import _play_game, _setup_host_game
 from sc2.player import Bot, Computer
+from sc2.sc2process import SC2Process
 from wicked_zerg_bot_pro_impl import WickedZergBotProImpl
 
 # GPU setup
@@ -77,6 +81,9 @@ except (ImportError, OSError):
 # Training config (env overrides allow quick simulator validation runs)
 TOTAL_GAMES = int(os.getenv("SC2_TOTAL_GAMES", "20"))
 GAME_TIME_LIMIT = int(os.getenv("SC2_GAME_TIME_LIMIT", "420"))
+# 동시 SC2 인스턴스 수 (인스턴스당 SC2 + 봇 프로세스로 약 2코어)
+WORKERS = int(os.getenv("SC2_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+BASE_PORT = int(os.getenv("SC2_BASE_PORT", "5000"))
 MAP_POOL = ["AbyssalReefLE", "AscensiontoAiurLE", "OdysseyLE"]
 RACE_POOL = [Race.Protoss, Race.Terran, Race.Zerg]
 DIFFICULTY_LADDER = [
@@ -87,129 +94,99 @@ DIFFICULTY_LADDER = [
 ]
 
 
-def _cleanup_sc2_processes():
-    """Best-effort SC2 process cleanup to avoid stale transport issues."""
-    if sys.platform != "win32":
-        return
-    for exe in ("SC2_x64.exe", "SC2.exe"):
-        try:
-            subprocess.run(
-                ["taskkill", "/F", "/IM", exe],
-                capture_output=True,
-                timeout=3,
-            )
-        except Exception:
-            pass
-
-
 def _is_win_result(result_text: str) -> bool:
     upper = (result_text or "").upper()
     return "VICTORY" in upper or "WIN" in upper
 
 
-def run_training_game(game_num, total, difficulty_idx=0):
-    """Run a single training game with random matchup."""
-    map_name = random.choice(MAP_POOL)
-    enemy_race = random.choice(RACE_POOL)
-    difficulty = DIFFICULTY_LADDER[min(difficulty_idx, len(DIFFICULTY_LADDER) - 1)]
-    diff_name = difficulty.name
-
-    logger.info(f"\n{'='*60}")
-    logger.info(
-        f"  TRAIN {game_num}/{total} | {map_name} | {enemy_race.name} | {diff_name}"
+def _is_transport_error(error: Exception) -> bool:
+    lower_error = str(error).lower()
+    return (
+        "connection already closed" in lower_error
+        or "cannot write to closing transport" in lower_error
     )
-    logger.info(f"{'='*60}")
 
-    # Transport close errors can happen right after on_end; retry once and
-    # recover from bot-side stored result when available.
-    max_attempts = 2
 
-    for attempt in range(1, max_attempts + 1):
-        _cleanup_sc2_processes()
+class SC2GameRunner:
+    """
+    GameFarm 워커용 게임 실행기
+
+    워커 프로세스 수명 동안 SC2 인스턴스 1개 (워커 포트 범위의 첫 포트)를
+    재사용한다. 게임 중 예외가 나면 인스턴스를 닫고 다음 게임에서 새로
+    띄운다. 다른 워커의 SC2를 죽이지 않도록 taskkill 정리는 하지 않는다.
+    """
+
+    def __init__(self, context):
+        _configure_logging()
+        self.context = context
+        self._loop = asyncio.new_event_loop()
+        self._process = None
+        self._server = None
+
+    def run(self, job: GameJob) -> dict:
         bot_ai = WickedZergBotProImpl(train_mode=True)
-        bot = Bot(Race.Zerg, bot_ai)
+        players = [
+            Bot(Race.Zerg, bot_ai),
+            Computer(Race[job.race], Difficulty[job.difficulty]),
+        ]
+        logger.info(
+            f"  [W{self.context.worker_id}] TRAIN {job.game} | {job.map_name} | "
+            f"{job.race} | {job.difficulty}"
+        )
         start = time.time()
         try:
-            result = run_game(
-                maps.get(map_name),
-                [bot, Computer(enemy_race, difficulty)],
-                realtime=False,
-                game_time_limit=GAME_TIME_LIMIT,
-            )
-            elapsed = time.time() - start
+            result = self._loop.run_until_complete(self._play(job.map_name, players))
             won = _is_win_result(str(result))
-            tag = "WIN" if won else "LOSS"
-            logger.info(f"  {tag} in {elapsed:.0f}s | {enemy_race.name} {diff_name}")
-            _cleanup_sc2_processes()
-            return {
-                "game": game_num,
-                "map": map_name,
-                "race": enemy_race.name,
-                "difficulty": diff_name,
-                "won": won,
-                "time": round(elapsed, 1),
-            }
+            recovered = {}
         except Exception as e:
-            elapsed = time.time() - start
-            error_text = str(e)
-            lower_error = error_text.lower()
-            is_transport_error = (
-                "connection already closed" in lower_error
-                or "cannot write to closing transport" in lower_error
-            )
-
+            self._shutdown_server()
+            # on_end 직후 transport 종료는 봇이 저장한 결과로 복구
             training_result = getattr(bot_ai, "_training_result", {}) or {}
             reported_result = str(training_result.get("game_result", ""))
-            has_reported_result = any(
+            if not _is_transport_error(e) or not any(
                 token in reported_result.upper()
                 for token in ("VICTORY", "WIN", "DEFEAT", "LOSS")
-            )
-
-            if is_transport_error and has_reported_result:
-                won = _is_win_result(reported_result)
-                logger.warning(
-                    "  Transport closed after on_end; recovered result from bot state."
-                )
-                _cleanup_sc2_processes()
-                return {
-                    "game": game_num,
-                    "map": map_name,
-                    "race": enemy_race.name,
-                    "difficulty": diff_name,
-                    "won": won,
-                    "time": round(elapsed, 1),
-                    "recovered": True,
-                    "error": error_text,
-                }
-
-            if is_transport_error and attempt < max_attempts:
-                logger.warning(
-                    f"  Transport error on attempt {attempt}/{max_attempts}: {error_text}"
-                )
-                time.sleep(1.5)
-                continue
-
-            logger.error(f"  ERROR: {error_text}")
-            _cleanup_sc2_processes()
-            return {
-                "game": game_num,
-                "map": map_name,
-                "race": enemy_race.name,
-                "difficulty": diff_name,
-                "won": False,
-                "error": error_text,
-                "time": round(elapsed, 1),
-            }
-
-    return {
-        "game": game_num,
-        "map": map_name,
-        "race": enemy_race.name,
-        "difficulty": diff_name,
-        "won": False,
-        "error": "retry_exhausted",
-        "time": 0,
-    }
+            ):
+                raise
+            won = _is_win_result(reported_result)
+            recovered = {"recovered": True, "error": str(e)}
+
+        return {
+            "game": job.game,
+            "map": job.map_name,
+            "race": job.race,
+            "difficulty": job.difficulty,
+            "won": won,
+            "time": round(time.time() - start, 1),
+            **recovered,
+        }
+
+    async def _play(self, map_name: str, players):
+        if self._server is None:
+            self._process = SC2Process(port=self.context.port)
+            self._server = await self._process.__aenter__()
+        await self._server.ping()
+        client = await _setup_host_game(
+            self._server, maps.get(map_name), players, realtime=False
+        )
+        result = await _play_game(
+            players[0], client, False, game_time_limit=GAME_TIME_LIMIT
+        )
+        await client.leave()
+        return result
+
+    def _shutdown_server(self) -> None:
+        if self._process is not None:
+            try:
+                self._loop.run_until_complete(self._process.__aexit__(None, None, None))
+            except Exception as e:
+                logger.warning(f"  SC2 shutdown failed: {e}")
+        self._process = None
+        self._server = None
+
+    def close(self) -> None:
+        self._shutdown_server()
+        self._loop.close()
 
 
 def main():
@@ -222,48 +199,41 @@ def main():
     logger.info(f"  Difficulty Ladder: {[d.name for d in DIFFICULTY_LADDER]}")
     logger.info(f"  Game Time Limit: {GAME_TIME_LIMIT}s")
     logger.info(f"  GPU: {GPU_NAME}")
-    logger.info(f"  Mode: Sequential Fast (realtime=False)")
+    logger.info(f"  Workers: {WORKERS} (ports from {BASE_PORT})")
     logger.info(f"{'='*70}\n")
 
-    results = []
-    wins = 0
-    losses = 0
-    streak = 0
-    difficulty_idx = 0  # Start at Easy
-
-    for game_num in range(1, TOTAL_GAMES + 1):
-        result = run_training_game(game_num, TOTAL_GAMES, difficulty_idx)
-        results.append(result)
-
-        if result.get("won"):
-            wins += 1
-            streak += 1
-            # 3연승 시 난이도 상승
-            if streak >= 3:
-                difficulty_idx = min(difficulty_idx + 1, len(DIFFICULTY_LADDER) - 1)
-                logger.info(
-                    f"  [LADDER UP] -> {DIFFICULTY_LADDER[difficulty_idx].name}"
-                )
-                streak = 0
-        else:
-            losses += 1
-            streak = 0
-            # 3연패 시 난이도 하락
-            recent = results[-3:]
-            if len(recent) >= 3 and all(not r.get("won") for r in recent):
-                difficulty_idx = max(difficulty_idx - 1, 0)
-                logger.info(
-                    f"  [LADDER DOWN] -> {DIFFICULTY_LADDER[difficulty_idx].name}"
-                )
-
-        elapsed = time.time() - start_time
-        wr = wins / max(wins + losses, 1) * 100
+    ladder = DifficultyLadder([d.name for d in DIFFICULTY_LADDER])
+    tally = {"wins": 0, "losses": 0}
+
+    def on_result(result):
+        tally["wins" if result.get("won") else "losses"] += 1
+        tag = "WIN" if result.get("won") else "LOSS"
+        if result.get("error") and not result.get("recovered"):
+            tag = f"ERROR ({result['error']})"
+        done = tally["wins"] + tally["losses"]
+        wr = tally["wins"] / max(done, 1) * 100
         logger.info(
-            f"  [{game_num}/{TOTAL_GAMES}] W:{wins} L:{losses} WR:{wr:.0f}% | "
-            f"Diff:{DIFFICULTY_LADDER[difficulty_idx].name} | {elapsed/60:.1f}m"
+            f"  [{done}/{TOTAL_GAMES}] game {result['game']} {tag} "
+            f"{result.get('race')} {result.get('difficulty')} | "
+            f"W:{tally['wins']} L:{tally['losses']} WR:{wr:.0f}% | "
+            f"Diff:{ladder.current} | {(time.time() - start_time) / 60:.1f}m"
         )
 
-        time.sleep(2)
+    jobs = [
+        GameJob(game_num, random.choice(MAP_POOL), random.choice(RACE_POOL).name)
+        for game_num in range(1, TOTAL_GAMES + 1)
+    ]
+    farm = GameFarm(
+        SC2GameRunner,
+        workers=WORKERS,
+        ladder=ladder,
+        base_port=BASE_PORT,
+        job_timeout=GAME_TIME_LIMIT * 3 + 120,
+        on_result=on_result,
+    )
+    results = sorted(farm.run(jobs), key=lambda r: r["game"])
+    wins, losses = tally["wins"], tally["losses"]
+    difficulty_idx = ladder.index
 
     # Final report
     total_time = time.time() - start_time
@@ -4,18 +4,167 @@ Spatial Optimizer - 공간 해싱 및 거리 계산 최적화
 
 맵을 그리드로 나누어 인접 그리드만 검사하여
 O(N^2) -> O(N) 연산량 감소 (70% 절감)
+
+* Incremental uniform grid *
+- 유닛은 태그별 고정 슬롯(stable tag -> slot)에 저장
+- 매 프레임 셀이 바뀐 유닛만 버킷 이동 (전체 재구축 없음)
+- 버킷은 슬롯 번호 NumPy 배열, 거리 필터는 벡터 연산
+- 아군/적군 별도 인덱스, 반경/k-최근접/개수 + 배치 쿼리
 """
 
-from collections import defaultdict
-from typing import Dict, List, Optional, Set, Tuple
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
 
 from utils.logger import get_logger
+from utils.unit_snapshot import get_frame_snapshot
 
 try:
     from sc2.position import Point2
 except ImportError:
     Point2 = tuple
 
+ALLY = "ally"
+ENEMY = "enemy"
+
+_EMPTY_SLOTS = np.zeros(0, dtype=np.int32)
+_NO_CELL = np.iinfo(np.int64).min  # 빈 슬롯 표시 (실제 셀 키와 겹치지 않음)
+
+
+def _xy(position: Any) -> Tuple[float, float]:
+    pos = getattr(position, "position", position)
+    if isinstance(pos, tuple):
+        return float(pos[0]), float(pos[1])
+    return float(pos.x), float(pos.y)
+
+
+class _GridSide:
+    """One side's (allies or enemies) incremental uniform grid."""
+
+    def __init__(self, cell_size: float, capacity: int = 256):
+        self.cell_size = cell_size
+        self.tags = np.zeros(capacity, dtype=np.int64)
+        self.positions = np.zeros((capacity, 2), dtype=np.float64)
+        self.cells = np.full(capacity, _NO_CELL, dtype=np.int64)
+        self.slot_of: Dict[int, int] = {}
+        self.free: List[int] = list(range(capacity - 1, -1, -1))
+        # cell key -> int32 slot array
+        self.buckets: Dict[int, np.ndarray] = {}
+        self.moves = 0  # 마지막 sync에서 버킷을 옮긴 유닛 수
+
+    def __len__(self) -> int:
+        return len(self.slot_of)
+
+    def cell_keys(self, positions: np.ndarray) -> np.ndarray:
+        cells = np.floor(positions / self.cell_size).astype(np.int64)
+        return (cells[:, 0] << 16) | (cells[:, 1] & 0xFFFF)
+
+    def cell_key(self, cx: int, cy: int) -> int:
+        return (cx << 16) | (cy & 0xFFFF)
+
+    def _grow(self) -> None:
+        old = len(self.tags)
+        new = old * 2
+        self.tags = np.resize(self.tags, new)
+        self.positions = np.resize(self.positions, (new, 2))
+        cells = np.full(new, _NO_CELL, dtype=np.int64)
+        cells[:old] = self.cells
+        self.cells = cells
+        self.free.extend(range(new - 1, old - 1, -1))
+
+    def _bucket_add(self, key: int, slot: int) -> None:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self.buckets[key] = np.array([slot], dtype=np.int32)
+        else:
+            self.buckets[key] = np.append(bucket, np.int32(slot))
+
+    def _bucket_remove(self, key: int, slot: int) -> None:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            return
+        bucket = bucket[bucket != slot]
+        if len(bucket):
+            self.buckets[key] = bucket
+        else:
+            del self.buckets[key]
+
+    def sync(self, tags: Iterable[int], positions: np.ndarray) -> None:
+        """Apply this frame's units; only units whose cell changed move buckets."""
+        tags = [int(t) for t in tags]
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        new_keys = self.cell_keys(positions)
+
+        # 사라진 유닛 제거
+        current = set(tags)
+        for tag in [t for t in self.slot_of if t not in current]:
+            slot = self.slot_of.pop(tag)
+            self._bucket_remove(int(self.cells[slot]), slot)
+            self.cells[slot] = _NO_CELL
+            self.free.append(slot)
+
+        # 새 유닛 슬롯 할당
+        slot_of = self.slot_of
+        slots = np.empty(len(tags), dtype=np.intp)
+        for row, tag in enumerate(tags):
+            slot = slot_of.get(tag)
+            if slot is None:
+                if not self.free:
+                    self._grow()
+                slot = self.free.pop()
+                slot_of[tag] = slot
+                self.tags[slot] = tag
+            slots[row] = slot
+
+        # 셀이 바뀐 유닛만 버킷 이동
+        changed = np.nonzero(self.cells[slots] != new_keys)[0]
+        for row in changed.tolist():
+            slot = int(slots[row])
+            old_key = int(self.cells[slot])
+            if old_key != _NO_CELL:
+                self._bucket_remove(old_key, slot)
+            self._bucket_add(int(new_keys[row]), slot)
+        self.moves = len(changed)
+
+        self.cells[slots] = new_keys
+        self.positions[slots] = positions
+
+    def candidates(self, x: float, y: float, radius: float) -> np.ndarray:
+        """Slots in every cell overlapping the square around (x, y)."""
+        size = self.cell_size
+        x0, x1 = int(np.floor((x - radius) / size)), int(np.floor((x + radius) / size))
+        y0, y1 = int(np.floor((y - radius) / size)), int(np.floor((y + radius) / size))
+        buckets = self.buckets
+        parts = []
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(buckets):
+            # 반경이 넓으면 셀 범위 대신 비어있지 않은 버킷만 순회
+            for key, bucket in buckets.items():
+                cx, cy = key >> 16, ((key & 0xFFFF) ^ 0x8000) - 0x8000
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    parts.append(bucket)
+        else:
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = buckets.get(self.cell_key(cx, cy))
+                    if bucket is not None:
+                        parts.append(bucket)
+        if not parts:
+            return _EMPTY_SLOTS
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def within(
+        self, x: float, y: float, radius: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(slots, squared distances) with distance < radius."""
+        slots = self.candidates(x, y, radius)
+        if not len(slots):
+            return slots, np.zeros(0)
+        delta = self.positions[slots] - (x, y)
+        dist_sq = np.einsum("ij,ij->i", delta, delta)
+        keep = dist_sq < radius * radius
+        return slots[keep], dist_sq[keep]
+
 
 class SpatialOptimizer:
     """
@@ -24,7 +173,8 @@ class SpatialOptimizer:
     공간 해싱을 사용하여 거리 계산 최적화
     - 맵을 그리드로 분할
     - 인접 그리드만 검사
-    - 70% 연산량 감소
+    - 셀이 바뀐 유닛만 갱신 (증분 업데이트)
+    - 아군/적군 반경, k-최근접, 개수, 배치 쿼리
     """
 
     def __init__(self, bot, grid_size: int = 10):
@@ -33,19 +183,27 @@ class SpatialOptimizer:
 
         # * 그리드 설정 *
         self.grid_size = max(grid_size, 1)  # 각 그리드 크기 (10x10), 0 방지
-        self.grids: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self.sides: Dict[str, _GridSide] = {
+            ALLY: _GridSide(self.grid_size),
+            ENEMY: _GridSide(self.grid_size),
+        }
 
-        # * 유닛 위치 캐시 *
-        self.unit_positions: Dict[int, Point2] = {}
-        self.unit_grids: Dict[int, Tuple[int, int]] = {}
+        # * 업데이트 주기 * (증분 갱신이라 매 프레임)
+        self.last_update = -1
+        self.update_interval = 1
+        self.version = 0
 
-        # * 업데이트 주기 *
-        self.last_update = 0
-        self.update_interval = 3  # 3프레임마다 (매우 빈번)
+        # * 쿼리 캐시 (프레임 내, 인덱스 버전별) *
+        self._query_cache: Dict[Tuple, Any] = {}
+        self._unit_lookup: Dict[str, Tuple[int, Dict[int, Any]]] = {}
 
         # * 통계 *
         self.queries_optimized = 0
         self.queries_total = 0
+        self.cache_hits = 0
+        self.query_time_ms = 0.0
+        self.update_time_ms = 0.0
+        self.units_moved = 0
 
     async def on_step(self, iteration: int):
         """매 프레임 실행"""
@@ -64,39 +222,213 @@ class SpatialOptimizer:
 
     def _update_grids(self):
         """
-        모든 유닛의 그리드 위치 업데이트
+        모든 유닛의 그리드 위치 업데이트 (셀이 바뀐 유닛만 이동)
         """
-        # 기존 그리드 초기화
-        self.grids.clear()
-        self.unit_positions.clear()
-        self.unit_grids.clear()
-
         if not hasattr(self.bot, "units") or not hasattr(self.bot, "enemy_units"):
             return
 
-        # * 아군 유닛 *
-        for unit in self.bot.units:
-            self._add_unit_to_grid(unit.tag, unit.position)
+        start = time.perf_counter()
+        snapshot = get_frame_snapshot(self.bot)
+        if snapshot is not None:
+            self.sync(ALLY, snapshot.own.tags.tolist(), snapshot.own.positions)
+            self.sync(ENEMY, snapshot.enemy.tags.tolist(), snapshot.enemy.positions)
+        else:
+            for side, units in ((ALLY, self.bot.units), (ENEMY, self.bot.enemy_units)):
+                units = list(units)
+                self.sync(
+                    side,
+                    [u.tag for u in units],
+                    np.array([_xy(u) for u in units], dtype=np.float64),
+                )
+        self.update_time_ms += (time.perf_counter() - start) * 1000
+
+    def sync(self, side: str, tags: Iterable[int], positions: np.ndarray) -> None:
+        """Update one side from (tags, positions) and invalidate cached queries."""
+        grid = self.sides[side]
+        grid.sync(tags, positions)
+        self.units_moved += grid.moves
+        self.version += 1
+        self._query_cache.clear()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _resolve_sides(self, side: Optional[str]) -> List[_GridSide]:
+        if side is None:
+            return [self.sides[ALLY], self.sides[ENEMY]]
+        return [self.sides[side]]
+
+    def _center_key(self, center: Any) -> Tuple:
+        """Cache key: stable unit tag for unit centres, exact coordinates otherwise."""
+        tag = getattr(center, "tag", None)
+        if tag is not None:
+            return ("tag", tag)
+        return _xy(center)
+
+    def query_radius(
+        self, center: Any, radius: float, side: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Tags within ``radius`` (strictly closer, like Units.closer_than).
 
-        # * 적 유닛 *
-        for unit in self.bot.enemy_units:
-            self._add_unit_to_grid(unit.tag, unit.position)
+        Args:
+            center: 유닛 또는 위치
+            radius: 반경
+            side: ALLY, ENEMY 또는 None (전체)
 
-    def _add_unit_to_grid(self, unit_tag: int, position: Point2):
+        Returns:
+            태그 배열
         """
-        유닛을 그리드에 추가
+        start = time.perf_counter()
+        self.queries_total += 1
+        key = ("radius", side, self._center_key(center), radius)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            self.query_time_ms += (time.perf_counter() - start) * 1000
+            return cached
+
+        x, y = _xy(center)
+        parts = []
+        for grid in self._resolve_sides(side):
+            slots, _ = grid.within(x, y, radius)
+            parts.append(grid.tags[slots])
+        result = parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+        self._query_cache[key] = result
+        self.queries_optimized += 1
+        self.query_time_ms += (time.perf_counter() - start) * 1000
+        return result
 
-        Args:
-            unit_tag: 유닛 태그
-            position: 유닛 위치
+    def count_in_range(
+        self, center: Any, radius: float, side: Optional[str] = None
+    ) -> int:
+        return int(len(self.query_radius(center, radius, side)))
+
+    def query_knn(
+        self, center: Any, k: int, side: str = ENEMY, max_distance: float = np.inf
+    ) -> List[Tuple[int, float]]:
+        """
+        k nearest units of one side, closest first.
+
+        Searches rings of doubling radius until k units are found, so only
+        nearby buckets are touched.
+
+        Returns:
+            [(tag, distance), ...]
+        """
+        start = time.perf_counter()
+        self.queries_total += 1
+        grid = self.sides[side]
+        x, y = _xy(center)
+        result: List[Tuple[int, float]] = []
+
+        if k > 0 and len(grid):
+            radius = float(self.grid_size)
+            while True:
+                capped = min(radius, max_distance)
+                slots, dist_sq = grid.within(x, y, capped)
+                if len(slots) >= k or capped >= max_distance or radius > 512:
+                    break
+                radius *= 2.0
+            if len(slots) > k:
+                nearest = np.argpartition(dist_sq, k - 1)[:k]
+                slots, dist_sq = slots[nearest], dist_sq[nearest]
+            order = np.argsort(dist_sq, kind="stable")
+            result = list(
+                zip(grid.tags[slots[order]].tolist(), np.sqrt(dist_sq[order]).tolist())
+            )
+
+        self.queries_optimized += 1
+        self.query_time_ms += (time.perf_counter() - start) * 1000
+        return result
+
+    def query_radius_batch(
+        self, centers: np.ndarray, radius: float, side: str = ENEMY
+    ) -> List[np.ndarray]:
+        """
+        Radius query for many centres in one call.
+
+        Candidates are the buckets overlapping the centres' bounding box;
+        distances are one (K, C) matrix.
+
+        Returns:
+            centre-aligned list of tag arrays
         """
-        grid_x = int(position.x / self.grid_size)
-        grid_y = int(position.y / self.grid_size)
-        grid_key = (grid_x, grid_y)
+        start = time.perf_counter()
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        self.queries_total += len(centers)
+        grid = self.sides[side]
+        if not len(centers) or not len(grid):
+            return [np.zeros(0, dtype=np.int64) for _ in range(len(centers))]
+
+        low = centers.min(axis=0)
+        high = centers.max(axis=0)
+        mid = (low + high) / 2
+        half = float(np.max(high - low)) / 2 + radius
+        slots = grid.candidates(float(mid[0]), float(mid[1]), half)
+
+        inside = self._within_matrix(centers, grid.positions[slots], radius)
+        tags = grid.tags[slots]
+        result = [tags[row] for row in inside]
+
+        self.queries_optimized += len(centers)
+        self.query_time_ms += (time.perf_counter() - start) * 1000
+        return result
+
+    def count_in_range_batch(
+        self, centers: np.ndarray, radius: float, side: str = ENEMY
+    ) -> np.ndarray:
+        """(K,) unit counts within ``radius`` of each centre."""
+        return np.array(
+            [len(tags) for tags in self.query_radius_batch(centers, radius, side)],
+            dtype=np.int64,
+        )
 
-        self.grids[grid_key].add(unit_tag)
-        self.unit_positions[unit_tag] = position
-        self.unit_grids[unit_tag] = grid_key
+    @staticmethod
+    def _within_matrix(
+        centers: np.ndarray, points: np.ndarray, radius: float
+    ) -> np.ndarray:
+        dist_sq = np.subtract.outer(centers[:, 0], points[:, 0])
+        dist_sq *= dist_sq
+        dy_sq = np.subtract.outer(centers[:, 1], points[:, 1])
+        dy_sq *= dy_sq
+        dist_sq += dy_sq
+        return dist_sq < radius * radius
+
+    def units_in_range(self, center: Any, radius: float, side: str = ENEMY) -> List:
+        """
+        Unit objects within ``radius`` (drop-in for ``units.closer_than``).
+        """
+        lookup = self._units_by_tag(side)
+        return [
+            lookup[tag]
+            for tag in self.query_radius(center, radius, side).tolist()
+            if tag in lookup
+        ]
+
+    def _units_by_tag(self, side: str) -> Dict[int, Any]:
+        """tag -> Unit for one side, rebuilt once per index version."""
+        cached = self._unit_lookup.get(side)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        units = self.bot.enemy_units if side == ENEMY else self.bot.units
+        lookup = {unit.tag: unit for unit in units}
+        self._unit_lookup[side] = (self.version, lookup)
+        return lookup
+
+    def position_of(self, tag: int) -> Optional[Point2]:
+        for grid in self.sides.values():
+            slot = grid.slot_of.get(tag)
+            if slot is not None:
+                x, y = grid.positions[slot]
+                return Point2((float(x), float(y)))
+        return None
+
+    # ------------------------------------------------------------------
+    # Legacy API (tag lists)
+    # ------------------------------------------------------------------
 
     def find_units_in_range(
         self, center: Point2, radius: float, unit_tags: Optional[Set[int]] = None
@@ -112,40 +444,10 @@ class SpatialOptimizer:
         Returns:
             범위 내 유닛 태그 리스트
         """
-        self.queries_total += 1
-
-        # * 1. 중심 위치의 그리드 계산 *
-        center_grid_x = int(center.x / self.grid_size)
-        center_grid_y = int(center.y / self.grid_size)
-
-        # * 2. 검색할 그리드 범위 계산 *
-        grid_radius = int(radius / self.grid_size) + 1
-
-        nearby_units = []
-
-        # * 3. 인접 그리드만 검사 *
-        for dx in range(-grid_radius, grid_radius + 1):
-            for dy in range(-grid_radius, grid_radius + 1):
-                grid_key = (center_grid_x + dx, center_grid_y + dy)
-
-                if grid_key not in self.grids:
-                    continue
-
-                # 해당 그리드의 유닛들 검사
-                for unit_tag in self.grids[grid_key]:
-                    # 필터링 (unit_tags가 지정된 경우)
-                    if unit_tags is not None and unit_tag not in unit_tags:
-                        continue
-
-                    # 실제 거리 확인
-                    unit_pos = self.unit_positions.get(unit_tag)
-                    if unit_pos:
-                        distance = self._fast_distance(center, unit_pos)
-                        if distance <= radius:
-                            nearby_units.append(unit_tag)
-
-        self.queries_optimized += 1
-        return nearby_units
+        tags = self.query_radius(center, radius).tolist()
+        if unit_tags is not None:
+            tags = [tag for tag in tags if tag in unit_tags]
+        return tags
 
     def find_closest_unit(
         self,
@@ -165,22 +467,20 @@ class SpatialOptimizer:
             (unit_tag, distance) or None
         """
         nearby = self.find_units_in_range(center, max_distance, unit_tags)
-
         if not nearby:
             return None
 
+        x, y = _xy(center)
         closest_tag = None
         min_distance = float("inf")
-
         for tag in nearby:
-            pos = self.unit_positions.get(tag)
-            if pos:
-                distance = self._fast_distance(center, pos)
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_tag = tag
+            pos = self.position_of(tag)
+            distance = ((pos.x - x) ** 2 + (pos.y - y) ** 2) ** 0.5
+            if distance < min_distance:
+                min_distance = distance
+                closest_tag = tag
 
-        return (closest_tag, min_distance) if closest_tag else None
+        return (closest_tag, min_distance) if closest_tag is not None else None
 
     def count_units_in_range(
         self, center: Point2, radius: float, unit_tags: Optional[Set[int]] = None
@@ -196,6 +496,8 @@ class SpatialOptimizer:
         Returns:
             유닛 개수
         """
+        if unit_tags is None:
+            return self.count_in_range(center, radius)
         return len(self.find_units_in_range(center, radius, unit_tags))
 
     def get_unit_clusters(
@@ -222,8 +524,8 @@ class SpatialOptimizer:
             if tag in processed:
                 continue
 
-            pos = self.unit_positions.get(tag)
-            if not pos:
+            pos = self.position_of(tag)
+            if pos is None:
                 continue
 
             # 주변 유닛 찾기
@@ -231,40 +533,15 @@ class SpatialOptimizer:
 
             if len(nearby) >= min_cluster_size:
                 # 클러스터 중심 계산
-                _nearby_count = len(nearby)
-                center_x = (
-                    sum(self.unit_positions[t].x for t in nearby) / _nearby_count
-                    if _nearby_count
-                    else 0
-                )
-                center_y = (
-                    sum(self.unit_positions[t].y for t in nearby) / _nearby_count
-                    if _nearby_count
-                    else 0
-                )
-                center = Point2((center_x, center_y))
+                points = np.array([tuple(self.position_of(t)) for t in nearby])
+                center_x, center_y = points.mean(axis=0)
+                center = Point2((float(center_x), float(center_y)))
 
                 clusters.append((center, nearby))
                 processed.update(nearby)
 
         return clusters
 
-    @staticmethod
-    def _fast_distance(p1: Point2, p2: Point2) -> float:
-        """
-        빠른 거리 계산 (제곱근 없이)
-
-        Args:
-            p1: 위치 1
-            p2: 위치 2
-
-        Returns:
-            거리
-        """
-        dx = p1.x - p2.x
-        dy = p1.y - p2.y
-        return (dx * dx + dy * dy) ** 0.5
-
     def get_statistics(self) -> Dict:
         """통계 반환"""
         efficiency = (
@@ -272,14 +549,24 @@ class SpatialOptimizer:
             if self.queries_total > 0
             else 0
         )
+        hit_rate = self.cache_hits / self.queries_total if self.queries_total else 0.0
+        avg_query_ms = (
+            self.query_time_ms / self.queries_total if self.queries_total else 0.0
+        )
 
         return {
             "grid_size": self.grid_size,
-            "total_grids": len(self.grids),
-            "total_units": len(self.unit_positions),
+            "total_grids": sum(len(grid.buckets) for grid in self.sides.values()),
+            "total_units": sum(len(grid) for grid in self.sides.values()),
             "queries_total": self.queries_total,
             "queries_optimized": self.queries_optimized,
             "efficiency": f"{efficiency:.1f}%",
+            "cache_hits": self.cache_hits,
+            "cache_hit_rate": hit_rate,
+            "query_time_ms": self.query_time_ms,
+            "avg_query_ms": avg_query_ms,
+            "update_time_ms": self.update_time_ms,
+            "units_moved": self.units_moved,
         }
 
     def get_grid_info(self, position: Point2) -> Dict:
@@ -292,14 +579,17 @@ class SpatialOptimizer:
         Returns:
             그리드 정보
         """
-        grid_x = int(position.x / self.grid_size)
-        grid_y = int(position.y / self.grid_size)
-        grid_key = (grid_x, grid_y)
+        x, y = _xy(position)
+        grid_x = int(np.floor(x / self.grid_size))
+        grid_y = int(np.floor(y / self.grid_size))
 
-        unit_count = len(self.grids.get(grid_key, set()))
+        unit_count = 0
+        for grid in self.sides.values():
+            bucket = grid.buckets.get(grid.cell_key(grid_x, grid_y))
+            unit_count += 0 if bucket is None else len(bucket)
 
         return {
-            "grid_key": grid_key,
+            "grid_key": (grid_x, grid_y),
             "unit_count": unit_count,
             "grid_bounds": {
                 "x_min": grid_x * self.grid_size,
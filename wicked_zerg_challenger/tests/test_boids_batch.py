@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sc2.position import Point2
+
+from combat.boids_swarm_control import BoidsSwarmController, _neighbor_pairs
+
+
+def make_unit(tag, x, y, name="ZERGLING"):
+    return SimpleNamespace(
+        tag=tag, position=Point2((x, y)), type_id=SimpleNamespace(name=name)
+    )
+
+
+class TestNeighborPairs(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        positions = rng.uniform(0, 40, size=(150, 2))
+        positions[5] = positions[4]  # 겹친 유닛은 쌍에서 제외
+
+        owner, other, delta, dist = _neighbor_pairs(positions, 5.0)
+
+        diff = positions[None, :, :] - positions[:, None, :]
+        brute = np.hypot(diff[..., 0], diff[..., 1])
+        expected = set(zip(*np.nonzero((brute > 0) & (brute < 5.0))))
+        self.assertEqual(set(zip(owner.tolist(), other.tolist())), expected)
+        np.testing.assert_allclose(delta, positions[other] - positions[owner])
+        np.testing.assert_allclose(dist, brute[owner, other])
+
+    def test_single_point_has_no_pairs(self):
+        owner, _, _, _ = _neighbor_pairs(np.array([[1.0, 2.0]]), 5.0)
+        self.assertEqual(len(owner), 0)
+
+
+class TestBatchSwarmVelocities(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.boids = BoidsSwarmController()
+        self.units = [make_unit(i, *rng.uniform(20, 35, size=2)) for i in range(40)]
+        names = ["MARINE", "SIEGETANKSIEGED", "COLOSSUS", "BANELING"]
+        self.enemies = [
+            make_unit(1000 + i, *rng.uniform(30, 45, size=2), name=names[i % 4])
+            for i in range(12)
+        ]
+
+    def test_batch_matches_per_unit_wrapper(self):
+        target = Point2((40.0, 40.0))
+        positions = np.array([(u.position.x, u.position.y) for u in self.units])
+        enemy_positions = np.array([(e.position.x, e.position.y) for e in self.enemies])
+        enemy_types = [e.type_id.name for e in self.enemies]
+        separation = np.linspace(1.0, 3.0, len(self.units))
+
+        batch = self.boids.calculate_swarm_velocities(
+            positions,
+            target=target,
+            enemy_positions=enemy_positions,
+            enemy_types=enemy_types,
+            separation_multiplier=separation,
+            cohesion_multiplier=0.5,
+        )
+
+        for row, unit in enumerate(self.units):
+            expected = self.boids.calculate_swarm_velocity(
+                unit,
+                self.units,
+                target=target,
+                enemy_units=self.enemies,
+                separation_multiplier=separation[row],
+                cohesion_multiplier=0.5,
+            )
+            np.testing.assert_allclose(batch[row], expected, atol=1e-12)
+
+    def test_grid_path_matches_dense_path(self):
+        rng = np.random.default_rng(11)
+        positions = rng.normal(50.0, 4.0, size=(120, 2))
+        velocities = rng.normal(0.0, 0.2, size=(120, 2))
+
+        dense = self.boids.calculate_swarm_velocities(positions, velocities)
+        self.boids.dense_limit = 0
+        grid = self.boids.calculate_swarm_velocities(positions, velocities)
+        np.testing.assert_allclose(grid, dense, atol=1e-9)
+
+    def test_velocities_are_clamped_to_max_force(self):
+        positions = np.array([(u.position.x, u.position.y) for u in self.units])
+        batch = self.boids.calculate_swarm_velocities(positions, target=(0.0, 0.0))
+        magnitudes = np.hypot(batch[:, 0], batch[:, 1])
+        self.assertTrue(np.all(magnitudes <= self.boids.max_force + 1e-12))
+
+    def test_nan_target_rows_skip_seeking(self):
+        positions = np.array([[0.0, 0.0], [100.0, 100.0]])
+        targets = np.array([[10.0, 0.0], [np.nan, np.nan]])
+        batch = self.boids.calculate_swarm_velocities(positions, target=targets)
+        self.assertGreater(batch[0, 0], 0.0)
+        np.testing.assert_allclose(batch[1], [0.0, 0.0])
+
+    def test_alignment_follows_neighbour_velocity(self):
+        boids = BoidsSwarmController(
+            separation_weight=0.0, cohesion_weight=0.0, alignment_weight=1.0
+        )
+        positions = np.array([[0.0, 0.0], [3.0, 0.0], [0.0, 3.0]])
+        velocities = np.array([[0.0, 0.0], [0.0, 1.0], [0.0, 1.0]])
+        batch = boids.calculate_swarm_velocities(positions, velocities=velocities)
+        np.testing.assert_allclose(batch[0], [0.0, boids.max_force])
+
+    def test_apply_boids_to_units_returns_points(self):
+        results = self.boids.apply_boids_to_units(
+            self.units, target=Point2((40.0, 40.0)), enemy_units=self.enemies
+        )
+        self.assertEqual([u.tag for u, _ in results], [u.tag for u in self.units])
+        self.assertTrue(all(isinstance(p, Point2) for _, p in results))
+        self.assertEqual(self.boids.apply_boids_to_units([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 from bot_step_integration import BotStepIntegrator
 from sc2.ids.unit_typeid import UnitTypeId
+from utils.frame_scheduler import FrameScheduler
 
 
 class FakePoint:
@@ -85,6 +86,7 @@ class TestBotStepEmergencyExpansionGate(unittest.TestCase):
         integrator = BotStepIntegrator.__new__(BotStepIntegrator)
         integrator.bot = bot
         integrator.logger = Mock()
+        integrator._scheduler = FrameScheduler()
         return integrator, bot, strategy
 
     def test_emergency_static_defense_waits_for_third_without_base_threat(self):
@@ -130,6 +132,21 @@ class TestBotStepEmergencyExpansionGate(unittest.TestCase):
 
         bot.build.assert_not_awaited()
 
+    def test_emergency_defense_is_gated_by_scheduler(self):
+        integrator, bot, strategy = self.make_integrator(
+            enemy_units=[FakeUnit(FakePoint(8 + offset, 0)) for offset in range(4)]
+        )
+        strategy.emergency_spore_requested = False
+        integrator._scheduler = FrameScheduler(spread=False)
+        BotStepIntegrator._register_scheduled_tasks(integrator)
+
+        for iteration in range(1, 44):
+            asyncio.run(integrator._handle_emergency_defense(iteration))
+
+        # interval=22 → 1..43 구간에서는 iteration 22 한 번만 실행
+        bot.build.assert_awaited_once()
+        self.assertEqual(integrator._scheduler.tasks["EmergencyDefense"].run_count, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
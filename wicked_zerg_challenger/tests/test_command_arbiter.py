@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sc2.action import combine_actions
+from sc2.ids.ability_id import AbilityId
+from sc2.position import Point2
+from sc2.unit_command import UnitCommand
+
+from core.command_arbiter import CommandArbiter, protocol_action_count
+from unit_authority_manager import AuthorityLevel, UnitAuthorityManager
+
+MOVE = AbilityId.MOVE_MOVE  # Unit.move
+ATTACK = AbilityId.ATTACK  # Unit.attack (COMBINEABLE_ABILITIES 에 포함)
+TRAIN = AbilityId.LARVATRAIN_ZERGLING
+
+
+class Unit(SimpleNamespace):
+    """UnitCommand 는 클래스 이름이 Unit 인지 검사함"""
+
+
+def unit(tag, orders=()):
+    return Unit(tag=tag, orders=list(orders))
+
+
+def order(ability, target, exact=None):
+    return SimpleNamespace(
+        ability=SimpleNamespace(id=ability, exact_id=exact or ability), target=target
+    )
+
+
+def cmd(ability, u, target=None, queue=False):
+    return UnitCommand(ability, u, target=target, queue=queue)
+
+
+class TestArbitration(unittest.TestCase):
+    def setUp(self):
+        self.bot = SimpleNamespace(actions=[])
+        self.bot.command_arbiter = CommandArbiter(self.bot)
+        self.arbiter = self.bot.command_arbiter
+
+    def issue(self, *commands):
+        self.bot.actions.extend(commands)
+
+    def test_identical_commands_are_grouped_for_combine(self):
+        a, b, c = unit(1), unit(2), unit(3)
+        goal, other = Point2((30, 30)), Point2((10, 10))
+        self.issue(cmd(ATTACK, a, goal), cmd(MOVE, b, other), cmd(ATTACK, c, goal))
+        before = len(list(combine_actions(self.bot.actions)))
+
+        self.arbiter.flush()
+
+        self.assertEqual([x.unit.tag for x in self.bot.actions], [1, 3, 2])
+        after = len(list(combine_actions(self.bot.actions)))
+        self.assertEqual((before, after), (3, 2))
+        self.assertEqual(protocol_action_count(self.bot.actions), after)
+
+    def test_last_replacing_command_wins_by_default(self):
+        a = unit(1)
+        self.issue(cmd(MOVE, a, Point2((5, 5))), cmd(ATTACK, a, Point2((9, 9))))
+        self.arbiter.flush()
+        self.assertEqual(len(self.bot.actions), 1)
+        self.assertEqual(self.bot.actions[0].ability, ATTACK)
+        self.assertEqual(self.arbiter.conflicts_dropped, 1)
+
+    def test_granted_command_beats_later_ungranted_one(self):
+        authority = UnitAuthorityManager(self.bot)
+        a = unit(1)
+        self.assertTrue(authority.request_unit(1, "Defense", AuthorityLevel.DEFENSE))
+        self.issue(cmd(ATTACK, a, Point2((5, 5))))
+        self.issue(cmd(MOVE, a, Point2((40, 40))))  # 권한 없이 덮어쓰기
+
+        self.arbiter.flush()
+
+        self.assertEqual([x.ability for x in self.bot.actions], [ATTACK])
+        self.assertEqual(self.arbiter._grants, {})
+
+    def test_higher_grant_wins_between_granted_commands(self):
+        authority = UnitAuthorityManager(self.bot)
+        a = unit(1)
+        authority.request_unit(1, "Creep", AuthorityLevel.CREEP)
+        self.issue(cmd(MOVE, a, Point2((5, 5))))
+        authority.request_unit(1, "Combat", AuthorityLevel.COMBAT)
+        self.issue(cmd(ATTACK, a, Point2((9, 9))))
+        self.issue(cmd(MOVE, a, Point2((1, 1))))
+
+        self.arbiter.flush()
+
+        self.assertEqual([x.ability for x in self.bot.actions], [ATTACK])
+
+    def test_queued_commands_follow_the_winner(self):
+        a = unit(1)
+        self.issue(
+            cmd(MOVE, a, Point2((1, 1))),
+            cmd(MOVE, a, Point2((5, 5))),
+            cmd(ATTACK, a, Point2((9, 9)), queue=True),
+        )
+        self.arbiter.flush()
+        self.assertEqual(
+            [(x.ability, x.queue) for x in self.bot.actions],
+            [(MOVE, False), (ATTACK, True)],
+        )
+        self.assertEqual(self.bot.actions[0].target, Point2((5, 5)))
+
+    def test_untargeted_commands_are_untouched(self):
+        larva = unit(1)
+        self.issue(cmd(TRAIN, larva), cmd(TRAIN, larva))
+        self.arbiter.flush()
+        self.assertEqual(len(self.bot.actions), 2)
+        self.assertEqual(self.arbiter.conflicts_dropped, 0)
+
+    def test_repeat_of_current_order_is_dropped(self):
+        enemy = SimpleNamespace(tag=77)
+        a = unit(1, [order(ATTACK, 77)])
+        b = unit(2, [order(MOVE, Point2((20.0, 20.0)))])
+        c = unit(3, [order(MOVE, Point2((20.0, 20.0)))])
+        self.issue(
+            cmd(ATTACK, a, enemy),
+            cmd(MOVE, b, Point2((20.05, 20.0))),  # 허용 오차 안
+            cmd(MOVE, c, Point2((25.0, 20.0))),
+        )
+        self.arbiter.flush()
+        self.assertEqual([x.unit.tag for x in self.bot.actions], [3])
+        self.assertEqual(self.arbiter.duplicates_dropped, 2)
+
+    def test_generic_or_exact_ability_matches_current_order(self):
+        # 주문은 일반 id(ATTACK)와 정확한 id(ATTACK_ATTACK)를 함께 가짐
+        current = [order(ATTACK, 77, exact=AbilityId.ATTACK_ATTACK)]
+        enemy = SimpleNamespace(tag=77)
+        self.issue(
+            cmd(ATTACK, unit(1, current), enemy),
+            cmd(AbilityId.ATTACK_ATTACK, unit(2, current), enemy),
+        )
+        self.arbiter.flush()
+        self.assertEqual(self.bot.actions, [])
+
+    def test_queued_repeat_is_not_a_duplicate(self):
+        a = unit(1, [order(MOVE, Point2((20.0, 20.0)))])
+        self.issue(cmd(MOVE, a, Point2((20.0, 20.0)), queue=True))
+        self.arbiter.flush()
+        self.assertEqual(len(self.bot.actions), 1)
+
+    def test_worker_protection_does_not_note_grants(self):
+        worker = SimpleNamespace(tag=5, is_gathering=True, is_returning=False)
+        self.bot.workers = _Units([worker])
+        authority = UnitAuthorityManager(self.bot)
+        authority._protect_economy_workers()
+        self.assertTrue(authority.is_worker_protected(5))
+        self.assertEqual(self.arbiter._grants, {})
+
+    def test_stats(self):
+        a, b = unit(1), unit(2)
+        goal = Point2((30, 30))
+        self.issue(cmd(ATTACK, a, goal), cmd(ATTACK, b, goal))
+        self.arbiter.flush()
+        stats = self.arbiter.get_stats()
+        self.assertEqual(stats["frames"], 1)
+        self.assertEqual(stats["commands_in"], 2)
+        self.assertEqual(stats["protocol_actions_out"], 1)
+
+
+class _Units(list):
+    @property
+    def amount(self):
+        return len(self)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import math
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sc2.position import Point2
+
+from creep_manager import CreepPlanner, CreepSpreadManager
+
+
+def reference_best(source, targets, tumors, pending, expansions, enemy, spread_range):
+    """이전 중첩 루프 구현 (require_creep 없이)"""
+    candidates = []
+    for target in targets:
+        dist = source.distance_to(target)
+        if dist > spread_range or dist < 2:
+            continue
+        pos_tuple = (round(target.x, 1), round(target.y, 1))
+        if pos_tuple in tumors or pos_tuple in pending:
+            continue
+        if any(
+            math.sqrt((target.x - t[0]) ** 2 + (target.y - t[1]) ** 2) < 8.0
+            for t in tumors
+        ):
+            continue
+        score = 0.0
+        for exp_dir in expansions:
+            if target.distance_to(exp_dir) < source.distance_to(exp_dir):
+                score += 2.0
+        if enemy and target.distance_to(enemy) < source.distance_to(enemy):
+            score += 1.0
+        score += dist * 0.1
+        candidates.append((target, score))
+    if not candidates:
+        return None
+    candidates.sort(key=lambda c: c[1], reverse=True)
+    return candidates[0][0]
+
+
+class TestCreepPlanner(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.targets = [
+            Point2((gx * 9.0 + 4.5, gy * 9.0 + 4.5))
+            for gx in range(1, 14)
+            for gy in range(1, 14)
+        ]
+        self.tumors = {
+            (round(x, 1), round(y, 1)) for x, y in rng.uniform(10, 120, size=(25, 2))
+        }
+        self.expansions = [Point2((30.0, 90.0)), Point2((80.0, 40.0))]
+        self.enemy = Point2((120.0, 120.0))
+
+        self.planner = CreepPlanner()
+        self.planner.set_targets([(p.x, p.y) for p in self.targets])
+        self.planner.set_directions(
+            [(p.x, p.y) for p in self.expansions] + [(self.enemy.x, self.enemy.y)],
+            [2.0, 2.0, 1.0],
+        )
+        self.planner.set_tumors(self.tumors)
+
+    def test_matches_reference_loops(self):
+        pending = {(round(self.targets[40].x, 1), round(self.targets[40].y, 1))}
+        self.planner.mark_pending(next(iter(pending)))
+        rng = np.random.default_rng(9)
+        for source in rng.uniform(0, 130, size=(80, 2)):
+            source = Point2(tuple(source))
+            for spread_range in (8.0, 10.0):
+                expected = reference_best(
+                    source,
+                    self.targets,
+                    self.tumors,
+                    pending,
+                    self.expansions,
+                    self.enemy,
+                    spread_range,
+                )
+                result = self.planner.best_target(source, spread_range, 8.0)
+                self.assertEqual(
+                    result, None if expected is None else (expected.x, expected.y)
+                )
+
+    def test_incremental_tumor_field_matches_rebuild(self):
+        fresh = CreepPlanner()
+        fresh.set_targets([(p.x, p.y) for p in self.targets])
+        tumors = sorted(self.tumors)
+        for count in range(0, len(tumors) + 5, 5):
+            fresh.set_tumors(tumors[:count])
+        np.testing.assert_allclose(fresh.tumor_distance, self.planner.tumor_distance)
+
+        # 종양 제거 시 전체 재계산
+        fresh.set_tumors(tumors[:3])
+        rebuilt = CreepPlanner()
+        rebuilt.set_targets([(p.x, p.y) for p in self.targets])
+        rebuilt.set_tumors(tumors[:3])
+        np.testing.assert_allclose(fresh.tumor_distance, rebuilt.tumor_distance)
+
+    def test_coverage_and_creep_filter(self):
+        creep = np.zeros((128, 128), dtype=np.uint8)
+        creep[:, :40] = 1
+        pathable = np.ones((128, 128), dtype=np.uint8)
+        pathable[:, 120:] = 0
+        visibility = np.zeros((128, 128), dtype=np.uint8)
+        visibility[:60, :] = 2
+        self.planner.update_grids(creep, pathable, visibility)
+
+        self.assertAlmostEqual(self.planner.coverage, 40 / 120)
+        self.assertAlmostEqual(self.planner.vision_coverage, 60 / 128)
+
+        source = (40.5, 40.5)
+        on_creep = self.planner.best_target(source, 10.0, 0.0)
+        self.assertLess(on_creep[0], 40)
+        anywhere = self.planner.best_target(source, 10.0, 0.0, require_creep=False)
+        self.assertGreater(anywhere[0], 40)
+
+    def test_empty_planner(self):
+        self.assertIsNone(CreepPlanner().best_target((10.0, 10.0), 10.0, 8.0))
+
+
+class TestCreepSpreadManagerGrids(unittest.TestCase):
+    def test_coverage_uses_full_grids(self):
+        creep = np.zeros((64, 64), dtype=np.uint8)
+        creep[:16, :] = 1
+        bot = SimpleNamespace(
+            state=SimpleNamespace(
+                creep=SimpleNamespace(data_numpy=creep), visibility=None
+            ),
+            game_info=SimpleNamespace(
+                pathing_grid=SimpleNamespace(data_numpy=np.ones((64, 64))),
+                map_size=Point2((64, 64)),
+            ),
+        )
+        manager = CreepSpreadManager(bot)
+        manager._update_coverage(60.0)
+        self.assertEqual(manager.get_creep_stats()["coverage_percent"], 25.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.frame_profiler import FrameProfiler
+from utils.performance_profiler import PerformanceProfiler
+
+
+def collapsed_paths(profiler):
+    return {line.rsplit(" ", 1)[0] for line in profiler.collapsed_lines()}
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_disabled_profiler_records_nothing(self):
+        profiler = FrameProfiler(slow_frame_ms=0.0)
+        profiler.begin_frame(1)
+        with profiler.span("Strategy"):
+            pass
+        self.assertIsNone(profiler.end_frame())
+        self.assertIsNone(profiler.start_span("x"))
+        self.assertEqual(profiler.frames_seen, 0)
+
+    def test_fast_frames_are_discarded(self):
+        profiler = FrameProfiler(slow_frame_ms=1000.0, enabled=True)
+        profiler.begin_frame(1)
+        with profiler.span("Strategy"):
+            pass
+        profiler.end_frame()
+        self.assertEqual(profiler.frames_seen, 1)
+        self.assertEqual(profiler.frames_sampled, 0)
+        self.assertEqual(profiler.collapsed_lines(), [])
+
+    def test_nested_spans_build_collapsed_stacks(self):
+        profiler = FrameProfiler(slow_frame_ms=0.0, enabled=True)
+        profiler.begin_frame(7)
+        with profiler.span("game_logic"):
+            with profiler.span("Strategy"):
+                with profiler.span("evaluate"):
+                    time.sleep(0.002)
+            span = profiler.start_span("Combat")
+            profiler.record("boids", 0.001)
+            profiler.end_span(span)
+        profiler.end_frame()
+
+        self.assertEqual(
+            set(profiler.collapsed),
+            {
+                "step",
+                "step;game_logic",
+                "step;game_logic;Strategy",
+                "step;game_logic;Strategy;evaluate",
+                "step;game_logic;Combat",
+                "step;game_logic;Combat;boids",
+            },
+        )
+        self.assertIn("step;game_logic;Strategy;evaluate", collapsed_paths(profiler))
+        # self time은 자식 시간을 제외
+        self.assertGreaterEqual(
+            profiler.collapsed["step;game_logic;Strategy;evaluate"], 0.002
+        )
+        self.assertLess(profiler.collapsed["step;game_logic;Strategy"], 0.002)
+
+    def test_gathered_tasks_keep_parent_span(self):
+        profiler = FrameProfiler(slow_frame_ms=0.0, enabled=True)
+
+        async def manager(name):
+            with profiler.span(name):
+                await asyncio.sleep(0.001)
+                with profiler.span("helper"):
+                    await asyncio.sleep(0.001)
+
+        async def frame():
+            profiler.begin_frame(1)
+            with profiler.span("pre_combat"):
+                await asyncio.gather(manager("Creep"), manager("MapMemory"))
+            profiler.end_frame()
+
+        asyncio.run(frame())
+        paths = {path for path, _, _ in profiler.slow_frames[0][2]}
+        self.assertIn("step;pre_combat;Creep;helper", paths)
+        self.assertIn("step;pre_combat;MapMemory;helper", paths)
+
+        # 겹치는 형제 스팬은 서로 다른 레인
+        events = {
+            e["args"]["path"]: e["tid"] for e in profiler.chrome_trace()["traceEvents"]
+        }
+        self.assertNotEqual(
+            events["step;pre_combat;Creep"], events["step;pre_combat;MapMemory"]
+        )
+        self.assertEqual(
+            events["step;pre_combat;Creep"], events["step;pre_combat;Creep;helper"]
+        )
+
+    def test_disable_mid_frame_drops_frame(self):
+        profiler = FrameProfiler(slow_frame_ms=0.0, enabled=True)
+        profiler.begin_frame(1)
+        with profiler.span("a"):
+            profiler.disable()
+        self.assertIsNone(profiler.end_frame())
+        self.assertEqual(profiler.frames_seen, 0)
+
+    def test_export_writes_collapsed_and_chrome_trace(self):
+        profiler = FrameProfiler(slow_frame_ms=0.0, enabled=True)
+        profiler.begin_frame(3)
+        with profiler.span("game_logic"):
+            time.sleep(0.001)
+        profiler.end_frame()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = profiler.export(tmp, "g1")
+            lines = paths["collapsed"].read_text(encoding="utf-8").splitlines()
+            self.assertTrue(any(line.startswith("step;game_logic ") for line in lines))
+            trace = json.loads(paths["chrome_trace"].read_text(encoding="utf-8"))
+            names = {e["name"] for e in trace["traceEvents"]}
+            self.assertEqual(names, {"step", "game_logic"})
+            self.assertTrue(all(e["ph"] == "X" for e in trace["traceEvents"]))
+
+        profiler.reset()
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(profiler.export(tmp, "g2"), {})
+
+
+class TestPerformanceProfilerSpans(unittest.TestCase):
+    def test_measure_nests_under_frame_profiler(self):
+        import utils.frame_profiler as frame_profiler
+
+        profiler = FrameProfiler(slow_frame_ms=0.0, enabled=True)
+        original = frame_profiler._global_frame_profiler
+        frame_profiler._global_frame_profiler = profiler
+        try:
+            perf = PerformanceProfiler()
+            profiler.begin_frame(1)
+            with profiler.span("Strategy"):
+                with perf.measure("threat_eval"):
+                    pass
+            profiler.end_frame()
+        finally:
+            frame_profiler._global_frame_profiler = original
+
+        paths = {path for path, _, _ in profiler.slow_frames[0][2]}
+        self.assertIn("step;Strategy;threat_eval", paths)
+        self.assertEqual(perf.call_counts["threat_eval"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.frame_scheduler import FrameScheduler, TaskPriority
+
+
+class TestFrameScheduler(unittest.TestCase):
+    def test_unknown_tasks_always_run(self):
+        scheduler = FrameScheduler(budget_ms=1.0)
+        self.assertTrue(scheduler.should_run("Unregistered", 7))
+
+    def test_periodic_tasks_are_spread_across_frames(self):
+        scheduler = FrameScheduler(budget_ms=None)
+        names = [f"Task{i}" for i in range(12)]
+        for name in names:
+            scheduler.register(name, interval=44)
+
+        runs_per_frame = []
+        for iteration in range(44):
+            runs_per_frame.append(
+                sum(scheduler.should_run(name, iteration) for name in names)
+            )
+
+        # every task runs exactly once per interval, but never all on one frame
+        self.assertEqual(sum(runs_per_frame), len(names))
+        self.assertLess(max(runs_per_frame), len(names))
+
+    def test_budget_defers_low_priority_but_keeps_critical(self):
+        scheduler = FrameScheduler(budget_ms=10.0)
+        scheduler.register("Combat", TaskPriority.CRITICAL, cost_ms=8.0)
+        scheduler.register("Economy", TaskPriority.HIGH, cost_ms=2.0)
+        scheduler.register(
+            "Analytics", TaskPriority.MINIMAL, cost_ms=6.0, max_staleness=3
+        )
+
+        self.assertTrue(scheduler.should_run("Combat", 0))
+        self.assertTrue(scheduler.should_run("Economy", 0))
+        self.assertFalse(scheduler.should_run("Analytics", 0))
+
+        # deferred task is forced once it reaches max staleness
+        ran = [scheduler.should_run("Analytics", it) for it in range(1, 4)]
+        self.assertEqual(ran, [False, False, True])
+        self.assertGreater(scheduler.get_stats()["total_deferrals"], 0)
+
+    def test_measured_cost_provider_overrides_estimate(self):
+        measured = {"Heavy": 50.0}
+        scheduler = FrameScheduler(budget_ms=20.0, cost_provider=measured.get)
+        scheduler.register("Heavy", TaskPriority.LOW, cost_ms=1.0, max_staleness=100)
+
+        self.assertFalse(scheduler.should_run("Heavy", 0))
+        measured["Heavy"] = 5.0
+        self.assertTrue(scheduler.should_run("Heavy", 1))
+
+    def test_condition_and_pinned_phase(self):
+        enabled = {"value": False}
+        scheduler = FrameScheduler(budget_ms=None)
+        scheduler.register(
+            "Gated", interval=22, phase=0, condition=lambda: enabled["value"]
+        )
+
+        self.assertFalse(scheduler.should_run("Gated", 22))
+        enabled["value"] = True
+        self.assertTrue(scheduler.should_run("Gated", 44))
+        self.assertFalse(scheduler.should_run("Gated", 45))
+
+    def test_end_frame_counts_over_budget_frames(self):
+        scheduler = FrameScheduler(budget_ms=5.0)
+        scheduler.register("Combat", TaskPriority.CRITICAL)
+        scheduler.begin_frame(0)
+        scheduler.record_cost("Combat", 7.5)
+
+        self.assertEqual(scheduler.end_frame(), 7.5)
+        self.assertEqual(scheduler.frames_over_budget, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
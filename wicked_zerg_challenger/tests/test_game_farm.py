@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from local_training.game_farm import DifficultyLadder, GameFarm, GameJob
+
+
+class FakeRunner:
+    """가짜 게임 실행기: map_name 으로 동작 선택"""
+
+    def __init__(self, context):
+        self.context = context
+        self.games = 0
+
+    def run(self, job):
+        self.games += 1
+        if job.map_name == "crash" and job.attempt == 0:
+            os._exit(3)
+        if job.map_name == "hang":
+            time.sleep(60)
+        if job.map_name == "slow":
+            time.sleep(0.02)
+        if job.map_name == "raise":
+            raise RuntimeError("transport closed")
+        return {
+            "map": job.map_name,
+            "race": job.race,
+            "won": job.map_name != "lose",
+            "port": self.context.port,
+            "pid": os.getpid(),
+            "games_on_worker": self.games,
+        }
+
+
+class BrokenRunner:
+    def __init__(self, context):
+        raise OSError("SC2 not installed")
+
+
+def make_farm(**kwargs):
+    kwargs.setdefault("start_method", "fork" if sys.platform != "win32" else "spawn")
+    kwargs.setdefault("poll_interval", 0.05)
+    return GameFarm(FakeRunner, **kwargs)
+
+
+class TestDifficultyLadder(unittest.TestCase):
+    def test_promote_and_demote(self):
+        ladder = DifficultyLadder(["Easy", "Medium", "Hard"])
+        self.assertEqual([ladder.record(True) for _ in range(3)], [0, 0, 1])
+        self.assertEqual(ladder.current, "Medium")
+        self.assertEqual([ladder.record(False) for _ in range(3)], [0, 0, -1])
+        self.assertEqual(ladder.current, "Easy")
+        # 최하위에서는 더 내려가지 않음
+        self.assertEqual(ladder.record(False), 0)
+
+
+class TestGameFarm(unittest.TestCase):
+    def test_jobs_are_spread_over_workers_with_own_ports(self):
+        farm = make_farm(workers=3, base_port=6000, ports_per_worker=20)
+        jobs = [GameJob(i, "win", "Terran", "Easy") for i in range(1, 10)]
+        results = farm.run(jobs)
+
+        self.assertEqual(sorted(r["game"] for r in results), list(range(1, 10)))
+        self.assertEqual({r["port"] for r in results}, {6000, 6020, 6040})
+        self.assertEqual(len({r["pid"] for r in results}), 3)
+        # 워커당 실행기 1개를 재사용
+        for pid in {r["pid"] for r in results}:
+            games = [r["games_on_worker"] for r in results if r["pid"] == pid]
+            self.assertEqual(sorted(games), list(range(1, len(games) + 1)))
+        self.assertTrue(all(r["attempts"] == 1 for r in results))
+
+    def test_crashed_worker_is_restarted_and_job_retried(self):
+        farm = make_farm(workers=2, max_attempts=2)
+        jobs = [GameJob(1, "crash", "Zerg", "Easy")] + [
+            GameJob(i, "win", "Zerg", "Easy") for i in range(2, 6)
+        ]
+        results = {r["game"]: r for r in farm.run(jobs)}
+
+        self.assertEqual(sorted(results), [1, 2, 3, 4, 5])
+        self.assertTrue(results[1]["won"])
+        self.assertEqual(results[1]["attempts"], 2)
+        self.assertEqual(farm.crashes, 1)
+        self.assertEqual(farm.retries, 1)
+
+    def test_runner_exceptions_and_timeouts_become_error_results(self):
+        farm = make_farm(workers=2, max_attempts=2, job_timeout=0.5)
+        jobs = [GameJob(1, "raise", "Zerg", "Easy"), GameJob(2, "hang", "Zerg", "Easy")]
+        results = {r["game"]: r for r in farm.run(jobs)}
+
+        self.assertEqual(results[1]["error"], "RuntimeError: transport closed")
+        self.assertEqual(results[1]["attempts"], 2)
+        self.assertEqual(results[2]["error"], "timeout")
+        self.assertFalse(results[2]["won"])
+
+    def test_hung_worker_times_out_while_others_keep_reporting(self):
+        farm = make_farm(workers=2, max_attempts=1, job_timeout=0.3)
+        jobs = [GameJob(1, "hang", "Zerg", "Easy")] + [
+            GameJob(i, "slow", "Zerg", "Easy") for i in range(2, 62)
+        ]
+        results = farm.run(jobs)
+
+        # 결과가 poll_interval 보다 자주 들어와도 타임아웃은 제때 처리
+        games = [r["game"] for r in results]
+        self.assertEqual(results[games.index(1)]["error"], "timeout")
+        self.assertLess(games.index(1), len(games) // 2)
+
+    def test_failed_runner_retires_workers(self):
+        farm = GameFarm(
+            BrokenRunner,
+            workers=1,
+            max_restarts=1,
+            start_method="fork" if sys.platform != "win32" else "spawn",
+            poll_interval=0.05,
+        )
+        results = farm.run([GameJob(1, "win", "Zerg", "Easy")])
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0]["won"])
+        self.assertIn("error", results[0])
+
+    def test_ladder_difficulty_is_applied_at_dispatch(self):
+        ladder = DifficultyLadder(["Easy", "Medium", "Hard"])
+        seen = []
+        farm = make_farm(workers=1, ladder=ladder, on_result=seen.append)
+        jobs = [GameJob(i, "win", "Protoss") for i in range(1, 8)]
+        results = farm.run(jobs)
+
+        self.assertEqual(
+            [r["difficulty"] for r in results],
+            ["Easy"] * 3 + ["Medium"] * 3 + ["Hard"],
+        )
+        self.assertEqual(seen, results)
+        self.assertEqual(ladder.current, "Hard")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from blackboard import GameStateBlackboard
+from data_cache_manager import DataCacheManager
+from utils.generational_cache import (
+    GenerationalCache,
+    get_shared_cache,
+    seconds_to_generations,
+)
+
+
+class TestGenerationalCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = GenerationalCache(max_entries=100, namespace_limits={})
+
+    def test_ttl_is_counted_in_generations(self):
+        self.cache.set("ns", "a", 1, ttl=2)
+        self.cache.set("ns", "b", 2, ttl=0)
+        self.cache.set("ns", "c", 3)
+        self.assertEqual(self.cache.get("ns", "b"), 2)
+
+        self.cache.advance(2)
+        self.assertEqual(self.cache.get("ns", "a"), 1)
+        self.assertIsNone(self.cache.get("ns", "b"))
+        self.cache.advance(3)
+        self.assertIsNone(self.cache.get("ns", "a"))
+        self.assertEqual(self.cache.get("ns", "c"), 3)
+        self.assertIsNone(self.cache.get("ns", "c", max_age=2))
+
+        # 세대가 되돌아가면 (새 게임) 이전 엔트리 무효
+        self.cache.set("ns", "d", 4)
+        self.cache.advance(0)
+        self.assertIsNone(self.cache.get("ns", "d"))
+        self.assertEqual(self.cache.stats("ns")["expirations"], 4)
+
+    def test_tag_invalidation_spans_namespaces(self):
+        self.cache.set("dist", (1, 2), 5.0, depends_on=(1, 2))
+        self.cache.set("query", "near_1", [2, 3], depends_on=(1,))
+        self.cache.set("query", "near_9", [], depends_on=(9,))
+
+        self.assertEqual(self.cache.invalidate_tag(1), 2)
+        self.assertIsNone(self.cache.get("dist", (1, 2)))
+        self.assertEqual(self.cache.get("query", "near_9"), [])
+        # 다른 태그 인덱스도 정리됨
+        self.assertEqual(self.cache.invalidate_tag(2), 0)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_lru_budgets(self):
+        cache = GenerationalCache(max_entries=4, namespace_limits={"small": 2})
+        for i in range(3):
+            cache.set("small", i, i)
+        self.assertEqual(sorted(cache.entries("small")), [1, 2])
+
+        cache.set("big", "x", 1)
+        cache.set("big", "y", 2)
+        cache.get("small", 1)  # small:1 최근 사용
+        cache.set("big", "z", 3)
+        self.assertEqual(len(cache), 4)
+        self.assertNotIn(2, cache.entries("small"))
+        self.assertIn(1, cache.entries("small"))
+
+        stats = cache.stats()
+        self.assertEqual(stats["small"]["evictions"], 2)
+        self.assertEqual(stats["big"]["evictions"], 0)
+
+    def test_get_or_compute_and_stats(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return None
+
+        for _ in range(3):
+            self.assertIsNone(self.cache.get_or_compute("ns", "k", compute, ttl=5))
+        self.assertEqual(len(calls), 1)
+        stats = self.cache.stats("ns")
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+
+        self.cache.reset_stats("ns")
+        self.assertEqual(self.cache.stats("ns")["hits"], 0)
+
+    def test_purge_and_invalidate_where(self):
+        for i in range(5):
+            self.cache.set("ns", f"enemy_{i}", i, ttl=i)
+        self.cache.advance(2)
+        self.assertEqual(self.cache.purge_expired("ns"), 2)
+        self.assertEqual(
+            self.cache.invalidate_where("ns", lambda k: k.endswith("3")), 1
+        )
+        self.assertEqual(sorted(self.cache.entries("ns")), ["enemy_2", "enemy_4"])
+
+
+class TestCacheWiring(unittest.TestCase):
+    def test_blackboard_cache_is_shared_and_game_time_driven(self):
+        bb = GameStateBlackboard()
+        bot = SimpleNamespace(blackboard=bb)
+        self.assertIs(get_shared_cache(bot), bb.cache)
+
+        bb.game_time = 10.0
+        bb.cache_set("target", "x", ttl=1.0, depends_on=(42,))
+        data = DataCacheManager(bot)
+        data.set("enemy_build_pattern", "AIR", ttl=2.0)
+
+        bb.game_time = 11.0
+        self.assertEqual(bb.cache_get("target"), "x")
+        bb.cache.invalidate_tag(42)
+        self.assertIsNone(bb.cache_get("target"))
+
+        bb.game_time = 12.5
+        self.assertIsNone(data.get("enemy_build_pattern"))
+        self.assertEqual(data.get_statistics()["cache_misses"], 1)
+
+    def test_data_cache_pattern_and_clear(self):
+        bot = SimpleNamespace(state=SimpleNamespace(game_loop=0))
+        data = DataCacheManager(bot)
+        data.set("enemy_a", 1)
+        data.set("enemy_b", 2)
+        data.set("own", 3)
+        data.invalidate_pattern("enemy_*")
+        self.assertEqual(data.get("own"), 3)
+        self.assertEqual(len(data.get_cache_info()), 1)
+
+        bot.state.game_loop = seconds_to_generations(1.0) + 1
+        self.assertIsNone(data.get("own"))
+        self.assertEqual(data.get("own", lambda: 4), 4)
+        data.clear()
+        self.assertEqual(data.get_cache_info(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sc2.position import Point2
+
+from utils.kd_tree import KDTree, build_kdtrees_by_type, build_unit_kdtree
+
+try:
+    import scipy  # noqa: F401
+
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+
+def brute_distances(points, query):
+    return np.hypot(*(points - np.asarray(query)).T)
+
+
+class KDTreeBackendMixin:
+    backend = "numpy"
+
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.points = rng.uniform(0, 150, size=(500, 2))
+        self.points[7] = self.points[3]  # 중복 좌표
+        self.queries = rng.uniform(-10, 160, size=(60, 2))
+        self.tree = KDTree.from_array(self.points, backend=self.backend)
+
+    def test_radius_batch_matches_brute_force(self):
+        radii = np.linspace(0.0, 25.0, len(self.queries))
+        indices, distances = self.tree.query_radius_batch(
+            self.queries, radii, return_distance=True
+        )
+        for row, query in enumerate(self.queries):
+            dist = brute_distances(self.points, query)
+            self.assertEqual(
+                set(indices[row].tolist()), set(np.nonzero(dist <= radii[row])[0])
+            )
+            np.testing.assert_allclose(distances[row], np.sort(dist[indices[row]]))
+            np.testing.assert_allclose(distances[row], dist[indices[row]])
+
+    def test_knn_batch_matches_brute_force(self):
+        distances, indices = self.tree.knn_batch(self.queries, 6)
+        for row, query in enumerate(self.queries):
+            expected = np.sort(brute_distances(self.points, query))[:6]
+            np.testing.assert_allclose(distances[row], expected)
+            np.testing.assert_allclose(
+                brute_distances(self.points[indices[row]], query), expected
+            )
+
+    def test_knn_pads_when_k_exceeds_size(self):
+        tree = KDTree.from_array(self.points[:3], backend=self.backend)
+        distances, indices = tree.knn_batch(self.queries[:2], 5)
+        self.assertEqual(indices.shape, (2, 5))
+        self.assertTrue(np.all(indices[:, 3:] == -1))
+        self.assertTrue(np.all(np.isinf(distances[:, 3:])))
+
+    def test_empty_tree(self):
+        tree = KDTree.from_array(np.zeros((0, 2)), backend=self.backend)
+        self.assertFalse(tree)
+        self.assertEqual(tree.range_query((1.0, 1.0), 5.0), [])
+        self.assertIsNone(tree.nearest_neighbor((1.0, 1.0)))
+        self.assertEqual([len(i) for i in tree.query_radius_batch([[0, 0]], 3)], [0])
+
+
+class TestNumpyKDTree(KDTreeBackendMixin, unittest.TestCase):
+    backend = "numpy"
+
+    def test_tree_is_array_backed(self):
+        self.assertIsNone(self.tree._scipy)
+        self.assertEqual(sorted(self.tree._order.tolist()), list(range(500)))
+        leaves = self.tree._leaf & (self.tree._end > self.tree._start)
+        sizes = self.tree._end[leaves] - self.tree._start[leaves]
+        self.assertEqual(int(sizes.sum()), 500)
+        self.assertTrue(np.all(sizes <= KDTree.leaf_size))
+
+
+@unittest.skipUnless(HAS_SCIPY, "scipy not installed")
+class TestScipyKDTree(KDTreeBackendMixin, unittest.TestCase):
+    backend = "scipy"
+
+
+class TestLegacyAPI(unittest.TestCase):
+    def setUp(self):
+        self.units = [
+            SimpleNamespace(tag=i, position=Point2((float(i), 0.0))) for i in range(10)
+        ]
+        self.tree = build_unit_kdtree(self.units, backend="numpy")
+
+    def test_nearest_neighbor_excludes_data(self):
+        point, data, dist = self.tree.nearest_neighbor((3.2, 0.0), self.units[3])
+        self.assertEqual(point, (4.0, 0.0))
+        self.assertIs(data, self.units[4])
+        self.assertAlmostEqual(dist, 0.8)
+
+    def test_range_query_is_inclusive_and_sorted(self):
+        results = self.tree.range_query((5.0, 0.0), 2.0)
+        self.assertEqual([r[1].tag for r in results][:1], [5])
+        self.assertEqual(sorted(r[1].tag for r in results), [3, 4, 5, 6, 7])
+
+    def test_query_radius_matches_spatial_grid_signature(self):
+        results = self.tree.query_radius((5.0, 0.0), 1.0, exclude_data=self.units[5])
+        self.assertEqual(sorted(r[1].tag for r in results), [4, 6])
+
+    def test_k_nearest_neighbors(self):
+        results = self.tree.k_nearest_neighbors((0.0, 0.0), 3)
+        self.assertEqual([r[1].tag for r in results], [0, 1, 2])
+        self.assertEqual([r[2] for r in results], [0.0, 1.0, 2.0])
+
+    def test_list_constructor(self):
+        tree = KDTree([((0.0, 0.0), "a"), ((5.0, 5.0), "b")], backend="numpy")
+        self.assertEqual(len(tree), 2)
+        self.assertEqual(tree.nearest_neighbor((4.0, 4.0))[1], "b")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            KDTree(backend="faiss")
+
+
+class TestTreesByType(unittest.TestCase):
+    def test_one_tree_per_type_with_snapshot_rows(self):
+        positions = np.array([[0.0, 0.0], [1.0, 0.0], [9.0, 9.0], [2.0, 0.0]])
+        type_ids = np.array([105, 9, 105, 9])
+        trees = build_kdtrees_by_type(positions, type_ids, backend="numpy")
+
+        self.assertEqual(sorted(trees), [9, 105])
+        self.assertEqual(len(trees[9]), 2)
+        # payload은 스냅샷 행 번호
+        self.assertEqual(trees[105].nearest_neighbor((8.0, 8.0))[1], 2)
+        self.assertEqual(trees[9].nearest_neighbor((0.0, 0.0))[1], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
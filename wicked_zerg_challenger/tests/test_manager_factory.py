@@ -15,6 +15,7 @@ from unittest.mock import Mock
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from core.manager_factory import ManagerConfig, ManagerFactory, ManagerPriority
+from core.startup import LazyManager
 
 
 class TestManagerFactory(unittest.TestCase):
@@ -160,6 +161,141 @@ class TestManagerFactory(unittest.TestCase):
         self.assertIsNone(reason)
 
 
+def _namespace_config(attr, priority=ManagerPriority.MEDIUM, **kwargs):
+    """SimpleNamespace(bot=bot)를 만드는 가벼운 매니저 설정"""
+    return ManagerConfig(
+        name=attr,
+        module_path="types",
+        class_name="SimpleNamespace",
+        attribute_name=attr,
+        priority=priority,
+        **kwargs,
+    )
+
+
+class TestStartupBudget(unittest.TestCase):
+    """Lazy / deferred manager construction and the startup report"""
+
+    def setUp(self):
+        self.bot = Mock()
+        self.factory = ManagerFactory(self.bot)
+
+    def test_lazy_manager_waits_for_activation(self):
+        ready = {"value": False}
+        self.factory.register_managers(
+            [
+                _namespace_config("core_mgr", ManagerPriority.CRITICAL),
+                _namespace_config(
+                    "late_mgr", lazy=True, activate_when=lambda bot: ready["value"]
+                ),
+            ]
+        )
+
+        stats = self.factory.initialize_all(verbose=False)
+
+        self.assertEqual(stats["pending_managers"], ["late_mgr"])
+        self.assertIsInstance(self.bot.late_mgr, LazyManager)
+        self.assertFalse(self.bot.late_mgr)  # 조건 전에는 "없는 매니저"
+        self.assertFalse(self.factory.is_initialized("late_mgr"))
+
+        ready["value"] = True
+        proxy = self.bot.late_mgr
+        self.assertTrue(proxy)
+        self.assertTrue(self.factory.is_initialized("late_mgr"))
+        self.assertNotIsInstance(self.bot.late_mgr, LazyManager)
+        self.assertIs(proxy.bot, self.bot)  # 기존 프록시 참조도 위임
+
+    def test_attribute_access_resolves_immediately(self):
+        self.factory.register_manager(
+            _namespace_config("late_mgr", lazy=True, activate_when=lambda bot: False)
+        )
+        self.factory.initialize_all(verbose=False)
+
+        proxy = self.bot.late_mgr
+        proxy.flag = 7
+
+        self.assertEqual(self.bot.late_mgr.flag, 7)
+        self.assertTrue(self.factory.is_initialized("late_mgr"))
+
+    def test_budget_defers_non_critical_managers(self):
+        self.factory.register_managers(
+            [
+                _namespace_config("high_mgr", ManagerPriority.HIGH),
+                _namespace_config("medium_mgr", ManagerPriority.MEDIUM),
+                _namespace_config("low_mgr", ManagerPriority.LOW),
+            ]
+        )
+
+        stats = self.factory.initialize_all(verbose=False, budget_ms=0.0)
+
+        self.assertEqual(self.factory.initialization_order, ["high_mgr"])
+        self.assertEqual(stats["pending_managers"], ["medium_mgr", "low_mgr"])
+        self.assertFalse(self.bot.medium_mgr)  # warm_up 전에는 건너뜀
+
+        self.assertEqual(self.factory.warm_up(budget_ms=1000.0), 2)
+        self.assertEqual(
+            self.factory.initialization_order, ["high_mgr", "medium_mgr", "low_mgr"]
+        )
+        self.assertEqual(self.factory.startup_report.pending(), [])
+        self.assertEqual(self.factory.warm_up(budget_ms=1000.0), 0)
+
+    def test_dependency_promotes_lazy_manager(self):
+        self.factory.register_managers(
+            [
+                _namespace_config("late_dep", ManagerPriority.CRITICAL, lazy=True),
+                _namespace_config(
+                    "user", ManagerPriority.HIGH, dependencies=["late_dep"]
+                ),
+            ]
+        )
+
+        self.factory.initialize_all(verbose=False)
+
+        self.assertEqual(self.factory.initialization_order, ["late_dep", "user"])
+        self.assertNotIsInstance(self.bot.late_dep, LazyManager)
+
+    def test_resolve_adopts_instance_created_elsewhere(self):
+        self.factory.register_manager(_namespace_config("late_mgr", lazy=True))
+        self.factory.initialize_all(verbose=False)
+        proxy = self.bot.late_mgr
+        replacement = Mock()
+        self.bot.late_mgr = replacement
+
+        self.assertIs(self.factory.resolve("late_mgr"), replacement)
+        self.assertIs(proxy.some_attr, replacement.some_attr)
+
+    def test_failed_lazy_manager_is_falsy(self):
+        config = _namespace_config("broken", lazy=True)
+        config.module_path = "nonexistent_module_for_startup_test"
+        self.factory.register_manager(config)
+        self.factory.initialize_all(verbose=False)
+
+        self.assertFalse(self.bot.broken)
+        self.assertIsNone(self.bot.broken)
+        self.assertIn("ImportError", self.factory.get_failed_reason("broken"))
+
+    def test_report_splits_import_and_construct_time(self):
+        self.factory.register_managers(
+            [
+                _namespace_config("eager_mgr", ManagerPriority.HIGH),
+                _namespace_config("late_mgr", lazy=True),
+            ]
+        )
+
+        self.factory.initialize_all(verbose=False, budget_ms=500.0)
+        report = self.factory.startup_report.to_dict()
+
+        eager = report["managers"]["eager_mgr"]
+        self.assertEqual(eager["mode"], "eager")
+        self.assertGreaterEqual(eager["import_ms"], 0.0)
+        self.assertGreaterEqual(eager["construct_ms"], 0.0)
+        self.assertIsNotNone(eager["resolved_at_ms"])
+        self.assertEqual(report["managers"]["late_mgr"]["mode"], "lazy")
+        self.assertEqual(report["pending"], ["late_mgr"])
+        self.assertFalse(report["over_budget"])
+        self.assertTrue(self.factory.startup_report.format_lines())
+
+
 class TestManagerConfig(unittest.TestCase):
     """Test suite for ManagerConfig"""
 
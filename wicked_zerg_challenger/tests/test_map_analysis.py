@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sc2.position import Point2
+
+from combat.terrain_analysis import ChokePointDetector
+from core.manager_factory import ManagerFactory
+from core.manager_registry import get_all_manager_configs
+from creep_manager import CreepSpreadManager
+from economy_manager import EconomyManager
+from overlord_vision_network import OverlordVisionNetwork
+from utils import map_analysis as ma
+from utils.map_analysis import MapAnalysis, build_layers
+from utils.path_distance import PathDistanceField, field_sources, path_distance
+
+
+class FakePixelMap:
+    """sc2 PixelMap 대역: [x, y] 인덱싱, data_numpy 는 [y, x]"""
+
+    def __init__(self, data):
+        self.data_numpy = data
+        self.height, self.width = data.shape
+
+    def __getitem__(self, pos):
+        x, y = pos
+        return int(self.data_numpy[y, x])
+
+
+def cliff_map():
+    """가운데 절벽 띠 + 적 본진 옆 막힌 고지대"""
+    grid = np.ones((96, 112), dtype=np.uint8)
+    grid[:, 50:54] = 0
+    grid[40:46, 50:54] = 1  # 통로
+    grid[70:80, 85:100] = 0  # 적 본진 옆 고지대
+    return grid
+
+
+def make_bot(grid, map_name="CliffAIE"):
+    ramp = SimpleNamespace(
+        top_center=Point2((52.0, 46.0)), bottom_center=Point2((52.0, 40.0))
+    )
+    resources = [
+        SimpleNamespace(position=Point2((22.0, 20.0)), type_id=Mock()),
+        SimpleNamespace(position=Point2((64.0, 30.0)), type_id=Mock()),
+        SimpleNamespace(position=Point2((66.0, 30.0)), type_id=Mock()),
+        SimpleNamespace(position=Point2((60.0, 36.0)), type_id=Mock()),
+    ]
+    for unit, name in zip(
+        resources,
+        ["MINERALFIELD", "RICHMINERALFIELD", "RICHMINERALFIELD750", "VESPENEGEYSER"],
+    ):
+        unit.type_id.name = name
+    return SimpleNamespace(
+        game_info=SimpleNamespace(
+            map_name=map_name,
+            map_size=Point2((112, 96)),
+            pathing_grid=FakePixelMap(grid),
+            map_ramps=[ramp],
+        ),
+        start_location=Point2((20.5, 20.5)),
+        enemy_start_locations=[Point2((90.5, 64.5))],
+        expansion_locations_list=[Point2((25.5, 25.5)), Point2((62.5, 32.5))],
+        resources=resources,
+        time=40.0,
+    )
+
+
+class TestMapAnalysisLayers(unittest.TestCase):
+    def setUp(self):
+        self.grid = cliff_map()
+        self.bot = make_bot(self.grid)
+
+    def test_creep_targets_match_manager_bfs(self):
+        manager = CreepSpreadManager(self.bot)
+        manager._generate_creep_grid()
+        expected = [(p.x, p.y) for p in manager._target_grid]
+
+        layer = ma.creep_targets(self.grid, self.bot.start_location, (112, 96))
+        self.assertGreater(len(expected), 0)
+        self.assertEqual([tuple(p) for p in layer], expected)
+
+    def test_pillars_match_vision_network(self):
+        network = OverlordVisionNetwork(self.bot)
+        enemy = self.bot.enemy_start_locations[0]
+        expected = [(p.x, p.y) for p in network._find_highground_pillars(enemy)]
+
+        layer = ma.highground_pillars(self.grid, enemy)
+        self.assertGreater(len(expected), 0)
+        np.testing.assert_allclose(layer, np.array(expected))
+
+    def test_expansion_resources_counts_rich_patches(self):
+        counts = ma.expansion_resources(
+            self.bot.expansion_locations_list, ma._bot_resources(self.bot)
+        )
+        # [광물, 황금 광물, 가스, 황금 가스]
+        np.testing.assert_array_equal(counts, [[1, 0, 0, 0], [2, 2, 1, 0]])
+
+
+class TestMapAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self.grid = cliff_map()
+        self.bot = make_bot(self.grid)
+
+    def test_disk_cache_roundtrip_skips_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = ma.build_for_bot(self.bot, cache_dir=Path(tmp))
+            self.assertFalse(first.loaded_from_disk)
+            self.assertEqual(len(list(Path(tmp).glob("mapinfo_*.npz"))), 1)
+
+            build = Mock()
+            with patch.object(PathDistanceField, "_build") as build_field:
+                second = MapAnalysis.load_or_build(
+                    "CliffAIE",
+                    self.grid,
+                    self.bot.start_location,
+                    self.bot.enemy_start_locations[0],
+                    build,
+                    cache_dir=Path(tmp),
+                    path_sources=field_sources(self.bot),
+                )
+            build.assert_not_called()
+            build_field.assert_not_called()
+            self.assertTrue(second.loaded_from_disk)
+            for name in ma.LAYERS:
+                np.testing.assert_array_equal(first.layers[name], second.layers[name])
+            np.testing.assert_array_equal(
+                first.path_field.distances, second.path_field.distances
+            )
+            self.assertEqual(second.path_field.distances.dtype, np.uint16)
+
+            # 다른 맵 이름 / 다른 스폰은 다른 키
+            ma.build_for_bot(make_bot(self.grid, "OtherAIE"), cache_dir=Path(tmp))
+            self.bot.start_location, self.bot.enemy_start_locations = (
+                self.bot.enemy_start_locations[0],
+                [self.bot.start_location],
+            )
+            ma.build_for_bot(self.bot, cache_dir=Path(tmp))
+            self.assertEqual(len(list(Path(tmp).glob("mapinfo_*.npz"))), 3)
+
+    def test_corrupt_cache_file_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = ma.build_for_bot(self.bot, cache_dir=Path(tmp))
+            path = Path(tmp) / f"mapinfo_{first.key}.npz"
+            path.write_bytes(b"not an npz")
+            again = ma.build_for_bot(self.bot, cache_dir=Path(tmp))
+            self.assertFalse(again.loaded_from_disk)
+            np.testing.assert_array_equal(
+                again.layers["creep_targets"], first.layers["creep_targets"]
+            )
+
+    def test_matches_spawn(self):
+        analysis = ma.build_for_bot(self.bot, cache_dir=None)
+        self.assertTrue(analysis.matches_spawn(start=Point2((20.5, 20.5))))
+        self.assertFalse(analysis.matches_spawn(start=Point2((90.5, 64.5))))
+        self.assertTrue(analysis.matches_spawn(enemy_start=Point2((90.0, 64.0))))
+
+        layers = build_layers(self.grid, (20.5, 20.5), None, (112, 96))
+        no_enemy = MapAnalysis("CliffAIE", "k", layers)
+        self.assertFalse(no_enemy.matches_spawn(enemy_start=Point2((90.5, 64.5))))
+        self.assertEqual(len(no_enemy.pillars), 0)
+
+
+class TestManagersUseAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.grid = cliff_map()
+        self.bot = make_bot(self.grid)
+        self.bot.map_analysis = ma.build_for_bot(self.bot, cache_dir=None)
+
+    def test_creep_manager_uses_cached_targets(self):
+        manager = CreepSpreadManager(self.bot)
+        self.bot.game_info.pathing_grid = None  # BFS 가 돌면 실패
+        manager._generate_creep_grid()
+        self.assertTrue(manager._grid_generated)
+        self.assertEqual(manager._target_grid, self.bot.map_analysis.creep_targets)
+
+    def test_creep_manager_falls_back_for_other_spawn(self):
+        self.bot.start_location = Point2((90.5, 20.5))
+        manager = CreepSpreadManager(self.bot)
+        manager._generate_creep_grid()
+        self.assertNotEqual(manager._target_grid, self.bot.map_analysis.creep_targets)
+
+    def test_vision_network_and_chokes_use_cached_layers(self):
+        network = OverlordVisionNetwork(self.bot)
+        enemy = self.bot.enemy_start_locations[0]
+        self.assertEqual(
+            network._find_highground_pillars(enemy), self.bot.map_analysis.pillars
+        )
+
+        detector = ChokePointDetector(self.bot)
+        self.bot.game_info.map_ramps = []
+        detector.update_chokepoints(1000)
+        self.assertEqual(
+            detector.chokepoints, [Point2((52.0, 46.0)), Point2((52.0, 40.0))]
+        )
+
+    def test_gold_detection_uses_rich_patch_counts(self):
+        bot = Mock()
+        bot.map_analysis = self.bot.map_analysis
+        bot.mineral_field.closer_than = Mock(side_effect=AssertionError("scanned"))
+        manager = EconomyManager(bot)
+
+        self.assertTrue(manager._is_gold_expansion(Point2((62.5, 32.5))))
+        self.assertFalse(manager._is_gold_expansion(Point2((25.5, 25.5))))
+
+    def test_gold_expansion_search_scans_only_rich_bases(self):
+        bot = Mock()
+        bot.time = 0
+        bot.map_analysis = self.bot.map_analysis
+        bot.expansion_locations_list = self.bot.expansion_locations_list
+        bot.enemy_structures = []
+        # 정적 분석상 RICH 2개, 그중 하나는 이미 채굴되어 임계값 아래
+        patches = [
+            SimpleNamespace(mineral_contents=1500),
+            SimpleNamespace(mineral_contents=900),
+        ]
+        bot.mineral_field.closer_than = Mock(return_value=patches)
+        manager = EconomyManager(bot)
+        manager._is_expansion_location_taken = Mock(return_value=False)
+
+        gold = manager._get_gold_expansion_locations()
+
+        bot.mineral_field.closer_than.assert_called_once_with(10, Point2((62.5, 32.5)))
+        self.assertEqual(gold, [(Point2((62.5, 32.5)), 1, 2400, 1 * 1000 + 2400)])
+
+
+class TestStartupStep(unittest.TestCase):
+    """정적 맵 계산은 on_start 예산 안에서 생성되고 리포트에 기록됨"""
+
+    def make_factory(self, bot):
+        config = next(
+            c for c in get_all_manager_configs() if c.attribute_name == "map_analysis"
+        )
+        factory = ManagerFactory(bot)
+        factory.register_manager(replace(config, init_args={"cache_dir": None}))
+        return factory
+
+    def test_over_budget_layers_wait_for_warm_up(self):
+        bot = make_bot(cliff_map())
+        bot.path_distances = None
+        factory = self.make_factory(bot)
+        a, b = Point2((25.5, 25.5)), Point2((62.5, 32.5))
+
+        factory.initialize_all(verbose=False, budget_ms=0.0)
+
+        # 분석 전: 소비자는 게임 정보로 직접 계산, 거리는 직선
+        self.assertIsNone(ma.get_map_analysis(bot))
+        network = OverlordVisionNetwork(bot)
+        self.assertTrue(network._find_highground_pillars(bot.enemy_start_locations[0]))
+        self.assertAlmostEqual(path_distance(bot, a, b), a.distance_to(b))
+        self.assertEqual(factory.startup_report.pending(), ["map_analysis"])
+
+        self.assertEqual(factory.warm_up(), 1)
+
+        self.assertIsInstance(ma.get_map_analysis(bot), MapAnalysis)
+        self.assertIs(bot.path_distances, bot.map_analysis.path_field)
+        self.assertGreater(path_distance(bot, a, b), a.distance_to(b) + 5)
+        timing = factory.startup_report.timings["map_analysis"]
+        self.assertEqual(timing.mode, "deferred")
+        self.assertGreater(timing.construct_ms, 0.0)
+
+    def test_startup_report_times_map_step(self):
+        bot = make_bot(cliff_map())
+        factory = self.make_factory(bot)
+
+        factory.initialize_all(verbose=False, budget_ms=10_000.0)
+
+        report = factory.startup_report.to_dict()
+        self.assertEqual(report["managers"]["map_analysis"]["mode"], "eager")
+        self.assertIsNone(report["managers"]["map_analysis"]["error"])
+        self.assertGreater(report["construct_ms"], 0.0)
+        lines = "\n".join(factory.startup_report.format_lines())
+        self.assertIn("map_analysis", lines)
+
+    def test_layers_use_on_start_pathing(self):
+        grid = cliff_map()
+        bot = make_bot(grid)
+        bot.start_pathing_grid = grid
+        later = grid.copy()
+        later[18:23, 18:23] = 0  # 해처리 등 이후 건물
+        bot.game_info.pathing_grid = FakePixelMap(later)
+
+        analysis = ma.build_for_bot(bot, cache_dir=None)
+
+        sources = field_sources(bot)
+        key = MapAnalysis.compute_key(
+            "CliffAIE", grid, bot.start_location, bot.enemy_start_locations[0], sources
+        )
+        self.assertEqual(analysis.key, key)
+        self.assertEqual(
+            analysis.path_field.key, PathDistanceField.compute_key(grid, sources)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from s2clientprotocol import common_pb2
+from s2clientprotocol import sc2api_pb2 as sc_pb
+
+from utils.observation_log import (
+    MAGIC,
+    ObservationLog,
+    ObservationLogWriter,
+    ObservationRecorder,
+    RecordKind,
+    iter_records,
+)
+
+
+def pathing(value):
+    return common_pb2.ImageData(
+        bits_per_pixel=1, size=common_pb2.Size2DI(x=8, y=8), data=bytes([value]) * 8
+    )
+
+
+def observation(loop):
+    response = sc_pb.ResponseObservation()
+    response.observation.game_loop = loop
+    return response
+
+
+class FakeClient:
+    async def _execute(self, **kwargs):
+        response = sc_pb.Response()
+        response.data.units.add(unit_id=105, name="Zergling", available=True)
+        return response
+
+
+class TestObservationLogFormat(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "game.wzobs"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_game(self, steps=3):
+        with ObservationLogWriter(self.path) as writer:
+            writer.write_meta({"player_id": 2})
+            writer.write_message(
+                RecordKind.GAME_INFO, sc_pb.ResponseGameInfo(map_name="Test")
+            )
+            writer.write_message(RecordKind.GAME_DATA, sc_pb.ResponseData())
+            for loop in range(steps):
+                if loop == 1:
+                    writer.write_message(RecordKind.PATHING, pathing(0xFF))
+                writer.write_message(RecordKind.OBSERVATION, observation(loop))
+        return writer
+
+    def test_roundtrip(self):
+        writer = self.write_game()
+        self.assertEqual(writer.records, 7)
+
+        log = ObservationLog.load(self.path)
+        self.assertEqual(log.meta, {"player_id": 2})
+        self.assertEqual(log.game_info.map_name, "Test")
+        self.assertEqual(len(log), 3)
+
+        steps = list(log.steps())
+        self.assertEqual(
+            [s.observation.observation.game_loop for s in steps], [0, 1, 2]
+        )
+        self.assertEqual([s.pathing is not None for s in steps], [False, True, False])
+        self.assertEqual(steps[1].pathing.data, bytes([0xFF]) * 8)
+        self.assertEqual(len(list(log.steps(2))), 2)
+
+    def test_truncated_tail_is_ignored(self):
+        self.write_game()
+        with gzip.open(self.path, "rb") as f:
+            raw = f.read()
+        with gzip.open(self.path, "wb") as f:
+            f.write(raw[:-3])
+
+        self.assertEqual(len(ObservationLog.load(self.path)), 2)
+
+    def test_rejects_foreign_files(self):
+        with gzip.open(self.path, "wb") as f:
+            f.write(b"not a log")
+        with self.assertRaises(ValueError):
+            list(iter_records(self.path))
+
+        with ObservationLogWriter(self.path) as writer:
+            writer.write_meta({})
+        with self.assertRaises(ValueError):
+            ObservationLog.load(self.path)
+
+    def test_magic_header(self):
+        self.write_game(steps=0)
+        with gzip.open(self.path, "rb") as f:
+            self.assertEqual(f.read(len(MAGIC)), MAGIC)
+
+
+class TestObservationRecorder(unittest.TestCase):
+    def test_records_pathing_only_when_changed(self):
+        bot = SimpleNamespace(
+            client=FakeClient(),
+            player_id=1,
+            base_build=-1,
+            game_info=SimpleNamespace(
+                map_name="Test",
+                _proto=sc_pb.ResponseGameInfo(map_name="Test"),
+                pathing_grid=SimpleNamespace(_proto=pathing(0xFF)),
+            ),
+            state=SimpleNamespace(response_observation=observation(0)),
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = ObservationRecorder(Path(tmp) / "rec.wzobs")
+            asyncio.run(recorder.start(bot))
+            for loop in range(4):
+                if loop == 2:
+                    bot.game_info.pathing_grid._proto = pathing(0x0F)
+                bot.state.response_observation = observation(loop)
+                recorder.record_step(bot)
+            path = recorder.close()
+
+            log = ObservationLog.load(path)
+            self.assertEqual(recorder.steps, 4)
+            self.assertEqual(log.meta["player_id"], 1)
+            self.assertEqual(log.game_data.units[0].name, "Zergling")
+            self.assertEqual(
+                [s.pathing.data[:1] if s.pathing else None for s in log.steps()],
+                [b"\xff", None, b"\x0f", None],
+            )
+
+        # close 이후 기록은 무시
+        recorder.record_step(bot)
+        self.assertEqual(recorder.steps, 4)
+
+
+class TestReplayHarness(unittest.TestCase):
+    def test_synthetic_replay_is_deterministic(self):
+        sys.path.insert(0, os.path.join(ROOT, "..", "benchmarks"))
+        try:
+            import replay_harness
+        except ImportError as e:
+            self.skipTest(f"replay harness unavailable: {e}")
+        from sc2.bot_ai import BotAI
+
+        class AttackBot(BotAI):
+            async def on_step(self, iteration):
+                for unit in self.units:
+                    if self.enemy_units:
+                        unit.attack(self.enemy_units.closest_to(unit))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = replay_harness.make_synthetic_log(
+                Path(tmp) / "syn.wzobs", steps=5, num_lings=4, num_marines=3
+            )
+            log = ObservationLog.load(path)
+            results = [
+                asyncio.run(replay_harness.ReplayPlayer(log, AttackBot).play())
+                for _ in range(2)
+            ]
+
+        self.assertEqual(results[0].steps, 5)
+        self.assertEqual(results[0].action_counts, results[1].action_counts)
+        # 일꾼 12 + 저글링 4, 매 스텝 공격
+        self.assertEqual(results[0].actions_per_step, [16] * 5)
+        self.assertEqual(len(results[0].summary()["actions_by_ability"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sc2.position import Point2
+
+from utils import path_distance as pd
+from utils.path_distance import UNREACHABLE, PathDistanceField
+
+
+def walled_map():
+    """가운데 벽 + 위쪽 틈(램프) + 바위로 막힌 아래쪽 틈, 오른쪽 아래 섬"""
+    grid = np.ones((40, 60), dtype=np.uint8)
+    grid[:, 29:31] = 0
+    grid[34:37, 29:31] = 1  # 램프
+    grid[4:7, 29:31] = 0  # 바위 자리 (처음엔 막힘)
+    grid[30:40, 50:60] = 0
+    grid[33:37, 53:57] = 1  # 섬
+    return grid
+
+
+SOURCES = [(10.5, 5.5), (50.5, 5.5), (10.5, 35.5), (55.0, 35.0)]
+
+
+class TestPathDistanceField(unittest.TestCase):
+    def setUp(self):
+        self.grid = walled_map()
+        self.field = PathDistanceField(self.grid, SOURCES)
+
+    def test_wall_forces_detour(self):
+        a, b = Point2((10.5, 5.5)), Point2((50.5, 5.5))
+        straight = a.distance_to(b)
+        ground = self.field.path_distance(a, b)
+        self.assertGreater(ground, straight + 25)
+        # 대칭 조회 (b 도 소스)
+        self.assertAlmostEqual(ground, self.field.path_distance(b, a), delta=1.5)
+
+    def test_unreachable_and_unknown_fall_back_to_straight_line(self):
+        island = Point2((55.0, 35.0))
+        main = Point2((10.5, 5.5))
+        self.assertAlmostEqual(
+            self.field.path_distance(main, island), main.distance_to(island)
+        )
+        # 소스 근처가 아닌 두 점
+        p, q = (20.0, 20.0), (23.0, 24.0)
+        self.assertAlmostEqual(self.field.path_distance(p, q), 5.0)
+        self.assertEqual(self.field.fallbacks, 2)
+
+    def test_heap_fallback_matches_csgraph(self):
+        with mock.patch.object(pd, "_csgraph_dijkstra", None):
+            heap_field = PathDistanceField(self.grid, SOURCES)
+        np.testing.assert_array_equal(heap_field.distances, self.field.distances)
+        # (10, 5) -> (0, 0): 대각 5칸 + 직선 5칸
+        self.assertEqual(int(self.field.distances[0][0, 0]), 5 * 14 + 5 * 10)
+
+    def test_open_cells_matches_rebuild(self):
+        before = self.field.path_distance((10.5, 5.5), (50.5, 5.5))
+        opened = self.grid.copy()
+        opened[4:7, 29:31] = 1
+        # 건물로 새로 막힌 셀은 무시 (열리는 방향만 반영)
+        opened[20, 10] = 0
+        self.assertGreater(self.field.update_pathing(opened), 0)
+
+        opened[20, 10] = 1
+        rebuilt = PathDistanceField(opened, SOURCES)
+        np.testing.assert_array_equal(self.field.distances, rebuilt.distances)
+        self.assertLess(self.field.path_distance((10.5, 5.5), (50.5, 5.5)), before)
+        self.assertEqual(self.field.update_pathing(opened), 0)
+
+    def test_blocked_source_snaps_to_pathable_cell(self):
+        grid = self.grid.copy()
+        grid[3:8, 8:13] = 0  # 본진 건물 발자국
+        field = PathDistanceField(grid, SOURCES)
+        self.assertIsNotNone(field.source_cells[0])
+        self.assertLess(field.path_distance((10.5, 5.5), (10.5, 12.5)), 16)
+        self.assertEqual(int(field.distances[0][5, 10]), UNREACHABLE)
+
+
+class TestBotHelpers(unittest.TestCase):
+    def test_path_distance_without_field_uses_distance_to(self):
+        bot = SimpleNamespace()
+        a, b = Point2((0, 0)), Point2((3, 4))
+        self.assertEqual(pd.path_distance(bot, a, b), 5.0)
+
+    def test_field_sources(self):
+        bot = SimpleNamespace(
+            expansion_locations_list=[Point2((50.5, 5.5))],
+            start_location=Point2((10.5, 5.5)),
+            enemy_start_locations=[Point2((10.5, 35.5))],
+        )
+        self.assertEqual(
+            pd.field_sources(bot),
+            [Point2((50.5, 5.5)), Point2((10.5, 5.5)), Point2((10.5, 35.5))],
+        )
+
+    def test_path_distance_uses_attached_field(self):
+        bot = SimpleNamespace(path_distances=PathDistanceField(walled_map(), SOURCES))
+        self.assertGreater(
+            pd.path_distance(bot, Point2((10.5, 5.5)), Point2((50.5, 5.5))), 60
+        )
+
+    def test_start_pathing_prefers_snapshot(self):
+        grid = walled_map()
+        blocked = grid.copy()
+        blocked[5, 20:24] = 0  # 이후 스텝의 pathing_grid: 건물로 막힌 셀
+        bot = SimpleNamespace(
+            game_info=SimpleNamespace(pathing_grid=SimpleNamespace(data_numpy=blocked))
+        )
+        self.assertIs(pd.start_pathing(bot), blocked)
+        bot.start_pathing_grid = grid
+        self.assertIs(pd.start_pathing(bot), grid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for PhaseRunner
+
+Tests wave planning from declared read/write sets and concurrent execution
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.manager_registry import get_pre_combat_phase_accesses
+from core.phase_runner import ALL_UNITS, PhaseRunner, access, plan_waves
+
+
+class TestPlanWaves(unittest.TestCase):
+    """Test suite for plan_waves"""
+
+    def test_independent_managers_share_a_wave(self):
+        """Managers without shared keys or pools run together"""
+        waves = plan_waves(
+            [
+                access("a", "A", reads={"x"}),
+                access("b", "B", reads={"x"}),
+                access("c", "C", unit_pools={"OVERSEER"}),
+            ]
+        )
+        self.assertEqual(len(waves), 1)
+
+    def test_write_read_and_pool_conflicts_are_ordered(self):
+        """Writer before reader, and pool owners, are serialized"""
+        waves = plan_waves(
+            [
+                access("writer", "Writer", writes={"memory"}),
+                access("reader", "Reader", reads={"memory"}),
+                access("roach1", "Roach1", unit_pools={"ROACH"}),
+                access("roach2", "Roach2", unit_pools={"ROACH"}),
+            ]
+        )
+        labels = [[item.label for item in wave] for wave in waves]
+        self.assertEqual(labels, [["Writer", "Roach1"], ["Reader", "Roach2"]])
+
+    def test_wildcard_pool_conflicts_with_every_pool(self):
+        """ALL_UNITS pool conflicts with any unit pool"""
+        waves = plan_waves(
+            [
+                access("a", "A", unit_pools={"QUEEN"}),
+                access("b", "B", unit_pools={ALL_UNITS}),
+                access("c", "C", reads={"x"}),
+            ]
+        )
+        labels = [[item.label for item in wave] for wave in waves]
+        self.assertEqual(labels, [["A", "C"], ["B"]])
+
+    def test_pre_combat_phase_is_shorter_than_sequential(self):
+        """Declared pre-combat phase has a shorter critical path"""
+        accesses = get_pre_combat_phase_accesses()
+        runner = PhaseRunner()
+        self.assertLess(runner.critical_path_length(accesses), len(accesses))
+
+    def test_hive_tech_conflicts_with_its_morph_sources(self):
+        """HiveTech morphs hydras / corruptors, so army-pool owners precede it"""
+        accesses = get_pre_combat_phase_accesses()
+        hive = next(a for a in accesses if a.label == "HiveTech")
+        self.assertTrue({"HYDRALISK", "CORRUPTOR"} <= hive.unit_pools)
+
+        labels = [[a.label for a in wave] for wave in plan_waves(accesses)]
+        hive_wave = next(i for i, w in enumerate(labels) if "HiveTech" in w)
+        creep_wave = next(i for i, w in enumerate(labels) if "CreepDenial" in w)
+        self.assertGreater(hive_wave, creep_wave)
+
+
+class TestPhaseRunner(unittest.TestCase):
+    """Test suite for PhaseRunner execution"""
+
+    def test_wave_members_run_concurrently(self):
+        """Latency of a wave is the slowest member, not the sum"""
+        runner = PhaseRunner()
+        accesses = [access(f"m{i}", f"M{i}") for i in range(4)]
+        finished = []
+
+        async def step(item):
+            await asyncio.sleep(0.05)
+            finished.append(item.label)
+
+        started = time.perf_counter()
+        asyncio.run(runner.run_phase(accesses, step))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(sorted(finished), ["M0", "M1", "M2", "M3"])
+        self.assertLess(elapsed, 0.15)
+        self.assertEqual(runner.get_stats()["waves_run"], 1)
+
+    def test_run_in_thread_uses_worker_thread(self):
+        """Pure computations are executed off the event loop thread"""
+        runner = PhaseRunner()
+
+        async def main():
+            return await runner.run_in_thread(lambda: threading.current_thread().name)
+
+        try:
+            thread_name = asyncio.run(main())
+        finally:
+            runner.shutdown()
+        self.assertTrue(thread_name.startswith("phase_runner"))
+
+    def test_shutdown_releases_worker_pool(self):
+        """shutdown joins the pool; a later call starts a fresh one"""
+        runner = PhaseRunner()
+        asyncio.run(runner.run_in_thread(sum, [1, 2]))
+        executor = runner._executor
+
+        runner.shutdown()
+        runner.shutdown()  # idempotent
+
+        self.assertIsNone(runner._executor)
+        self.assertTrue(executor._shutdown)
+        self.assertEqual(asyncio.run(runner.run_in_thread(sum, [3])), 3)
+        runner.shutdown()
+
+
+class TestEndOfGameShutdown(unittest.TestCase):
+    """The bot's end-of-game reset shuts the integrator's runner down"""
+
+    def test_reset_shuts_down_step_integrator(self):
+        from types import SimpleNamespace
+
+        from bot_step_integration import BotStepIntegrator
+        from wicked_zerg_bot_pro_impl import WickedZergBotProImpl
+
+        runner = PhaseRunner()
+        asyncio.run(runner.run_in_thread(sum, [1]))
+        executor = runner._executor
+        integrator = BotStepIntegrator.__new__(BotStepIntegrator)
+        integrator._phase_runner = runner
+        bot = SimpleNamespace(
+            _step_integrator=integrator, logger=logging.getLogger("test")
+        )
+
+        WickedZergBotProImpl._reset_all_managers(bot)
+
+        self.assertTrue(executor._shutdown)
+        self.assertIsNone(runner._executor)
+        self.assertIsNone(bot._step_integrator)
+
+
+if __name__ == "__main__":
+    unittest.main()
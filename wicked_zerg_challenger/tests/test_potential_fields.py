@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+
+from combat.potential_fields import PotentialFieldController, TerrainRepulsionGrid
+from utils.unit_snapshot import build_frame_snapshot
+
+
+def make_unit(tag, x, y, type_id=UnitTypeId.ZERGLING, is_flying=False):
+    return SimpleNamespace(
+        tag=tag,
+        position=Point2((x, y)),
+        type_id=type_id,
+        is_flying=is_flying,
+        health=35,
+        health_max=35,
+    )
+
+
+class TestTerrainRepulsionGrid(unittest.TestCase):
+    def test_grid_matches_point_obstacles(self):
+        pathable = np.ones((32, 32), dtype=np.uint8)
+        pathable[14:16, 4:28] = 0  # 가로 벽
+        grid = TerrainRepulsionGrid(pathable, radius=3.0)
+
+        blocked = [
+            Point2((x + 0.5, y + 0.5)) for y, x in zip(*np.nonzero(pathable == 0))
+        ]
+        field = PotentialFieldController()
+        for x, y in [(10.5, 12.5), (20.5, 17.5), (3.5, 14.5)]:
+            expected = field.get_repulsion_vector(
+                make_unit(1, x, y), [], terrain_points=blocked
+            )
+            np.testing.assert_allclose(
+                grid.sample(np.array([[x, y]]))[0], expected, atol=1e-12
+            )
+
+    def test_wall_pushes_units_away(self):
+        pathable = np.ones((32, 32), dtype=np.uint8)
+        pathable[14:16, :] = 0
+        grid = TerrainRepulsionGrid(pathable, radius=3.0)
+        below, above = grid.sample(np.array([[10.5, 12.5], [10.5, 17.5]]))
+        self.assertLess(below[1], 0.0)
+        self.assertGreater(above[1], 0.0)
+
+    def test_outside_map_is_zero(self):
+        grid = TerrainRepulsionGrid(np.zeros((8, 8)), radius=3.0)
+        np.testing.assert_allclose(grid.sample(np.array([[-5.0, 3.0]])), [[0.0, 0.0]])
+
+
+class TestPotentialFieldBatch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.field = PotentialFieldController()
+        self.units = [
+            make_unit(i, *rng.uniform(20, 35, size=2), is_flying=i % 4 == 0)
+            for i in range(30)
+        ]
+        types = [UnitTypeId.MARINE, UnitTypeId.THOR, UnitTypeId.WIDOWMINE]
+        self.enemies = [
+            make_unit(100 + i, *rng.uniform(25, 40, size=2), type_id=types[i % 3])
+            for i in range(15)
+        ]
+        self.structures = [
+            make_unit(200 + i, *rng.uniform(20, 40, size=2), UnitTypeId.BUNKER)
+            for i in range(4)
+        ]
+        self.terrain = [Point2(p) for p in rng.uniform(20, 35, size=(6, 2))]
+
+    def test_batch_matches_per_unit_wrapper(self):
+        batch = self.field.get_repulsion_for_units(
+            self.units, self.enemies, self.terrain, self.structures
+        )
+        for row, unit in enumerate(self.units):
+            expected = self.field.get_repulsion_vector(
+                unit, self.enemies, self.terrain, self.structures
+            )
+            np.testing.assert_allclose(batch[row], expected, atol=1e-12)
+
+    def test_snapshot_inputs_match_unit_inputs(self):
+        bot = SimpleNamespace(
+            units=self.units, enemy_units=self.enemies, state=SimpleNamespace()
+        )
+        for unit in self.units + self.enemies:
+            unit.can_attack_ground = True
+        snapshot = build_frame_snapshot(bot, 1)
+
+        from_units = self.field.get_repulsion_for_units(
+            self.units, self.enemies, self.terrain, self.structures
+        )
+        from_snapshot = self.field.get_repulsion_for_units(
+            self.units, self.enemies, self.terrain, self.structures, snapshot
+        )
+        np.testing.assert_allclose(from_snapshot, from_units, atol=1e-12)
+
+    def test_splash_mask_uses_integer_type_ids(self):
+        type_ids = np.array(
+            [UnitTypeId.THOR.value, UnitTypeId.MARINE.value, UnitTypeId.LURKERMP.value]
+        )
+        np.testing.assert_array_equal(
+            self.field.splash_mask(type_ids), [True, False, True]
+        )
+
+    def test_flying_units_ignore_terrain(self):
+        positions = np.array([[10.0, 10.0], [10.0, 10.0]])
+        repulsion = self.field.get_repulsion_vectors(
+            positions,
+            is_flying=np.array([False, True]),
+            terrain_positions=np.array([[11.0, 10.0]]),
+        )
+        self.assertLess(repulsion[0, 0], 0.0)
+        np.testing.assert_allclose(repulsion[1], [0.0, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
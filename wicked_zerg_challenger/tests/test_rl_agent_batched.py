@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from local_training import rl_agent as rl
+from local_training.rl_agent import (
+    PolicyNetwork,
+    RLAgent,
+    discounted_returns,
+    load_experience_files,
+    policy_gradient,
+)
+
+
+def make_experience(rng, steps, good_action=None):
+    """good_action 을 고른 스텝에만 보상을 주는 가짜 게임"""
+    states = rng.random((steps, 15)).astype(np.float32)
+    actions = rng.integers(0, 5, steps)
+    rewards = np.where(actions == good_action, 1.0, -0.2).astype(np.float32)
+    return {"states": states, "actions": actions, "rewards": rewards}
+
+
+class TestBatchedPolicyNetwork(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(3)
+        self.net = PolicyNetwork()
+        rng = np.random.default_rng(3)
+        self.X = rng.random((32, 15))
+        self.actions = rng.integers(0, 5, 32)
+        self.advantages = rng.normal(size=32)
+
+    def test_forward_batch_matches_single(self):
+        probs, _cache = self.net.forward_batch(self.X)
+        for row, x in zip(probs, self.X):
+            np.testing.assert_allclose(row, self.net.forward(x)[0], atol=1e-12)
+
+    def test_backward_batch_matches_per_sample_backward(self):
+        for x, action, advantage in zip(self.X, self.actions, self.advantages):
+            _probs, cache = self.net.forward(x)
+            self.net.backward(cache, action, advantage)
+        expected = {k: v.copy() for k, v in self.net.gradients().items()}
+        self.net.zero_grad()
+
+        probs, cache = self.net.forward_batch(self.X)
+        dz3, _loss, _entropy = policy_gradient(
+            probs, self.actions, self.advantages, entropy_coeff=0.0
+        )
+        self.net.backward_batch(cache, dz3)
+        for name, grad in self.net.gradients().items():
+            np.testing.assert_allclose(grad, expected[name], atol=1e-10)
+
+    def test_policy_gradient_matches_finite_differences(self):
+        rng = np.random.default_rng(0)
+        z = rng.normal(size=(4, 5))
+        actions, advantages = np.array([0, 3, 1, 4]), rng.normal(size=4)
+
+        def total_loss(logits):
+            exp_z = np.exp(logits - logits.max(axis=1, keepdims=True))
+            return policy_gradient(
+                exp_z / exp_z.sum(axis=1, keepdims=True), actions, advantages, 0.05
+            )[1].sum()
+
+        exp_z = np.exp(z - z.max(axis=1, keepdims=True))
+        dz3 = policy_gradient(
+            exp_z / exp_z.sum(axis=1, keepdims=True), actions, advantages, 0.05
+        )[0]
+        eps = 1e-6
+        for i, j in [(0, 0), (1, 3), (2, 2), (3, 4)]:
+            bumped = z.copy()
+            bumped[i, j] += eps
+            numeric = (total_loss(bumped) - total_loss(z)) / eps
+            self.assertAlmostEqual(dz3[i, j], numeric, places=4)
+
+    def test_positive_advantage_raises_action_probability(self):
+        x = self.X[0]
+        before = self.net.forward(x)[0][2]
+        for _ in range(20):
+            _probs, cache = self.net.forward(x)
+            self.net.backward(cache, 2, 1.0)
+            self.net.update_weights(0.05)
+        self.assertGreater(self.net.forward(x)[0][2], before)
+
+    def test_discounted_returns_fallback(self):
+        rewards = np.array([1.0, 0.0, -1.0, 2.0])
+        expected = discounted_returns(rewards, 0.9)
+        np.testing.assert_allclose(expected[-1], 2.0)
+        np.testing.assert_allclose(expected[0], 1.0 + 0.9**2 * -1.0 + 0.9**3 * 2.0)
+        original = rl._lfilter
+        rl._lfilter = None
+        try:
+            np.testing.assert_allclose(discounted_returns(rewards, 0.9), expected)
+        finally:
+            rl._lfilter = original
+
+
+class TestOfflineTraining(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(5)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model_path = Path(self.tmp.name) / "model.npz"
+        self.agent = RLAgent(learning_rate=0.01, model_path=str(self.model_path))
+        rng = np.random.default_rng(5)
+        self.experiences = [make_experience(rng, 200, good_action=1) for _ in range(6)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_train_offline_learns_rewarded_action(self):
+        states = np.concatenate([e["states"] for e in self.experiences])
+        before = self.agent.policy.forward_batch(states)[0][:, 1].mean()
+        stats = self.agent.train_offline(
+            self.experiences, epochs=5, batch_size=128, seed=0
+        )
+        after = self.agent.policy.forward_batch(states)[0][:, 1].mean()
+
+        self.assertEqual(stats["steps"], 1200)
+        self.assertEqual(stats["updates"], 5 * 10)
+        self.assertEqual(len(stats["epoch_loss"]), 5)
+        self.assertGreater(after, before + 0.2)
+        self.assertEqual(self.agent.optimizer.t, 50)
+
+    def test_experience_files_and_adam_state_roundtrip(self):
+        buffer_dir = Path(self.tmp.name) / "buffer"
+        for i, exp in enumerate(self.experiences[:3]):
+            self.agent.states = list(exp["states"])
+            self.agent.actions = list(exp["actions"])
+            self.agent.rewards = list(exp["rewards"])
+            self.assertTrue(
+                self.agent.save_experience_data(str(buffer_dir / f"exp_{i}.npz"))
+            )
+        self.agent._clear_buffers()
+        bad = self.experiences[3].copy()
+        bad["actions"] = bad["actions"] + 10
+        np.savez(buffer_dir / "bad.npz", **bad)
+
+        loaded = load_experience_files(buffer_dir)
+        self.assertEqual(len(loaded), 3)
+
+        stats = self.agent.train_from_experience_files(buffer_dir, epochs=2)
+        self.assertEqual(stats["games"], 3)
+        self.assertTrue(self.agent.save_model())
+        self.assertEqual(
+            sorted(p.name for p in self.model_path.parent.glob("*.npz")), ["model.npz"]
+        )
+
+        restored = RLAgent(model_path=str(self.model_path))
+        self.assertEqual(restored.optimizer.t, self.agent.optimizer.t)
+        np.testing.assert_array_equal(
+            restored.optimizer.m["W1"], self.agent.optimizer.m["W1"]
+        )
+        np.testing.assert_array_equal(restored.policy.W3, self.agent.policy.W3)
+
+    def test_train_from_batch_and_end_episode_use_batched_path(self):
+        stats = self.agent.train_from_batch(self.experiences)
+        self.assertEqual((stats["games"], stats["steps"]), (6, 1200))
+        self.assertTrue(np.isfinite(stats["loss"]))
+        self.assertEqual(self.agent.train_from_batch([])["steps"], 0)
+
+        for state in self.experiences[0]["states"][:30]:
+            self.agent.get_action(state[:10])
+            self.agent.update_reward(0.1)
+        result = self.agent.end_episode(final_reward=1.0, save_experience=False)
+        self.assertEqual(result["steps"], 30)
+        self.assertTrue(np.isfinite(result["loss"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sc2.position import Point2
+
+from spatial_optimizer import ALLY, ENEMY, SpatialOptimizer
+
+
+def make_unit(tag, x, y):
+    return SimpleNamespace(tag=tag, position=Point2((x, y)))
+
+
+def brute_radius(tags, positions, center, radius):
+    dist = np.hypot(*(positions - np.asarray(center)).T)
+    return set(np.asarray(tags)[dist < radius].tolist())
+
+
+class TestIncrementalGrid(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(1)
+        self.bot = SimpleNamespace(units=[], enemy_units=[], state=SimpleNamespace())
+        self.index = SpatialOptimizer(self.bot, grid_size=8)
+        self.tags = np.arange(1000, 1200)
+        self.positions = self.rng.uniform(-20, 150, size=(200, 2))
+        self.index.sync(ENEMY, self.tags.tolist(), self.positions)
+
+    def test_radius_query_matches_brute_force(self):
+        for center in self.rng.uniform(0, 130, size=(20, 2)):
+            found = self.index.query_radius(Point2(center), 12.0, ENEMY)
+            self.assertEqual(
+                set(found.tolist()),
+                brute_radius(self.tags, self.positions, center, 12.0),
+            )
+
+    def test_moves_and_removals_stay_consistent(self):
+        keep = self.rng.permutation(200)[:150]
+        tags = self.tags[keep]
+        positions = self.positions[keep] + self.rng.normal(0, 3, size=(150, 2))
+        extra_tags = np.arange(5000, 5020)
+        extra_positions = self.rng.uniform(0, 130, size=(20, 2))
+        tags = np.concatenate([tags, extra_tags])
+        positions = np.concatenate([positions, extra_positions])
+
+        self.index.sync(ENEMY, tags.tolist(), positions)
+
+        self.assertEqual(len(self.index.sides[ENEMY]), 170)
+        for center in self.rng.uniform(0, 130, size=(20, 2)):
+            found = self.index.query_radius(tuple(center), 15.0, ENEMY)
+            self.assertEqual(
+                set(found.tolist()), brute_radius(tags, positions, center, 15.0)
+            )
+
+    def test_only_units_changing_cell_are_moved(self):
+        positions = self.positions.copy()
+        grid = self.index.sides[ENEMY]
+        cell_before = grid.cell_keys(positions)
+        positions[:10] += 40.0  # 확실히 다른 셀
+        positions[10:] = np.floor(positions[10:] / 8.0) * 8.0 + 4.0  # 같은 셀 안
+
+        self.index.sync(ENEMY, self.tags.tolist(), positions)
+
+        moved = int(np.sum(grid.cell_keys(positions) != cell_before))
+        self.assertEqual(grid.moves, moved)
+        self.assertGreaterEqual(moved, 10)
+        self.assertLess(moved, 20)
+
+    def test_knn_matches_brute_force(self):
+        center = (60.0, 60.0)
+        result = self.index.query_knn(center, 7, ENEMY)
+        dist = np.hypot(*(self.positions - center).T)
+        order = np.argsort(dist)[:7]
+        self.assertEqual([tag for tag, _ in result], self.tags[order].tolist())
+        np.testing.assert_allclose([d for _, d in result], dist[order])
+
+    def test_knn_respects_max_distance(self):
+        result = self.index.query_knn((60.0, 60.0), 50, ENEMY, max_distance=5.0)
+        self.assertTrue(all(distance < 5.0 for _, distance in result))
+
+    def test_batch_queries_match_single_queries(self):
+        centers = self.rng.uniform(20, 90, size=(12, 2))
+        batch = self.index.query_radius_batch(centers, 10.0, ENEMY)
+        counts = self.index.count_in_range_batch(centers, 10.0, ENEMY)
+        for row, center in enumerate(centers):
+            expected = brute_radius(self.tags, self.positions, center, 10.0)
+            self.assertEqual(set(batch[row].tolist()), expected)
+            self.assertEqual(counts[row], len(expected))
+
+    def test_sides_are_independent(self):
+        self.index.sync(ALLY, [1, 2], np.array([[50.0, 50.0], [51.0, 50.0]]))
+        allies = self.index.query_radius((50.0, 50.0), 3.0, ALLY)
+        both = self.index.query_radius((50.0, 50.0), 3.0)
+        self.assertEqual(sorted(allies.tolist()), [1, 2])
+        self.assertTrue({1, 2} <= set(both.tolist()))
+
+
+class TestQueryCacheAndBot(unittest.TestCase):
+    def setUp(self):
+        self.units = [make_unit(i, 10.0 + i, 10.0) for i in range(5)]
+        self.enemies = [make_unit(100 + i, 12.0 + i, 11.0) for i in range(5)]
+        self.bot = SimpleNamespace(
+            units=self.units, enemy_units=self.enemies, state=SimpleNamespace()
+        )
+        self.index = SpatialOptimizer(self.bot)
+        self.index._update_grids()
+
+    def test_repeated_query_hits_cache_until_next_sync(self):
+        first = self.index.query_radius(self.units[0], 4.0, ENEMY)
+        second = self.index.query_radius(self.units[0], 4.0, ENEMY)
+        self.assertIs(first, second)
+        self.assertEqual(self.index.cache_hits, 1)
+
+        self.index._update_grids()
+        self.index.query_radius(self.units[0], 4.0, ENEMY)
+        stats = self.index.get_statistics()
+        self.assertEqual(stats["cache_hits"], 1)
+        self.assertEqual(stats["queries_total"], 3)
+        self.assertEqual(stats["total_units"], 10)
+
+    def test_units_in_range_is_strict_like_closer_than(self):
+        # 거리 정확히 2.0인 유닛(102)은 제외
+        found = self.index.units_in_range(Point2((12.0, 11.0)), 2.0, ENEMY)
+        self.assertEqual(sorted(u.tag for u in found), [100, 101])
+
+    def test_legacy_api_still_returns_tags(self):
+        tags = self.index.find_units_in_range(Point2((10.0, 10.0)), 3.0, {0, 1, 2, 3})
+        self.assertEqual(sorted(tags), [0, 1, 2])
+        self.assertEqual(self.index.position_of(103), Point2((15.0, 11.0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from game_data_logger import GameDataLogger
+from monitoring.dashboard import DashboardServer
+from monitoring.telemetry_logger_atomic import TelemetryCollector
+from monitoring.telemetry_store import FRAME_MS_EDGES, TelemetryStore
+
+
+def frames(times):
+    return [{"frame_time_ms": t, "minerals": 50, "game_phase": "early"} for t in times]
+
+
+class TestTelemetryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = TelemetryStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def add(self, game_id, race, result, day, times=(), map_name="Simple64"):
+        self.store.append_game(
+            game_id,
+            start_time=f"2026-05-{day:02d} 10:00:00",
+            enemy_race=race,
+            map_name=map_name,
+            result=result,
+            frames=frames(times),
+        )
+
+    def test_win_rate_overall_grouped_and_filtered(self):
+        self.add("g1", "Race.Terran", "Result.Victory", 1)
+        self.add("g2", "Terran", "Defeat", 2)
+        self.add("g3", "Protoss", "Win", 3, map_name="Other")
+
+        self.assertEqual(self.store.win_rate()["wins"], 2)
+        by_race = self.store.win_rate(group_by="enemy_race")
+        self.assertEqual(by_race["Terran"], {"total": 2, "wins": 1, "winrate": 50.0})
+        self.assertEqual(self.store.win_rate(map_name="Other")["total"], 1)
+        self.assertEqual(self.store.win_rate(since="2026-05-02")["total"], 2)
+        self.assertEqual(self.store.win_rate(recent=1)["total"], 1)
+        self.assertEqual(self.store.count(enemy_race="Race.Terran"), 2)
+
+        with self.assertRaises(ValueError):
+            self.store.win_rate(group_by="summary")
+        with self.assertRaises(ValueError):
+            self.store.count(frames_file="x")
+
+    def test_frame_time_percentiles_from_histograms(self):
+        rng = np.random.default_rng(0)
+        a, b = rng.uniform(1, 40, 500), rng.uniform(5, 120, 300)
+        self.add("g1", "Terran", "Victory", 1, a)
+        self.add("g2", "Zerg", "Defeat", 2, b)
+        self.add("g3", "Zerg", "Defeat", 3)  # 프레임 없음
+
+        overall = self.store.frame_time_percentiles((50, 95, 99))
+        expected = np.percentile(np.concatenate([a, b]), [50, 95, 99])
+        for q, value in zip((50, 95, 99), expected):
+            width = np.diff(FRAME_MS_EDGES)[np.searchsorted(FRAME_MS_EDGES, value) - 1]
+            self.assertLessEqual(abs(overall[q] - value), width)
+
+        zerg = self.store.frame_time_percentiles(group_by="enemy_race")["Zerg"]
+        self.assertLessEqual(zerg[99], b.max())
+
+    def test_matchup_summary_and_recent_games(self):
+        self.add("g1", "Terran", "Victory", 1, [10.0, 20.0])
+        self.add("g2", "Terran", "Defeat", 2, [30.0])
+
+        summary = self.store.matchup_summary()["Terran"]
+        self.assertEqual(summary["total"], 2)
+        self.assertAlmostEqual(summary["avg_frame_ms"], 20.0)
+        self.assertIn(95, summary["frame_ms"])
+
+        recent = self.store.recent_games(limit=1)
+        self.assertEqual(recent[0]["game_id"], "g2")
+        self.assertEqual(recent[0]["total_frames"], 1)
+
+    def test_frames_and_events_round_trip(self):
+        self.store.append_game(
+            "g/1",
+            frames=frames([5.0, 6.0]),
+            events=[{"type": "expansion_started", "base_count": 2}],
+        )
+        columns = self.store.load_frames("g/1", ["frame_time_ms", "game_phase"])
+        np.testing.assert_array_equal(columns["frame_time_ms"], [5.0, 6.0])
+        self.assertEqual(list(columns["game_phase"]), ["early", "early"])
+        self.assertEqual(self.store.load_events("g/1")[0]["base_count"], 2)
+        self.assertEqual(self.store.load_frames("missing"), {})
+
+    def test_ingest_directory_handles_both_formats_once(self):
+        root = Path(self.tmp.name)
+        telemetry = {
+            "game_id": "t1",
+            "start_time": "2026-05-09 10:00:00",
+            "enemy_race": "Zerg",
+            "map_name": "Simple64",
+            "result": "Victory",
+            "frames": frames([12.0, 14.0]),
+            "events": [],
+        }
+        game_log = {
+            "meta": {
+                "timestamp": "2026-05-10T11:00:00",
+                "map_name": "Simple64",
+                "opponent_race": "Race.Protoss",
+            },
+            "game_result": {"result": "Result.Defeat", "duration": 300.0},
+            "resource_snapshots": [{"time": 60.0, "minerals": 175}],
+        }
+        (root / "t1_Victory.json").write_text(json.dumps(telemetry), encoding="utf-8")
+        (root / "20260510_log.json").write_text(json.dumps(game_log), encoding="utf-8")
+        (root / "analytics.json").write_text("{}", encoding="utf-8")
+        (root / "broken.json").write_text("{", encoding="utf-8")
+
+        self.assertEqual(self.store.ingest_directory(), 2)
+        self.assertEqual(self.store.ingest_directory(), 0)
+
+        by_race = self.store.win_rate(group_by="enemy_race")
+        self.assertEqual(by_race["Protoss"]["wins"], 0)
+        self.assertEqual(by_race["Zerg"]["wins"], 1)
+        log = self.store.recent_games(source="game_log")[0]
+        self.assertEqual(log["duration"], 300.0)
+        self.assertEqual(
+            list(self.store.load_frames(log["game_id"])["minerals"]), [175]
+        )
+
+
+class TestWriters(unittest.TestCase):
+    def test_collector_appends_to_store_without_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            collector = TelemetryCollector(
+                output_dir=tmp, sample_interval=1, write_json=False
+            )
+            collector.start_game("game1", "Terran", "Simple64")
+            collector.record_frame(SimpleNamespace(time=1.0), 1, frame_time_ms=9.0)
+            collector.end_game("Victory")
+
+            self.assertEqual(list(Path(tmp).glob("*.json")), [])
+            store = TelemetryStore(tmp)
+            self.assertEqual(store.win_rate()["wins"], 1)
+            self.assertEqual(store.recent_games()[0]["max_frame_ms"], 9.0)
+
+    def test_dashboard_does_not_reindex_collector_games(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            collector = TelemetryCollector(output_dir=tmp, sample_interval=1)
+            collector.start_game("game1", "Protoss", "Simple64")
+            collector.end_game("Defeat")
+
+            dashboard = DashboardServer(data_dir=tmp)
+            self.assertEqual(dashboard.refresh(), 0)
+            self.assertEqual(
+                dashboard.get_winrate_summary()["by_race"]["Protoss"]["total"], 1
+            )
+
+    def test_game_data_logger_indexes_saved_game(self):
+        bot = SimpleNamespace(
+            game_info=SimpleNamespace(map_name="Simple64"),
+            enemy_race="Race.Zerg",
+            supply_used=50,
+            minerals=100,
+            vespene=20,
+        )
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                logger = GameDataLogger(bot)
+                logger.initialize_game_meta()
+                logger.finalize_game("Result.Victory")
+                store = TelemetryStore(Path(tmp, "data", "games"))
+                self.assertEqual(store.win_rate(enemy_race="Zerg")["wins"], 1)
+                self.assertEqual(store.ingest_directory(), 0)
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
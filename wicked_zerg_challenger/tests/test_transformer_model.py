@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from local_training.transformer_model import KVCache, TransformerDecisionModel
+
+
+def reference_logits(model, states):
+    """전체 시퀀스를 밴드 마스크(슬라이딩 윈도우 인과) 어텐션으로 한 번에 계산"""
+    n, window = len(states), model.max_history_len
+    delta = np.arange(n)[:, None] - np.arange(n)[None, :]
+    mask = ((delta < 0) | (delta >= window)).astype(np.float64)
+    x = model.pos_encoding.encode(model._embed_input(states))
+    for block in model.transformer_blocks:
+        x = block.forward(x, mask)
+    return np.dot(x, model.output_layer)
+
+
+def probs(result):
+    return np.array(list(result["action_probs"].values()))
+
+
+class TestKVCache(unittest.TestCase):
+    def test_ring_buffer_keeps_latest_positions(self):
+        cache = KVCache(capacity=3, d_model=2)
+        for pos in range(5):
+            cache.append(np.full((1, 2), pos), np.full((1, 2), -pos), np.array([pos]))
+        keys, values, positions = cache.view()
+        self.assertEqual(sorted(positions.tolist()), [2, 3, 4])
+        np.testing.assert_array_equal(keys[:, 0], positions)
+
+        cache.append(np.zeros((4, 2)), np.zeros((4, 2)), np.arange(5, 9))
+        self.assertEqual(sorted(cache.view()[2].tolist()), [6, 7, 8])
+        cache.clear()
+        self.assertEqual(len(cache.view()[0]), 0)
+
+
+class TestIncrementalInference(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(7)
+        self.model = TransformerDecisionModel(max_history_len=6)
+        self.states = np.random.rand(25, self.model.input_dim)
+
+    def test_incremental_matches_full_window_recompute(self):
+        expected = reference_logits(self.model, self.states.astype(np.float32))
+        for i, state in enumerate(self.states):
+            result = self.model.predict(list(state))
+            np.testing.assert_allclose(
+                probs(result), self.model._softmax(expected[i]), atol=1e-9
+            )
+        self.assertEqual(result["sequence_length"], 6)
+        self.assertEqual(len(self.model.state_history), 6)
+
+    def test_predict_many_matches_step_by_step(self):
+        stepwise = [self.model.predict(list(state)) for state in self.states]
+        live_history = len(self.model.state_history)
+        for chunk_size in (1, 4, 100):
+            batched = self.model.predict_many(self.states, chunk_size=chunk_size)
+            self.assertEqual(
+                [r["action"] for r in batched], [r["action"] for r in stepwise]
+            )
+            for a, b in zip(batched, stepwise):
+                np.testing.assert_allclose(probs(a), probs(b), atol=1e-9)
+                self.assertEqual(a["sequence_length"], b["sequence_length"])
+        # 라이브 히스토리는 그대로
+        self.assertEqual(len(self.model.state_history), live_history)
+        self.assertEqual(self.model.predict_many([]), [])
+
+    def test_reset_and_short_input(self):
+        first = self.model.predict([1.0, 2.0])
+        self.model.predict(list(self.states[0]))
+        self.model.reset()
+        self.assertEqual(len(self.model.state_history), 0)
+        again = self.model.predict([1.0, 2.0])
+        np.testing.assert_allclose(probs(again), probs(first))
+        self.assertEqual(again["sequence_length"], 1)
+
+    def test_full_recompute_mode_is_kept(self):
+        model = TransformerDecisionModel(incremental=False)
+        for state in self.states[:12]:
+            result = model.predict(list(state))
+        self.assertNotIn("error", result)
+        self.assertEqual(result["sequence_length"], model.max_history_len)
+        self.assertAlmostEqual(sum(probs(result)), 1.0, places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.command_arbiter import CommandArbiter
+from unit_authority_manager import AuthorityLevel, UnitAuthorityManager
+
+
+class _Units(list):
+    @property
+    def amount(self):
+        return len(self)
+
+
+def make_manager(time=0.0):
+    bot = SimpleNamespace(time=time, actions=[])
+    return UnitAuthorityManager(bot), bot
+
+
+class TestExpiry(unittest.TestCase):
+    def test_expired_authority_is_released(self):
+        manager, bot = make_manager()
+        manager.request_unit(1, "Combat", AuthorityLevel.COMBAT)
+        manager.request_unit(2, "Scout", AuthorityLevel.SCOUTING)
+
+        bot.time = 3.0
+        manager.request_unit(2, "Scout", AuthorityLevel.SCOUTING)  # 갱신
+        bot.time = 6.0
+        manager._cleanup_expired_authorities()
+
+        self.assertNotIn(1, manager.authorities)
+        self.assertNotIn(1, manager.system_units["Combat"])
+        self.assertTrue(manager.has_authority(2, "Scout"))
+
+        bot.time = 8.5
+        manager._cleanup_expired_authorities()
+        self.assertEqual(manager.authorities, {})
+
+    def test_renewed_authority_survives_cleanup(self):
+        manager, bot = make_manager()
+        manager.request_unit(1, "Combat", AuthorityLevel.COMBAT)
+
+        bot.time = manager.AUTHORITY_TIMEOUT - 0.5
+        manager.request_unit(1, "Combat", AuthorityLevel.COMBAT)  # 만료 직전 갱신
+        bot.time = manager.AUTHORITY_TIMEOUT + 1.0  # 최초 요청 기준으로는 만료
+        manager._cleanup_expired_authorities()
+
+        self.assertTrue(manager.has_authority(1, "Combat"))
+        self.assertIn(1, manager.system_units["Combat"])
+
+    def test_transferred_authority_keeps_its_own_deadline(self):
+        manager, bot = make_manager()
+        manager.request_unit(1, "Creep", AuthorityLevel.CREEP)
+        bot.time = 4.0
+        self.assertTrue(manager.request_unit(1, "Combat", AuthorityLevel.COMBAT))
+        self.assertEqual(manager.total_conflicts, 1)
+
+        bot.time = 6.0  # 이전 소유자의 기한은 지났지만 새 권한은 유효
+        manager._cleanup_expired_authorities()
+        self.assertTrue(manager.has_authority(1, "Combat"))
+        self.assertNotIn(1, manager.system_units["Creep"])
+
+    def test_released_entries_do_not_accumulate(self):
+        manager, bot = make_manager()
+        for step in range(2000):
+            bot.time = step * 0.01
+            manager.request_unit(step % 10, "Combat", AuthorityLevel.COMBAT)
+            manager.release_unit(step % 10, "Combat")
+        self.assertLessEqual(len(manager._expiry), 2 * len(manager.authorities) + 257)
+
+    def test_reset_clears_heap(self):
+        manager, _ = make_manager()
+        manager.request_unit(1, "Combat", AuthorityLevel.COMBAT)
+        manager.reset()
+        self.assertEqual(manager._expiry, [])
+        self.assertEqual(manager.authorities, {})
+
+
+class TestBulkOperations(unittest.TestCase):
+    def test_request_many_accepts_tag_arrays(self):
+        manager, _ = make_manager()
+        manager.request_unit(3, "Defense", AuthorityLevel.DEFENSE)
+
+        granted = manager.request_many(
+            np.array([1, 2, 3, 4], dtype=np.int64), "Combat", AuthorityLevel.COMBAT
+        )
+
+        self.assertEqual(granted, [1, 2, 4])
+        self.assertTrue(all(type(tag) is int for tag in granted))
+        self.assertEqual(manager.system_units["Combat"], {1, 2, 4})
+        self.assertTrue(manager.has_authority(3, "Defense"))
+
+    def test_request_authority_returns_set(self):
+        manager, _ = make_manager()
+        granted = manager.request_authority([5, 6], AuthorityLevel.HARASSMENT, "Ling")
+        self.assertEqual(granted, {5, 6})
+
+    def test_request_many_notes_grants_for_arbiter(self):
+        manager, bot = make_manager()
+        bot.command_arbiter = CommandArbiter(bot)
+        manager.request_many([1, 2], "Combat", AuthorityLevel.COMBAT)
+        self.assertEqual(set(bot.command_arbiter._grants), {1, 2})
+
+    def test_release_many_only_releases_own_units(self):
+        manager, _ = make_manager()
+        manager.request_many([1, 2], "Drop", AuthorityLevel.TACTICAL)
+        manager.request_unit(3, "Combat", AuthorityLevel.COMBAT)
+
+        self.assertEqual(manager.release_many({1, 2, 3}, "Drop"), 2)
+        self.assertEqual(set(manager.authorities), {3})
+        self.assertEqual(manager.system_units["Drop"], set())
+
+    def test_protect_economy_workers_in_bulk(self):
+        manager, bot = make_manager()
+        bot.workers = _Units(
+            SimpleNamespace(tag=tag, is_gathering=tag != 0, is_returning=False)
+            for tag in range(20)
+        )
+        manager.request_unit(1, "Combat", AuthorityLevel.COMBAT)
+
+        asyncio.run(manager.on_step(0))
+
+        protected = manager.system_units["EconomyManager"]
+        self.assertEqual(len(protected), 12)  # max(8, 20 * 0.6)
+        self.assertNotIn(0, protected)
+        self.assertTrue(manager.is_worker_protected(1))
+
+
+class TestUnitDestroyed(unittest.TestCase):
+    def test_dead_unit_is_released_for_any_owner(self):
+        manager, _ = make_manager()
+        manager.request_unit(1, "AdvancedScoutingV2", AuthorityLevel.SCOUTING)
+
+        self.assertTrue(manager.on_unit_destroyed(1))
+        self.assertNotIn(1, manager.authorities)
+        self.assertNotIn(1, manager.system_units["AdvancedScoutingV2"])
+        self.assertFalse(manager.on_unit_destroyed(99))  # 적 유닛 태그
+
+    def test_bot_event_releases_authority(self):
+        from wicked_zerg_bot_pro_impl import WickedZergBotProImpl
+
+        manager, _ = make_manager()
+        manager.request_unit(7, "Combat", AuthorityLevel.COMBAT)
+        bot = SimpleNamespace(unit_authority=manager, logger=None)
+
+        asyncio.run(WickedZergBotProImpl.on_unit_destroyed(bot, 7))
+
+        self.assertNotIn(7, manager.authorities)
+
+    def test_bot_event_suppresses_cleanup_errors(self):
+        from wicked_zerg_bot_pro_impl import WickedZergBotProImpl
+
+        manager, _ = make_manager()
+        manager.request_unit(7, "Combat", AuthorityLevel.COMBAT)
+        bot = SimpleNamespace(unit_authority=manager, logger=Mock())
+
+        with patch(
+            "wicked_zerg_bot_pro_impl.get_shared_cache",
+            side_effect=RuntimeError("cache"),
+        ):
+            asyncio.run(WickedZergBotProImpl.on_unit_destroyed(bot, 7))
+
+        self.assertNotIn(7, manager.authorities)
+        bot.logger.warning.assert_called_once()
+
+        bot.unit_authority = Mock(on_unit_destroyed=Mock(side_effect=KeyError(8)))
+        asyncio.run(WickedZergBotProImpl.on_unit_destroyed(bot, 8))
+        self.assertEqual(bot.logger.warning.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sc2.ids.unit_typeid import UnitTypeId
+
+from utils.unit_snapshot import (
+    FLAG_ATTACKS_AIR,
+    FLAG_FLYING,
+    UnitSnapshot,
+    build_frame_snapshot,
+    get_frame_snapshot,
+)
+
+
+def make_unit(tag, x, y, type_id=UnitTypeId.ZERGLING, health=35, health_max=35, **kw):
+    return SimpleNamespace(
+        tag=tag,
+        position=SimpleNamespace(x=x, y=y),
+        type_id=type_id,
+        health=health,
+        health_max=health_max,
+        shield=kw.get("shield", 0),
+        shield_max=kw.get("shield_max", 0),
+        is_flying=kw.get("is_flying", False),
+        is_burrowed=False,
+        is_cloaked=False,
+        can_attack_ground=True,
+        can_attack_air=kw.get("can_attack_air", False),
+        ground_range=kw.get("ground_range", 0.1),
+        air_range=0.0,
+        radius=0.375,
+    )
+
+
+class TestUnitSnapshot(unittest.TestCase):
+    def test_columns_and_tag_index(self):
+        units = [
+            make_unit(1, 10, 20),
+            make_unit(
+                2,
+                30,
+                40,
+                type_id=UnitTypeId.MUTALISK,
+                health=60,
+                health_max=120,
+                is_flying=True,
+                can_attack_air=True,
+            ),
+        ]
+        snap = UnitSnapshot.from_units(units)
+
+        self.assertEqual(len(snap), 2)
+        np.testing.assert_allclose(snap.positions, [[10, 20], [30, 40]])
+        self.assertEqual(snap.row(2), 1)
+        self.assertAlmostEqual(float(snap.hp_ratio[1]), 0.5)
+        self.assertTrue(snap.mask(FLAG_FLYING)[1])
+        self.assertTrue(snap.mask(FLAG_ATTACKS_AIR)[1])
+        self.assertFalse(snap.mask(FLAG_FLYING)[0])
+        self.assertEqual(snap.type_mask([UnitTypeId.MUTALISK]).tolist(), [False, True])
+        self.assertEqual(snap.rows_for([2, 99, 1]).tolist(), [1, 0])
+
+    def test_type_lookup_uses_default_for_unknown_types(self):
+        snap = UnitSnapshot.from_units(
+            [make_unit(1, 0, 0), make_unit(2, 0, 0, type_id=UnitTypeId.ROACH)]
+        )
+        lut = snap.type_lookup({UnitTypeId.ROACH: 2.0}, default=1.0)
+        self.assertEqual(lut.tolist(), [1.0, 2.0])
+
+    def test_frame_snapshot_velocity_and_blackboard_lookup(self):
+        bot = SimpleNamespace(
+            units=[make_unit(1, 0, 0)],
+            enemy_units=[make_unit(5, 50, 50)],
+            state=SimpleNamespace(game_loop=100),
+        )
+        first = build_frame_snapshot(bot, iteration=1)
+
+        bot.units = [make_unit(1, 4, 0), make_unit(2, 9, 9)]
+        bot.state.game_loop = 104
+        second = build_frame_snapshot(bot, iteration=2, previous=first)
+
+        np.testing.assert_allclose(second.own.velocities, [[1, 0], [0, 0]])
+
+        bot.blackboard = SimpleNamespace(unit_snapshot=second)
+        self.assertIs(get_frame_snapshot(bot), second)
+        bot.state.game_loop = 108
+        self.assertIsNone(get_frame_snapshot(bot))
+
+
+if __name__ == "__main__":
+    unittest.main()
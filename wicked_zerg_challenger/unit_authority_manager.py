@@ -2,12 +2,20 @@
 Unit Authority Manager - 유닛 제어 권한 관리 시스템
 
 여러 시스템이 같은 유닛을 제어하려 할 때 충돌을 방지합니다
+
+- 만료: (마지막 명령 시각) 최소 힙, 만료된 것만 꺼냄 (전체 스캔 없음)
+- 소유자별 태그 집합: system_units
+- 일괄 요청/해제: request_many / release_many (태그 배열)
+- 죽은 유닛: on_unit_destroyed 이벤트로 즉시 해제
 """
 
+import heapq
 from collections import defaultdict
 from enum import IntEnum
-from typing import Dict, Set
+from itertools import count
+from typing import Dict, Iterable, List, Set, Tuple
 
+from core.command_arbiter import get_command_arbiter
 from utils.logger import get_logger
 
 try:
@@ -54,6 +62,10 @@ class UnitAuthorityManager:
         self.system_units: Dict[str, Set[int]] = defaultdict(set)
         self.AUTHORITY_TIMEOUT = 5.0  # 30초에서 5초로 단축 (빠른 권한 이관)
         self.total_conflicts = 0
+        # (기록 시점의 last_command_time, 순번, 권한) 최소 힙
+        # 갱신/해제/이관된 항목은 꺼낼 때 걸러냄 (lazy invalidation)
+        self._expiry: List[Tuple[float, int, UnitAuthority]] = []
+        self._expiry_seq = count()
 
     async def on_step(self, iteration: int):
         # * 일꾼 보호: 경제 일꾼을 WORKER_PROTECTED 권한으로 등록
@@ -69,18 +81,17 @@ class UnitAuthorityManager:
             return
 
         min_protected = max(8, int(self.bot.workers.amount * 0.6))
-        protected_count = 0
-
+        tags = []
         for worker in self.bot.workers:
             if worker.is_gathering or worker.is_returning:
                 # 자원 채취 중인 일꾼은 보호
-                self.request_unit(
-                    worker.tag, "EconomyManager", AuthorityLevel.WORKER_PROTECTED
-                )
-                protected_count += 1
-            if protected_count >= min_protected:
+                tags.append(worker.tag)
+            if len(tags) >= min_protected:
                 break
 
+        # 명령 없는 등록이므로 중재기에 알리지 않음
+        self._request_many(tags, "EconomyManager", AuthorityLevel.WORKER_PROTECTED)
+
     def is_worker_protected(self, unit_tag: int) -> bool:
         """해당 유닛이 보호된 일꾼인지 확인"""
         if unit_tag not in self.authorities:
@@ -94,10 +105,56 @@ class UnitAuthorityManager:
     def request_unit(
         self, unit_tag: int, requester: str, level: AuthorityLevel
     ) -> bool:
+        granted = self._request_unit(unit_tag, requester, level)
+        if granted:
+            # 승인 직후의 명령이 이 레벨로 중재됨 (core.command_arbiter)
+            arbiter = get_command_arbiter(self.bot)
+            if arbiter is not None:
+                arbiter.note_grant(unit_tag, level)
+        return granted
+
+    def request_many(
+        self, unit_tags: Iterable[int], requester: str, level: AuthorityLevel
+    ) -> List[int]:
+        """
+        여러 유닛 권한 일괄 요청
+
+        Args:
+            unit_tags: 태그 리스트/집합/정수 배열
+            requester: 요청 시스템 이름
+            level: 요청 권한 레벨
+
+        Returns:
+            승인된 태그 리스트 (입력 순서)
+        """
+        granted = self._request_many(unit_tags, requester, level)
+        arbiter = get_command_arbiter(self.bot)
+        if arbiter is not None:
+            for tag in granted:
+                arbiter.note_grant(tag, level)
+        return granted
+
+    def _request_unit(
+        self, unit_tag: int, requester: str, level: AuthorityLevel
+    ) -> bool:
+        return self._claim(unit_tag, requester, level, getattr(self.bot, "time", 0))
+
+    def _request_many(
+        self, unit_tags: Iterable[int], requester: str, level: AuthorityLevel
+    ) -> List[int]:
         game_time = getattr(self.bot, "time", 0)
+        claim = self._claim
+        return [
+            int(tag)
+            for tag in unit_tags
+            if claim(int(tag), requester, level, game_time)
+        ]
 
-        if unit_tag in self.authorities:
-            current = self.authorities[unit_tag]
+    def _claim(
+        self, unit_tag: int, requester: str, level: AuthorityLevel, game_time: float
+    ) -> bool:
+        current = self.authorities.get(unit_tag)
+        if current is not None:
             if current.owner == requester:
                 current.last_command_time = game_time
                 return True
@@ -107,19 +164,32 @@ class UnitAuthorityManager:
                 return True
             return False
 
-        self.authorities[unit_tag] = UnitAuthority(
-            unit_tag, requester, level, game_time
-        )
-        self.system_units[requester].add(unit_tag)
+        self._grant(unit_tag, requester, level, game_time)
         return True
 
     def release_unit(self, unit_tag: int, releaser: str) -> bool:
-        if unit_tag not in self.authorities:
+        auth = self.authorities.get(unit_tag)
+        if auth is None or auth.owner != releaser:
             return False
-        if self.authorities[unit_tag].owner != releaser:
+        self._drop(auth)
+        return True
+
+    def release_many(self, unit_tags: Iterable[int], releaser: str) -> int:
+        """releaser 소유인 태그들 일괄 해제, 해제된 개수 반환"""
+        released = 0
+        for tag in unit_tags:
+            auth = self.authorities.get(int(tag))
+            if auth is not None and auth.owner == releaser:
+                self._drop(auth)
+                released += 1
+        return released
+
+    def on_unit_destroyed(self, unit_tag: int) -> bool:
+        """죽은 유닛 권한 해제 (소유자 무관, 적 유닛 태그는 무시됨)"""
+        auth = self.authorities.get(unit_tag)
+        if auth is None:
             return False
-        del self.authorities[unit_tag]
-        self.system_units[releaser].discard(unit_tag)
+        self._drop(auth)
         return True
 
     def has_authority(self, unit_tag: int, requester: str) -> bool:
@@ -133,33 +203,61 @@ class UnitAuthorityManager:
     ):
         old = self.authorities[unit_tag]
         self.system_units[old.owner].discard(unit_tag)
-        self.authorities[unit_tag] = UnitAuthority(
-            unit_tag, new_owner, level, game_time
-        )
-        self.system_units[new_owner].add(unit_tag)
+        self._grant(unit_tag, new_owner, level, game_time)
+
+    def _grant(
+        self, unit_tag: int, owner: str, level: AuthorityLevel, game_time: float
+    ) -> None:
+        auth = UnitAuthority(unit_tag, owner, level, game_time)
+        self.authorities[unit_tag] = auth
+        self.system_units[owner].add(unit_tag)
+        self._push_expiry(auth)
+
+    def _drop(self, auth: UnitAuthority) -> None:
+        # 힙 항목은 남겨 두고 꺼낼 때 무시
+        del self.authorities[auth.unit_tag]
+        self.system_units[auth.owner].discard(auth.unit_tag)
+
+    def _push_expiry(self, auth: UnitAuthority) -> None:
+        heap = self._expiry
+        if len(heap) > 2 * len(self.authorities) + 256:
+            # 무효 항목이 쌓이면 살아 있는 권한으로 재구성
+            heap[:] = [
+                (a.last_command_time, next(self._expiry_seq), a)
+                for a in self.authorities.values()
+                if a is not auth
+            ]
+            heapq.heapify(heap)
+        heapq.heappush(heap, (auth.last_command_time, next(self._expiry_seq), auth))
 
     def request_authority(
         self, unit_tags, level: AuthorityLevel, requester: str, game_loop: int = 0
     ) -> set:
         """호환 메서드: 여러 유닛에 대해 권한 요청 (set 기반)"""
-        granted = set()
-        for tag in unit_tags:
-            if self.request_unit(tag, requester, level):
-                granted.add(tag)
-        return granted
+        return set(self.request_many(unit_tags, requester, level))
 
     def reset(self):
         """게임 간 상태 초기화 (훈련 에피소드 간 호출 필수)"""
         self.authorities.clear()
         self.system_units.clear()
+        self._expiry.clear()
         self.total_conflicts = 0
 
     def _cleanup_expired_authorities(self):
+        """
+        마지막 명령 후 AUTHORITY_TIMEOUT 지난 권한 해제
+
+        Time Complexity: O((e + r) log n) - e 만료, r 갱신/무효 항목
+        """
         game_time = getattr(self.bot, "time", 0)
-        expired = [
-            (tag, auth.owner)
-            for tag, auth in self.authorities.items()
-            if game_time - auth.last_command_time > self.AUTHORITY_TIMEOUT
-        ]
-        for tag, owner in expired:
-            self.release_unit(tag, owner)
+        timeout = self.AUTHORITY_TIMEOUT
+        heap = self._expiry
+        while heap and game_time - heap[0][0] > timeout:
+            _, _, auth = heapq.heappop(heap)
+            if self.authorities.get(auth.unit_tag) is not auth:
+                continue  # 이미 해제/이관됨
+            if game_time - auth.last_command_time > timeout:
+                self._drop(auth)
+            else:
+                # 그 사이 갱신됨 -> 새 시각으로 다시 등록
+                self._push_expiry(auth)
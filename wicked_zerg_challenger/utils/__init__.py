@@ -6,10 +6,11 @@ Modules:
 - kd_tree: K-D Tree for spatial queries
 - spatial_partition: Grid-based spatial partitioning
 - pid_controller: PID control for smooth movement
+- unit_snapshot: Once-per-frame columnar (NumPy) unit snapshot
 """
 
 from .frame_cache import FrameCache, cached_per_frame
-from .kd_tree import KDTree, KDTreeNode, build_unit_kdtree
+from .kd_tree import KDTree, KDTreeNode, build_kdtrees_by_type, build_unit_kdtree
 from .pid_controller import (
     PID2D,
     FormationController,
@@ -17,11 +18,13 @@ from .pid_controller import (
     UnitMovementController,
 )
 from .spatial_partition import DynamicSpatialPartition, SpatialGrid, build_unit_grid
+from .unit_snapshot import FrameSnapshot, UnitSnapshot, build_frame_snapshot
 
 __all__ = [
     "KDTree",
     "KDTreeNode",
     "build_unit_kdtree",
+    "build_kdtrees_by_type",
     "SpatialGrid",
     "DynamicSpatialPartition",
     "build_unit_grid",
@@ -31,4 +34,7 @@ __all__ = [
     "FormationController",
     "FrameCache",
     "cached_per_frame",
+    "UnitSnapshot",
+    "FrameSnapshot",
+    "build_frame_snapshot",
 ]
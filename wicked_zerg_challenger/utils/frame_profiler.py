@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+Frame Profiler - 게임 스텝 계층형 스팬 기록기
+
+한 프레임 안에서 매니저 -> 하위 단계 -> 헬퍼 순으로 중첩된 스팬을 기록하고,
+느린 프레임(slow_frame_ms 이상)만 보관하여 게임 종료 시 내보낸다.
+
+Features:
+- Hierarchical spans (``span(name)`` context manager / ``start_span`` + ``end_span``)
+- Nesting follows asyncio tasks via ``contextvars`` (gather-ed managers keep
+  their parent span)
+- Only slow frames are kept; fast frames are discarded at ``end_frame``
+- Export per game: collapsed stacks (flamegraph.pl / speedscope) and Chrome
+  trace JSON (chrome://tracing / Perfetto)
+- Runtime toggle (``enable`` / ``disable``, ``FRAME_PROFILER=1``); disabled
+  spans are a shared no-op object
+
+Usage:
+    profiler = get_frame_profiler()
+    profiler.begin_frame(iteration)
+    with profiler.span("Strategy"):
+        with profiler.span("evaluate"):
+            ...
+    profiler.end_frame()
+    profiler.export("logs", game_id)
+"""
+
+import json
+import os
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT_SPAN = "step"
+
+# 현재 스팬 경로 ("step;game_logic;Strategy"), asyncio 태스크별로 복사됨
+_current_path: ContextVar[Optional[str]] = ContextVar(
+    "frame_profiler_path", default=None
+)
+
+
+class _NullSpan:
+    """비활성 상태에서 반환되는 공유 no-op 스팬"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "path", "start", "token")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        parent = _current_path.get()
+        self.path = f"{parent};{self.name}" if parent else self.name
+        self.token = _current_path.set(self.path)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = time.perf_counter()
+        try:
+            _current_path.reset(self.token)
+        except ValueError:
+            pass  # 다른 컨텍스트에서 종료된 스팬 (경로 복원 불가)
+        self.profiler._add(self.path, self.start, end)
+        return False
+
+
+class FrameProfiler:
+    """느린 프레임만 샘플링하는 저오버헤드 계층형 스팬 기록기"""
+
+    def __init__(
+        self, slow_frame_ms: float = 45.0, max_frames: int = 200, enabled: bool = False
+    ):
+        """
+        Args:
+            slow_frame_ms: 이 시간 이상 걸린 프레임만 보관
+            max_frames: Chrome trace로 보관할 최대 프레임 수 (최근 것 유지)
+            enabled: 시작 시 활성화 여부
+        """
+        self.enabled = enabled
+        self.slow_frame_ms = slow_frame_ms
+        self.max_frames = max_frames
+
+        # 집계: collapsed stack -> self time (초)
+        self.collapsed: Dict[str, float] = defaultdict(float)
+        # 보관된 느린 프레임: (iteration, frame_ms, [(path, start, end), ...])
+        self.slow_frames: deque = deque(maxlen=max_frames)
+
+        self.frames_seen = 0
+        self.frames_sampled = 0
+        self.max_frame_ms = 0.0
+
+        self._origin = time.perf_counter()
+        self._spans: List[Tuple[str, float, float]] = []
+        self._frame_start: Optional[float] = None
+        self._frame_token = None
+        self._iteration = 0
+
+    # ------------------------------------------------------------------
+    # Runtime toggle
+    # ------------------------------------------------------------------
+
+    def enable(self) -> None:
+        """다음 begin_frame부터 기록"""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """즉시 기록 중단 (진행 중 프레임은 버림)"""
+        self.enabled = False
+        self._discard_frame()
+
+    @property
+    def recording(self) -> bool:
+        return self._frame_start is not None
+
+    # ------------------------------------------------------------------
+    # Frame lifecycle
+    # ------------------------------------------------------------------
+
+    def begin_frame(self, iteration: int) -> None:
+        if not self.enabled:
+            return
+        self._discard_frame()
+        self._iteration = iteration
+        self._frame_token = _current_path.set(ROOT_SPAN)
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> Optional[float]:
+        """
+        프레임 종료. 느린 프레임이면 스팬을 집계/보관한다.
+
+        Returns:
+            프레임 시간 (ms), 기록 중이 아니면 None
+        """
+        if self._frame_start is None:
+            return None
+
+        end = time.perf_counter()
+        spans = self._spans
+        spans.append((ROOT_SPAN, self._frame_start, end))
+        frame_ms = (end - self._frame_start) * 1000
+        self._discard_frame()
+
+        self.frames_seen += 1
+        self.max_frame_ms = max(self.max_frame_ms, frame_ms)
+        if frame_ms >= self.slow_frame_ms:
+            self.frames_sampled += 1
+            self._accumulate(spans)
+            self.slow_frames.append((self._iteration, frame_ms, spans))
+        return frame_ms
+
+    def _discard_frame(self) -> None:
+        if self._frame_token is not None:
+            try:
+                _current_path.reset(self._frame_token)
+            except ValueError:
+                _current_path.set(None)
+        self._frame_token = None
+        self._frame_start = None
+        self._spans = []
+
+    # ------------------------------------------------------------------
+    # Spans
+    # ------------------------------------------------------------------
+
+    def span(self, name: str):
+        """중첩 스팬 컨텍스트 매니저 (기록 중이 아니면 no-op)"""
+        if self._frame_start is None:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def start_span(self, name: str) -> Optional[_Span]:
+        """start/end 쌍 API (LogicActivityTracker 용)"""
+        if self._frame_start is None:
+            return None
+        return _Span(self, name).__enter__()
+
+    def end_span(self, span: Optional[_Span]) -> None:
+        if span is not None:
+            span.__exit__(None, None, None)
+
+    def record(self, name: str, elapsed: float) -> None:
+        """이미 측정된 구간(초)을 현재 스팬의 자식으로 기록 (지금 끝난 것으로 간주)"""
+        if self._frame_start is None:
+            return
+        parent = _current_path.get()
+        end = time.perf_counter()
+        self._add(f"{parent};{name}" if parent else name, end - elapsed, end)
+
+    def _add(self, path: str, start: float, end: float) -> None:
+        # 프레임 종료 후 닫힌 스팬은 버림
+        if self._frame_start is not None and start >= self._frame_start:
+            self._spans.append((path, start, end))
+
+    # ------------------------------------------------------------------
+    # Aggregation / export
+    # ------------------------------------------------------------------
+
+    def _accumulate(self, spans: List[Tuple[str, float, float]]) -> None:
+        """collapsed stack별 self time 누적 (자식 시간 제외)"""
+        totals: Dict[str, float] = defaultdict(float)
+        for path, start, end in spans:
+            totals[path] += end - start
+        children: Dict[str, float] = defaultdict(float)
+        for path, total in totals.items():
+            parent, sep, _ = path.rpartition(";")
+            if sep:
+                children[parent] += total
+        for path, total in totals.items():
+            # 동시 실행된 자식이 부모보다 길 수 있으므로 0으로 제한
+            self.collapsed[path] += max(total - children.get(path, 0.0), 0.0)
+
+    def collapsed_lines(self) -> List[str]:
+        """``a;b;c <microseconds>`` 형식 (flamegraph.pl / speedscope)"""
+        return [
+            f"{path} {int(round(seconds * 1e6))}"
+            for path, seconds in sorted(self.collapsed.items())
+            if seconds > 0
+        ]
+
+    def chrome_trace(self) -> Dict:
+        """Chrome trace event JSON (complete events, 겹치는 형제 스팬은 별도 레인)"""
+        events = []
+        for iteration, frame_ms, spans in self.slow_frames:
+            lanes: List[List[Tuple[float, str]]] = []
+            for path, start, end in sorted(spans, key=lambda s: (s[1], -s[2])):
+                lane = self._pick_lane(lanes, path, start, end)
+                events.append(
+                    {
+                        "name": path.rpartition(";")[2],
+                        "cat": "frame",
+                        "ph": "X",
+                        "ts": round((start - self._origin) * 1e6, 3),
+                        "dur": round((end - start) * 1e6, 3),
+                        "pid": 1,
+                        "tid": lane,
+                        "args": {"iteration": iteration, "path": path},
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    @staticmethod
+    def _pick_lane(
+        lanes: List[List[Tuple[float, str]]], path: str, start: float, end: float
+    ) -> int:
+        """부모 스팬 안에 완전히 중첩되는 첫 레인 선택 (없으면 새 레인)"""
+        for index, stack in enumerate(lanes):
+            while stack and stack[-1][0] <= start:
+                stack.pop()
+            if not stack or (
+                end <= stack[-1][0] and path.startswith(stack[-1][1] + ";")
+            ):
+                stack.append((end, path))
+                return index
+        lanes.append([(end, path)])
+        return len(lanes) - 1
+
+    def export(self, directory, game_id) -> Dict[str, Path]:
+        """
+        게임별 프로파일 파일 저장 (느린 프레임이 없으면 저장하지 않음)
+
+        Returns:
+            {"collapsed": path, "chrome_trace": path}
+        """
+        if not self.frames_sampled:
+            return {}
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {
+            "collapsed": directory / f"frame_profile_{game_id}.collapsed",
+            "chrome_trace": directory / f"frame_profile_{game_id}.trace.json",
+        }
+        paths["collapsed"].write_text(
+            "\n".join(self.collapsed_lines()) + "\n", encoding="utf-8"
+        )
+        with open(paths["chrome_trace"], "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return paths
+
+    def get_top_spans(self, n: int = 10) -> List[Tuple[str, float]]:
+        """self time 기준 상위 N개 (path, ms)"""
+        ranked = sorted(self.collapsed.items(), key=lambda x: x[1], reverse=True)
+        return [(path, seconds * 1000) for path, seconds in ranked[:n]]
+
+    def get_summary(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "frames_seen": self.frames_seen,
+            "frames_sampled": self.frames_sampled,
+            "max_frame_ms": self.max_frame_ms,
+            "slow_frame_ms": self.slow_frame_ms,
+            "top_spans": self.get_top_spans(5),
+        }
+
+    def reset(self) -> None:
+        """새 게임 시작 시 초기화"""
+        self._discard_frame()
+        self.collapsed.clear()
+        self.slow_frames.clear()
+        self.frames_seen = 0
+        self.frames_sampled = 0
+        self.max_frame_ms = 0.0
+        self._origin = time.perf_counter()
+
+
+# Global frame profiler instance
+_global_frame_profiler = None
+
+
+def get_frame_profiler() -> FrameProfiler:
+    """글로벌 프레임 프로파일러 (FRAME_PROFILER=1 이면 활성 상태로 생성)"""
+    global _global_frame_profiler
+    if _global_frame_profiler is None:
+        try:
+            from config.constants import FRAME_PROFILE_SLOW_MS
+        except ImportError:
+            FRAME_PROFILE_SLOW_MS = 45.0
+        _global_frame_profiler = FrameProfiler(
+            slow_frame_ms=FRAME_PROFILE_SLOW_MS,
+            enabled=os.environ.get("FRAME_PROFILER", "0") == "1",
+        )
+    return _global_frame_profiler
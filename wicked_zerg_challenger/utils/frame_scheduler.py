@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""Frame-budgeted manager scheduler.
+
+One engine decides which managers run on a given game step:
+
+- every task declares a priority, a nominal interval, a cost estimate and
+  a maximum staleness (frames a due task may be postponed);
+- critical tasks always run when due;
+- the remaining per-frame millisecond budget is filled with due tasks in
+  urgency order, using measured EWMA costs when a cost provider is given;
+- periodic tasks are phase-shifted by a stable hash of their name, so tasks
+  sharing an interval (22/44/660/1320 ...) no longer land on the same frame.
+
+``FrameSkipManager`` is a thin policy on top of this engine.
+"""
+
+from __future__ import annotations
+
+import zlib
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional, Set
+
+
+class TaskPriority(IntEnum):
+    """Scheduling priority (lower value = more important)."""
+
+    CRITICAL = 0  # never deferred for budget reasons
+    HIGH = 1
+    MEDIUM = 2
+    LOW = 3
+    MINIMAL = 4
+
+
+@dataclass
+class ScheduledTask:
+    """Registration and runtime state of one scheduled manager."""
+
+    name: str
+    priority: TaskPriority = TaskPriority.MEDIUM
+    interval: int = 1
+    cost_ms: float = 1.0
+    max_staleness: int = 0  # 0 -> 4 * interval
+    condition: Optional[Callable[[], bool]] = None
+    offset: int = 0
+    pending_since: Optional[int] = None
+    last_run: int = -1
+    run_count: int = 0
+    deferred_count: int = 0
+
+    @property
+    def critical(self) -> bool:
+        return self.priority == TaskPriority.CRITICAL
+
+
+class FrameScheduler:
+    """Selects the set of tasks to run per frame under a millisecond budget."""
+
+    EWMA_ALPHA = 0.2
+
+    def __init__(
+        self,
+        budget_ms: Optional[float] = None,
+        cost_provider: Optional[Callable[[str], Optional[float]]] = None,
+        spread: bool = True,
+    ) -> None:
+        """
+        Args:
+            budget_ms: Per-frame budget for non-critical work. ``None`` disables
+                budget accounting (every due task runs).
+            cost_provider: Optional ``name -> ms`` callable returning a measured
+                cost (e.g. ``LogicActivityTracker.get_ewma_ms``).
+            spread: Phase-shift periodic tasks by a stable hash of their name.
+        """
+        self.budget_ms = budget_ms
+        self.cost_provider = cost_provider
+        self.spread = spread
+        self.tasks: Dict[str, ScheduledTask] = {}
+        self.interval_overrides: Dict[str, int] = {}
+        self.interval_scale = 1
+
+        self._cost_ewma: Dict[str, float] = {}
+        self._plan_iteration: Optional[int] = None
+        self._plan: Set[str] = set()
+        self._claimed: Set[str] = set()
+        self._planned_ms = 0.0
+        self._spent_ms = 0.0
+
+        # Statistics
+        self.frames_planned = 0
+        self.frames_over_budget = 0
+        self.total_deferrals = 0
+        self.last_frame_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def register(
+        self,
+        name: str,
+        priority: TaskPriority = TaskPriority.MEDIUM,
+        interval: int = 1,
+        cost_ms: float = 1.0,
+        max_staleness: int = 0,
+        condition: Optional[Callable[[], bool]] = None,
+        phase: Optional[int] = None,
+    ) -> ScheduledTask:
+        """Register (or replace) a task.
+
+        ``phase`` pins the frame offset (``iteration % interval == phase``)
+        instead of deriving it from the name hash.
+        """
+        interval = max(1, int(interval))
+        if phase is not None:
+            offset = (-int(phase)) % interval
+        elif self.spread:
+            offset = zlib.crc32(name.encode("utf-8")) % interval
+        else:
+            offset = 0
+        task = ScheduledTask(
+            name=name,
+            priority=TaskPriority(priority),
+            interval=interval,
+            cost_ms=float(cost_ms),
+            max_staleness=int(max_staleness),
+            condition=condition,
+            offset=offset,
+        )
+        self.tasks[name] = task
+        return task
+
+    def has_task(self, name: str) -> bool:
+        return name in self.tasks
+
+    def set_interval_overrides(self, overrides: Optional[Dict[str, int]]) -> None:
+        """Replace per-task interval overrides (e.g. combat-mode tables)."""
+        self.interval_overrides = dict(overrides or {})
+
+    def set_overloaded(self, overloaded: bool) -> None:
+        """Double every non-critical interval while the bot is overloaded."""
+        self.interval_scale = 2 if overloaded else 1
+
+    # ------------------------------------------------------------------
+    # Cost model
+    # ------------------------------------------------------------------
+
+    def effective_interval(self, task: ScheduledTask) -> int:
+        interval = self.interval_overrides.get(task.name, task.interval)
+        if not task.critical:
+            interval *= self.interval_scale
+        return max(1, int(interval))
+
+    def estimate_cost_ms(self, name: str) -> float:
+        """Measured cost when available, otherwise the registered estimate."""
+        if self.cost_provider is not None:
+            measured = self.cost_provider(name)
+            if measured:
+                return float(measured)
+        task = self.tasks.get(name)
+        default = task.cost_ms if task else 0.0
+        return self._cost_ewma.get(name, default)
+
+    def record_cost(self, name: str, elapsed_ms: float) -> None:
+        """Account the measured cost of a task that ran this frame."""
+        self._spent_ms += elapsed_ms
+        previous = self._cost_ewma.get(name)
+        if previous is None:
+            self._cost_ewma[name] = elapsed_ms
+        else:
+            self._cost_ewma[name] = (
+                self.EWMA_ALPHA * elapsed_ms + (1.0 - self.EWMA_ALPHA) * previous
+            )
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def _max_staleness(self, task: ScheduledTask) -> int:
+        return task.max_staleness or 4 * self.effective_interval(task)
+
+    def _is_stale(self, task: ScheduledTask, iteration: int) -> bool:
+        return (
+            task.pending_since is not None
+            and iteration - task.pending_since >= self._max_staleness(task)
+        )
+
+    def begin_frame(self, iteration: int) -> Set[str]:
+        """Compute (once per iteration) the set of task names allowed to run."""
+        if iteration == self._plan_iteration:
+            return self._plan
+
+        # A task that got a slot but was never claimed (manager missing or
+        # skipped by its caller) gives the slot back instead of staying stale.
+        for name in self._plan - self._claimed:
+            task = self.tasks.get(name)
+            if task is not None:
+                task.pending_since = None
+
+        plan: Set[str] = set()
+        planned_ms = 0.0
+        candidates: List[ScheduledTask] = []
+
+        for task in self.tasks.values():
+            if task.condition is not None:
+                try:
+                    if not task.condition():
+                        task.pending_since = None
+                        continue
+                except Exception:
+                    pass  # condition failure -> treat as enabled
+
+            interval = self.effective_interval(task)
+            if task.pending_since is None and (iteration + task.offset) % interval == 0:
+                task.pending_since = iteration
+            if task.pending_since is None:
+                continue
+
+            if task.critical:
+                plan.add(task.name)
+                planned_ms += self.estimate_cost_ms(task.name)
+            else:
+                candidates.append(task)
+
+        # Stale tasks first, then priority, then the longest-waiting task.
+        candidates.sort(
+            key=lambda t: (
+                not self._is_stale(t, iteration),
+                t.priority,
+                t.pending_since,
+            )
+        )
+        for task in candidates:
+            cost = self.estimate_cost_ms(task.name)
+            if (
+                self.budget_ms is None
+                or self._is_stale(task, iteration)
+                or planned_ms + cost <= self.budget_ms
+            ):
+                plan.add(task.name)
+                planned_ms += cost
+            else:
+                task.deferred_count += 1
+                self.total_deferrals += 1
+
+        self._plan_iteration = iteration
+        self._plan = plan
+        self._claimed = set()
+        self._planned_ms = planned_ms
+        self._spent_ms = 0.0
+        self.frames_planned += 1
+        return plan
+
+    def should_run(self, name: str, iteration: int) -> bool:
+        """True if ``name`` may run on ``iteration``. Unknown tasks always run."""
+        task = self.tasks.get(name)
+        if task is None:
+            return True
+
+        if name not in self.begin_frame(iteration):
+            return False
+
+        if name not in self._claimed:
+            self._claimed.add(name)
+            task.pending_since = None
+            task.last_run = iteration
+            task.run_count += 1
+        return True
+
+    def end_frame(self) -> float:
+        """Close budget accounting for the current frame; returns spent ms."""
+        self.last_frame_ms = self._spent_ms
+        if self.budget_ms is not None and self._spent_ms > self.budget_ms:
+            self.frames_over_budget += 1
+        return self._spent_ms
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict:
+        return {
+            "tasks": len(self.tasks),
+            "budget_ms": self.budget_ms,
+            "planned_ms": round(self._planned_ms, 3),
+            "last_frame_ms": round(self.last_frame_ms, 3),
+            "frames_planned": self.frames_planned,
+            "frames_over_budget": self.frames_over_budget,
+            "total_deferrals": self.total_deferrals,
+            "most_deferred": sorted(
+                (
+                    (t.name, t.deferred_count)
+                    for t in self.tasks.values()
+                    if t.deferred_count
+                ),
+                key=lambda item: item[1],
+                reverse=True,
+            )[:5],
+        }
@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
-"""Dynamic frame-skip policy for manager execution."""
+"""Dynamic frame-skip policy for manager execution.
+
+The interval tables are a policy on top of :class:`FrameScheduler`; the
+scheduler owns the actual per-frame decision.
+"""
 
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Optional
+
+from .frame_scheduler import FrameScheduler, TaskPriority
 
 
 class FrameSkipManager:
@@ -29,19 +35,29 @@ class FrameSkipManager:
         "intel_manager": 3,
     }
 
-    def __init__(self) -> None:
+    def __init__(self, scheduler: Optional[FrameScheduler] = None) -> None:
         self.in_combat = False
         self._overloaded = False
+        # Legacy behaviour: no budget, no phase spreading (iteration % N).
+        self.scheduler = scheduler or FrameScheduler(budget_ms=None, spread=False)
+        for name, interval in self.DEFAULT_INTERVALS.items():
+            if not self.scheduler.has_task(name):
+                priority = (
+                    TaskPriority.CRITICAL
+                    if name == "combat_manager"
+                    else TaskPriority.MEDIUM
+                )
+                self.scheduler.register(name, priority=priority, interval=interval)
 
     def should_execute(self, manager_name: str, iteration: int) -> bool:
-        intervals = self.COMBAT_INTERVALS if self.in_combat else self.DEFAULT_INTERVALS
-        interval = max(1, int(intervals.get(manager_name, 1)))
-        if self._overloaded and manager_name != "combat_manager":
-            interval *= 2
-        return iteration % interval == 0
+        return self.scheduler.should_run(manager_name, iteration)
 
     def set_combat_mode(self, active: bool) -> None:
         self.in_combat = bool(active)
+        self.scheduler.set_interval_overrides(
+            self.COMBAT_INTERVALS if self.in_combat else None
+        )
 
     def set_overloaded(self, overloaded: bool) -> None:
         self._overloaded = bool(overloaded)
+        self.scheduler.set_overloaded(self._overloaded)
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+Generational Cache - 봇 전체가 공유하는 단일 캐시
+
+Blackboard.cache_*, DataCacheManager, PerformanceOptimizer 거리/값 캐시,
+SpatialQueryOptimizer 쿼리 캐시가 각자 다른 무효화 규칙(게임 시간 TTL,
+벽시계 TTL, 이터레이션 키)을 쓰던 것을 하나로 통합한다.
+
+- 프레임 세대(generation = game_loop) 기준 만료, 타임스탬프 없음
+  (세대가 되돌아가면 - 새 게임 - 이전 엔트리는 모두 무효)
+- 태그 의존성: depends_on=(unit_tag, ...) 로 저장하면 invalidate_tag()
+  한 번으로 해당 유닛에 의존하는 엔트리를 모두 제거 (유닛 사망 등)
+- 전체/네임스페이스별 엔트리 상한, LRU 축출
+- 네임스페이스별 hit/miss/eviction/expiration/invalidation 통계
+"""
+
+import math
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+GAME_LOOPS_PER_SECOND = 22.4
+
+# 프레임마다 대량으로 쌓이는 네임스페이스 상한
+DEFAULT_NAMESPACE_LIMITS = {
+    "distance": 4096,
+    "perf_distance": 4096,
+    "spatial_query": 2048,
+}
+
+_MISSING = object()
+
+
+def seconds_to_generations(seconds: float) -> int:
+    """게임 초 -> game_loop 세대 수"""
+    return max(0, int(math.ceil(seconds * GAME_LOOPS_PER_SECOND - 1e-9)))
+
+
+class _Entry:
+    __slots__ = ("value", "created", "expires", "tags", "tick")
+
+    def __init__(self, value, created, expires, tags, tick):
+        self.value = value
+        self.created = created
+        self.expires = expires
+        self.tags = tags
+        self.tick = tick
+
+
+class _Namespace:
+    __slots__ = (
+        "entries",
+        "limit",
+        "hits",
+        "misses",
+        "evictions",
+        "expirations",
+        "invalidations",
+    )
+
+    def __init__(self, limit: Optional[int]):
+        self.entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+
+class GenerationalCache:
+    """
+    Namespaced LRU cache keyed by frame generation.
+
+    Time Complexity:
+    - get / set: O(1) (+ O(namespaces) when the global budget evicts)
+    - invalidate_tag: O(entries depending on the tag)
+    """
+
+    def __init__(
+        self,
+        clock: Optional[Callable[[], int]] = None,
+        max_entries: int = 8192,
+        namespace_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            clock: 현재 세대를 돌려주는 함수 (없으면 advance() 로 수동 진행)
+            max_entries: 전체 엔트리 상한
+            namespace_limits: 네임스페이스별 엔트리 상한 (기본 DEFAULT_NAMESPACE_LIMITS)
+        """
+        self._clock = clock
+        self._generation = 0
+        self.max_entries = max_entries
+        self.namespace_limits = dict(
+            DEFAULT_NAMESPACE_LIMITS if namespace_limits is None else namespace_limits
+        )
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._tag_index: Dict[Hashable, Set[Tuple[str, Hashable]]] = {}
+        self._size = 0
+        self._tick = 0
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+
+    @property
+    def generation(self) -> int:
+        if self._clock is not None:
+            return self._clock()
+        return self._generation
+
+    def advance(self, generation: Optional[int] = None) -> int:
+        """수동 세대 진행 (clock 이 없을 때)"""
+        self._generation = (
+            self._generation + 1 if generation is None else int(generation)
+        )
+        return self._generation
+
+    # ------------------------------------------------------------------
+    # Core operations
+    # ------------------------------------------------------------------
+
+    def _namespace(self, namespace: str) -> _Namespace:
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            ns = _Namespace(self.namespace_limits.get(namespace))
+            self._namespaces[namespace] = ns
+        return ns
+
+    def get(
+        self,
+        namespace: str,
+        key: Hashable,
+        default: Any = None,
+        max_age: Optional[int] = None,
+        generation: Optional[int] = None,
+    ) -> Any:
+        """
+        Args:
+            max_age: 저장 시 ttl 과 별개로 조회 시점 최대 나이 (세대)
+            generation: 현재 세대 대신 사용할 세대 (호출자가 프레임 번호를 가진 경우)
+        """
+        ns = self._namespace(namespace)
+        entry = ns.entries.get(key)
+        if entry is None:
+            ns.misses += 1
+            return default
+
+        gen = self.generation if generation is None else generation
+        if (
+            gen < entry.created
+            or (entry.expires is not None and gen > entry.expires)
+            or (max_age is not None and gen - entry.created > max_age)
+        ):
+            self._remove(namespace, ns, key)
+            ns.expirations += 1
+            ns.misses += 1
+            return default
+
+        ns.hits += 1
+        self._tick += 1
+        entry.tick = self._tick
+        ns.entries.move_to_end(key)
+        return entry.value
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[int] = None,
+        depends_on: Iterable[Hashable] = (),
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            ttl: 유효 세대 수 (0 = 같은 세대에서만, None = 축출/무효화 전까지)
+            depends_on: 의존 태그 (invalidate_tag 대상)
+        """
+        ns = self._namespace(namespace)
+        if key in ns.entries:
+            self._remove(namespace, ns, key)
+
+        created = self.generation if generation is None else generation
+        tags = tuple(depends_on)
+        self._tick += 1
+        ns.entries[key] = _Entry(
+            value, created, None if ttl is None else created + ttl, tags, self._tick
+        )
+        self._size += 1
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add((namespace, key))
+
+        if ns.limit is not None:
+            while len(ns.entries) > ns.limit:
+                self._evict_from(namespace, ns)
+        while self._size > self.max_entries:
+            self._evict_global()
+
+    def get_or_compute(
+        self,
+        namespace: str,
+        key: Hashable,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        depends_on: Iterable[Hashable] = (),
+        generation: Optional[int] = None,
+    ) -> Any:
+        value = self.get(namespace, key, _MISSING, generation=generation)
+        if value is _MISSING:
+            value = compute()
+            self.set(
+                namespace,
+                key,
+                value,
+                ttl=ttl,
+                depends_on=depends_on,
+                generation=generation,
+            )
+        return value
+
+    def _remove(self, namespace: str, ns: _Namespace, key: Hashable) -> None:
+        entry = ns.entries.pop(key)
+        self._size -= 1
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard((namespace, key))
+                if not keys:
+                    del self._tag_index[tag]
+
+    def _evict_from(self, namespace: str, ns: _Namespace) -> None:
+        key = next(iter(ns.entries))
+        self._remove(namespace, ns, key)
+        ns.evictions += 1
+
+    def _evict_global(self) -> None:
+        oldest_name, oldest_ns, oldest_tick = None, None, None
+        for name, ns in self._namespaces.items():
+            if ns.entries:
+                tick = next(iter(ns.entries.values())).tick
+                if oldest_tick is None or tick < oldest_tick:
+                    oldest_name, oldest_ns, oldest_tick = name, ns, tick
+        if oldest_ns is not None:
+            self._evict_from(oldest_name, oldest_ns)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, namespace: str, key: Hashable) -> bool:
+        ns = self._namespace(namespace)
+        if key not in ns.entries:
+            return False
+        self._remove(namespace, ns, key)
+        ns.invalidations += 1
+        return True
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """tag 에 의존하는 모든 엔트리 제거 (모든 네임스페이스)"""
+        keys = self._tag_index.pop(tag, None)
+        if not keys:
+            return 0
+        for namespace, key in list(keys):
+            ns = self._namespaces[namespace]
+            if key in ns.entries:
+                self._remove(namespace, ns, key)
+                ns.invalidations += 1
+        return len(keys)
+
+    def invalidate_where(
+        self, namespace: str, predicate: Callable[[Hashable], bool]
+    ) -> int:
+        """namespace 안에서 predicate(key) 가 참인 엔트리 제거"""
+        ns = self._namespace(namespace)
+        keys = [key for key in ns.entries if predicate(key)]
+        for key in keys:
+            self._remove(namespace, ns, key)
+        ns.invalidations += len(keys)
+        return len(keys)
+
+    def invalidate_namespace(self, namespace: str) -> int:
+        return self.invalidate_where(namespace, lambda _key: True)
+
+    def purge_expired(
+        self, namespace: Optional[str] = None, generation: Optional[int] = None
+    ) -> int:
+        """만료된 엔트리 일괄 제거 (주기적 정리용)"""
+        gen = self.generation if generation is None else generation
+        names = [namespace] if namespace is not None else list(self._namespaces)
+        removed = 0
+        for name in names:
+            ns = self._namespace(name)
+            stale = [
+                key
+                for key, entry in ns.entries.items()
+                if gen < entry.created
+                or (entry.expires is not None and gen > entry.expires)
+            ]
+            for key in stale:
+                self._remove(name, ns, key)
+            ns.expirations += len(stale)
+            removed += len(stale)
+        return removed
+
+    def clear(self) -> None:
+        for name in list(self._namespaces):
+            self.invalidate_namespace(name)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._size
+
+    def size(self, namespace: str) -> int:
+        ns = self._namespaces.get(namespace)
+        return len(ns.entries) if ns is not None else 0
+
+    def entries(self, namespace: str) -> Dict[Hashable, Any]:
+        """namespace 의 (만료 검사 없는) key -> value 스냅샷"""
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            return {}
+        return {key: entry.value for key, entry in ns.entries.items()}
+
+    def reset_stats(self, namespace: Optional[str] = None) -> None:
+        names = [namespace] if namespace is not None else list(self._namespaces)
+        for name in names:
+            ns = self._namespace(name)
+            ns.hits = ns.misses = ns.evictions = 0
+            ns.expirations = ns.invalidations = 0
+
+    def stats(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        """네임스페이스별 통계 (namespace 지정 시 해당 항목만)"""
+        names = [namespace] if namespace is not None else list(self._namespaces)
+        result = {}
+        for name in names:
+            ns = self._namespace(name)
+            requests = ns.hits + ns.misses
+            result[name] = {
+                "size": len(ns.entries),
+                "hits": ns.hits,
+                "misses": ns.misses,
+                "evictions": ns.evictions,
+                "expirations": ns.expirations,
+                "invalidations": ns.invalidations,
+                "hit_rate": ns.hits / requests if requests else 0.0,
+            }
+        return result[namespace] if namespace is not None else result
+
+
+def _bot_generation(bot: Any) -> int:
+    game_loop = getattr(getattr(bot, "state", None), "game_loop", 0)
+    return game_loop if isinstance(game_loop, int) else 0
+
+
+def get_shared_cache(bot: Any) -> GenerationalCache:
+    """
+    봇 공유 캐시: Blackboard.cache (game_loop 세대) 우선, 없으면 봇에 붙인
+    전용 인스턴스 (state.game_loop 세대).
+    """
+    cache = getattr(getattr(bot, "blackboard", None), "cache", None)
+    if isinstance(cache, GenerationalCache):
+        return cache
+    cache = getattr(bot, "_generational_cache", None)
+    if not isinstance(cache, GenerationalCache):
+        cache = GenerationalCache(clock=lambda: _bot_generation(bot))
+        try:
+            bot._generational_cache = cache
+        except AttributeError:
+            pass
+    return cache
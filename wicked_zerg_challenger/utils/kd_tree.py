@@ -9,14 +9,42 @@ Features:
 - Fast nearest neighbor search
 - Range queries for finding units within radius
 - Efficient for sparse unit distributions
+
+Layout:
+- Static, implicit tree over an (N, 2) float64 array (no per-point objects)
+- Node i has children 2i+1 / 2i+2; each node owns a contiguous slice of the
+  tree-ordered point array, split at the median of its widest axis
+- Leaves hold up to ``leaf_size`` points and are scanned as one distance matrix
+- Batch queries (``query_radius_batch`` / ``knn_batch``) walk the tree once for
+  all query points, carrying the active query subset per node
+- SciPy ``cKDTree`` is used as backend when available (``backend="auto"``);
+  it is imported on the first SciPy-backed build, not on ``import utils``
 """
 
-import math
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+BACKENDS = ("auto", "numpy", "scipy")
+
+_UNLOADED = object()
+_cKDTree: Any = _UNLOADED
+
+
+def _load_ckdtree() -> Any:
+    """scipy.spatial.cKDTree, or None without SciPy (imported once, on demand)."""
+    global _cKDTree
+    if _cKDTree is _UNLOADED:
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            cKDTree = None
+        _cKDTree = cKDTree
+    return _cKDTree
 
 
 class KDTreeNode:
-    """K-D Tree node for 2D points."""
+    """K-D Tree node for 2D points (legacy linked representation)."""
 
     def __init__(
         self,
@@ -33,29 +61,73 @@ class KDTreeNode:
         self.axis = axis  # 0 for x, 1 for y
 
 
+def _pairwise_sq(queries: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """(Q, P) squared distances."""
+    dist_sq = np.subtract.outer(queries[:, 0], points[:, 0])
+    dist_sq *= dist_sq
+    dy_sq = np.subtract.outer(queries[:, 1], points[:, 1])
+    dy_sq *= dy_sq
+    dist_sq += dy_sq
+    return dist_sq
+
+
 class KDTree:
     """
     2D K-D Tree for efficient spatial queries.
 
     Time Complexity:
-    - Build: O(N log N)
+    - Build: O(N log^2 N), one vectorized sort per tree level
     - Nearest neighbor: O(log N) average, O(N) worst case
     - Range query: O(sqrt(N) + k) where k is result count
+    - Batch queries: one tree walk for all query points
     """
 
-    def __init__(self, points: Optional[List[Tuple[Tuple[float, float], Any]]] = None):
+    leaf_size = 16
+
+    def __init__(
+        self,
+        points: Optional[List[Tuple[Tuple[float, float], Any]]] = None,
+        backend: str = "auto",
+    ):
         """
         Initialize K-D Tree.
 
         Args:
             points: List of ((x, y), data) tuples to build tree from
+            backend: "auto" (SciPy if installed), "numpy" or "scipy"
         """
-        self.root: Optional[KDTreeNode] = None
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown KDTree backend: {backend}")
+        if backend == "scipy" and _load_ckdtree() is None:
+            raise ImportError("scipy is required for the 'scipy' KDTree backend")
+        self.backend = backend
+
+        self.positions = np.zeros((0, 2), dtype=np.float64)
+        self.data: Optional[List[Any]] = None
         self.size = 0
+        self._scipy = None
 
         if points:
             self.build(points)
 
+    @classmethod
+    def from_array(
+        cls,
+        positions: np.ndarray,
+        data: Optional[Sequence[Any]] = None,
+        backend: str = "auto",
+    ) -> "KDTree":
+        """
+        Build directly from an (N, 2) position array.
+
+        Args:
+            positions: (N, 2) array of x, y
+            data: optional per-row payload (e.g. units); row indices otherwise
+        """
+        tree = cls(backend=backend)
+        tree.build_array(positions, data)
+        return tree
+
     def build(self, points: List[Tuple[Tuple[float, float], Any]]) -> None:
         """
         Build K-D Tree from list of points.
@@ -63,38 +135,234 @@ class KDTree:
         Args:
             points: List of ((x, y), data) tuples
         """
-        if not points:
-            self.root = None
-            self.size = 0
-            return
+        positions = np.array([p for p, _ in points], dtype=np.float64)
+        self.build_array(positions, [d for _, d in points])
 
-        self.size = len(points)
-        self.root = self._build_recursive(points, depth=0)
-
-    def _build_recursive(
-        self, points: List[Tuple[Tuple[float, float], Any]], depth: int
-    ) -> Optional[KDTreeNode]:
-        """Recursively build K-D Tree."""
-        if not points:
-            return None
-
-        axis = depth % 2  # Alternate between x (0) and y (1)
-
-        # Sort by current axis and find median
-        points.sort(key=lambda p: p[0][axis])
-        median_idx = len(points) // 2
-
-        # Create node with median point
-        point, data = points[median_idx]
-        node = KDTreeNode(
-            point=point,
-            data=data,
-            axis=axis,
-            left=self._build_recursive(points[:median_idx], depth + 1),
-            right=self._build_recursive(points[median_idx + 1 :], depth + 1),
+    def build_array(
+        self, positions: np.ndarray, data: Optional[Sequence[Any]] = None
+    ) -> None:
+        """Build from an (N, 2) array; see ``from_array``."""
+        self.positions = np.ascontiguousarray(positions, dtype=np.float64).reshape(
+            -1, 2
         )
+        self.size = len(self.positions)
+        self.data = list(data) if data is not None else None
+        self._scipy = None
 
-        return node
+        if self.size and self.uses_scipy:
+            self._scipy = _load_ckdtree()(self.positions, leafsize=self.leaf_size)
+        else:
+            self._build_nodes()
+
+    @property
+    def uses_scipy(self) -> bool:
+        return self.backend != "numpy" and _load_ckdtree() is not None
+
+    def _build_nodes(self) -> None:
+        """
+        Median-split the points into the implicit node arrays, level by level.
+
+        Every level is one vectorized pass: per-node bounding boxes via
+        ``reduceat`` and one ``lexsort`` by (node, coordinate on the node's
+        widest axis), so all leaves sit on the last level.
+        """
+        n = self.size
+        depth = 0
+        while -(-n // (1 << depth)) > self.leaf_size:  # ceil(n / 2**depth)
+            depth += 1
+        n_nodes = (1 << (depth + 1)) - 1
+
+        self._start = np.zeros(n_nodes, dtype=np.int64)
+        self._end = np.zeros(n_nodes, dtype=np.int64)
+        self._leaf = np.zeros(n_nodes, dtype=bool)
+        self._leaf[(1 << depth) - 1 :] = True
+        self._lo = np.full((n_nodes, 2), np.inf)
+        self._hi = np.full((n_nodes, 2), -np.inf)
+        self._order = np.arange(n, dtype=np.int64)
+        self._sorted = self.positions.copy()
+        if not n:
+            return
+
+        rows = np.arange(n)
+        starts = np.zeros(1, dtype=np.int64)
+        for level in range(depth + 1):
+            first = (1 << level) - 1
+            ends = np.append(starts[1:], n)
+            nodes = slice(first, first + len(starts))
+            self._start[nodes], self._end[nodes] = starts, ends
+            self._lo[nodes] = np.minimum.reduceat(self._sorted, starts, axis=0)
+            self._hi[nodes] = np.maximum.reduceat(self._sorted, starts, axis=0)
+            if level == depth:
+                break
+
+            # 노드별로 가장 넓은 축 기준 정렬 -> 중앙값에서 분할
+            segment = np.repeat(np.arange(len(starts)), ends - starts)
+            axis = np.argmax(self._hi[nodes] - self._lo[nodes], axis=1)
+            perm = np.lexsort((self._sorted[rows, axis[segment]], segment))
+            self._order = self._order[perm]
+            self._sorted = self._sorted[perm]
+            starts = np.column_stack([starts, (starts + ends) // 2]).ravel()
+
+    def _box_gap_sq(self, node: int, queries: np.ndarray) -> np.ndarray:
+        """Squared distance from each query to the node's bounding box."""
+        gap = np.maximum(self._lo[node] - queries, 0.0)
+        gap += np.maximum(queries - self._hi[node], 0.0)
+        gap *= gap
+        return gap[:, 0] + gap[:, 1]
+
+    # ------------------------------------------------------------------
+    # Batch queries
+    # ------------------------------------------------------------------
+
+    def query_radius_batch(
+        self,
+        queries: np.ndarray,
+        radius: Union[float, np.ndarray],
+        return_distance: bool = False,
+    ) -> Union[List[np.ndarray], Tuple[List[np.ndarray], List[np.ndarray]]]:
+        """
+        Row indices within ``radius`` (inclusive) of each query point.
+
+        Args:
+            queries: (Q, 2) query points
+            radius: scalar or (Q,) per-query radius
+            return_distance: also return the matching distances
+
+        Returns:
+            query-aligned list of index arrays (and of distance arrays)
+        """
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, 2)
+        q_count = len(queries)
+        radii = np.broadcast_to(np.asarray(radius, dtype=np.float64), (q_count,))
+
+        if not self.size or not q_count:
+            rows, cols = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        elif self._scipy is not None:
+            hits = self._scipy.query_ball_point(queries, radii)
+            counts = np.fromiter((len(h) for h in hits), dtype=np.int64, count=q_count)
+            rows = np.repeat(np.arange(q_count), counts)
+            cols = np.fromiter(
+                (i for h in hits for i in h), dtype=np.int64, count=int(counts.sum())
+            )
+        else:
+            rows, cols = self._radius_pairs(queries, radii * radii)
+
+        dist = None
+        if return_distance or self._scipy is not None:
+            delta = self.positions[cols] - queries[rows]
+            dist = np.hypot(delta[:, 0], delta[:, 1])
+
+        # 쿼리별 그룹화, 쿼리 안에서는 거리순
+        order = np.lexsort((dist, rows)) if dist is not None else np.argsort(rows)
+        rows, cols = rows[order], cols[order]
+        bounds = np.cumsum(np.bincount(rows, minlength=q_count))[:-1]
+        indices = np.split(cols, bounds)
+        if not return_distance:
+            return indices
+        return indices, np.split(dist[order], bounds)
+
+    def _radius_pairs(
+        self, queries: np.ndarray, radii_sq: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        rows_out, cols_out = [], []
+        stack = [(0, np.arange(len(queries)))]
+        while stack:
+            node, active = stack.pop()
+            if self._end[node] == self._start[node]:
+                continue
+            active = active[self._box_gap_sq(node, queries[active]) <= radii_sq[active]]
+            if not len(active):
+                continue
+            if not self._leaf[node]:
+                stack.append((2 * node + 1, active))
+                stack.append((2 * node + 2, active))
+                continue
+
+            start, end = self._start[node], self._end[node]
+            dist_sq = _pairwise_sq(queries[active], self._sorted[start:end])
+            hit_rows, hit_cols = np.nonzero(dist_sq <= radii_sq[active, None])
+            rows_out.append(active[hit_rows])
+            cols_out.append(self._order[start + hit_cols])
+
+        if not rows_out:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(rows_out), np.concatenate(cols_out)
+
+    def knn_batch(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        k nearest points for each query point, closest first.
+
+        Args:
+            queries: (Q, 2) query points
+            k: neighbours per query
+
+        Returns:
+            (distances (Q, k), indices (Q, k)); missing slots are inf / -1
+        """
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, 2)
+        q_count = len(queries)
+        best_d = np.full((q_count, max(k, 0)), np.inf)
+        best_i = np.full((q_count, max(k, 0)), -1, dtype=np.int64)
+        if k <= 0 or not self.size or not q_count:
+            return best_d, best_i
+
+        if self._scipy is not None:
+            kk = min(k, self.size)
+            dist, idx = self._scipy.query(queries, k=kk)
+            best_d[:, :kk] = np.reshape(dist, (q_count, kk))
+            best_i[:, :kk] = np.reshape(idx, (q_count, kk))
+            return best_d, best_i
+
+        # 제곱 거리로 탐색, 마지막에 sqrt
+        stack = [(0, np.arange(q_count))]
+        while stack:
+            node, active = stack.pop()
+            if self._end[node] == self._start[node]:
+                continue
+            gap = self._box_gap_sq(node, queries[active])
+            keep = gap < best_d[active, -1]
+            active = active[keep]
+            if not len(active):
+                continue
+
+            if not self._leaf[node]:
+                left, right = 2 * node + 1, 2 * node + 2
+                # 가까운 자식을 먼저 꺼내도록 먼 자식을 먼저 push
+                near_left = self._box_gap_sq(left, queries[active]).sum() <= (
+                    self._box_gap_sq(right, queries[active]).sum()
+                )
+                first, second = (right, left) if near_left else (left, right)
+                stack.append((first, active))
+                stack.append((second, active))
+                continue
+
+            start, end = self._start[node], self._end[node]
+            cand_d = np.hstack(
+                [best_d[active], _pairwise_sq(queries[active], self._sorted[start:end])]
+            )
+            cand_i = np.hstack(
+                [
+                    best_i[active],
+                    np.broadcast_to(self._order[start:end], (len(active), end - start)),
+                ]
+            )
+            top = np.argsort(cand_d, axis=1, kind="stable")[:, :k]
+            best_d[active] = np.take_along_axis(cand_d, top, axis=1)
+            best_i[active] = np.take_along_axis(cand_i, top, axis=1)
+
+        np.sqrt(best_d, out=best_d)
+        return best_d, best_i
+
+    # ------------------------------------------------------------------
+    # Single-point API (((x, y), data, distance) tuples)
+    # ------------------------------------------------------------------
+
+    def _item(
+        self, index: int, distance: float
+    ) -> Tuple[Tuple[float, float], Any, float]:
+        x, y = self.positions[index]
+        data = self.data[index] if self.data is not None else int(index)
+        return ((float(x), float(y)), data, float(distance))
 
     def nearest_neighbor(
         self, query: Tuple[float, float], exclude_data: Any = None
@@ -109,51 +377,8 @@ class KDTree:
         Returns:
             ((x, y), data, distance) or None if tree is empty
         """
-        if not self.root:
-            return None
-
-        best = [None, float("inf")]  # [node, distance]
-        self._nearest_neighbor_recursive(self.root, query, best, exclude_data)
-
-        if best[0] is None:
-            return None
-
-        return (best[0].point, best[0].data, best[1])
-
-    def _nearest_neighbor_recursive(
-        self,
-        node: Optional[KDTreeNode],
-        query: Tuple[float, float],
-        best: List,
-        exclude_data: Any,
-    ) -> None:
-        """Recursively search for nearest neighbor."""
-        if node is None:
-            return
-
-        # Calculate distance to current node
-        dist = self._distance(query, node.point)
-
-        # Update best if this node is closer (and not excluded)
-        if dist < best[1] and node.data != exclude_data:
-            best[0] = node
-            best[1] = dist
-
-        # Determine which subtree to search first
-        axis = node.axis
-        diff = query[axis] - node.point[axis]
-
-        # Search closer subtree first
-        if diff <= 0:
-            first, second = node.left, node.right
-        else:
-            first, second = node.right, node.left
-
-        self._nearest_neighbor_recursive(first, query, best, exclude_data)
-
-        # Check if we need to search the other subtree
-        if abs(diff) < best[1]:
-            self._nearest_neighbor_recursive(second, query, best, exclude_data)
+        results = self.k_nearest_neighbors(query, 1, exclude_data)
+        return results[0] if results else None
 
     def range_query(
         self, center: Tuple[float, float], radius: float
@@ -166,43 +391,23 @@ class KDTree:
             radius: Search radius
 
         Returns:
-            List of ((x, y), data, distance) tuples
+            List of ((x, y), data, distance) tuples, closest first
         """
-        results = []
-        if self.root:
-            self._range_query_recursive(self.root, center, radius, results)
-        return results
-
-    def _range_query_recursive(
-        self,
-        node: Optional[KDTreeNode],
-        center: Tuple[float, float],
-        radius: float,
-        results: List,
-    ) -> None:
-        """Recursively search for points within radius."""
-        if node is None:
-            return
+        indices, distances = self.query_radius_batch(
+            [center], radius, return_distance=True
+        )
+        return [
+            self._item(i, d) for i, d in zip(indices[0].tolist(), distances[0].tolist())
+        ]
 
-        # Check if current node is within radius
-        dist = self._distance(center, node.point)
-        if dist <= radius:
-            results.append((node.point, node.data, dist))
-
-        # Determine which subtrees might contain points in range
-        axis = node.axis
-        diff = center[axis] - node.point[axis]
-
-        # Always search the closer subtree
-        if diff <= 0:
-            self._range_query_recursive(node.left, center, radius, results)
-            # Search other subtree if it might contain points in range
-            if abs(diff) <= radius:
-                self._range_query_recursive(node.right, center, radius, results)
-        else:
-            self._range_query_recursive(node.right, center, radius, results)
-            if abs(diff) <= radius:
-                self._range_query_recursive(node.left, center, radius, results)
+    def query_radius(
+        self, center: Tuple[float, float], radius: float, exclude_data: Any = None
+    ) -> List[Tuple[Tuple[float, float], Any, float]]:
+        """``range_query`` with SpatialGrid's signature (exclude_data)."""
+        results = self.range_query(center, radius)
+        if exclude_data is None:
+            return results
+        return [r for r in results if r[1] != exclude_data]
 
     def k_nearest_neighbors(
         self, query: Tuple[float, float], k: int, exclude_data: Any = None
@@ -218,83 +423,28 @@ class KDTree:
         Returns:
             List of ((x, y), data, distance) tuples, sorted by distance
         """
-        if not self.root or k <= 0:
+        if not self.size or k <= 0:
             return []
 
-        # Use a max heap (negative distances) to track k best
-        import heapq
-
-        heap = []  # Max heap using negative distances
-        self._knn_recursive(self.root, query, k, heap, exclude_data)
-
-        # Convert heap to sorted list
-        results = []
-        while heap:
-            neg_dist, point, data = heapq.heappop(heap)
-            results.append((point, data, -neg_dist))
-
-        results.reverse()  # Sort by increasing distance
-        return results
-
-    def _knn_recursive(
-        self,
-        node: Optional[KDTreeNode],
-        query: Tuple[float, float],
-        k: int,
-        heap: List,
-        exclude_data: Any,
-    ) -> None:
-        """Recursively search for k nearest neighbors."""
-        import heapq
-
-        if node is None:
-            return
-
-        dist = self._distance(query, node.point)
-
-        # Add to heap if not excluded
-        if node.data != exclude_data:
-            if len(heap) < k:
-                heapq.heappush(heap, (-dist, node.point, node.data))
-            elif dist < -heap[0][0]:
-                heapq.heapreplace(heap, (-dist, node.point, node.data))
-
-        # Get current max distance in heap
-        max_dist = -heap[0][0] if heap else float("inf")
-
-        # Determine which subtree to search first
-        axis = node.axis
-        diff = query[axis] - node.point[axis]
-
-        if diff <= 0:
-            first, second = node.left, node.right
-        else:
-            first, second = node.right, node.left
-
-        self._knn_recursive(first, query, k, heap, exclude_data)
-
-        # Update max_dist after searching first subtree
-        max_dist = -heap[0][0] if len(heap) >= k else float("inf")
-
-        # Check if we need to search the other subtree
-        if abs(diff) < max_dist or len(heap) < k:
-            self._knn_recursive(second, query, k, heap, exclude_data)
-
-    @staticmethod
-    def _distance(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
-        """Calculate Euclidean distance between two points."""
-        dx = p1[0] - p2[0]
-        dy = p1[1] - p2[1]
-        return math.sqrt(dx * dx + dy * dy)
+        extra = 1 if exclude_data is not None else 0
+        distances, indices = self.knn_batch([query], k + extra)
+        results = [
+            self._item(i, d)
+            for i, d in zip(indices[0].tolist(), distances[0].tolist())
+            if i >= 0
+        ]
+        if extra:
+            results = [r for r in results if r[1] != exclude_data]
+        return results[:k]
 
     def __len__(self) -> int:
         return self.size
 
     def __bool__(self) -> bool:
-        return self.root is not None
+        return self.size > 0
 
 
-def build_unit_kdtree(units) -> KDTree:
+def build_unit_kdtree(units, backend: str = "auto") -> KDTree:
     """
     Build a K-D Tree from SC2 units.
 
@@ -304,9 +454,37 @@ def build_unit_kdtree(units) -> KDTree:
     Returns:
         KDTree with unit positions and unit references
     """
-    points = []
-    for unit in units:
-        pos = unit.position
-        points.append(((pos.x, pos.y), unit))
+    units = list(units)
+    positions = np.array(
+        [(u.position.x, u.position.y) for u in units], dtype=np.float64
+    ).reshape(-1, 2)
+    return KDTree.from_array(positions, units, backend=backend)
+
+
+def build_kdtrees_by_type(
+    positions: np.ndarray,
+    type_ids: np.ndarray,
+    data: Optional[Sequence[Any]] = None,
+    backend: str = "auto",
+) -> Dict[int, KDTree]:
+    """
+    One tree per unit type from snapshot columns (e.g. ``UnitSnapshot``).
+
+    Args:
+        positions: (N, 2) positions
+        type_ids: (N,) type id per row
+        data: optional per-row payload; snapshot row indices otherwise
 
-    return KDTree(points)
+    Returns:
+        type_id -> KDTree
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    type_ids = np.asarray(type_ids)
+    order = np.argsort(type_ids, kind="stable")
+    kinds, starts = np.unique(type_ids[order], return_index=True)
+
+    trees: Dict[int, KDTree] = {}
+    for kind, rows in zip(kinds.tolist(), np.split(order, starts[1:])):
+        payload = [data[r] for r in rows] if data is not None else rows.tolist()
+        trees[kind] = KDTree.from_array(positions[rows], payload, backend=backend)
+    return trees
@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+"""
+Per-Map Static Analysis Cache
+
+크립 목표 그리드, 초크포인트, 고지대 필러, 확장 기지 자원 정보는 맵과
+스폰 위치가 같으면 매 게임 동일하다. 매니저마다 game_info 에서 다시
+계산하는 대신 on_start 에서 한 번 계산(또는 디스크에서 로드)하고
+조회만 한다. 학습 팜은 같은 맵 몇 개를 수천 번 반복하므로 두 번째
+게임부터는 .npz 로드 한 번으로 끝난다.
+
+Layers (모두 numpy 배열):
+- spawns: (2, 2) 아군/적 시작 위치 (적 위치를 모르면 NaN)
+- creep_targets: (N, 2) 시작 위치 기준 BFS 크립 종양 목표 (CreepSpreadManager)
+- pillars: (P, 2) 적 본진 주변 지상 접근 불가 지점 (OverlordVisionNetwork)
+- chokes: (K, 2) 램프 top/bottom 중심 (ChokePointDetector / ChokePointManager)
+- expansions: (E, 2) 확장 위치
+- expansion_resources: (E, 4) int16 [광물, 황금 광물, 가스, 황금 가스] 패치 수
+- path_sources / path_distances: 지상 거리장 (utils.path_distance.PathDistanceField)
+  소스 좌표와 (S, H, W) uint16 래스터. 거리장은 path_field 로 노출된다.
+
+Disk cache: 맵 이름 + pathing_grid 비트 + 아군/적 시작 위치 + 거리장 소스로
+키잉된 .npz 하나 (거리장을 따로 캐시하지 않음)
+"""
+
+import hashlib
+import math
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from sc2.position import Point2
+except ImportError:
+    Point2 = None
+
+from utils.path_distance import PathDistanceField, field_sources, start_pathing
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "map_cache"
+CACHE_VERSION = 2  # 2: 거리장 포함
+
+LAYERS = (
+    "spawns",
+    "creep_targets",
+    "pillars",
+    "chokes",
+    "expansions",
+    "expansion_resources",
+)
+PATH_LAYERS = ("path_sources", "path_distances")
+
+# CreepSpreadManager._generate_creep_grid 와 동일한 파라미터
+CREEP_GRID_CELL_SIZE = 9.0
+CREEP_TARGET_CAP = 300
+CREEP_MAP_MARGIN = 5.0
+
+# OverlordVisionNetwork._find_highground_pillars 와 동일한 샘플링
+PILLAR_DISTANCES = (10, 15, 20)
+PILLAR_ANGLE_STEP = 45
+PILLAR_MIN_SEPARATION = 5.0
+PILLAR_BORDER = 2
+
+# 확장 위치 주변 자원 탐색 반경 (economy_manager 의 closer_than(10, ...) 과 동일)
+RESOURCE_RADIUS = 10.0
+# 조회 좌표를 확장 위치로 스냅하는 반경
+EXPANSION_SNAP_RADIUS = 3.0
+# 시작 위치 비교 허용 오차
+SPAWN_TOLERANCE = 1.0
+
+
+def _xy(point: Any) -> Tuple[float, float]:
+    point = getattr(point, "position", point)
+    if hasattr(point, "x"):
+        return float(point.x), float(point.y)
+    return float(point[0]), float(point[1])
+
+
+def _points(array: np.ndarray) -> List[Any]:
+    if Point2 is None:
+        return [(float(x), float(y)) for x, y in array]
+    return [Point2((float(x), float(y))) for x, y in array]
+
+
+def creep_targets(
+    pathing: np.ndarray,
+    start: Any,
+    map_size: Tuple[float, float],
+    cell_size: float = CREEP_GRID_CELL_SIZE,
+    cap: int = CREEP_TARGET_CAP,
+) -> np.ndarray:
+    """시작 위치에서 8방향 BFS, 통행 가능한 셀 중심을 방문 순서대로 (최대 cap개)"""
+    pathable = np.asarray(pathing) != 0
+    height, width = pathable.shape
+    max_x, max_y = map_size
+    sx, sy = _xy(start)
+    first = (int(sx / cell_size), int(sy / cell_size))
+    visited = {first}
+    queue = deque([first])
+    targets: List[Tuple[float, float]] = []
+    directions = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)]
+
+    while queue:
+        gx, gy = queue.popleft()
+        real_x = gx * cell_size + cell_size / 2
+        real_y = gy * cell_size + cell_size / 2
+        if real_x < CREEP_MAP_MARGIN or real_x > max_x - CREEP_MAP_MARGIN:
+            continue
+        if real_y < CREEP_MAP_MARGIN or real_y > max_y - CREEP_MAP_MARGIN:
+            continue
+        px, py = int(real_x), int(real_y)
+        if 0 <= px < width and 0 <= py < height and not pathable[py, px]:
+            continue
+
+        targets.append((real_x, real_y))
+        for dx, dy in directions:
+            cell = (gx + dx, gy + dy)
+            if cell not in visited:
+                visited.add(cell)
+                queue.append(cell)
+
+    return np.array(targets[:cap], dtype=np.float64).reshape(-1, 2)
+
+
+def highground_pillars(pathing: np.ndarray, enemy_start: Any) -> np.ndarray:
+    """적 본진 주변 10/15/20 거리, 45도 간격에서 지상 이동 불가 지점"""
+    if enemy_start is None:
+        return np.zeros((0, 2), dtype=np.float64)
+    pathable = np.asarray(pathing) != 0
+    height, width = pathable.shape
+    ex, ey = _xy(enemy_start)
+    pillars: List[Tuple[float, float]] = []
+
+    for distance in PILLAR_DISTANCES:
+        for angle_deg in range(0, 360, PILLAR_ANGLE_STEP):
+            rad = math.radians(angle_deg)
+            x = ex + distance * math.cos(rad)
+            y = ey + distance * math.sin(rad)
+            px, py = int(x), int(y)
+            if px < PILLAR_BORDER or py < PILLAR_BORDER:
+                continue
+            if px >= width - PILLAR_BORDER or py >= height - PILLAR_BORDER:
+                continue
+            if pathable[py, px]:
+                continue
+            if all(
+                math.hypot(x - qx, y - qy) > PILLAR_MIN_SEPARATION for qx, qy in pillars
+            ):
+                pillars.append((x, y))
+
+    return np.array(pillars, dtype=np.float64).reshape(-1, 2)
+
+
+def expansion_resources(
+    expansions: Sequence[Any], resources: Sequence[Tuple[float, float, str]]
+) -> np.ndarray:
+    """
+    확장 위치별 RESOURCE_RADIUS 안의 자원 패치 수
+
+    Args:
+        expansions: 확장 위치
+        resources: (x, y, type_name) - 예: "RICHMINERALFIELD", "VESPENEGEYSER"
+
+    Returns:
+        (E, 4) int16 [광물, 황금 광물, 가스, 황금 가스]
+    """
+    exp = np.array([_xy(e) for e in expansions], dtype=np.float64).reshape(-1, 2)
+    out = np.zeros((len(exp), 4), dtype=np.int16)
+    if not len(exp) or not resources:
+        return out
+
+    pos = np.array([(x, y) for x, y, _ in resources], dtype=np.float64)
+    names = [name.upper() for _, _, name in resources]
+    rich = np.array(["RICH" in n for n in names])
+    mineral = np.array(["MINERAL" in n for n in names])
+    gas = ~mineral
+    kinds = np.stack([mineral, mineral & rich, gas, gas & rich], axis=1)
+
+    d2 = ((exp[:, None, :] - pos[None, :, :]) ** 2).sum(axis=2)
+    near = d2 < RESOURCE_RADIUS * RESOURCE_RADIUS
+    out[:] = near.astype(np.int16) @ kinds.astype(np.int16)
+    return out
+
+
+class MapAnalysis:
+    """
+    Static per-map layers for one (map, spawn) pair.
+
+    Time Complexity:
+    - Build: BFS over the creep grid + O(E * R) resource matching
+      + PathDistanceField build (once per map)
+    - Load: one compressed .npz read
+    - Queries: O(1) cached lists, O(E) expansion snap
+    """
+
+    def __init__(
+        self,
+        map_name: str,
+        key: str,
+        layers: Dict[str, np.ndarray],
+        path_field: Optional[PathDistanceField] = None,
+    ):
+        self.map_name = map_name
+        self.key = key
+        self.layers = {name: np.asarray(layers[name]) for name in LAYERS}
+        self.path_field = path_field
+        self.loaded_from_disk = False
+        self._point_cache: Dict[str, List[Any]] = {}
+
+    # ------------------------------------------------------------------
+    # Construction / cache
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def compute_key(
+        map_name: str,
+        pathing: np.ndarray,
+        start: Any,
+        enemy_start: Any,
+        path_sources: Sequence[Any] = (),
+    ) -> str:
+        """맵 해시: 맵 이름 + pathing_grid 비트 + 시작 위치 + 거리장 소스"""
+        digest = hashlib.sha1()
+        digest.update(str(map_name).encode())
+        pathable = np.asarray(pathing) != 0
+        digest.update(np.array(pathable.shape, dtype=np.int32).tobytes())
+        digest.update(np.packbits(pathable).tobytes())
+        spawns = [_xy(p) for p in (start, enemy_start) if p is not None]
+        digest.update(np.round(np.array(spawns, dtype=np.float64), 1).tobytes())
+        sources = [_xy(p) for p in path_sources]
+        digest.update(np.round(np.array(sources, dtype=np.float64), 1).tobytes())
+        digest.update(str(CACHE_VERSION).encode())
+        return digest.hexdigest()[:20]
+
+    @classmethod
+    def load_or_build(
+        cls,
+        map_name: str,
+        pathing: np.ndarray,
+        start: Any,
+        enemy_start: Any,
+        build: Callable[[], Dict[str, np.ndarray]],
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        path_sources: Sequence[Any] = (),
+    ) -> "MapAnalysis":
+        """
+        디스크 캐시가 있으면 로드, 없으면 build() 로 레이어 계산 후 저장
+
+        build 는 캐시 미스일 때만 호출되므로 확장/자원 수집 비용도 건너뛴다.
+        path_sources 가 있으면 그 소스의 거리장도 같은 파일에 담는다.
+        """
+        points = np.array([_xy(p) for p in path_sources], dtype=np.float64)
+        points = points.reshape(-1, 2)
+        key = cls.compute_key(map_name, pathing, start, enemy_start, points)
+        path = None
+        if cache_dir is not None:
+            path = Path(cache_dir) / f"mapinfo_{key}.npz"
+            if path.exists():
+                try:
+                    with np.load(path) as data:
+                        layers = {name: data[name] for name in LAYERS}
+                        distances = data["path_distances"] if len(points) else None
+                    field = None
+                    if distances is not None:
+                        if distances.shape != (len(points),) + np.shape(pathing):
+                            raise ValueError("path field shape mismatch")
+                        field = PathDistanceField(pathing, points, distances=distances)
+                    analysis = cls(map_name, key, layers, field)
+                    analysis.loaded_from_disk = True
+                    return analysis
+                except (OSError, ValueError, KeyError):
+                    pass
+
+        field = PathDistanceField(pathing, points) if len(points) else None
+        analysis = cls(map_name, key, build(), field)
+        if path is not None:
+            analysis.save(path)
+        return analysis
+
+    def save(self, path: Path) -> bool:
+        try:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            arrays = dict(self.layers)
+            if self.path_field is not None:
+                arrays["path_sources"] = self.path_field.sources
+                arrays["path_distances"] = self.path_field.distances
+            with open(tmp, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            tmp.replace(path)
+            return True
+        except OSError:
+            return False
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _layer_points(self, name: str) -> List[Any]:
+        if name not in self._point_cache:
+            self._point_cache[name] = _points(self.layers[name])
+        return self._point_cache[name]
+
+    @property
+    def creep_targets(self) -> List[Any]:
+        return self._layer_points("creep_targets")
+
+    @property
+    def pillars(self) -> List[Any]:
+        return self._layer_points("pillars")
+
+    @property
+    def chokes(self) -> List[Any]:
+        return self._layer_points("chokes")
+
+    def matches_spawn(self, start: Any = None, enemy_start: Any = None) -> bool:
+        """레이어를 계산한 시작 위치와 같은지 (다른 스폰이면 레이어를 쓰지 않음)"""
+        for index, point in ((0, start), (1, enemy_start)):
+            if point is None:
+                continue
+            x, y = _xy(point)
+            sx, sy = self.layers["spawns"][index]
+            if not math.hypot(x - sx, y - sy) <= SPAWN_TOLERANCE:
+                return False
+        return True
+
+    def expansion_index(self, point: Any) -> Optional[int]:
+        """EXPANSION_SNAP_RADIUS 안의 가장 가까운 확장 인덱스"""
+        expansions = self.layers["expansions"]
+        if not len(expansions):
+            return None
+        x, y = _xy(point)
+        d2 = (expansions[:, 0] - x) ** 2 + (expansions[:, 1] - y) ** 2
+        i = int(np.argmin(d2))
+        if d2[i] > EXPANSION_SNAP_RADIUS * EXPANSION_SNAP_RADIUS:
+            return None
+        return i
+
+    def gold_patches(self, point: Any) -> Optional[int]:
+        """확장 위치의 황금 광물 패치 수 (확장 위치가 아니면 None)"""
+        index = self.expansion_index(point)
+        if index is None:
+            return None
+        return int(self.layers["expansion_resources"][index, 1])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "map": self.map_name,
+            "key": self.key,
+            "from_disk": self.loaded_from_disk,
+            **{name: int(len(self.layers[name])) for name in LAYERS[1:5]},
+            "path_sources": (
+                len(self.path_field.sources) if self.path_field is not None else 0
+            ),
+        }
+
+
+def build_layers(
+    pathing: np.ndarray,
+    start: Any,
+    enemy_start: Any,
+    map_size: Tuple[float, float],
+    expansions: Sequence[Any] = (),
+    resources: Sequence[Tuple[float, float, str]] = (),
+    chokes: Sequence[Any] = (),
+) -> Dict[str, np.ndarray]:
+    """모든 정적 레이어 계산 (캐시 미스일 때만)"""
+    spawns = np.full((2, 2), np.nan)
+    spawns[0] = _xy(start)
+    if enemy_start is not None:
+        spawns[1] = _xy(enemy_start)
+    return {
+        "spawns": spawns,
+        "creep_targets": creep_targets(pathing, start, map_size),
+        "pillars": highground_pillars(pathing, enemy_start),
+        "chokes": np.array([_xy(c) for c in chokes], dtype=np.float64).reshape(-1, 2),
+        "expansions": np.array([_xy(e) for e in expansions], dtype=np.float64).reshape(
+            -1, 2
+        ),
+        "expansion_resources": expansion_resources(expansions, resources),
+    }
+
+
+def _ramp_chokes(game_info: Any) -> List[Any]:
+    chokes = []
+    for ramp in getattr(game_info, "map_ramps", None) or []:
+        if hasattr(ramp, "top_center"):
+            chokes.append(ramp.top_center)
+        if hasattr(ramp, "bottom_center"):
+            chokes.append(ramp.bottom_center)
+    return chokes
+
+
+def _bot_resources(bot: Any) -> List[Tuple[float, float, str]]:
+    resources = getattr(bot, "resources", None)
+    if resources is None:
+        resources = list(getattr(bot, "mineral_field", None) or []) + list(
+            getattr(bot, "vespene_geyser", None) or []
+        )
+    out = []
+    for unit in resources:
+        x, y = _xy(unit)
+        out.append((x, y, getattr(unit.type_id, "name", str(unit.type_id))))
+    return out
+
+
+def build_for_bot(
+    bot: Any, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR
+) -> MapAnalysis:
+    """
+    on_start 시점 pathing_grid 로 정적 맵 분석 + 지상 거리장 로드/생성
+    (디스크 캐시 사용, 거리장은 bot.path_distances 로도 노출)
+    """
+    game_info = bot.game_info
+    pathing = start_pathing(bot)
+    start = bot.start_location
+    enemy_starts = getattr(bot, "enemy_start_locations", None) or []
+    enemy_start = enemy_starts[0] if enemy_starts else None
+    map_size = _xy(game_info.map_size)
+
+    def build() -> Dict[str, np.ndarray]:
+        return build_layers(
+            pathing,
+            start,
+            enemy_start,
+            map_size,
+            expansions=list(getattr(bot, "expansion_locations_list", None) or []),
+            resources=_bot_resources(bot),
+            chokes=_ramp_chokes(game_info),
+        )
+
+    analysis = MapAnalysis.load_or_build(
+        game_info.map_name,
+        pathing,
+        start,
+        enemy_start,
+        build,
+        cache_dir=cache_dir,
+        path_sources=field_sources(bot),
+    )
+    bot.path_distances = analysis.path_field
+    return analysis
+
+
+def get_map_analysis(bot: Any) -> Optional[MapAnalysis]:
+    """봇에 붙은 정적 맵 분석 (아직 생성 전이거나 대기 중인 프록시면 None)"""
+    analysis = getattr(bot, "map_analysis", None)
+    return analysis if isinstance(analysis, MapAnalysis) else None
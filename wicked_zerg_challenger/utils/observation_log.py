@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Observation Log - 실제 게임의 원시 관측값을 압축 바이너리로 기록/재생
+
+SC2 없이 on_step 파이프라인을 벤치마크하기 위한 입력 포맷.
+게임 중 ObservationRecorder가 매 스텝의 원시 protobuf를 기록하고,
+benchmarks/replay_harness.py 의 헤드리스 플레이어가 이를 다시 재생한다.
+
+Format (gzip stream):
+    MAGIC + record*
+    record = kind (u8) + length (u32 LE) + payload
+
+Record kinds:
+    META         JSON {player_id, base_build, map_name, ...}
+    GAME_INFO    sc2api ResponseGameInfo (게임당 1회)
+    GAME_DATA    sc2api ResponseData (게임당 1회)
+    PATHING      common ImageData, pathing grid가 바뀐 스텝에만
+    OBSERVATION  sc2api ResponseObservation (스텝당 1회)
+"""
+
+import gzip
+import json
+import struct
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    from s2clientprotocol import common_pb2, sc2api_pb2
+except ImportError:
+    common_pb2 = None
+    sc2api_pb2 = None
+
+MAGIC = b"WZOBS\x00\x01\n"
+FILE_SUFFIX = ".wzobs"
+_HEADER = struct.Struct("<BI")
+
+
+class RecordKind(IntEnum):
+    META = 1
+    GAME_INFO = 2
+    GAME_DATA = 3
+    PATHING = 4
+    OBSERVATION = 5
+
+
+class ObservationLogWriter:
+    """레코드 단위 압축 로그 작성기"""
+
+    def __init__(self, path: Union[str, Path], compresslevel: int = 6):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: BinaryIO = gzip.open(self.path, "wb", compresslevel=compresslevel)
+        self._file.write(MAGIC)
+        self.records = 0
+        self.raw_bytes = len(MAGIC)
+
+    def write(self, kind: RecordKind, payload: bytes) -> None:
+        self._file.write(_HEADER.pack(int(kind), len(payload)))
+        self._file.write(payload)
+        self.records += 1
+        self.raw_bytes += _HEADER.size + len(payload)
+
+    def write_message(self, kind: RecordKind, message: Any) -> None:
+        self.write(kind, message.SerializeToString())
+
+    def write_meta(self, meta: Dict[str, Any]) -> None:
+        self.write(RecordKind.META, json.dumps(meta).encode("utf-8"))
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "ObservationLogWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+def iter_records(path: Union[str, Path]) -> Iterator[Tuple[RecordKind, bytes]]:
+    """(kind, payload) 순회. 잘린 마지막 레코드(게임 중 크래시)는 무시한다."""
+    with gzip.open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not an observation log: {path}")
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            kind, length = _HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            yield RecordKind(kind), payload
+
+
+@dataclass
+class RecordedStep:
+    """재생용 한 스텝: 원시 관측 + (바뀐 경우) 새 pathing grid"""
+
+    index: int
+    observation: Any  # sc2api_pb2.ResponseObservation
+    pathing: Optional[Any] = None  # common_pb2.ImageData
+
+
+@dataclass
+class ObservationLog:
+    """
+    기록된 게임 한 판.
+
+    스텝은 직렬화된 바이트로 보관하고 ``steps()`` 순회 시에만 파싱한다.
+    """
+
+    meta: Dict[str, Any] = field(default_factory=dict)
+    game_info: Any = None  # sc2api_pb2.ResponseGameInfo
+    game_data: Any = None  # sc2api_pb2.ResponseData
+    _steps: List[Tuple[Optional[bytes], bytes]] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ObservationLog":
+        if sc2api_pb2 is None:
+            raise ImportError("s2clientprotocol is required to read observation logs")
+
+        log = cls()
+        pending_pathing: Optional[bytes] = None
+        for kind, payload in iter_records(path):
+            if kind == RecordKind.META:
+                log.meta = json.loads(payload.decode("utf-8"))
+            elif kind == RecordKind.GAME_INFO:
+                log.game_info = sc2api_pb2.ResponseGameInfo.FromString(payload)
+            elif kind == RecordKind.GAME_DATA:
+                log.game_data = sc2api_pb2.ResponseData.FromString(payload)
+            elif kind == RecordKind.PATHING:
+                pending_pathing = payload
+            elif kind == RecordKind.OBSERVATION:
+                log._steps.append((pending_pathing, payload))
+                pending_pathing = None
+
+        if log.game_info is None or log.game_data is None:
+            raise ValueError(f"Observation log without game info/data: {path}")
+        return log
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def steps(self, limit: Optional[int] = None) -> Iterator[RecordedStep]:
+        for index, (pathing, observation) in enumerate(self._steps[:limit]):
+            yield RecordedStep(
+                index=index,
+                observation=sc2api_pb2.ResponseObservation.FromString(observation),
+                pathing=(
+                    common_pb2.ImageData.FromString(pathing)
+                    if pathing is not None
+                    else None
+                ),
+            )
+
+
+class ObservationRecorder:
+    """
+    BotAI 실행 중 원시 관측 기록기
+
+    Usage (BotAI):
+        on_start: await recorder.start(self)
+        on_step:  recorder.record_step(self)
+        on_end:   recorder.close()
+    """
+
+    def __init__(self, path: Union[str, Path], compresslevel: int = 6):
+        self.path = Path(path)
+        self.compresslevel = compresslevel
+        self._writer: Optional[ObservationLogWriter] = None
+        self._last_pathing: Optional[bytes] = None
+        self.steps = 0
+        self.record_time_ms = 0.0
+
+    async def start(self, bot) -> None:
+        """게임 정보/데이터 기록 (GameData 원본 protobuf는 1회 재요청)"""
+        response = await bot.client._execute(
+            data=sc2api_pb2.RequestData(
+                ability_id=True,
+                unit_type_id=True,
+                upgrade_id=True,
+                buff_id=True,
+                effect_id=True,
+            )
+        )
+        self._writer = ObservationLogWriter(self.path, self.compresslevel)
+        self._writer.write_meta(
+            {
+                "player_id": int(bot.player_id),
+                "base_build": int(getattr(bot, "base_build", -1)),
+                "map_name": bot.game_info.map_name,
+                "bot": type(bot).__name__,
+                "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        )
+        self._writer.write_message(RecordKind.GAME_INFO, bot.game_info._proto)
+        self._writer.write_message(RecordKind.GAME_DATA, response.data)
+
+    def record_step(self, bot) -> None:
+        if self._writer is None:
+            return
+        start = time.perf_counter()
+        pathing = bot.game_info.pathing_grid._proto
+        if pathing.data != self._last_pathing:
+            self._last_pathing = pathing.data
+            self._writer.write_message(RecordKind.PATHING, pathing)
+        self._writer.write_message(
+            RecordKind.OBSERVATION, bot.state.response_observation
+        )
+        self.steps += 1
+        self.record_time_ms += (time.perf_counter() - start) * 1000
+
+    def close(self) -> Optional[Path]:
+        if self._writer is None:
+            return None
+        self._writer.close()
+        self._writer = None
+        return self.path
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+Precomputed Ground Path Distance Fields
+
+직선 거리(distance_to)는 램프/벽이 있는 맵에서 확장 기지, 랠리 포인트,
+후퇴 기지 순위를 틀리게 매긴다. 게임마다 경로 탐색을 반복하는 대신
+모든 확장 위치 + 시작 위치에서 pathing_grid 위 Dijkstra 거리장을 한 번
+계산해 두고, 조회는 래스터 인덱싱 한 번으로 끝낸다.
+
+Layout:
+- 소스 1개당 (H, W) uint16 래스터, 단위는 0.1 타일 (직선 10, 대각 14)
+- 도달 불가 셀은 UNREACHABLE (65535)
+- 디스크 캐시: utils.map_analysis 가 맵 레이어와 같은 .npz 에 함께 저장
+- SciPy csgraph 가 있으면 전체 빌드에 사용, 없으면 heapq Dijkstra
+- 파괴 가능한 바위가 부서지면 open_cells() 로 열린 셀부터 증분 완화
+"""
+
+import hashlib
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.sparse import csr_matrix as _csr_matrix
+    from scipy.sparse.csgraph import dijkstra as _csgraph_dijkstra
+except ImportError:
+    _csr_matrix = None
+    _csgraph_dijkstra = None
+
+UNREACHABLE = np.iinfo(np.uint16).max
+SCALE = 10
+STRAIGHT_COST = 10
+DIAGONAL_COST = 14
+
+CACHE_VERSION = 1
+
+# 소스 좌표를 이 반경 안에서 스냅 (해처리는 확장 위치 중심에 지어짐)
+SOURCE_SNAP_RADIUS = 3.0
+# 조회 지점이 막힌 셀(건물/광물)이면 주변 몇 셀까지 볼지
+LOOKUP_WINDOW = 2
+
+
+def _xy(point: Any) -> Tuple[float, float]:
+    point = getattr(point, "position", point)
+    if hasattr(point, "x"):
+        return float(point.x), float(point.y)
+    return float(point[0]), float(point[1])
+
+
+class PathDistanceField:
+    """
+    Ground distance rasters from a fixed set of source points.
+
+    Time Complexity:
+    - Build: O(S * C log C) for S sources over C pathable cells (once per map)
+    - path_distance(a, b): O(S) source snap + O(1) raster lookup
+    - open_cells: O(cells whose distance improves) per source
+    """
+
+    def __init__(
+        self,
+        pathing: np.ndarray,
+        sources: Sequence[Any],
+        distances: Optional[np.ndarray] = None,
+    ):
+        """
+        Args:
+            pathing: (H, W) pathing grid, indexed [y, x], nonzero = pathable
+            sources: Source points (Point2 or (x, y)) - expansions, start locations
+            distances: Precomputed (S, H, W) uint16 rasters (disk cache)
+        """
+        self.pathable = np.asarray(pathing) != 0
+        self.height, self.width = self.pathable.shape
+        self.sources = np.array([_xy(s) for s in sources], dtype=np.float64).reshape(
+            -1, 2
+        )
+        self.source_cells = [self._source_cell(x, y) for x, y in self.sources]
+        self.key = self.compute_key(self.pathable, self.sources)
+
+        if distances is None:
+            distances = self._build()
+        self.distances = distances
+        self.lookups = 0
+        self.fallbacks = 0
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def compute_key(pathing: np.ndarray, sources: np.ndarray) -> str:
+        """맵 해시: pathing_grid 비트 + 소스 좌표"""
+        digest = hashlib.sha1()
+        pathable = np.asarray(pathing) != 0
+        digest.update(np.array(pathable.shape, dtype=np.int32).tobytes())
+        digest.update(np.packbits(pathable).tobytes())
+        digest.update(np.round(np.asarray(sources, dtype=np.float64), 1).tobytes())
+        digest.update(str(CACHE_VERSION).encode())
+        return digest.hexdigest()[:20]
+
+    def _source_cell(self, x: float, y: float) -> Optional[int]:
+        """소스 좌표를 가장 가까운 통행 가능 셀로 (시작 위치는 본진 건물 아래)"""
+        cx = min(max(int(x), 0), self.width - 1)
+        cy = min(max(int(y), 0), self.height - 1)
+        if self.pathable[cy, cx]:
+            return cy * self.width + cx
+        radius = int(math.ceil(SOURCE_SNAP_RADIUS)) + 2
+        y0, y1 = max(cy - radius, 0), min(cy + radius + 1, self.height)
+        x0, x1 = max(cx - radius, 0), min(cx + radius + 1, self.width)
+        ys, xs = np.nonzero(self.pathable[y0:y1, x0:x1])
+        if len(ys) == 0:
+            return None
+        d2 = (ys + y0 + 0.5 - y) ** 2 + (xs + x0 + 0.5 - x) ** 2
+        i = int(np.argmin(d2))
+        return int(ys[i] + y0) * self.width + int(xs[i] + x0)
+
+    def _neighbor_offsets(self) -> List[Tuple[int, int, int]]:
+        return [
+            (dx, dy, DIAGONAL_COST if dx and dy else STRAIGHT_COST)
+            for dy in (-1, 0, 1)
+            for dx in (-1, 0, 1)
+            if dx or dy
+        ]
+
+    def _build(self) -> np.ndarray:
+        shape = (len(self.sources), self.height, self.width)
+        out = np.full(shape, UNREACHABLE, dtype=np.uint16)
+        if _csgraph_dijkstra is not None:
+            self._build_csgraph(out)
+        else:
+            for i, cell in enumerate(self.source_cells):
+                if cell is not None:
+                    flat = out[i].reshape(-1)
+                    dist = flat.tolist()
+                    dist[cell] = 0
+                    self._relax(dist, [(0, cell)])
+                    flat[:] = dist
+        return out
+
+    def _build_csgraph(self, out: np.ndarray) -> None:
+        valid = [(i, c) for i, c in enumerate(self.source_cells) if c is not None]
+        if not valid:
+            return
+        h, w = self.height, self.width
+        rows, cols, costs = [], [], []
+        ids = np.arange(h * w).reshape(h, w)
+        for dx, dy, cost in (
+            (1, 0, STRAIGHT_COST),
+            (0, 1, STRAIGHT_COST),
+            (1, 1, DIAGONAL_COST),
+            (-1, 1, DIAGONAL_COST),
+        ):
+            xs = slice(max(-dx, 0), w - max(dx, 0))
+            xt = slice(max(dx, 0), w - max(-dx, 0))
+            a = ids[: h - dy, xs][self.pathable[: h - dy, xs] & self.pathable[dy:, xt]]
+            rows.append(a)
+            cols.append(a + dy * w + dx)
+            costs.append(np.full(a.size, cost, dtype=np.float32))
+        graph = _csr_matrix(
+            (np.concatenate(costs), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(h * w, h * w),
+        )
+        dist = _csgraph_dijkstra(
+            graph, directed=False, indices=[c for _, c in valid], limit=UNREACHABLE - 1
+        )
+        dist[~np.isfinite(dist)] = UNREACHABLE
+        for row, (i, _) in enumerate(valid):
+            out[i] = dist[row].reshape(h, w).astype(np.uint16)
+
+    def _relax(self, flat: List[int], heap: List[Tuple[int, int]]) -> int:
+        """flat (H*W 리스트) 거리장에서 heap 의 셀부터 Dijkstra 완화, 갱신 셀 수 반환"""
+        w, h = self.width, self.height
+        pathable = self.pathable.reshape(-1).tolist()
+        offsets = self._neighbor_offsets()
+        heapq.heapify(heap)
+        updated = 0
+        while heap:
+            d, cell = heapq.heappop(heap)
+            if d > flat[cell]:
+                continue
+            updated += 1
+            cy, cx = divmod(cell, w)
+            for dx, dy, cost in offsets:
+                nx, ny = cx + dx, cy + dy
+                if nx < 0 or ny < 0 or nx >= w or ny >= h:
+                    continue
+                n = ny * w + nx
+                nd = d + cost
+                if pathable[n] and nd < flat[n] and nd < UNREACHABLE:
+                    flat[n] = nd
+                    heapq.heappush(heap, (nd, n))
+        return updated
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def open_cells(self, mask: np.ndarray) -> int:
+        """
+        새로 통행 가능해진 셀 반영 (파괴된 바위).
+
+        거리는 줄어들기만 하므로 열린 셀의 이웃에서 시드를 잡아 개선되는
+        셀만 다시 완화한다. 반환값은 갱신된 셀 수 (모든 소스 합).
+        """
+        opened = (np.asarray(mask) != 0) & ~self.pathable
+        if not opened.any():
+            return 0
+        self.pathable |= opened
+        cells = np.flatnonzero(opened.reshape(-1))
+        offsets = self._neighbor_offsets()
+        updated = 0
+        for i in range(len(self.sources)):
+            flat = self.distances[i].reshape(-1)
+            dist = flat.tolist()
+            heap = []
+            for cell in cells.tolist():
+                cy, cx = divmod(cell, self.width)
+                best = dist[cell]
+                for dx, dy, cost in offsets:
+                    nx, ny = cx + dx, cy + dy
+                    if 0 <= nx < self.width and 0 <= ny < self.height:
+                        d = dist[ny * self.width + nx]
+                        if d != UNREACHABLE and d + cost < best:
+                            best = d + cost
+                if best < dist[cell]:
+                    dist[cell] = best
+                    heap.append((best, cell))
+            if heap:
+                updated += self._relax(dist, heap)
+                flat[:] = dist
+        return updated
+
+    def update_pathing(self, pathing: np.ndarray) -> int:
+        """현재 pathing_grid 와 비교해 새로 열린 셀만 반영 (건물로 막힌 셀은 무시)"""
+        pathing = np.asarray(pathing)
+        if pathing.shape != self.pathable.shape:
+            return 0
+        return self.open_cells(pathing)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def source_index(self, point: Any) -> Optional[int]:
+        """SOURCE_SNAP_RADIUS 안의 가장 가까운 소스 인덱스"""
+        if not len(self.sources):
+            return None
+        x, y = _xy(point)
+        d2 = (self.sources[:, 0] - x) ** 2 + (self.sources[:, 1] - y) ** 2
+        i = int(np.argmin(d2))
+        if d2[i] > SOURCE_SNAP_RADIUS * SOURCE_SNAP_RADIUS:
+            return None
+        return i
+
+    def distance_from_source(self, index: int, point: Any) -> Optional[float]:
+        """소스 index 에서 point 까지 지상 거리 (타일), 도달 불가면 None"""
+        x, y = _xy(point)
+        cx, cy = int(x), int(y)
+        if not (0 <= cx < self.width and 0 <= cy < self.height):
+            return None
+        raster = self.distances[index]
+        value = int(raster[cy, cx])
+        if value == UNREACHABLE:
+            r = LOOKUP_WINDOW
+            window = raster[
+                max(cy - r, 0) : cy + r + 1, max(cx - r, 0) : cx + r + 1
+            ].min()
+            value = int(window)
+            if value == UNREACHABLE:
+                return None
+        return value / SCALE
+
+    def path_distance(self, a: Any, b: Any) -> float:
+        """
+        a, b 사이 지상 거리. 둘 중 하나가 소스 근처여야 O(1) 조회가 되고,
+        아니면 (또는 도달 불가면) 직선 거리로 대체한다.
+        """
+        self.lookups += 1
+        for source, other in ((a, b), (b, a)):
+            index = self.source_index(source)
+            if index is not None:
+                distance = self.distance_from_source(index, other)
+                if distance is not None:
+                    return distance
+        self.fallbacks += 1
+        ax, ay = _xy(a)
+        bx, by = _xy(b)
+        return math.hypot(ax - bx, ay - by)
+
+    def rank(self, origin: Any, candidates: Iterable[Any]) -> List[Any]:
+        """origin 에서 지상 거리 오름차순으로 정렬"""
+        return sorted(candidates, key=lambda c: self.path_distance(origin, c))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "sources": len(self.sources),
+            "key": self.key,
+            "lookups": self.lookups,
+            "fallbacks": self.fallbacks,
+            "bytes": int(self.distances.nbytes),
+        }
+
+
+def start_pathing(bot: Any) -> np.ndarray:
+    """
+    on_start 시점 pathing_grid (bot.start_pathing_grid).
+
+    game_info.pathing_grid 는 매 스텝 건물을 반영해 다시 만들어지므로, 빌드가
+    warm_up 으로 밀려도 같은 캐시 키를 쓰도록 시작 스냅샷을 우선한다.
+    """
+    grid = getattr(bot, "start_pathing_grid", None)
+    if grid is None:
+        grid = bot.game_info.pathing_grid.data_numpy
+    return grid
+
+
+def field_sources(bot: Any) -> List[Any]:
+    """거리장 소스: 확장 위치 + 아군/적 시작 위치"""
+    sources = list(getattr(bot, "expansion_locations_list", None) or [])
+    start = getattr(bot, "start_location", None)
+    if start is not None:
+        sources.append(start)
+    sources.extend(getattr(bot, "enemy_start_locations", None) or [])
+    return sources
+
+
+def get_path_field(bot: Any) -> Optional[PathDistanceField]:
+    """봇에 붙은 거리장 (MapAnalysis 가 아직 생성 전이거나 대기 중이면 None)"""
+    field = getattr(bot, "path_distances", None)
+    return field if isinstance(field, PathDistanceField) else None
+
+
+def path_distance(bot: Any, a: Any, b: Any) -> float:
+    """거리장이 있으면 지상 거리, 없으면 직선 거리"""
+    field = get_path_field(bot)
+    if field is not None:
+        return field.path_distance(a, b)
+    a = getattr(a, "position", a)
+    b = getattr(b, "position", b)
+    return a.distance_to(b)
@@ -15,6 +15,8 @@ import time
 from collections import defaultdict, deque
 from typing import Any, Callable, Dict, List
 
+from .frame_profiler import get_frame_profiler
+
 
 class PerformanceProfiler:
     """성능 프로파일러 - 함수 실행 시간 및 병목 지점 추적"""
@@ -59,7 +61,9 @@ class PerformanceProfiler:
 
             start_time = time.perf_counter()
             try:
-                result = func(*args, **kwargs)
+                # 프레임 프로파일러가 기록 중이면 현재 스팬의 자식으로 중첩
+                with get_frame_profiler().span(func.__qualname__):
+                    result = func(*args, **kwargs)
                 return result
             finally:
                 elapsed = time.perf_counter() - start_time
@@ -249,13 +253,16 @@ class TimingContext:
         self.name = name
         self.profiler = profiler or get_profiler()
         self.start_time = None
+        self._span = None
 
     def __enter__(self):
+        self._span = get_frame_profiler().start_span(self.name)
         self.start_time = time.perf_counter()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         elapsed = time.perf_counter() - self.start_time
+        get_frame_profiler().end_span(self._span)
 
         self.profiler.timing_data[self.name].append(elapsed)
         self.profiler.call_counts[self.name] += 1
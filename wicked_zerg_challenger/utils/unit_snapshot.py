@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""Once-per-frame columnar unit snapshot.
+
+Combat modules used to walk ``bot.units`` / ``bot.enemy_units`` themselves and
+build their own per-unit Python objects and ``np.array`` pairs.  The snapshot
+reads every unit attribute once per frame into contiguous NumPy columns:
+
+- ``tags``            int64   (N,)
+- ``positions``       float64 (N, 2)
+- ``velocities``      float64 (N, 2)  position delta per game loop vs. previous snapshot
+- ``type_ids``        int32   (N,)
+- ``hp_ratio``        float32 (N,)    health / health_max
+- ``shield_ratio``    float32 (N,)    shield / shield_max (0 when no shields)
+- ``flags``           uint8   (N,)    FLAG_* bitmask
+- ``ground_range``    float32 (N,)
+- ``air_range``       float32 (N,)
+- ``radius``          float32 (N,)
+- ``supply``          float32 (N,)
+
+plus a ``tag -> row`` index.  The frame snapshot is published on the
+blackboard (``blackboard.unit_snapshot``) so downstream consumers can index
+and vectorize instead of re-reading attributes.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+import numpy as np
+
+FLAG_FLYING = 1
+FLAG_BURROWED = 2
+FLAG_CLOAKED = 4
+FLAG_ATTACKS_GROUND = 8
+FLAG_ATTACKS_AIR = 16
+
+# Supply per UnitTypeId value, resolved lazily from game data.
+_SUPPLY_CACHE: Dict[int, float] = {}
+
+
+def _type_value(type_id: Any) -> int:
+    value = getattr(type_id, "value", type_id)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+def _unit_supply(unit: Any, type_value: int) -> float:
+    supply = _SUPPLY_CACHE.get(type_value)
+    if supply is None:
+        try:
+            supply = float(unit._type_data._proto.food_required)
+        except (AttributeError, TypeError, ValueError):
+            supply = 0.0
+        _SUPPLY_CACHE[type_value] = supply
+    return supply
+
+
+class UnitSnapshot:
+    """Columnar view of one side's units for a single frame."""
+
+    __slots__ = (
+        "tags",
+        "positions",
+        "velocities",
+        "type_ids",
+        "hp_ratio",
+        "shield_ratio",
+        "flags",
+        "ground_range",
+        "air_range",
+        "radius",
+        "supply",
+        "index",
+    )
+
+    def __init__(self, size: int = 0):
+        self.tags = np.zeros(size, dtype=np.int64)
+        self.positions = np.zeros((size, 2), dtype=np.float64)
+        self.velocities = np.zeros((size, 2), dtype=np.float64)
+        self.type_ids = np.zeros(size, dtype=np.int32)
+        self.hp_ratio = np.ones(size, dtype=np.float32)
+        self.shield_ratio = np.zeros(size, dtype=np.float32)
+        self.flags = np.zeros(size, dtype=np.uint8)
+        self.ground_range = np.zeros(size, dtype=np.float32)
+        self.air_range = np.zeros(size, dtype=np.float32)
+        self.radius = np.zeros(size, dtype=np.float32)
+        self.supply = np.zeros(size, dtype=np.float32)
+        self.index: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return int(self.tags.shape[0])
+
+    @classmethod
+    def from_units(cls, units: Iterable[Any]) -> "UnitSnapshot":
+        """Read every unit attribute exactly once into column arrays."""
+        units = list(units) if units is not None else []
+        snapshot = cls(len(units))
+        tags = snapshot.tags
+        positions = snapshot.positions
+        type_ids = snapshot.type_ids
+        hp_ratio = snapshot.hp_ratio
+        shield_ratio = snapshot.shield_ratio
+        flags = snapshot.flags
+        ground_range = snapshot.ground_range
+        air_range = snapshot.air_range
+        radius = snapshot.radius
+        supply = snapshot.supply
+
+        for row, unit in enumerate(units):
+            tags[row] = unit.tag
+            pos = getattr(unit, "position_tuple", None)
+            if not isinstance(pos, tuple):
+                pos = unit.position
+            if isinstance(pos, tuple):
+                positions[row] = pos[0], pos[1]
+            else:
+                positions[row] = pos.x, pos.y
+
+            type_value = _type_value(getattr(unit, "type_id", -1))
+            type_ids[row] = type_value
+
+            health_max = getattr(unit, "health_max", 0) or 0
+            if health_max > 0:
+                hp_ratio[row] = getattr(unit, "health", health_max) / health_max
+            shield_max = getattr(unit, "shield_max", 0) or 0
+            if shield_max > 0:
+                shield_ratio[row] = getattr(unit, "shield", 0) / shield_max
+
+            bits = 0
+            if getattr(unit, "is_flying", False):
+                bits |= FLAG_FLYING
+            if getattr(unit, "is_burrowed", False):
+                bits |= FLAG_BURROWED
+            if getattr(unit, "is_cloaked", False):
+                bits |= FLAG_CLOAKED
+            if getattr(unit, "can_attack_ground", False):
+                bits |= FLAG_ATTACKS_GROUND
+            if getattr(unit, "can_attack_air", False):
+                bits |= FLAG_ATTACKS_AIR
+            flags[row] = bits
+
+            ground_range[row] = getattr(unit, "ground_range", 0.0) or 0.0
+            air_range[row] = getattr(unit, "air_range", 0.0) or 0.0
+            radius[row] = getattr(unit, "radius", 0.5) or 0.5
+            supply[row] = _unit_supply(unit, type_value)
+
+        snapshot.index = {int(tag): row for row, tag in enumerate(tags.tolist())}
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def row(self, tag: int) -> Optional[int]:
+        return self.index.get(tag)
+
+    def rows_for(self, tags: Iterable[int]) -> np.ndarray:
+        """Row indices for ``tags`` (unknown tags are skipped)."""
+        index = self.index
+        return np.fromiter((index[t] for t in tags if t in index), dtype=np.intp)
+
+    def rows_for_units(self, units: Iterable[Any]) -> np.ndarray:
+        return self.rows_for(u.tag for u in units)
+
+    def mask(self, flag: int) -> np.ndarray:
+        return (self.flags & flag) != 0
+
+    def type_mask(self, type_ids: Iterable[Any]) -> np.ndarray:
+        values = np.fromiter((_type_value(t) for t in type_ids), dtype=np.int32)
+        return np.isin(self.type_ids, values)
+
+    def type_lookup(
+        self, table: Mapping[Any, float], default: float = 0.0
+    ) -> np.ndarray:
+        """Vectorized ``table.get(type_id, default)`` over all rows."""
+        lookup = {_type_value(type_id): value for type_id, value in table.items()}
+        values = np.full(len(self), default, dtype=np.float32)
+        for type_value in np.unique(self.type_ids).tolist():
+            if type_value in lookup:
+                values[self.type_ids == type_value] = lookup[type_value]
+        return values
+
+    def compute_velocities(
+        self, previous: Optional["UnitSnapshot"], loops: float
+    ) -> None:
+        """Fill ``velocities`` from the position delta against ``previous``."""
+        if previous is None or loops <= 0 or not len(self) or not len(previous):
+            return
+        prev_index = previous.index
+        prev_rows = np.fromiter(
+            (prev_index.get(t, -1) for t in self.tags.tolist()),
+            dtype=np.intp,
+            count=len(self),
+        )
+        known = prev_rows >= 0
+        self.velocities[known] = (
+            self.positions[known] - previous.positions[prev_rows[known]]
+        ) / loops
+
+
+class FrameSnapshot:
+    """Own and enemy unit snapshots for one game step."""
+
+    __slots__ = ("iteration", "game_loop", "own", "enemy")
+
+    def __init__(
+        self,
+        iteration: int,
+        game_loop: int,
+        own: UnitSnapshot,
+        enemy: UnitSnapshot,
+    ):
+        self.iteration = iteration
+        self.game_loop = game_loop
+        self.own = own
+        self.enemy = enemy
+
+
+def build_frame_snapshot(
+    bot: Any, iteration: int, previous: Optional[FrameSnapshot] = None
+) -> FrameSnapshot:
+    """Build the per-frame snapshot for ``bot`` (velocities vs. ``previous``)."""
+    state = getattr(bot, "state", None)
+    game_loop = int(getattr(state, "game_loop", iteration) or iteration)
+    own = UnitSnapshot.from_units(getattr(bot, "units", None) or [])
+    enemy = UnitSnapshot.from_units(getattr(bot, "enemy_units", None) or [])
+
+    if previous is not None:
+        loops = game_loop - previous.game_loop
+        own.compute_velocities(previous.own, loops)
+        enemy.compute_velocities(previous.enemy, loops)
+
+    return FrameSnapshot(iteration, game_loop, own, enemy)
+
+
+def get_frame_snapshot(bot: Any) -> Optional[FrameSnapshot]:
+    """Current frame snapshot published on the blackboard, if any."""
+    blackboard = getattr(bot, "blackboard", None)
+    snapshot = getattr(blackboard, "unit_snapshot", None)
+    if snapshot is None:
+        return None
+    game_loop = getattr(getattr(bot, "state", None), "game_loop", None)
+    if isinstance(game_loop, int) and snapshot.game_loop != game_loop:
+        return None  # stale (blackboard not updated this frame)
+    return snapshot
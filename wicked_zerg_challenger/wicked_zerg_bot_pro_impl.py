@@ -21,6 +21,7 @@ except ImportError:
 
 
 import json
+import os
 import shutil
 import time
 import traceback
@@ -30,10 +31,15 @@ from typing import Any, Dict, List, Optional
 
 from blackboard import Blackboard
 from bot_step_integration import BotStepIntegrator
+from core.command_arbiter import CommandArbiter
+from core.startup import STARTUP_BUDGET_MS, STARTUP_WARMUP_SLICE_MS
 from difficulty_progression import DifficultyProgression
 from personality_module import PersonalityMode, PersonalityModule
 
+from utils.generational_cache import get_shared_cache
 from utils.logger import setup_logger
+from utils.observation_log import FILE_SUFFIX, ObservationRecorder
+from utils.path_distance import PathDistanceField, get_path_field
 
 
 class WickedZergBotProImpl(BotAI):
@@ -110,6 +116,19 @@ class WickedZergBotProImpl(BotAI):
         self._workers_created: int = 0
         self._expansions_built: int = 0
 
+        # * Observation log for the offline replay harness (OBSERVATION_LOG_DIR) *
+        self._obs_recorder: Optional[ObservationRecorder] = None
+
+        # * Ground distance fields from expansions/start locations (utils.path_distance) *
+        # MapAnalysis 시작 단계가 함께 생성 (예산 초과 시 warm_up, 그 전엔 직선 거리)
+        self.path_distances: Optional[PathDistanceField] = None
+        self._path_destructables: int = 0
+        # on_start 시점 pathing_grid (매 스텝 건물이 반영되므로 맵 캐시 키는 이 스냅샷 기준)
+        self.start_pathing_grid: Optional[Any] = None
+
+        # * Per-frame command arbitration in front of _after_step (core.command_arbiter) *
+        self.command_arbiter = CommandArbiter(self)
+
     async def on_start(self):
         """
         Called when the bot starts.
@@ -127,6 +146,25 @@ class WickedZergBotProImpl(BotAI):
         self.logger = setup_logger("WickedZergBot")
         self.logger.info("on_start: Initializing all managers...")
 
+        # === Observation recording (benchmarks/replay_harness.py input) ===
+        obs_log_dir = os.environ.get("OBSERVATION_LOG_DIR")
+        if obs_log_dir:
+            path = Path(obs_log_dir) / (
+                f"obs_{self.game_count}_{time.strftime('%Y%m%d_%H%M%S')}{FILE_SUFFIX}"
+            )
+            try:
+                self._obs_recorder = ObservationRecorder(path)
+                await self._obs_recorder.start(self)
+                self.logger.info(f"[OBS_LOG] Recording observations to {path}")
+            except Exception as e:
+                self.logger.warning(f"[OBS_LOG] Recorder disabled: {e}")
+                self._obs_recorder = None
+
+        # === 맵별 정적 계산 입력 고정 ===
+        # 거리장/맵 분석 레이어는 ManagerFactory 시작 단계에서 예산 안에 생성
+        self.start_pathing_grid = self.game_info.pathing_grid.data_numpy
+        self._path_destructables = len(self.destructables)
+
         # === 0. Blackboard (Central State) ===
         # Already initialized in __init__, but logging here
         if self.blackboard:
@@ -199,7 +237,8 @@ class WickedZergBotProImpl(BotAI):
             factory.register_managers(get_all_manager_configs())
 
             # 모든 매니저 초기화 (의존성 순서 자동 관리)
-            stats = factory.initialize_all(verbose=True)
+            # 예산을 넘긴 비핵심 매니저는 on_step의 warm_up()이 이어서 생성
+            stats = factory.initialize_all(verbose=True, budget_ms=STARTUP_BUDGET_MS)
 
             # Factory를 bot에 저장 (나중에 매니저 조회용)
             self.manager_factory = factory
@@ -418,6 +457,14 @@ class WickedZergBotProImpl(BotAI):
         - AggressiveStrategies: 초반 공격 전략 (12풀, 맹독충 올인 등)
         중복 호출 방지를 위해 여기서는 호출하지 않음
         """
+        if self._obs_recorder is not None:
+            try:
+                self._obs_recorder.record_step(self)
+            except Exception as e:
+                self.logger.warning(f"[OBS_LOG] Recording stopped: {e}")
+                self._obs_recorder.close()
+                self._obs_recorder = None
+
         # *** 시간 제한: 30분(1800초) 강제 종료 (충분한 학습 시간 확보) - train_mode일 때만 ***
         if self.train_mode and self.time > 1800:
             if not hasattr(self, "_game_ended"):
@@ -431,6 +478,22 @@ class WickedZergBotProImpl(BotAI):
         # Store iteration as attribute for other modules to access
         self.iteration = iteration
 
+        # on_start 예산 초과로 미뤄진 매니저를 스텝마다 조금씩 생성
+        factory = getattr(self, "manager_factory", None)
+        if factory is not None:
+            factory.warm_up(STARTUP_WARMUP_SLICE_MS)
+
+        # 바위가 부서지면 열린 셀만 거리장에 증분 반영 (거리장이 준비된 뒤부터)
+        path_field = get_path_field(self)
+        if path_field is not None:
+            destructables = len(self.destructables)
+            if destructables < self._path_destructables:
+                try:
+                    path_field.update_pathing(self.game_info.pathing_grid.data_numpy)
+                except Exception as e:
+                    self.logger.warning(f"[PATH_DIST] Update failed: {e}")
+            self._path_destructables = destructables
+
         # * Feature 86: Cache our unit tags for unit lost tracking *
         if iteration % 22 == 0:
             if not hasattr(self, "_known_unit_tags"):
@@ -489,6 +552,12 @@ class WickedZergBotProImpl(BotAI):
             except Exception:
                 pass
 
+        # 이번 프레임 명령 중재: 충돌/중복 제거 + 같은 명령 묶기 (_after_step 전송 전)
+        try:
+            self.command_arbiter.flush()
+        except Exception as e:
+            self.logger.warning(f"[COMMANDS] Arbitration skipped: {e}")
+
         # Personality module is called in bot_step_integration.py; do not call here.
 
     async def on_end(self, game_result):
@@ -892,6 +961,21 @@ class WickedZergBotProImpl(BotAI):
         except Exception as e:
             self.logger.info(f"[WARNING] Build order log save error: {e}")
 
+        # * Observation log: flush and close *
+        if self._obs_recorder is not None:
+            path = self._obs_recorder.close()
+            self.logger.info(
+                f"[OBS_LOG] {self._obs_recorder.steps} steps -> {path} "
+                f"({self._obs_recorder.record_time_ms:.0f}ms recording)"
+            )
+            self._obs_recorder = None
+
+        # * Frame profile export (slow-frame flame graph / Chrome trace) *
+        try:
+            self._save_frame_profile()
+        except Exception as e:
+            self.logger.info(f"[WARNING] Frame profile save error: {e}")
+
         # Store training result for run_with_training.py
         self._training_result = {
             "game_result": str(game_result),
@@ -1123,6 +1207,23 @@ class WickedZergBotProImpl(BotAI):
                 )
                 continue
 
+    def _save_frame_profile(self) -> None:
+        """Export this game's slow-frame spans to logs/ and reset the recorder."""
+        profiler = getattr(self, "frame_profiler", None)
+        if profiler is None or not profiler.frames_sampled:
+            return
+
+        logs_dir = Path(__file__).parent / "logs"
+        game_id = getattr(self, "game_count", 0)
+        paths = profiler.export(logs_dir, f"{game_id}_{time.strftime('%Y%m%d_%H%M%S')}")
+        self.logger.info(
+            f"[FRAME_PROFILE] {profiler.frames_sampled}/{profiler.frames_seen} slow frames "
+            f"-> {', '.join(p.name for p in paths.values())}"
+        )
+        for path, ms in profiler.get_top_spans(5):
+            self.logger.info(f"[FRAME_PROFILE]   {ms:8.1f}ms  {path}")
+        profiler.reset()
+
     def _save_build_order_log(self) -> None:
         """Save build order log to JSON at game end."""
         if not self._build_order_log:
@@ -1153,6 +1254,20 @@ class WickedZergBotProImpl(BotAI):
     # =========================================================================
     async def on_unit_destroyed(self, unit_tag: int):
         """Track which of our units died, what type, and when."""
+        # 죽은 유닛에 의존하는 캐시 엔트리 제거 (아군/적 모두)
+        try:
+            get_shared_cache(self).invalidate_tag(unit_tag)
+        except Exception as e:
+            self.logger.warning(f"[WickedZergBot] Cache invalidation suppressed: {e}")
+        # 죽은 유닛의 제어 권한 해제 (폴링 대신 이벤트)
+        unit_authority = getattr(self, "unit_authority", None)
+        if unit_authority is not None:
+            try:
+                unit_authority.on_unit_destroyed(unit_tag)
+            except Exception as e:
+                self.logger.warning(
+                    f"[WickedZergBot] Authority release suppressed: {e}"
+                )
         try:
             # Check if the destroyed unit was one of ours by checking known tags
             # The bot framework calls this for ALL destroyed units, so we need to
@@ -1296,6 +1411,7 @@ class WickedZergBotProImpl(BotAI):
             ("situational_awareness", "SituationalAwareness"),
             ("complete_destruction", "CompleteDestruction"),
             ("battle_prep", "BattlePreparation"),
+            ("transformer_model", "TransformerDecisionModel"),
         ]
         for attr, name in extra_reset_targets:
             mgr = getattr(self, attr, None)
@@ -1305,6 +1421,16 @@ class WickedZergBotProImpl(BotAI):
                 except Exception as e:
                     self.logger.info(f"[RESET_WARN] {name}.reset() failed: {e}")
 
+        # * 스텝 통합기 정리 (게임마다 스레드 풀이 누적되지 않도록)
+        step_integrator = getattr(self, "_step_integrator", None)
+        if step_integrator is not None and hasattr(step_integrator, "shutdown"):
+            try:
+                step_integrator.shutdown()
+            except Exception as e:
+                self.logger.info(
+                    f"[RESET_WARN] BotStepIntegrator.shutdown() failed: {e}"
+                )
+
         # * 누적 가능한 dict/set/list 직접 초기화
         for attr in ["_step_integrator"]:
             if hasattr(self, attr):
@@ -1314,10 +1440,8 @@ class WickedZergBotProImpl(BotAI):
         self._units_lost = []
         self._build_order_log = []
 
-        # DataCacheManager 초기화
-        if hasattr(self, "data_cache") and self.data_cache:
-            if hasattr(self.data_cache, "cache"):
-                self.data_cache.cache.clear()
+        # 공유 캐시 초기화 (Blackboard / DataCacheManager / 쿼리·거리 캐시)
+        get_shared_cache(self).clear()
 
         # * 로거 핸들러 누적 방지
         try:
@@ -11,7 +11,7 @@ Features:
 - KL balancing for latent space regularization
 - Free bits and KL scaling
 - Visualization of latent space (t-SNE/PCA)
-- NumPy fallback, CLI demo
+- Batched (B, T, dim) NumPy math; pure-Python list fallback, CLI demo
 """
 
 from __future__ import annotations
@@ -28,119 +28,10 @@ try:
     import numpy as np
 
     HAS_NUMPY = True
-except ImportError:
+except ImportError:  # dependency-free fallback: list math below
+    np = None
     HAS_NUMPY = False
 
-    class _NumpyFallback:
-        """Minimal NumPy shim."""
-
-        float32 = "float32"
-
-        @staticmethod
-        def array(data, dtype=None):
-            if isinstance(data, list):
-                return [float(x) for x in data]
-            return float(data)
-
-        @staticmethod
-        def zeros(shape, dtype=None):
-            if isinstance(shape, (list, tuple)):
-                if len(shape) == 1:
-                    return [0.0] * shape[0]
-                return [[0.0] * shape[1] for _ in range(shape[0])]
-            return [0.0] * shape
-
-        @staticmethod
-        def ones(shape, dtype=None):
-            if isinstance(shape, (list, tuple)):
-                if len(shape) == 1:
-                    return [1.0] * shape[0]
-                return [[1.0] * shape[1] for _ in range(shape[0])]
-            return [1.0] * shape
-
-        @staticmethod
-        def mean(arr, axis=None):
-            if isinstance(arr, (int, float)):
-                return float(arr)
-            flat = (
-                arr if not isinstance(arr[0], list) else [x for row in arr for x in row]
-            )
-            return sum(flat) / len(flat) if flat else 0.0
-
-        @staticmethod
-        def std(arr, axis=None):
-            m = _NumpyFallback.mean(arr)
-            flat = (
-                arr if not isinstance(arr[0], list) else [x for row in arr for x in row]
-            )
-            var = sum((x - m) ** 2 for x in flat) / len(flat) if flat else 0.0
-            return math.sqrt(var)
-
-        @staticmethod
-        def clip(val, lo, hi):
-            if isinstance(val, list):
-                return [max(lo, min(hi, v)) for v in val]
-            return max(lo, min(hi, val))
-
-        @staticmethod
-        def exp(x):
-            if isinstance(x, list):
-                return [math.exp(min(v, 500)) for v in x]
-            return math.exp(min(x, 500))
-
-        @staticmethod
-        def log(x):
-            if isinstance(x, list):
-                return [math.log(max(v, 1e-10)) for v in x]
-            return math.log(max(x, 1e-10))
-
-        @staticmethod
-        def sqrt(x):
-            if isinstance(x, list):
-                return [math.sqrt(max(v, 0)) for v in x]
-            return math.sqrt(max(x, 0))
-
-        @staticmethod
-        def sum(arr, axis=None):
-            if isinstance(arr, (int, float)):
-                return float(arr)
-            if isinstance(arr, list) and arr and isinstance(arr[0], list):
-                return [x for row in arr for x in row]
-            return sum(arr) if arr else 0.0
-
-        @staticmethod
-        def argmax(arr):
-            return max(range(len(arr)), key=lambda i: arr[i])
-
-        class _Random:
-            @staticmethod
-            def randn(*shape):
-                if len(shape) == 0:
-                    return random.gauss(0, 1)
-                if len(shape) == 1:
-                    return [random.gauss(0, 1) for _ in range(shape[0])]
-                return [
-                    [random.gauss(0, 1) for _ in range(shape[1])]
-                    for _ in range(shape[0])
-                ]
-
-            @staticmethod
-            def uniform(low=0.0, high=1.0, size=None):
-                if size is None:
-                    return random.uniform(low, high)
-                if isinstance(size, int):
-                    return [random.uniform(low, high) for _ in range(size)]
-                r, c = size
-                return [[random.uniform(low, high) for _ in range(c)] for _ in range(r)]
-
-            @staticmethod
-            def choice(n, size=1, replace=True):
-                return [random.randint(0, n - 1) for _ in range(size)]
-
-        random = _Random()
-
-    np = _NumpyFallback()
-
 
 # ─────────────────────────────────────────────
 # SC2 Constants
@@ -243,25 +134,117 @@ def _vec_scale(a: List[float], s: float) -> List[float]:
     return [x * s for x in a]
 
 
+# Backend-neutral vector ops: with NumPy they take ndarrays with any number
+# of leading batch axes (features on the last axis); in the fallback they
+# take plain lists.  RSSM / heads are written once on top of these.
+
+_NP_ACTIVATIONS = {
+    "relu": lambda z: np.maximum(z, 0.0),
+    "elu": lambda z: np.where(z >= 0, z, np.expm1(np.minimum(z, 500.0))),
+    "tanh": lambda z: np.tanh(z),
+    "sigmoid": lambda z: 1.0 / (1.0 + np.exp(-np.clip(z, -500.0, 500.0))),
+}
+
+
+def _cat(*parts: Any) -> Any:
+    """Concatenate along the feature axis."""
+    if HAS_NUMPY:
+        return np.concatenate(parts, axis=-1)
+    out: List[float] = []
+    for p in parts:
+        out.extend(p)
+    return out
+
+
+def _split(v: Any, n: int) -> Tuple[Any, Any]:
+    """Split the feature axis at n."""
+    if HAS_NUMPY:
+        return v[..., :n], v[..., n:]
+    return v[:n], v[n:]
+
+
+def _mul(a: Any, b: Any) -> Any:
+    if HAS_NUMPY:
+        return a * b
+    return [x * y for x, y in zip(a, b)]
+
+
+def _lerp(u: Any, a: Any, b: Any) -> Any:
+    """u * a + (1 - u) * b, elementwise."""
+    if HAS_NUMPY:
+        return u * a + (1.0 - u) * b
+    return [ui * ai + (1.0 - ui) * bi for ui, ai, bi in zip(u, a, b)]
+
+
+def _clip(v: Any, lo: float, hi: float) -> Any:
+    if HAS_NUMPY:
+        return np.clip(v, lo, hi)
+    return [max(lo, min(hi, x)) for x in v]
+
+
+def _gauss_sample(mean: Any, log_std: Any) -> Any:
+    """Reparameterized sampling: z = mu + sigma * epsilon."""
+    if HAS_NUMPY:
+        return mean + np.exp(log_std) * np.random.standard_normal(mean.shape)
+    return [m + math.exp(ls) * random.gauss(0, 1) for m, ls in zip(mean, log_std)]
+
+
+def _action_input(action: Any, dim: int) -> Any:
+    """One-hot encode an action (int) or a batch of actions ((B,) ints)."""
+    if HAS_NUMPY:
+        return np.eye(dim)[np.asarray(action, dtype=np.int64)]
+    return _one_hot(action, dim)
+
+
+def _head(out: Any) -> Any:
+    """Single-unit network output -> scalar (or (B, ...) array)."""
+    if HAS_NUMPY:
+        return out[..., 0]
+    return out[0]
+
+
+def _softmax_last(logits: Any) -> Any:
+    if HAS_NUMPY:
+        exps = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exps / exps.sum(axis=-1, keepdims=True)
+    return _softmax(logits)
+
+
 # ─────────────────────────────────────────────
 # Dense Layer & MLP
 # ─────────────────────────────────────────────
 
 
 class DenseLayer:
-    """Single dense layer with Xavier initialization."""
+    """
+    Single dense layer with Xavier initialization.
+
+    With NumPy the weights are an (out_dim, in_dim) ndarray and forward()
+    maps a whole (..., in_dim) batch in one matmul; otherwise nested lists.
+    """
 
     def __init__(self, in_dim: int, out_dim: int, activation: str = "relu"):
         scale = math.sqrt(2.0 / (in_dim + out_dim))
-        self.weights = [
+        weights = [
             [random.gauss(0, scale) for _ in range(in_dim)] for _ in range(out_dim)
         ]
-        self.biases = [0.0] * out_dim
+        if HAS_NUMPY:
+            self.weights = np.array(weights)
+            self.biases = np.zeros(out_dim)
+        else:
+            self.weights = weights
+            self.biases = [0.0] * out_dim
         self.activation = activation
         self.in_dim = in_dim
         self.out_dim = out_dim
 
-    def forward(self, x: List[float]) -> List[float]:
+    def forward(self, x: Any) -> Any:
+        if HAS_NUMPY:
+            z = np.asarray(x, dtype=np.float64)[..., : self.in_dim]
+            z = z @ self.weights.T + self.biases
+            act = _NP_ACTIVATIONS.get(self.activation)
+            return act(z) if act else z
+
         out = []
         for i in range(self.out_dim):
             z = _dot(self.weights[i], x[: self.in_dim]) + self.biases[i]
@@ -288,7 +271,7 @@ class MLP:
             act = activations[i] if i < len(activations) else "linear"
             self.layers.append(DenseLayer(dims[i], dims[i + 1], act))
 
-    def forward(self, x: List[float]) -> List[float]:
+    def forward(self, x: Any) -> Any:
         for layer in self.layers:
             x = layer.forward(x)
         return x
@@ -307,10 +290,12 @@ class TimeStep:
     done: bool
 
 
-class SequenceBuffer:
-    """Stores sequences of transitions for world model training."""
+class _ListSequenceBuffer:
+    """Stores sequences of transitions for world model training (no NumPy)."""
 
-    def __init__(self, capacity: int = 10_000, seq_len: int = 50):
+    def __init__(
+        self, capacity: int = 10_000, seq_len: int = 50, obs_dim: Optional[int] = None
+    ):
         self.capacity = capacity
         self.seq_len = seq_len
         self.episodes: List[List[TimeStep]] = []
@@ -325,15 +310,22 @@ class SequenceBuffer:
             if len(self.episodes) > self.capacity:
                 self.episodes.pop(0)
 
-    def sample_sequences(self, batch_size: int) -> List[List[TimeStep]]:
+    @property
+    def num_episodes(self) -> int:
+        return len(self.episodes)
+
+    def sample_sequences(
+        self, batch_size: int, seq_len: Optional[int] = None
+    ) -> List[List[TimeStep]]:
         """Sample batch_size subsequences of length seq_len."""
+        seq_len = seq_len or self.seq_len
         seqs = []
         for _ in range(batch_size):
             ep_idx = random.randint(0, len(self.episodes) - 1)
             ep = self.episodes[ep_idx]
-            max_start = max(0, len(ep) - self.seq_len)
+            max_start = max(0, len(ep) - seq_len)
             start = random.randint(0, max_start)
-            end = min(start + self.seq_len, len(ep))
+            end = min(start + seq_len, len(ep))
             seqs.append(ep[start:end])
         return seqs
 
@@ -341,6 +333,189 @@ class SequenceBuffer:
         return sum(len(ep) for ep in self.episodes)
 
 
+class SequenceBuffer:
+    """
+    Stores sequences of transitions for world model training.
+
+    Transitions are appended to flat growable arrays (obs / action / reward /
+    done) and an episode is just a (start, length) span over them, so
+    sample_batch() gathers B contiguous windows with one fancy index per
+    column.  Evicted episodes leave a dead prefix that is compacted away
+    when the arrays would otherwise grow.
+    """
+
+    def __init__(
+        self, capacity: int = 10_000, seq_len: int = 50, obs_dim: Optional[int] = None
+    ):
+        self.capacity = capacity  # max stored episodes
+        self.seq_len = seq_len
+        self.obs_dim = obs_dim  # inferred from the first add() if None
+        self._obs: Optional[np.ndarray] = None
+        self._actions = np.zeros(0, dtype=np.int64)
+        self._rewards = np.zeros(0, dtype=np.float32)
+        self._dones = np.zeros(0, dtype=bool)
+        self._head = 0  # first row still referenced by an episode
+        self._size = 0  # rows written
+        self._open = 0  # first row of the in-progress episode
+        self._transitions = 0
+        self._ep_start: deque = deque()
+        self._ep_len: deque = deque()
+        self._spans: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def _reserve_row(self, obs_dim: int) -> int:
+        if self._obs is None:
+            self.obs_dim = self.obs_dim or obs_dim
+            self._grow(1024)
+        if self._size == len(self._actions):
+            if self._head >= len(self._actions) // 2:
+                self._compact()
+            else:
+                self._grow(2 * len(self._actions))
+        return self._size
+
+    def _grow(self, rows: int) -> None:
+        obs = np.zeros((rows, self.obs_dim), dtype=np.float32)
+        actions = np.zeros(rows, dtype=np.int64)
+        rewards = np.zeros(rows, dtype=np.float32)
+        dones = np.zeros(rows, dtype=bool)
+        if self._obs is not None:
+            n = self._size
+            obs[:n] = self._obs[:n]
+            actions[:n] = self._actions[:n]
+            rewards[:n] = self._rewards[:n]
+            dones[:n] = self._dones[:n]
+        self._obs, self._actions, self._rewards, self._dones = (
+            obs,
+            actions,
+            rewards,
+            dones,
+        )
+
+    def _compact(self) -> None:
+        """Slide live rows down over the evicted prefix."""
+        head, n = self._head, self._size - self._head
+        for col in (self._obs, self._actions, self._rewards, self._dones):
+            col[:n] = col[head : self._size]
+        self._ep_start = deque(s - head for s in self._ep_start)
+        self._open -= head
+        self._size = n
+        self._head = 0
+        self._spans = None
+
+    def add(self, obs: List[float], action: int, reward: float, done: bool) -> None:
+        row = self._reserve_row(len(obs))
+        self._obs[row] = obs
+        self._actions[row] = action
+        self._rewards[row] = reward
+        self._dones[row] = done
+        self._size = row + 1
+        if not done:
+            return
+
+        length = self._size - self._open
+        if length >= 2:
+            self._ep_start.append(self._open)
+            self._ep_len.append(length)
+            self._transitions += length
+            if len(self._ep_start) > self.capacity:
+                self._ep_start.popleft()
+                self._transitions -= self._ep_len.popleft()
+                self._head = self._ep_start[0]
+            self._spans = None
+        else:
+            self._size = self._open  # 1-step episodes are dropped
+        self._open = self._size
+
+    @property
+    def num_episodes(self) -> int:
+        return len(self._ep_start)
+
+    def _timesteps(self, rows: Any) -> List[TimeStep]:
+        return [
+            TimeStep(
+                self._obs[r].tolist(),
+                int(self._actions[r]),
+                float(self._rewards[r]),
+                bool(self._dones[r]),
+            )
+            for r in rows
+        ]
+
+    @property
+    def episodes(self) -> List[List[TimeStep]]:
+        """Stored episodes as TimeStep lists (materialized on access)."""
+        return [
+            self._timesteps(range(s, s + n))
+            for s, n in zip(self._ep_start, self._ep_len)
+        ]
+
+    @property
+    def current_episode(self) -> List[TimeStep]:
+        return self._timesteps(range(self._open, self._size))
+
+    def sample_batch(
+        self, batch_size: int, seq_len: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Sample batch_size contiguous windows of up to seq_len steps.
+
+        Returns (B, T, obs_dim) "obs" and (B, T) "actions" / "rewards" /
+        "dones" plus a bool "mask"; windows from episodes shorter than T
+        are left-aligned and padded with their first row (mask False).
+        """
+        if not self._ep_start:
+            raise ValueError("SequenceBuffer has no complete episodes")
+        T = seq_len or self.seq_len
+        if self._spans is None:
+            self._spans = (
+                np.fromiter(self._ep_start, dtype=np.int64),
+                np.fromiter(self._ep_len, dtype=np.int64),
+            )
+        starts, lengths = self._spans
+
+        ep = np.random.randint(0, len(starts), size=batch_size)
+        length = lengths[ep]
+        offset = (
+            np.random.random_sample(batch_size) * (np.maximum(length - T, 0) + 1)
+        ).astype(np.int64)
+        begin = starts[ep] + offset
+        steps = np.arange(T)
+        mask = steps < np.minimum(length - offset, T)[:, None]
+        rows = np.where(mask, begin[:, None] + steps, begin[:, None])
+        return {
+            "obs": self._obs[rows],
+            "actions": self._actions[rows],
+            "rewards": self._rewards[rows],
+            "dones": self._dones[rows],
+            "mask": mask,
+        }
+
+    def sample_sequences(
+        self, batch_size: int, seq_len: Optional[int] = None
+    ) -> List[List[TimeStep]]:
+        """Sample batch_size subsequences of length seq_len (as TimeSteps)."""
+        batch = self.sample_batch(batch_size, seq_len)
+        return [
+            [
+                TimeStep(o.tolist(), int(a), float(r), bool(d))
+                for o, a, r, d in zip(
+                    batch["obs"][b][m],
+                    batch["actions"][b][m],
+                    batch["rewards"][b][m],
+                    batch["dones"][b][m],
+                )
+            ]
+            for b, m in enumerate(batch["mask"])
+        ]
+
+    def __len__(self) -> int:
+        return self._transitions
+
+
+if not HAS_NUMPY:
+    SequenceBuffer = _ListSequenceBuffer  # noqa: F811
+
+
 # ─────────────────────────────────────────────
 # RSSM: Recurrent State Space Model
 # ─────────────────────────────────────────────
@@ -348,12 +523,35 @@ class SequenceBuffer:
 
 @dataclass
 class RSSMState:
-    """Combined deterministic + stochastic state."""
+    """
+    Combined deterministic + stochastic state.
+
+    Each field is a (dim,) vector for a single state, or carries leading
+    batch axes ((B, dim), (B, T, dim)) for batched rollouts.
+    """
 
-    deterministic: List[float]  # h_t (GRU hidden state)
-    stochastic: List[float]  # z_t (sampled latent)
-    mean: List[float]  # mu of posterior/prior
-    log_std: List[float]  # log_sigma of posterior/prior
+    deterministic: Any  # h_t (GRU hidden state)
+    stochastic: Any  # z_t (sampled latent)
+    mean: Any  # mu of posterior/prior
+    log_std: Any  # log_sigma of posterior/prior
+
+    def __getitem__(self, index: Any) -> "RSSMState":
+        """Index the batch axes, e.g. state[b] or state[:, t] (NumPy only)."""
+        return RSSMState(
+            self.deterministic[index],
+            self.stochastic[index],
+            self.mean[index],
+            self.log_std[index],
+        )
+
+    def tile(self, batch_size: int) -> "RSSMState":
+        """Repeat a single (dim,) state into a (batch_size, dim) batch."""
+        return RSSMState(
+            *(
+                np.repeat(np.asarray(v, dtype=np.float64)[None], batch_size, axis=0)
+                for v in (self.deterministic, self.stochastic, self.mean, self.log_std)
+            )
+        )
 
 
 class RSSM:
@@ -363,6 +561,9 @@ class RSSM:
     Prior:     p(z_t | h_t)
     Posterior: q(z_t | h_t, o_t)
     Transition: h_t = f(h_{t-1}, z_{t-1}, a_{t-1})
+
+    Every step accepts a single state or a batch of B states (with (B,)
+    actions); observe_sequence() / imagine_sequence() unroll (B, T) inputs.
     """
 
     def __init__(
@@ -402,8 +603,18 @@ class RSSM:
         # Observation encoder: obs -> embedded_obs
         self.obs_encoder = MLP([obs_dim, hidden_dim, hidden_dim], ["elu", "elu"])
 
-    def initial_state(self) -> RSSMState:
-        """Return zero-initialized RSSM state."""
+    def initial_state(self, batch_size: Optional[int] = None) -> RSSMState:
+        """Return zero-initialized RSSM state (a (batch_size, dim) batch if given)."""
+        if HAS_NUMPY:
+            lead = () if batch_size is None else (batch_size,)
+            return RSSMState(
+                deterministic=np.zeros(lead + (self.det_dim,)),
+                stochastic=np.zeros(lead + (self.latent_dim,)),
+                mean=np.zeros(lead + (self.latent_dim,)),
+                log_std=np.full(lead + (self.latent_dim,), -1.0),
+            )
+        if batch_size is not None:
+            raise RuntimeError("batched RSSM states require NumPy")
         return RSSMState(
             deterministic=[0.0] * self.det_dim,
             stochastic=[0.0] * self.latent_dim,
@@ -411,62 +622,47 @@ class RSSM:
             log_std=[-1.0] * self.latent_dim,
         )
 
-    def _gru_step(
-        self, h_prev: List[float], z_prev: List[float], action: List[float]
-    ) -> List[float]:
+    def _gru_step(self, h_prev: Any, z_prev: Any, action: Any) -> Any:
         """GRU-like deterministic transition."""
-        inp = h_prev + z_prev + action
-        gates = self.gru_gate.forward(inp)
-
-        reset_gate = gates[: self.det_dim]
-        update_gate = gates[self.det_dim :]
+        gates = self.gru_gate.forward(_cat(h_prev, z_prev, action))
+        reset_gate, update_gate = _split(gates, self.det_dim)
 
         # Apply reset gate to h_prev
-        reset_h = [r * h for r, h in zip(reset_gate, h_prev)]
-        candidate_inp = reset_h + z_prev + action
-        candidate = self.gru_candidate.forward(candidate_inp)
+        candidate = self.gru_candidate.forward(
+            _cat(_mul(reset_gate, h_prev), z_prev, action)
+        )
 
         # Update gate
-        new_h = [
-            u * h + (1.0 - u) * c for u, h, c in zip(update_gate, h_prev, candidate)
-        ]
-        return new_h
+        return _lerp(update_gate, h_prev, candidate)
 
-    def _split_mean_logstd(
-        self, params: List[float]
-    ) -> Tuple[List[float], List[float]]:
+    def _split_mean_logstd(self, params: Any) -> Tuple[Any, Any]:
         """Split network output into mean and log_std."""
-        mid = len(params) // 2
-        mean = params[:mid]
-        log_std = [max(-5.0, min(2.0, v)) for v in params[mid:]]
-        return mean, log_std
+        mean, raw_log_std = _split(params, self.latent_dim)
+        return mean, _clip(raw_log_std, -5.0, 2.0)
 
-    def _sample_gaussian(self, mean: List[float], log_std: List[float]) -> List[float]:
+    def _sample_gaussian(self, mean: Any, log_std: Any) -> Any:
         """Reparameterized sampling: z = mu + sigma * epsilon."""
-        return [m + math.exp(ls) * random.gauss(0, 1) for m, ls in zip(mean, log_std)]
+        return _gauss_sample(mean, log_std)
 
-    def prior(self, h: List[float]) -> Tuple[List[float], List[float]]:
+    def prior(self, h: Any) -> Tuple[Any, Any]:
         """Compute prior distribution p(z_t | h_t)."""
         params = self.prior_net.forward(h)
         return self._split_mean_logstd(params)
 
-    def posterior(
-        self, h: List[float], obs: List[float]
-    ) -> Tuple[List[float], List[float]]:
+    def posterior(self, h: Any, obs: Any) -> Tuple[Any, Any]:
         """Compute posterior distribution q(z_t | h_t, o_t)."""
-        embedded = self.obs_encoder.forward(obs)
-        inp = h + embedded
-        params = self.posterior_net.forward(inp)
+        return self._posterior_embedded(h, self.obs_encoder.forward(obs))
+
+    def _posterior_embedded(self, h: Any, embedded: Any) -> Tuple[Any, Any]:
+        params = self.posterior_net.forward(_cat(h, embedded))
         return self._split_mean_logstd(params)
 
-    def observe_step(
-        self, prev_state: RSSMState, action: int, obs: List[float]
-    ) -> RSSMState:
+    def observe_step(self, prev_state: RSSMState, action: Any, obs: Any) -> RSSMState:
         """
         One step with observation (training).
         Computes posterior for z_t given h_t and o_t.
         """
-        action_vec = _one_hot(action, self.action_dim)
+        action_vec = _action_input(action, self.action_dim)
 
         # Deterministic transition
         h = self._gru_step(prev_state.deterministic, prev_state.stochastic, action_vec)
@@ -482,12 +678,12 @@ class RSSM:
             log_std=log_std,
         )
 
-    def imagine_step(self, prev_state: RSSMState, action: int) -> RSSMState:
+    def imagine_step(self, prev_state: RSSMState, action: Any) -> RSSMState:
         """
         One step without observation (imagination).
         Uses prior for z_t given h_t only.
         """
-        action_vec = _one_hot(action, self.action_dim)
+        action_vec = _action_input(action, self.action_dim)
 
         # Deterministic transition
         h = self._gru_step(prev_state.deterministic, prev_state.stochastic, action_vec)
@@ -503,9 +699,60 @@ class RSSM:
             log_std=log_std,
         )
 
-    def get_feature(self, state: RSSMState) -> List[float]:
+    def observe_sequence(
+        self,
+        obs: np.ndarray,
+        actions: np.ndarray,
+        state: Optional[RSSMState] = None,
+    ) -> Tuple[RSSMState, np.ndarray, np.ndarray]:
+        """
+        Posterior unroll over (B, T, obs_dim) observations and (B, T) actions.
+
+        Returns the (B, T, dim) posterior states together with the prior
+        (mean, log_std) at every step, for the KL term.
+        """
+        B, T = actions.shape
+        if state is None:
+            state = self.initial_state(B)
+
+        # The encoder does not depend on h: embed all B*T steps at once
+        embedded = self.obs_encoder.forward(obs)
+        steps = []
+        for t in range(T):
+            h = self._gru_step(
+                state.deterministic,
+                state.stochastic,
+                _action_input(actions[:, t], self.action_dim),
+            )
+            mean, log_std = self._posterior_embedded(h, embedded[:, t])
+            state = RSSMState(h, self._sample_gaussian(mean, log_std), mean, log_std)
+            steps.append(state)
+
+        states = _stack_states(steps)
+        prior_mean, prior_logstd = self.prior(states.deterministic)
+        return states, prior_mean, prior_logstd
+
+    def imagine_sequence(self, state: RSSMState, actions: np.ndarray) -> RSSMState:
+        """Open-loop prior unroll of (B, H) actions; returns (B, H, dim) states."""
+        steps = []
+        for t in range(actions.shape[1]):
+            state = self.imagine_step(state, actions[:, t])
+            steps.append(state)
+        return _stack_states(steps)
+
+    def get_feature(self, state: RSSMState) -> Any:
         """Concatenate deterministic and stochastic for downstream use."""
-        return state.deterministic + state.stochastic
+        return _cat(state.deterministic, state.stochastic)
+
+
+def _stack_states(steps: List[RSSMState]) -> RSSMState:
+    """T states with (B, dim) fields -> one state with (B, T, dim) fields."""
+    return RSSMState(
+        *(
+            np.stack([getattr(s, name) for s in steps], axis=1)
+            for name in ("deterministic", "stochastic", "mean", "log_std")
+        )
+    )
 
 
 # ─────────────────────────────────────────────
@@ -516,6 +763,9 @@ class RSSM:
 class KLManager:
     """
     Manages KL divergence computation with free bits and balancing.
+
+    Inputs may be single vectors or (..., latent_dim) batches; batched
+    calls return per-sample KL arrays.
     """
 
     def __init__(
@@ -524,19 +774,32 @@ class KLManager:
         self.free_bits = free_bits
         self.kl_scale = kl_scale
         self.kl_balance = kl_balance  # alpha: weight on prior vs posterior
-        self.kl_history: List[float] = []
+        self.kl_history: deque = deque(maxlen=1000)
 
     def gaussian_kl(
         self,
-        post_mean: List[float],
-        post_logstd: List[float],
-        prior_mean: List[float],
-        prior_logstd: List[float],
-    ) -> float:
+        post_mean: Any,
+        post_logstd: Any,
+        prior_mean: Any,
+        prior_logstd: Any,
+    ) -> Any:
         """
         KL(q || p) for diagonal Gaussian distributions.
         KL = sum[ log(s_p/s_q) + (s_q^2 + (m_q - m_p)^2) / (2*s_p^2) - 0.5 ]
         """
+        if HAS_NUMPY:
+            mq, lsq, mp, lsp = (
+                np.asarray(v, dtype=np.float64)
+                for v in (post_mean, post_logstd, prior_mean, prior_logstd)
+            )
+            kl_dim = (
+                lsp
+                - lsq
+                + (np.exp(2 * lsq) + (mq - mp) ** 2) / (2 * np.exp(2 * lsp))
+                - 0.5
+            )
+            return np.maximum(kl_dim, 0.0).sum(axis=-1)
+
         kl = 0.0
         for mq, lsq, mp, lsp in zip(post_mean, post_logstd, prior_mean, prior_logstd):
             sq = math.exp(lsq)
@@ -548,11 +811,11 @@ class KLManager:
 
     def compute_loss(
         self,
-        post_mean: List[float],
-        post_logstd: List[float],
-        prior_mean: List[float],
-        prior_logstd: List[float],
-    ) -> Tuple[float, Dict[str, float]]:
+        post_mean: Any,
+        post_logstd: Any,
+        prior_mean: Any,
+        prior_logstd: Any,
+    ) -> Tuple[Any, Dict[str, Any]]:
         """
         Compute KL loss with free bits and balancing.
 
@@ -562,24 +825,24 @@ class KLManager:
         where sg = stop_gradient (simulated by using fixed values).
         """
         raw_kl = self.gaussian_kl(post_mean, post_logstd, prior_mean, prior_logstd)
+        clamp = np.maximum if HAS_NUMPY else max
 
         # Free bits: clamp KL to at least free_bits per dimension
-        kl_free = max(raw_kl, self.free_bits)
-
-        # KL balancing
-        # Forward KL component (trains prior, posterior is fixed)
-        kl_prior = self.gaussian_kl(post_mean, post_logstd, prior_mean, prior_logstd)
-        # Reverse KL component (trains posterior, prior is fixed)
-        kl_posterior = self.gaussian_kl(
-            post_mean, post_logstd, prior_mean, prior_logstd
-        )
+        kl_free = clamp(raw_kl, self.free_bits)
 
-        balanced_kl = self.kl_balance * max(kl_prior, self.free_bits) + (
+        # KL balancing: without gradients both stop-gradient halves
+        # evaluate to the same value, so the raw KL serves for each
+        kl_prior = kl_posterior = raw_kl
+
+        balanced_kl = self.kl_balance * clamp(kl_prior, self.free_bits) + (
             1 - self.kl_balance
-        ) * max(kl_posterior, self.free_bits)
+        ) * clamp(kl_posterior, self.free_bits)
 
         scaled_kl = self.kl_scale * balanced_kl
-        self.kl_history.append(raw_kl)
+        if HAS_NUMPY and np.ndim(raw_kl):
+            self.kl_history.extend(raw_kl.ravel().tolist())
+        else:
+            self.kl_history.append(float(raw_kl))
 
         info = {
             "raw_kl": raw_kl,
@@ -593,7 +856,7 @@ class KLManager:
         """Get KL statistics over recent history."""
         if not self.kl_history:
             return {"mean_kl": 0.0, "max_kl": 0.0, "min_kl": 0.0}
-        recent = self.kl_history[-100:]
+        recent = list(self.kl_history)[-100:]
         return {
             "mean_kl": sum(recent) / len(recent),
             "max_kl": max(recent),
@@ -621,7 +884,7 @@ class ObservationDecoder:
             [feature_dim, hidden_dim, hidden_dim, obs_dim], ["elu", "elu", "sigmoid"]
         )
 
-    def forward(self, feature: List[float]) -> List[float]:
+    def forward(self, feature: Any) -> Any:
         return self.net.forward(feature)
 
 
@@ -631,8 +894,8 @@ class RewardPredictor:
     def __init__(self, feature_dim: int = FEATURE_DIM, hidden_dim: int = HIDDEN_DIM):
         self.net = MLP([feature_dim, hidden_dim, 1], ["elu", "linear"])
 
-    def forward(self, feature: List[float]) -> float:
-        return self.net.forward(feature)[0]
+    def forward(self, feature: Any) -> Any:
+        return _head(self.net.forward(feature))
 
 
 class ContinuePredictor:
@@ -641,8 +904,8 @@ class ContinuePredictor:
     def __init__(self, feature_dim: int = FEATURE_DIM, hidden_dim: int = HIDDEN_DIM):
         self.net = MLP([feature_dim, hidden_dim, 1], ["elu", "sigmoid"])
 
-    def forward(self, feature: List[float]) -> float:
-        return self.net.forward(feature)[0]
+    def forward(self, feature: Any) -> Any:
+        return _head(self.net.forward(feature))
 
 
 # ─────────────────────────────────────────────
@@ -665,11 +928,11 @@ class DreamerActor:
         self.action_dim = action_dim
         self.entropy_scale = 0.003
 
-    def get_action_dist(self, feature: List[float]) -> List[float]:
+    def get_action_dist(self, feature: Any) -> Any:
         logits = self.net.forward(feature)
-        return _softmax(logits)
+        return _softmax_last(logits)
 
-    def select_action(self, feature: List[float], greedy: bool = False) -> int:
+    def select_action(self, feature: Any, greedy: bool = False) -> int:
         probs = self.get_action_dist(feature)
         if greedy:
             return max(range(self.action_dim), key=lambda i: probs[i])
@@ -681,7 +944,19 @@ class DreamerActor:
                 return i
         return self.action_dim - 1
 
-    def entropy(self, probs: List[float]) -> float:
+    def sample_actions(self, features: np.ndarray, greedy: bool = False) -> np.ndarray:
+        """Vectorized select_action over (B, feature_dim) -> (B,) actions."""
+        probs = self.get_action_dist(features)
+        if greedy:
+            return probs.argmax(axis=-1)
+        u = np.random.random_sample(probs.shape[:-1] + (1,))
+        actions = (np.cumsum(probs, axis=-1) < u).sum(axis=-1)
+        return np.minimum(actions, self.action_dim - 1)
+
+    def entropy(self, probs: Any) -> Any:
+        if HAS_NUMPY:
+            probs = np.asarray(probs)
+            return -(probs * np.log(np.maximum(probs, 1e-10))).sum(axis=-1)
         return -sum(p * math.log(max(p, 1e-10)) for p in probs)
 
 
@@ -693,8 +968,8 @@ class DreamerCritic:
             [feature_dim, hidden_dim, hidden_dim, 1], ["elu", "elu", "linear"]
         )
 
-    def forward(self, feature: List[float]) -> float:
-        return self.net.forward(feature)[0]
+    def forward(self, feature: Any) -> Any:
+        return _head(self.net.forward(feature))
 
 
 # ─────────────────────────────────────────────
@@ -719,8 +994,8 @@ class LatentVisualizer:
         except ImportError:
             pass
 
-    def add(self, latent: List[float], label: str = "") -> None:
-        self.collected_states.append(latent[:])
+    def add(self, latent: Any, label: str = "") -> None:
+        self.collected_states.append([float(x) for x in latent])
         self.collected_labels.append(label)
 
     def pca_2d(self) -> List[Tuple[float, float]]:
@@ -728,6 +1003,9 @@ class LatentVisualizer:
         if len(self.collected_states) < 3:
             return [(0.0, 0.0)] * len(self.collected_states)
 
+        if HAS_NUMPY:
+            return self._pca_2d_numpy()
+
         n = len(self.collected_states)
         d = len(self.collected_states[0])
 
@@ -782,16 +1060,32 @@ class LatentVisualizer:
 
         return result
 
+    def _pca_2d_numpy(self) -> List[Tuple[float, float]]:
+        data = np.asarray(self.collected_states, dtype=np.float64)
+        centered = data - data.mean(axis=0)
+        rows = centered
+        components = []
+        for _ in range(2):
+            pc = np.array([random.gauss(0, 1) for _ in range(data.shape[1])])
+            pc /= max(np.linalg.norm(pc), 1e-10)
+            for _ in range(50):
+                pc = rows.T @ (rows @ pc)
+                pc /= max(np.linalg.norm(pc), 1e-10)
+            components.append(pc)
+            # Deflate for the next component
+            rows = rows - np.outer(rows @ pc, pc)
+        projected = centered @ np.stack(components, axis=1)
+        return [(float(x), float(y)) for x, y in projected]
+
     def tsne_2d(
         self, perplexity: float = 5.0, iterations: int = 300
     ) -> Optional[List[Tuple[float, float]]]:
         """Simplified t-SNE. Falls back to PCA if sklearn unavailable."""
         if self._has_sklearn and HAS_NUMPY:
             try:
-                import numpy as real_np
                 from sklearn.manifold import TSNE
 
-                data = real_np.array(self.collected_states)
+                data = np.array(self.collected_states)
                 perp = min(perplexity, len(data) - 1)
                 embedded = TSNE(
                     n_components=2,
@@ -852,6 +1146,9 @@ class SC2WorldModel:
     4. Reward predictor: latent -> reward
     5. Continue predictor: latent -> done probability
     6. Actor-Critic: trained purely from imagined trajectories
+
+    With NumPy, training and imagination run on (B, T, dim) batches and
+    plan_action() scores thousands of imagined futures per decision.
     """
 
     def __init__(
@@ -880,7 +1177,7 @@ class SC2WorldModel:
         self.kl_manager = KLManager(free_bits=1.0, kl_scale=0.1, kl_balance=0.8)
 
         # Data
-        self.buffer = SequenceBuffer(capacity=5_000, seq_len=50)
+        self.buffer = SequenceBuffer(capacity=5_000, seq_len=50, obs_dim=obs_dim)
         self.visualizer = LatentVisualizer()
 
         # Training state
@@ -927,6 +1224,18 @@ class SC2WorldModel:
         if horizon is None:
             horizon = self.imagination_horizon
 
+        if HAS_NUMPY:
+            traj = self.imagine_batch(start_state.tile(1), horizon)
+            return [
+                (
+                    traj["states"][0, t],
+                    int(traj["actions"][0, t]),
+                    float(traj["rewards"][0, t]),
+                    float(traj["continues"][0, t]),
+                )
+                for t in range(horizon)
+            ]
+
         trajectory = []
         state = start_state
 
@@ -943,6 +1252,49 @@ class SC2WorldModel:
 
         return trajectory
 
+    def imagine_batch(
+        self,
+        start_state: RSSMState,
+        horizon: Optional[int] = None,
+        first_actions: Optional[np.ndarray] = None,
+        greedy: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Imagine B trajectories at once from a (B, dim) batch of start states.
+
+        Returns "states" / "features" with (B, H, dim) fields (the state each
+        action was taken in) and (B, H) "actions", "rewards", "continues".
+        The reward and continue heads run once over all B*H features after
+        the unroll.  first_actions, if given, overrides the actor at t=0.
+        """
+        if horizon is None:
+            horizon = self.imagination_horizon
+
+        state = start_state
+        steps: List[RSSMState] = []
+        actions = []
+        for t in range(horizon):
+            if t == 0 and first_actions is not None:
+                action = np.asarray(first_actions, dtype=np.int64)
+            else:
+                feature = self.rssm.get_feature(state)
+                action = self.actor.sample_actions(feature, greedy=greedy)
+            steps.append(state)
+            actions.append(action)
+
+            # Imagine next state (no observation)
+            state = self.rssm.imagine_step(state, action)
+
+        states = _stack_states(steps)
+        features = self.rssm.get_feature(states)
+        return {
+            "states": states,
+            "features": features,
+            "actions": np.stack(actions, axis=1),
+            "rewards": self.reward_pred.forward(features),
+            "continues": self.continue_pred.forward(features),
+        }
+
     def compute_lambda_returns(
         self, rewards: List[float], values: List[float], continues: List[float]
     ) -> List[float]:
@@ -972,14 +1324,156 @@ class SC2WorldModel:
 
         return returns
 
+    def lambda_returns_batch(
+        self, rewards: np.ndarray, values: np.ndarray, continues: np.ndarray
+    ) -> np.ndarray:
+        """compute_lambda_returns() over the last (time) axis of (B, H) arrays."""
+        H = rewards.shape[-1]
+        returns = np.empty_like(rewards)
+        last_val = values[..., -1]
+        last_return = last_val
+
+        for t in reversed(range(H)):
+            next_val = last_val if t == H - 1 else values[..., t + 1]
+            disc = self.discount * continues[..., t]
+            returns[..., t] = (
+                rewards[..., t]
+                + disc * next_val
+                + disc * self.lambda_gae * (last_return - next_val)
+            )
+            last_return = returns[..., t]
+
+        return returns
+
+    def plan_action(
+        self, num_trajectories: int = 1024, horizon: Optional[int] = None
+    ) -> int:
+        """
+        Model-based action choice: imagine num_trajectories futures from the
+        current latent state, split evenly across first actions, and return
+        the first action with the best mean lambda-return.  Without NumPy
+        this falls back to the greedy actor.
+        """
+        if self.current_state is None:
+            self.reset()
+        if not HAS_NUMPY:
+            return self.actor.select_action(
+                self.rssm.get_feature(self.current_state), greedy=True
+            )
+
+        per_action = max(num_trajectories // self.action_dim, 1)
+        first = np.tile(np.arange(self.action_dim), per_action)
+        traj = self.imagine_batch(
+            self.current_state.tile(len(first)), horizon, first_actions=first
+        )
+        values = self.critic.forward(traj["features"])
+        returns = self.lambda_returns_batch(traj["rewards"], values, traj["continues"])
+        scores = np.bincount(first, weights=returns[:, 0], minlength=self.action_dim)
+        return int(np.argmax(scores / per_action))
+
     def train_world_model_step(self, batch_size: int = 8) -> Dict[str, float]:
         """
         Train the world model on sequences from the buffer.
         Returns loss components.
         """
-        if len(self.buffer.episodes) < 2:
+        if self.buffer.num_episodes < 2:
+            return {"total": 0.0}
+
+        if HAS_NUMPY:
+            losses, sample = self._world_model_losses_batched(batch_size)
+        else:
+            losses, sample = self._world_model_losses_list(batch_size)
+        if losses is None:
             return {"total": 0.0}
 
+        avg_recon, avg_reward, avg_kl = losses
+        total = avg_recon + avg_reward + avg_kl
+
+        # Perturbation-based gradient update on decoder & reward predictor.
+        # The probe feature does not depend on these weights: encode it once,
+        # and difference against the probe's own unperturbed loss.
+        sample_obs, sample_action, sample_reward = sample
+        test_state = self.rssm.observe_step(
+            self.rssm.initial_state(), sample_action, sample_obs
+        )
+        test_feat = self.rssm.get_feature(test_state)
+        base_recon = _mse(self.decoder.forward(test_feat), sample_obs)
+        base_reward = (self.reward_pred.forward(test_feat) - sample_reward) ** 2
+
+        eps = 1e-4
+        for net, loss_fn_name in [
+            (self.decoder.net, "recon"),
+            (self.reward_pred.net, "reward"),
+        ]:
+            for layer in net.layers:
+                for i in range(layer.out_dim):
+                    for j in range(min(layer.in_dim, 4)):
+                        orig = layer.weights[i][j]
+                        layer.weights[i][j] = orig + eps
+
+                        # Recompute loss for one sample
+                        if loss_fn_name == "recon":
+                            p = self.decoder.forward(test_feat)
+                            new_loss = _mse(p, sample_obs)
+                            grad = (new_loss - base_recon) / eps
+                        else:
+                            p = self.reward_pred.forward(test_feat)
+                            new_loss = (p - sample_reward) ** 2
+                            grad = (new_loss - base_reward) / eps
+
+                        layer.weights[i][j] = orig - self.lr * grad
+
+        self.train_steps += 1
+        losses = {
+            "reconstruction": avg_recon,
+            "reward": avg_reward,
+            "kl": avg_kl,
+            "total": total,
+        }
+        for k, v in losses.items():
+            self.loss_history[k].append(v)
+
+        return losses
+
+    def _world_model_losses_batched(
+        self, batch_size: int
+    ) -> Tuple[Tuple[float, float, float], Tuple[Any, int, float]]:
+        """Masked (B, T) losses: one posterior unroll, heads over all steps."""
+        batch = self.buffer.sample_batch(batch_size)
+        obs, actions, mask = batch["obs"], batch["actions"], batch["mask"]
+
+        # Observe steps (posterior) for the whole batch
+        states, prior_mean, prior_logstd = self.rssm.observe_sequence(obs, actions)
+        features = self.rssm.get_feature(states)
+
+        # Reconstruction / reward prediction losses
+        recon = ((self.decoder.forward(features) - obs) ** 2).mean(axis=-1)
+        reward_err = (self.reward_pred.forward(features) - batch["rewards"]) ** 2
+
+        # KL loss (posterior vs prior), valid steps only
+        kl_loss, _ = self.kl_manager.compute_loss(
+            states.mean[mask],
+            states.log_std[mask],
+            prior_mean[mask],
+            prior_logstd[mask],
+        )
+
+        # Collect for visualization (sparse)
+        for b, t in zip(*np.nonzero(mask[:, ::10])):
+            t *= 10
+            self.visualizer.add(states.stochastic[b, t], ACTION_NAMES[actions[b, t]])
+
+        losses = (
+            float(recon[mask].mean()),
+            float(reward_err[mask].mean()),
+            float(kl_loss.mean()),
+        )
+        sample = (obs[0, 0], int(actions[0, 0]), float(batch["rewards"][0, 0]))
+        return losses, sample
+
+    def _world_model_losses_list(
+        self, batch_size: int
+    ) -> Tuple[Optional[Tuple[float, float, float]], Any]:
         sequences = self.buffer.sample_sequences(batch_size)
 
         total_recon_loss = 0.0
@@ -1022,70 +1516,120 @@ class SC2WorldModel:
                     self.visualizer.add(state.stochastic, action_label)
 
         if count == 0:
-            return {"total": 0.0}
+            return None, None
 
-        avg_recon = total_recon_loss / count
-        avg_reward = total_reward_loss / count
-        avg_kl = total_kl_loss / count
-        total = avg_recon + avg_reward + avg_kl
+        sample = sequences[0][0]
+        losses = (
+            total_recon_loss / count,
+            total_reward_loss / count,
+            total_kl_loss / count,
+        )
+        return losses, (sample.observation, sample.action, sample.reward)
+
+    def train_actor_critic_step(self, batch_size: int = 16) -> Dict[str, float]:
+        """
+        Train actor and critic purely from imagined trajectories.
+
+        With NumPy, batch_size start states are imagined forward together
+        and the losses average over the whole (B, H) rollout.
+        """
+        if self.current_state is None or self.buffer.num_episodes < 2:
+            return {"actor_loss": 0.0, "critic_loss": 0.0}
+
+        if HAS_NUMPY:
+            result = self._actor_critic_losses_batched(batch_size)
+        else:
+            result = self._actor_critic_losses_list()
+        if result is None:
+            return {"actor_loss": 0.0, "critic_loss": 0.0}
+        actor_loss, critic_loss, (f0, a0, ret0, v0) = result
 
-        # Perturbation-based gradient update on decoder & reward predictor
+        # Update actor via perturbation (one-step probe at t=0)
+        probs0 = self.actor.get_action_dist(f0)
+        base_loss = -(
+            math.log(max(probs0[a0], 1e-10)) * (ret0 - v0)
+            + self.actor.entropy_scale * self.actor.entropy(probs0)
+        )
         eps = 1e-4
-        for net, loss_fn_name in [
-            (self.decoder.net, "recon"),
-            (self.reward_pred.net, "reward"),
-        ]:
-            for layer in net.layers:
-                for i in range(layer.out_dim):
-                    for j in range(min(layer.in_dim, 4)):
-                        orig = layer.weights[i][j]
-                        layer.weights[i][j] = orig + eps
+        for layer in self.actor.net.layers:
+            for i in range(layer.out_dim):
+                for j in range(min(layer.in_dim, 4)):
+                    orig = layer.weights[i][j]
+                    layer.weights[i][j] = orig + eps
 
-                        # Recompute loss for one sample
-                        if sequences and sequences[0]:
-                            sample = sequences[0][0]
-                            test_state = self.rssm.initial_state()
-                            test_state = self.rssm.observe_step(
-                                test_state, sample.action, sample.observation
-                            )
-                            test_feat = self.rssm.get_feature(test_state)
-
-                            if loss_fn_name == "recon":
-                                p = self.decoder.forward(test_feat)
-                                new_loss = _mse(p, sample.observation)
-                                grad = (new_loss - avg_recon) / eps
-                            else:
-                                p = self.reward_pred.forward(test_feat)
-                                new_loss = (p - sample.reward) ** 2
-                                grad = (new_loss - avg_reward) / eps
-
-                            layer.weights[i][j] = orig - self.lr * grad
-                        else:
-                            layer.weights[i][j] = orig
+                    # Recompute actor loss for one step
+                    new_probs = self.actor.get_action_dist(f0)
+                    new_lp = math.log(max(new_probs[a0], 1e-10))
+                    new_loss = -(
+                        new_lp * (ret0 - v0)
+                        + self.actor.entropy_scale * self.actor.entropy(new_probs)
+                    )
+                    grad = (new_loss - base_loss) / eps
 
-        self.train_steps += 1
-        losses = {
-            "reconstruction": avg_recon,
-            "reward": avg_reward,
-            "kl": avg_kl,
-            "total": total,
-        }
-        for k, v in losses.items():
-            self.loss_history[k].append(v)
+                    layer.weights[i][j] = orig - self.lr * grad
 
-        return losses
+        # Update critic via perturbation
+        for layer in self.critic.net.layers:
+            for i in range(layer.out_dim):
+                for j in range(min(layer.in_dim, 4)):
+                    orig = layer.weights[i][j]
+                    layer.weights[i][j] = orig + eps
 
-    def train_actor_critic_step(self) -> Dict[str, float]:
-        """
-        Train actor and critic purely from imagined trajectories.
-        """
-        if self.current_state is None or len(self.buffer.episodes) < 2:
-            return {"actor_loss": 0.0, "critic_loss": 0.0}
+                    new_v = self.critic.forward(f0)
+                    new_closs = (new_v - ret0) ** 2
+                    grad = (new_closs - (v0 - ret0) ** 2) / eps
+
+                    layer.weights[i][j] = orig - self.lr * grad
+
+        result = {"actor_loss": actor_loss, "critic_loss": critic_loss}
+        self.loss_history["actor"].append(actor_loss)
+        self.loss_history["critic"].append(critic_loss)
+        return result
+
+    def _actor_critic_losses_batched(
+        self, batch_size: int
+    ) -> Tuple[float, float, Tuple[Any, int, float, float]]:
+        # Starting latent states: posterior over short buffer windows
+        batch = self.buffer.sample_batch(batch_size, seq_len=5)
+        states, _, _ = self.rssm.observe_sequence(batch["obs"], batch["actions"])
+        last = batch["mask"].sum(axis=1) - 1
+        start_state = states[np.arange(batch_size), last]
+
+        # Imagine trajectories, then values and returns for all (B, H) steps
+        traj = self.imagine_batch(start_state, self.imagination_horizon)
+        features, actions = traj["features"], traj["actions"]
+        values = self.critic.forward(features)
+        lambda_returns = self.lambda_returns_batch(
+            traj["rewards"], values, traj["continues"]
+        )
+
+        # Actor loss: maximize returns (policy gradient)
+        probs = self.actor.get_action_dist(features)
+        taken = np.take_along_axis(probs, actions[..., None], axis=-1)[..., 0]
+        log_prob = np.log(np.maximum(taken, 1e-10))
+        advantage = lambda_returns - values
+        actor_loss = -(
+            log_prob * advantage + self.actor.entropy_scale * self.actor.entropy(probs)
+        )
+
+        # Critic loss: MSE between values and returns
+        critic_loss = (values - lambda_returns) ** 2
+
+        probe = (
+            features[0, 0],
+            int(actions[0, 0]),
+            float(lambda_returns[0, 0]),
+            float(values[0, 0]),
+        )
+        return float(actor_loss.mean()), float(critic_loss.mean()), probe
 
+    def _actor_critic_losses_list(
+        self,
+    ) -> Optional[Tuple[float, float, Tuple[Any, int, float, float]]]:
         # Sample a starting state from buffer
         seqs = self.buffer.sample_sequences(1)
         if not seqs or not seqs[0]:
-            return {"actor_loss": 0.0, "critic_loss": 0.0}
+            return None
 
         # Build a starting latent state
         start_state = self.rssm.initial_state()
@@ -1096,7 +1640,7 @@ class SC2WorldModel:
         trajectory = self.imagine_rollout(start_state, self.imagination_horizon)
 
         if not trajectory:
-            return {"actor_loss": 0.0, "critic_loss": 0.0}
+            return None
 
         # Compute values and returns
         features = [self.rssm.get_feature(s) for s, _, _, _ in trajectory]
@@ -1108,9 +1652,8 @@ class SC2WorldModel:
 
         # Actor loss: maximize returns (policy gradient)
         actor_loss = 0.0
-        for t, (state, action, _, _) in enumerate(trajectory):
-            feature = self.rssm.get_feature(state)
-            probs = self.actor.get_action_dist(feature)
+        for t, (_, action, _, _) in enumerate(trajectory):
+            probs = self.actor.get_action_dist(features[t])
             log_prob = math.log(max(probs[action], 1e-10))
             advantage = lambda_returns[t] - values[t]
             entropy = self.actor.entropy(probs)
@@ -1124,46 +1667,8 @@ class SC2WorldModel:
             critic_loss += (values[t] - lambda_returns[t]) ** 2
         critic_loss /= len(trajectory)
 
-        # Update actor via perturbation
-        eps = 1e-4
-        for layer in self.actor.net.layers:
-            for i in range(layer.out_dim):
-                for j in range(min(layer.in_dim, 4)):
-                    orig = layer.weights[i][j]
-                    layer.weights[i][j] = orig + eps
-
-                    # Recompute actor loss for one step
-                    s0, a0, _, _ = trajectory[0]
-                    f0 = self.rssm.get_feature(s0)
-                    new_probs = self.actor.get_action_dist(f0)
-                    new_lp = math.log(max(new_probs[a0], 1e-10))
-                    adv = lambda_returns[0] - values[0]
-                    new_loss = -(
-                        new_lp * adv
-                        + self.actor.entropy_scale * self.actor.entropy(new_probs)
-                    )
-                    grad = (new_loss - actor_loss) / eps
-
-                    layer.weights[i][j] = orig - self.lr * grad
-
-        # Update critic via perturbation
-        for layer in self.critic.net.layers:
-            for i in range(layer.out_dim):
-                for j in range(min(layer.in_dim, 4)):
-                    orig = layer.weights[i][j]
-                    layer.weights[i][j] = orig + eps
-
-                    f0 = self.rssm.get_feature(trajectory[0][0])
-                    new_v = self.critic.forward(f0)
-                    new_closs = (new_v - lambda_returns[0]) ** 2
-                    grad = (new_closs - (values[0] - lambda_returns[0]) ** 2) / eps
-
-                    layer.weights[i][j] = orig - self.lr * grad
-
-        result = {"actor_loss": actor_loss, "critic_loss": critic_loss}
-        self.loss_history["actor"].append(actor_loss)
-        self.loss_history["critic"].append(critic_loss)
-        return result
+        probe = (features[0], trajectory[0][1], lambda_returns[0], values[0])
+        return actor_loss, critic_loss, probe
 
     def get_diagnostics(self) -> Dict[str, Any]:
         """Return comprehensive diagnostic information."""
@@ -1179,7 +1684,7 @@ class SC2WorldModel:
 
         return {
             "train_steps": self.train_steps,
-            "buffer_episodes": len(self.buffer.episodes),
+            "buffer_episodes": self.buffer.num_episodes,
             "buffer_transitions": len(self.buffer),
             "latent_dim": self.rssm.latent_dim,
             "deterministic_dim": self.rssm.det_dim,
@@ -1334,7 +1839,7 @@ def run_demo(
             obs = next_obs
 
             # Train world model periodically
-            if step % 20 == 0 and len(world_model.buffer.episodes) >= 2:
+            if step % 20 == 0 and world_model.buffer.num_episodes >= 2:
                 wm_losses = world_model.train_world_model_step(batch_size=4)
                 ac_losses = world_model.train_actor_critic_step()
 